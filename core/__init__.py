@@ -44,8 +44,11 @@ except ImportError as e:
 try:
     from .relations import UDS3RelationsCore
     from .framework import UDS3RelationsDataFramework
-    from .cache import SingleRecordCache
-    __all__.extend(["UDS3RelationsCore", "UDS3RelationsDataFramework", "SingleRecordCache"])
+    from .cache import SingleRecordCache, ShardedSingleRecordCache
+    __all__.extend([
+        "UDS3RelationsCore", "UDS3RelationsDataFramework",
+        "SingleRecordCache", "ShardedSingleRecordCache"
+    ])
 except ImportError:
     pass
 
@@ -72,16 +75,22 @@ LEGACY_CORE_AVAILABLE = False
 try:
     from .polyglot_manager import UDS3PolyglotManager
     from .embeddings import UDS3GermanEmbeddings, create_german_embeddings
+    from .embedding_store import MMapEmbeddingStore
     from .llm_ollama import OllamaClient
     from .rag_pipeline import UDS3GenericRAG, QueryType, RAGContext
     from .rag_cache import RAGCache, PersistentRAGCache, CachedRAGResult
     from .rag_async import UDS3AsyncRAG, AsyncRAGResult, create_async_rag, batch_answer_queries
+    from .rag_concurrency import ConcurrencyLimits, DatabaseTiming, MultiDBExecutor
+    from .single_flight import SingleFlight, AsyncSingleFlight
     LEGACY_CORE_AVAILABLE = True
     __all__.extend([
         "UDS3PolyglotManager", "UDS3GermanEmbeddings", "create_german_embeddings",
+        "MMapEmbeddingStore",
         "OllamaClient", "UDS3GenericRAG", "QueryType", "RAGContext", 
         "RAGCache", "PersistentRAGCache", "CachedRAGResult",
-        "UDS3AsyncRAG", "AsyncRAGResult", "create_async_rag", "batch_answer_queries"
+        "UDS3AsyncRAG", "AsyncRAGResult", "create_async_rag", "batch_answer_queries",
+        "ConcurrencyLimits", "DatabaseTiming", "MultiDBExecutor",
+        "SingleFlight", "AsyncSingleFlight"
     ])
 except ImportError:
     pass
@@ -96,6 +105,7 @@ __all__ = [
     "RelationsCore",
     "RelationsDataFramework",
     "SingleRecordCache",
+    "ShardedSingleRecordCache",
     
     # Prometheus Metrics (v1.6.0)
     "UDS3Metrics",
@@ -114,6 +124,7 @@ __all__ = [
     # Embeddings
     "UDS3GermanEmbeddings",
     "create_german_embeddings",
+    "MMapEmbeddingStore",
     # LLM
     "OllamaClient",
     # RAG Pipeline
@@ -129,6 +140,11 @@ __all__ = [
     "AsyncRAGResult",
     "create_async_rag",
     "batch_answer_queries",
+    "ConcurrencyLimits",
+    "DatabaseTiming",
+    "MultiDBExecutor",
+    "SingleFlight",
+    "AsyncSingleFlight",
 ]
 
 __module_name__ = "core"
@@ -10,6 +10,7 @@ Features:
 - LRU (Least Recently Used) Eviction Policy
 - TTL (Time-To-Live) für automatische Invalidierung
 - Thread-Safe Operations (threading.Lock)
+- Optional Sharding (lock-striped LRU Segmente für Multi-Thread Reads)
 - Cache Statistics & Performance Monitoring
 - Flexible Invalidierung (Single, Pattern, Full)
 - Warmup-Mechanismus für häufig genutzte Records
@@ -27,11 +28,11 @@ Repository: https://github.com/makr-code/VCC-UDS3
 import logging
 import threading
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Any, Callable, Pattern
+from typing import Deque, Dict, List, Optional, Any, Callable, Pattern
 import re
 
 logger = logging.getLogger(__name__)
@@ -148,6 +149,69 @@ class CacheConfig:
     max_memory_mb: Optional[float] = None  # Memory limit
 
 
+# ============================================================================
+# SIZE ESTIMATION
+# ============================================================================
+
+_SCALAR_SIZE = 8
+_CONTAINER_OVERHEAD = 16
+
+
+def estimate_size(data: Any, max_nodes: int = 256) -> int:
+    """
+    Günstige Größenschätzung ohne Serialisierung
+    
+    Summiert String-/Byte-Längen und pauschale Kosten für Skalare und
+    Container. Nach ``max_nodes`` besuchten Elementen wird der Rest eines
+    Containers anhand des Durchschnitts der bereits gemessenen Elemente
+    hochgerechnet, sodass große Payloads (z.B. Embeddings) nicht
+    vollständig traversiert werden.
+    
+    Args:
+        data: Zu messende Daten
+        max_nodes: Maximale Anzahl besuchter Elemente
+        
+    Returns:
+        Geschätzte Größe in Bytes
+    """
+    budget = [max_nodes]
+    
+    def _walk(obj: Any) -> int:
+        budget[0] -= 1
+        if isinstance(obj, (str, bytes, bytearray)):
+            return len(obj)
+        if obj is None or isinstance(obj, (bool, int, float)):
+            return _SCALAR_SIZE
+        if isinstance(obj, dict):
+            total = _CONTAINER_OVERHEAD
+            seen = 0
+            for key, value in obj.items():
+                if budget[0] <= 0:
+                    break
+                total += _walk(key) + _walk(value)
+                seen += 1
+            if seen and seen < len(obj):
+                total += (total - _CONTAINER_OVERHEAD) // seen * (len(obj) - seen)
+            return total
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            total = _CONTAINER_OVERHEAD
+            seen = 0
+            for value in obj:
+                if budget[0] <= 0:
+                    break
+                total += _walk(value)
+                seen += 1
+            if seen and seen < len(obj):
+                total += (total - _CONTAINER_OVERHEAD) // seen * (len(obj) - seen)
+            return total
+        nbytes = getattr(obj, "nbytes", None)  # numpy arrays
+        if isinstance(nbytes, int):
+            return nbytes
+        return _SCALAR_SIZE * 4
+    
+    return _walk(data)
+
+
 # ============================================================================
 # MAIN CACHE CLASS
 # ============================================================================
@@ -180,6 +244,9 @@ class SingleRecordCache:
         print(f"Hit rate: {stats.hit_rate}%")
     """
     
+    # Anzahl Messwerte für average_access_time_ms (gleitendes Fenster)
+    ACCESS_TIME_WINDOW = 1000
+    
     def __init__(self, config: Optional[CacheConfig] = None):
         """
         Initialisiert den Cache
@@ -191,7 +258,8 @@ class SingleRecordCache:
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self._lock = threading.Lock()
         self._stats = CacheStatistics()
-        self._access_times: List[float] = []
+        self._access_times: Deque[float] = deque(maxlen=self.ACCESS_TIME_WINDOW)
+        self._access_time_sum = 0.0
         self._cleanup_thread: Optional[threading.Thread] = None
         self._stop_cleanup = threading.Event()
         
@@ -228,7 +296,7 @@ class SingleRecordCache:
             if document_id not in self._cache:
                 self._stats.misses += 1
                 self._record_access_time(start_time)
-                logger.debug(f"Cache MISS: {document_id}")
+                logger.debug("Cache MISS: %s", document_id)
                 return None
             
             entry = self._cache[document_id]
@@ -240,7 +308,7 @@ class SingleRecordCache:
                 self._stats.total_size_bytes -= entry.size_bytes
                 del self._cache[document_id]
                 self._record_access_time(start_time)
-                logger.debug(f"Cache EXPIRED: {document_id}")
+                logger.debug("Cache EXPIRED: %s", document_id)
                 return None
             
             # Valid hit
@@ -251,7 +319,7 @@ class SingleRecordCache:
             self._cache.move_to_end(document_id)
             
             self._record_access_time(start_time)
-            logger.debug(f"Cache HIT: {document_id} (hits: {entry.access_count})")
+            logger.debug("Cache HIT: %s (hits: %d)", document_id, entry.access_count)
             
             return entry.data
     
@@ -269,6 +337,11 @@ class SingleRecordCache:
             data: Document data
             ttl_seconds: Custom TTL (überschreibt default)
         """
+        # Größenschätzung außerhalb des Locks
+        size_bytes = self._estimate_size(data)
+        ttl = ttl_seconds if ttl_seconds is not None else self.config.default_ttl_seconds
+        now = time.time()
+        
         with self._lock:
             # Remove old entry if exists
             if document_id in self._cache:
@@ -280,14 +353,11 @@ class SingleRecordCache:
                 self._evict_lru()
             
             # Create new entry
-            size_bytes = self._estimate_size(data)
-            ttl = ttl_seconds if ttl_seconds is not None else self.config.default_ttl_seconds
-            
             entry = CacheEntry(
                 document_id=document_id,
                 data=data,
-                created_at=time.time(),
-                last_accessed=time.time(),
+                created_at=now,
+                last_accessed=now,
                 ttl_seconds=ttl,
                 size_bytes=size_bytes
             )
@@ -303,8 +373,8 @@ class SingleRecordCache:
                     self._evict_lru()
             
             logger.debug(
-                f"Cache PUT: {document_id} "
-                f"(size: {len(self._cache)}/{self.config.max_size})"
+                "Cache PUT: %s (size: %d/%d)",
+                document_id, len(self._cache), self.config.max_size
             )
     
     def invalidate(self, document_id: str) -> bool:
@@ -379,7 +449,7 @@ class SingleRecordCache:
         doc_id, entry = self._cache.popitem(last=False)
         self._stats.total_size_bytes -= entry.size_bytes
         self._stats.evictions += 1
-        logger.debug(f"Cache EVICTED: {doc_id} (LRU)")
+        logger.debug("Cache EVICTED: %s (LRU)", doc_id)
     
     # ========================================================================
     # BATCH OPERATIONS
@@ -563,6 +633,7 @@ class SingleRecordCache:
         with self._lock:
             self._stats = CacheStatistics()
             self._access_times.clear()
+            self._access_time_sum = 0.0
             logger.info("Cache statistics reset")
     
     # ========================================================================
@@ -579,25 +650,282 @@ class SingleRecordCache:
         Returns:
             Geschätzte Größe in Bytes
         """
-        # Simple estimation based on string representation
-        import sys
         try:
-            return sys.getsizeof(str(data))
+            return estimate_size(data)
         except Exception:
             return 1024  # Default 1KB
     
     def _record_access_time(self, start_time: float):
-        """Zeichnet Access-Zeit auf"""
+        """Zeichnet Access-Zeit auf (O(1) gleitender Mittelwert)"""
         access_time_ms = (time.time() - start_time) * 1000
+        
+        # deque(maxlen) verdrängt den ältesten Wert - laufende Summe nachführen
+        if len(self._access_times) == self._access_times.maxlen:
+            self._access_time_sum -= self._access_times[0]
         self._access_times.append(access_time_ms)
+        self._access_time_sum += access_time_ms
         
-        # Keep only last 1000 measurements
-        if len(self._access_times) > 1000:
-            self._access_times = self._access_times[-1000:]
+        self._stats.average_access_time_ms = self._access_time_sum / len(self._access_times)
+    
+    # ========================================================================
+    # CONTEXT MANAGER
+    # ========================================================================
+    
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.stop()
+        return False
+
+
+# ============================================================================
+# SHARDED CACHE
+# ============================================================================
+
+class ShardedSingleRecordCache:
+    """
+    Lock-striped Variante des SingleRecordCache
+    
+    Verteilt die Einträge per Hash der document_id auf N unabhängige
+    LRU-Segmente mit jeweils eigenem Lock. Parallele Reads auf
+    unterschiedliche Dokumente konkurrieren dadurch nicht mehr um einen
+    globalen Lock. ``max_size`` und ``max_memory_mb`` werden gleichmäßig auf
+    die Segmente verteilt, die LRU-Ordnung gilt daher pro Segment.
+    
+    Die öffentliche API entspricht SingleRecordCache (get/put, get_many,
+    put_many, invalidate_pattern, Statistiken, Warmup, Context Manager).
+    
+    Example:
+        cache = ShardedSingleRecordCache(CacheConfig(max_size=10000), num_shards=16)
+        cache.put("doc123", {"title": "Test"})
+        data = cache.get("doc123")
+    """
+    
+    def __init__(self, config: Optional[CacheConfig] = None, num_shards: int = 16):
+        """
+        Initialisiert den Sharded Cache
         
-        # Update average
-        if self._access_times:
-            self._stats.average_access_time_ms = sum(self._access_times) / len(self._access_times)
+        Args:
+            config: Cache-Konfiguration (gilt für den gesamten Cache)
+            num_shards: Anzahl unabhängiger Segmente
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be >= 1")
+        
+        self.config = config or CacheConfig()
+        self.num_shards = num_shards
+        
+        shard_size = max(1, -(-self.config.max_size // num_shards))
+        shard_memory = (
+            self.config.max_memory_mb / num_shards
+            if self.config.max_memory_mb else None
+        )
+        shard_config = CacheConfig(
+            max_size=shard_size,
+            default_ttl_seconds=self.config.default_ttl_seconds,
+            enable_stats=self.config.enable_stats,
+            enable_compression=self.config.enable_compression,
+            auto_cleanup_interval=0.0,  # Ein gemeinsamer Cleanup-Thread
+            invalidation_strategy=self.config.invalidation_strategy,
+            warmup_enabled=self.config.warmup_enabled,
+            max_memory_mb=shard_memory
+        )
+        self._shards: List[SingleRecordCache] = [
+            SingleRecordCache(shard_config) for _ in range(num_shards)
+        ]
+        self._cleanup_thread: Optional[threading.Thread] = None
+        self._stop_cleanup = threading.Event()
+        
+        logger.info(
+            f"ShardedSingleRecordCache initialized: "
+            f"max_size={self.config.max_size}, shards={num_shards}, "
+            f"ttl={self.config.default_ttl_seconds}s"
+        )
+        
+        if self.config.auto_cleanup_interval > 0:
+            self._start_cleanup_thread()
+    
+    def _shard_for(self, document_id: str) -> SingleRecordCache:
+        """Wählt das Segment für eine document_id"""
+        return self._shards[hash(document_id) % self.num_shards]
+    
+    def _group_by_shard(self, document_ids) -> Dict[int, List[str]]:
+        """Gruppiert IDs nach Segment-Index"""
+        groups: Dict[int, List[str]] = {}
+        for doc_id in document_ids:
+            groups.setdefault(hash(doc_id) % self.num_shards, []).append(doc_id)
+        return groups
+    
+    # ========================================================================
+    # CORE OPERATIONS
+    # ========================================================================
+    
+    def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """Holt einen Eintrag aus dem zuständigen Segment"""
+        return self._shard_for(document_id).get(document_id)
+    
+    def put(
+        self,
+        document_id: str,
+        data: Dict[str, Any],
+        ttl_seconds: Optional[float] = None
+    ):
+        """Speichert einen Eintrag im zuständigen Segment"""
+        self._shard_for(document_id).put(document_id, data, ttl_seconds)
+    
+    def invalidate(self, document_id: str) -> bool:
+        """Invalidiert einen Cache-Eintrag"""
+        return self._shard_for(document_id).invalidate(document_id)
+    
+    def invalidate_pattern(self, pattern: str) -> int:
+        """Invalidiert alle Einträge die Pattern matchen (alle Segmente)"""
+        return sum(shard.invalidate_pattern(pattern) for shard in self._shards)
+    
+    def clear(self):
+        """Leert alle Segmente"""
+        for shard in self._shards:
+            shard.clear()
+    
+    # ========================================================================
+    # BATCH OPERATIONS
+    # ========================================================================
+    
+    def get_many(self, document_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Holt mehrere Einträge, gruppiert nach Segment
+        
+        Args:
+            document_ids: Liste von Dokument-IDs
+            
+        Returns:
+            Dict mit document_id -> data (None bei Miss), in Eingabereihenfolge
+        """
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        for index, ids in self._group_by_shard(document_ids).items():
+            found.update(self._shards[index].get_many(ids))
+        return {doc_id: found[doc_id] for doc_id in document_ids}
+    
+    def put_many(self, documents: Dict[str, Dict[str, Any]], ttl_seconds: Optional[float] = None):
+        """Speichert mehrere Einträge, gruppiert nach Segment"""
+        for index, ids in self._group_by_shard(documents.keys()).items():
+            self._shards[index].put_many(
+                {doc_id: documents[doc_id] for doc_id in ids}, ttl_seconds
+            )
+    
+    def invalidate_many(self, document_ids: List[str]) -> int:
+        """Invalidiert mehrere Einträge"""
+        return sum(
+            self._shards[index].invalidate_many(ids)
+            for index, ids in self._group_by_shard(document_ids).items()
+        )
+    
+    def warmup(self, loader_fn: Callable[[str], Dict[str, Any]], document_ids: List[str]):
+        """Lädt Dokumente in den Cache (Warmup)"""
+        logger.info(f"Cache warmup: loading {len(document_ids)} documents")
+        
+        success_count = 0
+        for doc_id in document_ids:
+            try:
+                data = loader_fn(doc_id)
+                if data:
+                    self.put(doc_id, data)
+                    success_count += 1
+            except Exception as e:
+                logger.error(f"Warmup failed for {doc_id}: {e}")
+        
+        logger.info(f"Cache warmup complete: {success_count}/{len(document_ids)} loaded")
+    
+    # ========================================================================
+    # CLEANUP
+    # ========================================================================
+    
+    def cleanup_expired(self) -> int:
+        """Entfernt abgelaufene Einträge aus allen Segmenten"""
+        return sum(shard.cleanup_expired() for shard in self._shards)
+    
+    def _start_cleanup_thread(self):
+        """Startet Background-Thread für automatisches Cleanup"""
+        def cleanup_loop():
+            while not self._stop_cleanup.wait(self.config.auto_cleanup_interval):
+                self.cleanup_expired()
+        
+        self._cleanup_thread = threading.Thread(
+            target=cleanup_loop,
+            daemon=True,
+            name="ShardedCacheCleanup"
+        )
+        self._cleanup_thread.start()
+        logger.info("Cache cleanup thread started")
+    
+    def stop(self):
+        """Stoppt den Cache (cleanup thread)"""
+        if self._cleanup_thread:
+            self._stop_cleanup.set()
+            self._cleanup_thread.join(timeout=5)
+            logger.info("Cache stopped")
+    
+    # ========================================================================
+    # STATISTICS
+    # ========================================================================
+    
+    def get_statistics(self) -> CacheStatistics:
+        """
+        Aggregiert die Statistiken aller Segmente
+        
+        Returns:
+            CacheStatistics Objekt
+        """
+        total = CacheStatistics()
+        weighted_access_ms = 0.0
+        for shard in self._shards:
+            stats = shard.get_statistics()
+            total.hits += stats.hits
+            total.misses += stats.misses
+            total.evictions += stats.evictions
+            total.invalidations += stats.invalidations
+            total.total_requests += stats.total_requests
+            total.total_size_bytes += stats.total_size_bytes
+            weighted_access_ms += stats.average_access_time_ms * stats.total_requests
+        if total.total_requests:
+            total.average_access_time_ms = weighted_access_ms / total.total_requests
+        return total
+    
+    def get_info(self) -> Dict[str, Any]:
+        """
+        Gibt detaillierte Cache-Informationen zurück
+        
+        Returns:
+            Dict mit Cache-Informationen
+        """
+        shard_infos = [shard.get_info() for shard in self._shards]
+        current_size = sum(info["current_size"] for info in shard_infos)
+        top_entries = sorted(
+            (entry for info in shard_infos for entry in info["top_entries"]),
+            key=lambda entry: entry["access_count"],
+            reverse=True
+        )[:10]
+        
+        return {
+            "config": {
+                "max_size": self.config.max_size,
+                "default_ttl_seconds": self.config.default_ttl_seconds,
+                "invalidation_strategy": self.config.invalidation_strategy.value,
+                "num_shards": self.num_shards
+            },
+            "current_size": current_size,
+            "usage_percent": round((current_size / self.config.max_size) * 100, 2),
+            "statistics": self.get_statistics().to_dict(),
+            "shard_sizes": [info["current_size"] for info in shard_infos],
+            "top_entries": top_entries
+        }
+    
+    def reset_statistics(self):
+        """Setzt Statistiken aller Segmente zurück"""
+        for shard in self._shards:
+            shard.reset_statistics()
     
     # ========================================================================
     # CONTEXT MANAGER
@@ -620,8 +948,9 @@ class SingleRecordCache:
 def create_single_record_cache(
     max_size: int = 1000,
     default_ttl_seconds: float = 300.0,
-    enable_auto_cleanup: bool = True
-) -> SingleRecordCache:
+    enable_auto_cleanup: bool = True,
+    num_shards: int = 1
+):
     """
     Factory-Funktion zum Erstellen eines Caches
     
@@ -629,15 +958,18 @@ def create_single_record_cache(
         max_size: Maximale Anzahl Einträge
         default_ttl_seconds: Standard TTL in Sekunden
         enable_auto_cleanup: Automatisches Cleanup aktivieren
+        num_shards: Anzahl Segmente (> 1 liefert ShardedSingleRecordCache)
         
     Returns:
-        SingleRecordCache Instanz
+        SingleRecordCache oder ShardedSingleRecordCache Instanz
     """
     config = CacheConfig(
         max_size=max_size,
         default_ttl_seconds=default_ttl_seconds,
         auto_cleanup_interval=60.0 if enable_auto_cleanup else 0.0
     )
+    if num_shards > 1:
+        return ShardedSingleRecordCache(config, num_shards=num_shards)
     return SingleRecordCache(config)
 
 
@@ -3663,20 +3663,28 @@ class UnifiedDatabaseStrategy(UDS3DatabaseSchemasMixin, UDS3CRUDStrategiesMixin)
     def stream_to_vector_db(
         self,
         file_path: str,
-        embedding_function: Callable[[str], List[float]],
+        embedding_function: Optional[Callable[[str], List[float]]] = None,
         chunk_text_size: int = 1000,
-        progress_callback: Optional[Callable[[Any], None]] = None
+        progress_callback: Optional[Callable[[Any], None]] = None,
+        embedder: Optional[Any] = None,
+        document_id: Optional[str] = None,
+        chunk_overlap: int = 200
     ) -> Dict[str, Any]:
         """
         Streamt große Datei zur Vector DB mit Chunked Embeddings.
         
         Für große PDFs (300+ MB) mit Embeddings - vermeidet Out-of-Memory.
+        Extraktion, Chunking, Embedding (Micro-Batches) und Vector-Inserts
+        laufen als Pipeline mit begrenzten Queues (konstanter Speicherbedarf).
         
         Args:
             file_path: Pfad zur Datei
-            embedding_function: Funktion zur Embedding-Generierung
+            embedding_function: Funktion zur Embedding-Generierung (ohne embedder)
             chunk_text_size: Text-Chunk-Größe (Zeichen)
             progress_callback: Optional: Callback für Progress-Updates
+            embedder: Optional: Objekt mit embed_batch (z. B. UDS3GermanEmbeddings)
+            document_id: Optional: Dokument-ID für Chunk-IDs (Default: Dateiname)
+            chunk_overlap: Überlappung benachbarter Chunks (Zeichen)
         
         Returns:
             Dict mit Streaming-Details
@@ -3706,7 +3714,11 @@ class UnifiedDatabaseStrategy(UDS3DatabaseSchemasMixin, UDS3CRUDStrategiesMixin)
                 file_path=file_path,
                 embedding_function=embedding_function,
                 chunk_text_size=chunk_text_size,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                embedder=embedder,
+                vector_backend=self.vector_backend,
+                document_id=document_id,
+                chunk_overlap=chunk_overlap
             )
             
             # Get final progress
@@ -3716,6 +3728,7 @@ class UnifiedDatabaseStrategy(UDS3DatabaseSchemasMixin, UDS3CRUDStrategiesMixin)
                 'success': True,
                 'operation_id': operation_id,
                 'chunks_processed': progress.current_chunk if progress else 0,
+                'stage_progress': progress.stage_progress if progress else {},
                 'status': progress.status.value if progress else 'unknown',
                 'progress': progress.to_dict() if progress else None
             }
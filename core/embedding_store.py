@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+embedding_store.py
+
+UDS3 Memory-Mapped Embedding Store
+Append-only float32 Matrix mit kompaktem Hash→Row Index als Ersatz für
+den Pickle-Disk-Cache (eine Datei pro Embedding).
+
+Layout (ein Verzeichnis pro Embedding-Dimension):
+- vectors.f32  : Zeilen mit je ``dim`` float32 Werten (append-only)
+- keys.bin     : 32-Byte SHA256 Digest pro Zeile (parallel zu vectors.f32)
+- deleted.bin  : int64 Zeilennummern gelöschter Einträge (bis zur Compaction)
+- meta.json    : Format-Version und Dimension
+
+Features:
+- Batched Lookups (vektorisiert über sortierten uint64-Prefix-Index)
+- Zero-Copy Views in die gemappte Matrix
+- Crash-Recovery: unvollständige Zeilen werden beim Öffnen abgeschnitten
+- Compaction (entfernt gelöschte Zeilen)
+- Migration aus dem bestehenden ``<sha256>.pkl`` Verzeichnis
+
+Der Store ist thread-safe, erwartet aber genau einen schreibenden Prozess.
+
+Usage (CLI):
+python -m core.embedding_store migrate ~/.uds3/embeddings_cache --dim 768
+python -m core.embedding_store compact ~/.uds3/embeddings_cache/mmap_768d --dim 768
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+KeyLike = Union[str, bytes]
+
+
+def store_dir_for(cache_dir: Union[str, Path], dim: int) -> Path:
+    """Standard-Verzeichnis des Stores innerhalb eines Embedding-Cache-Verzeichnisses"""
+    return Path(cache_dir) / f"mmap_{dim}d"
+
+
+class MMapEmbeddingStore:
+    """
+    Append-only, memory-mapped Embedding Store
+
+    Beispiel:
+    ```python
+    store = MMapEmbeddingStore(Path("~/.uds3/embeddings_cache/mmap_768d"), dim=768)
+    store.put_batch(keys, vectors)            # keys: SHA256 hex oder 32-Byte Digest
+    rows = store.lookup_rows(keys)            # -1 für Misses
+    matrix, found = store.get_batch(keys)     # matrix enthält nur Treffer
+    ```
+    """
+
+    FORMAT_VERSION = 1
+    VECTORS_FILE = "vectors.f32"
+    KEYS_FILE = "keys.bin"
+    DELETED_FILE = "deleted.bin"
+    META_FILE = "meta.json"
+    KEY_BYTES = 32
+    DTYPE = np.float32
+
+    # Ab dieser Anzahl ungemergter Appends wird der sortierte Index neu gebaut
+    INDEX_MERGE_THRESHOLD = 65536
+
+    def __init__(self, path: Union[str, Path], dim: int):
+        """
+        Öffnet (oder erstellt) einen Store
+
+        Args:
+            path: Verzeichnis des Stores
+            dim: Embedding-Dimension (muss zu meta.json passen)
+        """
+        if dim <= 0:
+            raise ValueError(f"Ungültige Dimension: {dim}")
+
+        self.path = Path(path)
+        self.dim = dim
+        self.row_bytes = dim * np.dtype(self.DTYPE).itemsize
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._vectors_fh = None
+        self._keys_fh = None
+        self._vectors_mm: Optional[np.ndarray] = None
+        self._keys_mm: Optional[np.ndarray] = None
+
+        self._check_meta()
+        self._open()
+
+    # ========================================================================
+    # OPEN / RECOVERY
+    # ========================================================================
+
+    def _check_meta(self):
+        """Validiert bzw. schreibt meta.json"""
+        meta_file = self.path / self.META_FILE
+        if meta_file.exists():
+            meta = json.loads(meta_file.read_text(encoding="utf-8"))
+            if meta.get("dim") != self.dim:
+                raise ValueError(
+                    f"Store {self.path} hat Dimension {meta.get('dim')}, erwartet {self.dim}"
+                )
+            if meta.get("version") != self.FORMAT_VERSION:
+                raise ValueError(f"Unbekannte Store-Version: {meta.get('version')}")
+        else:
+            meta_file.write_text(
+                json.dumps({"version": self.FORMAT_VERSION, "dim": self.dim, "dtype": "float32"}),
+                encoding="utf-8"
+            )
+
+    def _open(self):
+        """Öffnet Dateien, schneidet unvollständige Zeilen ab und baut den Index"""
+        vectors_file = self.path / self.VECTORS_FILE
+        keys_file = self.path / self.KEYS_FILE
+        vectors_file.touch(exist_ok=True)
+        keys_file.touch(exist_ok=True)
+
+        # Vektoren werden vor den Keys geschrieben: ein Key impliziert eine
+        # vollständige Zeile. Überhänge stammen aus abgebrochenen Writes.
+        n_vectors = vectors_file.stat().st_size // self.row_bytes
+        n_keys = keys_file.stat().st_size // self.KEY_BYTES
+        n_rows = min(n_vectors, n_keys)
+        if vectors_file.stat().st_size != n_rows * self.row_bytes:
+            os.truncate(vectors_file, n_rows * self.row_bytes)
+            logger.warning(f"Embedding Store {self.path}: vectors.f32 auf {n_rows} Zeilen gekürzt")
+        if keys_file.stat().st_size != n_rows * self.KEY_BYTES:
+            os.truncate(keys_file, n_rows * self.KEY_BYTES)
+            logger.warning(f"Embedding Store {self.path}: keys.bin auf {n_rows} Zeilen gekürzt")
+
+        self._n_rows = n_rows
+        self._vectors_fh = open(vectors_file, "ab")
+        self._keys_fh = open(keys_file, "ab")
+
+        deleted_file = self.path / self.DELETED_FILE
+        if deleted_file.exists():
+            deleted = np.fromfile(deleted_file, dtype="<i8")
+            self._deleted = set(int(r) for r in deleted if r < n_rows)
+        else:
+            self._deleted = set()
+
+        self._remap()
+        self._rebuild_index()
+
+    def _remap(self):
+        """Mappt vectors.f32 / keys.bin neu (nach Appends)"""
+        self._vectors_fh.flush()
+        self._keys_fh.flush()
+        if self._n_rows == 0:
+            self._vectors_mm = np.empty((0, self.dim), dtype=self.DTYPE)
+            self._keys_mm = np.empty((0, self.KEY_BYTES), dtype=np.uint8)
+            return
+        self._vectors_mm = np.memmap(
+            self.path / self.VECTORS_FILE, dtype=self.DTYPE, mode="r",
+            shape=(self._n_rows, self.dim)
+        )
+        self._keys_mm = np.memmap(
+            self.path / self.KEYS_FILE, dtype=np.uint8, mode="r",
+            shape=(self._n_rows, self.KEY_BYTES)
+        )
+
+    def _rebuild_index(self):
+        """Baut den sortierten Prefix-Index über alle Zeilen"""
+        live = np.arange(self._n_rows, dtype=np.int64)
+        if self._deleted:
+            live = np.setdiff1d(
+                live, np.fromiter(self._deleted, dtype=np.int64, count=len(self._deleted))
+            )
+        prefixes = self._prefixes(self._keys_mm[live])
+        order = np.argsort(prefixes, kind="stable")
+        self._index_prefix = prefixes[order]
+        self._index_rows = live[order]
+        self._pending: Dict[bytes, int] = {}
+
+    @staticmethod
+    def _prefixes(digests: np.ndarray) -> np.ndarray:
+        """Erste 8 Bytes jedes Digests als uint64"""
+        if len(digests) == 0:
+            return np.empty(0, dtype=np.uint64)
+        return np.ascontiguousarray(digests[:, :8]).view("<u8").ravel().astype(np.uint64)
+
+    # ========================================================================
+    # KEYS
+    # ========================================================================
+
+    @classmethod
+    def to_digest(cls, key: KeyLike) -> bytes:
+        """Normalisiert Keys: 32-Byte Digest, SHA256 hex oder beliebiger String"""
+        if isinstance(key, bytes) and len(key) == cls.KEY_BYTES:
+            return key
+        if isinstance(key, str) and len(key) == cls.KEY_BYTES * 2:
+            try:
+                return bytes.fromhex(key)
+            except ValueError:
+                pass
+        raw = key if isinstance(key, bytes) else key.encode("utf-8")
+        return hashlib.sha256(raw).digest()
+
+    def _digest_matrix(self, keys: Sequence[KeyLike]) -> np.ndarray:
+        joined = b"".join(self.to_digest(k) for k in keys)
+        return np.frombuffer(joined, dtype=np.uint8).reshape(len(keys), self.KEY_BYTES)
+
+    # ========================================================================
+    # LOOKUP
+    # ========================================================================
+
+    def lookup_rows(self, keys: Sequence[KeyLike]) -> np.ndarray:
+        """
+        Ermittelt die Zeilennummern für einen Batch von Keys
+
+        Args:
+            keys: SHA256 hex Strings oder 32-Byte Digests
+
+        Returns:
+            int64 Array (len(keys),) mit Zeilennummer oder -1 bei Miss
+        """
+        if not len(keys):
+            return np.empty(0, dtype=np.int64)
+        digests = self._digest_matrix(keys)
+        with self._lock:
+            return self._lookup_digests(digests)
+
+    def _lookup_digests(self, digests: np.ndarray) -> np.ndarray:
+        rows = np.full(len(digests), -1, dtype=np.int64)
+
+        if len(self._index_prefix):
+            prefixes = self._prefixes(digests)
+            pos = np.searchsorted(self._index_prefix, prefixes, side="left")
+            in_range = pos < len(self._index_prefix)
+            candidates = np.where(in_range, pos, 0)
+            prefix_match = in_range & (self._index_prefix[candidates] == prefixes)
+            hit_idx = np.nonzero(prefix_match)[0]
+            if len(hit_idx):
+                cand_rows = self._index_rows[candidates[hit_idx]]
+                full_match = np.all(self._keys_mm[cand_rows] == digests[hit_idx], axis=1)
+                rows[hit_idx[full_match]] = cand_rows[full_match]
+                # Prefix-Kollision (sehr selten): benachbarte Einträge prüfen
+                for i in hit_idx[~full_match]:
+                    rows[i] = self._scan_prefix_run(int(pos[i]), digests[i])
+
+        if self._deleted:
+            deleted = np.fromiter(self._deleted, dtype=np.int64, count=len(self._deleted))
+            rows[np.isin(rows, deleted)] = -1
+
+        # Appends seit dem letzten Index-Build (inkl. erneut eingefügter Keys)
+        if self._pending:
+            for i in np.nonzero(rows < 0)[0]:
+                row = self._pending.get(digests[i].tobytes())
+                if row is not None and row not in self._deleted:
+                    rows[i] = row
+
+        return rows
+
+    def _scan_prefix_run(self, start: int, digest: np.ndarray) -> int:
+        prefix = self._index_prefix[start]
+        pos = start
+        while pos < len(self._index_prefix) and self._index_prefix[pos] == prefix:
+            row = int(self._index_rows[pos])
+            if np.array_equal(self._keys_mm[row], digest):
+                return row
+            pos += 1
+        return -1
+
+    def rows(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Liefert die Vektoren für Zeilennummern
+
+        Zusammenhängende, aufsteigende Zeilen (typisch für gemeinsam
+        eingefügte Chunks eines Dokuments) werden als Zero-Copy View in die
+        gemappte Matrix zurückgegeben, sonst als ein einzelner Gather.
+
+        Args:
+            rows: Zeilennummern (>= 0)
+
+        Returns:
+            float32 Matrix (len(rows), dim)
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        with self._lock:
+            mm = self._vectors_mm
+        if len(rows) == 0:
+            return np.empty((0, self.dim), dtype=self.DTYPE)
+        first = int(rows[0])
+        if int(rows[-1]) - first + 1 == len(rows) and (len(rows) == 1 or np.all(np.diff(rows) == 1)):
+            return mm[first:first + len(rows)]
+        return np.take(mm, rows, axis=0)
+
+    def get(self, key: KeyLike) -> Optional[np.ndarray]:
+        """Liefert einen einzelnen Vektor als Zero-Copy View (oder None)"""
+        row = int(self.lookup_rows([key])[0])
+        if row < 0:
+            return None
+        with self._lock:
+            return self._vectors_mm[row]
+
+    def get_batch(self, keys: Sequence[KeyLike]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batched Lookup
+
+        Args:
+            keys: SHA256 hex Strings oder 32-Byte Digests
+
+        Returns:
+            (matrix, found) - matrix enthält die Treffer in Eingabereihenfolge
+            (len = found.sum()), found ist eine bool-Maske über ``keys``
+        """
+        found_rows = self.lookup_rows(keys)
+        found = found_rows >= 0
+        return self.rows(found_rows[found]), found
+
+    def __contains__(self, key: KeyLike) -> bool:
+        return int(self.lookup_rows([key])[0]) >= 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._n_rows - len(self._deleted)
+
+    # ========================================================================
+    # WRITE
+    # ========================================================================
+
+    def put(self, key: KeyLike, vector: np.ndarray) -> bool:
+        """Fügt einen Vektor hinzu; False wenn der Key bereits existiert"""
+        return self.put_batch([key], np.asarray(vector).reshape(1, -1)) == 1
+
+    def put_batch(self, keys: Sequence[KeyLike], vectors: np.ndarray) -> int:
+        """
+        Hängt neue Vektoren an (bereits vorhandene Keys werden übersprungen)
+
+        Args:
+            keys: SHA256 hex Strings oder 32-Byte Digests
+            vectors: Matrix (len(keys), dim)
+
+        Returns:
+            Anzahl tatsächlich angehängter Zeilen
+        """
+        vectors = np.asarray(vectors, dtype=self.DTYPE)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if len(keys) != len(vectors):
+            raise ValueError("keys und vectors müssen gleich lang sein")
+        if len(keys) == 0:
+            return 0
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Dimension {vectors.shape[1]} passt nicht zu Store ({self.dim})")
+
+        digests = self._digest_matrix(keys)
+        with self._lock:
+            existing = self._lookup_digests(digests)
+            new_idx: List[int] = []
+            seen = set()
+            for i in np.nonzero(existing < 0)[0]:
+                digest = digests[i].tobytes()
+                if digest not in seen:
+                    seen.add(digest)
+                    new_idx.append(int(i))
+            if not new_idx:
+                return 0
+
+            idx = np.asarray(new_idx, dtype=np.int64)
+            self._vectors_fh.write(np.ascontiguousarray(vectors[idx]).tobytes())
+            self._vectors_fh.flush()
+            self._keys_fh.write(np.ascontiguousarray(digests[idx]).tobytes())
+            self._keys_fh.flush()
+
+            start = self._n_rows
+            for offset, i in enumerate(new_idx):
+                self._pending[digests[i].tobytes()] = start + offset
+            self._n_rows += len(new_idx)
+            self._remap()
+
+            if len(self._pending) >= self.INDEX_MERGE_THRESHOLD:
+                self._rebuild_index()
+
+            return len(new_idx)
+
+    def delete(self, keys: Iterable[KeyLike]) -> int:
+        """
+        Markiert Einträge als gelöscht (physisch entfernt bei compact())
+
+        Returns:
+            Anzahl gelöschter Einträge
+        """
+        keys = list(keys)
+        rows = self.lookup_rows(keys)
+        rows = rows[rows >= 0]
+        if len(rows) == 0:
+            return 0
+        with self._lock:
+            self._deleted.update(int(r) for r in rows)
+            with open(self.path / self.DELETED_FILE, "ab") as fh:
+                fh.write(rows.astype("<i8").tobytes())
+        return len(rows)
+
+    def flush(self):
+        """Schreibt gepufferte Daten und fsynct die Dateien"""
+        with self._lock:
+            for fh in (self._vectors_fh, self._keys_fh):
+                fh.flush()
+                os.fsync(fh.fileno())
+
+    # ========================================================================
+    # COMPACTION
+    # ========================================================================
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Schreibt den Store ohne gelöschte Zeilen neu (atomar via os.replace)
+
+        Vorher zurückgegebene Views bleiben auf POSIX-Systemen gültig (sie
+        referenzieren die alte Datei). Unter Windows müssen alle Views vor der
+        Compaction freigegeben sein.
+
+        Returns:
+            Dict mit rows_before / rows_after / rows_removed
+        """
+        with self._lock:
+            rows_before = self._n_rows
+            keep = np.ones(rows_before, dtype=bool)
+            if self._deleted:
+                keep[np.fromiter(self._deleted, dtype=np.int64, count=len(self._deleted))] = False
+
+            # Doppelte Keys (z.B. aus parallelen Migrationen) nur unter den lebenden
+            # Zeilen auflösen und jeweils die jüngste behalten (delete → put)
+            live = np.nonzero(keep)[0]
+            if len(live):
+                newest_first = live[::-1]
+                _, first = np.unique(self._keys_mm[newest_first], axis=0, return_index=True)
+                keep[:] = False
+                keep[newest_first[first]] = True
+
+            rows_after = int(keep.sum())
+            if rows_after == rows_before and not self._deleted:
+                return {"rows_before": rows_before, "rows_after": rows_after, "rows_removed": 0}
+
+            tmp_vectors = self.path / (self.VECTORS_FILE + ".tmp")
+            tmp_keys = self.path / (self.KEYS_FILE + ".tmp")
+            chunk = 65536
+            with open(tmp_vectors, "wb") as vf, open(tmp_keys, "wb") as kf:
+                for start in range(0, rows_before, chunk):
+                    sel = np.nonzero(keep[start:start + chunk])[0] + start
+                    vf.write(np.ascontiguousarray(self._vectors_mm[sel]).tobytes())
+                    kf.write(np.ascontiguousarray(self._keys_mm[sel]).tobytes())
+                vf.flush()
+                os.fsync(vf.fileno())
+                kf.flush()
+                os.fsync(kf.fileno())
+
+            self._close_files()
+            os.replace(tmp_vectors, self.path / self.VECTORS_FILE)
+            os.replace(tmp_keys, self.path / self.KEYS_FILE)
+            deleted_file = self.path / self.DELETED_FILE
+            if deleted_file.exists():
+                deleted_file.unlink()
+            self._open()
+
+            logger.info(f"Embedding Store compacted: {rows_before} → {rows_after} Zeilen")
+            return {
+                "rows_before": rows_before,
+                "rows_after": rows_after,
+                "rows_removed": rows_before - rows_after
+            }
+
+    # ========================================================================
+    # LIFECYCLE / STATS
+    # ========================================================================
+
+    def _close_files(self):
+        self._vectors_mm = None
+        self._keys_mm = None
+        for fh in (self._vectors_fh, self._keys_fh):
+            if fh is not None and not fh.closed:
+                fh.close()
+
+    def close(self):
+        """Schließt den Store"""
+        with self._lock:
+            self._close_files()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Gibt Store-Statistiken zurück"""
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "dim": self.dim,
+                "rows": self._n_rows,
+                "live_rows": self._n_rows - len(self._deleted),
+                "deleted_rows": len(self._deleted),
+                "pending_index_entries": len(self._pending),
+                "size_mb": round(self._n_rows * (self.row_bytes + self.KEY_BYTES) / (1024 * 1024), 2)
+            }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def __repr__(self):
+        return f"MMapEmbeddingStore(path={self.path}, dim={self.dim}, rows={len(self)})"
+
+
+# ============================================================================
+# MIGRATION
+# ============================================================================
+
+def migrate_pickle_directory(
+    pickle_dir: Union[str, Path],
+    store: MMapEmbeddingStore,
+    batch_size: int = 4096,
+    remove_source: bool = False
+) -> Dict[str, int]:
+    """
+    Übernimmt einen bestehenden ``<sha256>.pkl`` Cache in den Store
+
+    Dateien mit abweichender Dimension (andere Modelle im selben Verzeichnis)
+    werden übersprungen und nicht gelöscht.
+
+    Args:
+        pickle_dir: Verzeichnis mit ``<sha256>.pkl`` Dateien
+        store: Ziel-Store
+        batch_size: Anzahl Embeddings pro put_batch
+        remove_source: Erfolgreich migrierte Pickle-Dateien löschen
+
+    Returns:
+        Dict mit scanned / migrated / skipped_dim / failed
+    """
+    stats = {"scanned": 0, "migrated": 0, "skipped_dim": 0, "failed": 0}
+    keys: List[str] = []
+    vectors: List[np.ndarray] = []
+    sources: List[Path] = []
+
+    def _flush():
+        if not keys:
+            return
+        stats["migrated"] += store.put_batch(keys, np.vstack(vectors))
+        if remove_source:
+            for source in sources:
+                try:
+                    source.unlink()
+                except OSError as e:
+                    logger.warning(f"Konnte {source} nicht löschen: {e}")
+        keys.clear()
+        vectors.clear()
+        sources.clear()
+
+    with os.scandir(pickle_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".pkl") or len(entry.name) != 68:
+                continue
+            stats["scanned"] += 1
+            try:
+                with open(entry.path, "rb") as fh:
+                    embedding = np.asarray(pickle.load(fh), dtype=np.float32).ravel()
+            except Exception as e:
+                stats["failed"] += 1
+                logger.warning(f"Pickle nicht lesbar ({entry.name}): {e}")
+                continue
+            if embedding.shape[0] != store.dim:
+                stats["skipped_dim"] += 1
+                continue
+            keys.append(entry.name[:-4])
+            vectors.append(embedding)
+            sources.append(Path(entry.path))
+            if len(keys) >= batch_size:
+                _flush()
+    _flush()
+    store.flush()
+
+    logger.info(f"Pickle-Migration abgeschlossen: {stats}")
+    return stats
+
+
+def _main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="UDS3 Embedding Store Tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    migrate = sub.add_parser("migrate", help="Pickle-Cache in mmap Store übernehmen")
+    migrate.add_argument("pickle_dir", type=Path)
+    migrate.add_argument("--dim", type=int, required=True)
+    migrate.add_argument("--store", type=Path, default=None,
+                         help="Ziel (default: <pickle_dir>/mmap_<dim>d)")
+    migrate.add_argument("--remove-source", action="store_true")
+
+    compact = sub.add_parser("compact", help="Store kompaktieren")
+    compact.add_argument("store", type=Path)
+    compact.add_argument("--dim", type=int, required=True)
+
+    stats = sub.add_parser("stats", help="Store-Statistiken anzeigen")
+    stats.add_argument("store", type=Path)
+    stats.add_argument("--dim", type=int, required=True)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "migrate":
+        target = args.store or store_dir_for(args.pickle_dir, args.dim)
+        with MMapEmbeddingStore(target, args.dim) as store:
+            print(json.dumps(migrate_pickle_directory(
+                args.pickle_dir, store, remove_source=args.remove_source
+            ), indent=2))
+    elif args.command == "compact":
+        with MMapEmbeddingStore(args.store, args.dim) as store:
+            print(json.dumps(store.compact(), indent=2))
+    else:
+        with MMapEmbeddingStore(args.store, args.dim) as store:
+            print(json.dumps(store.get_stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
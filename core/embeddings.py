@@ -12,6 +12,8 @@ Nutzt German BERT Modelle für semantische Embeddings:
 Features:
 - Batch Processing
 - Memory + Disk Caching (SHA256)
+- Disk-Cache als memory-mapped float32 Matrix (core/embedding_store.py)
+- Single-Flight: gleichzeitige identische Texte werden nur einmal encodiert
 - 768-dim Vektoren
 - Optimiert für deutsche Verwaltungstexte
 Part of UDS3 (Unified Database Strategy v3)
@@ -27,11 +29,15 @@ Repository: https://github.com/makr-code/VCC-UDS3
 
 import logging
 import hashlib
+import inspect
 import pickle
 from pathlib import Path
-from typing import List, Optional, Union, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Union
 import numpy as np
 
+from .embedding_store import MMapEmbeddingStore, store_dir_for
+from .single_flight import SingleFlight
+
 try:
     from sentence_transformers import SentenceTransformer
     SENTENCE_TRANSFORMERS_AVAILABLE = True
@@ -74,7 +80,8 @@ class UDS3GermanEmbeddings:
         device: str = "cpu",
         use_disk_cache: bool = True,
         use_memory_cache: bool = True,
-        memory_cache_size: int = 1000
+        memory_cache_size: int = 1000,
+        disk_cache_backend: str = "mmap"
     ):
         """
         Initialisiert German BERT Embeddings
@@ -86,6 +93,10 @@ class UDS3GermanEmbeddings:
             use_disk_cache: Disk-Cache aktivieren
             use_memory_cache: Memory-Cache aktivieren (LRU)
             memory_cache_size: Maximale Anzahl gecachter Embeddings im RAM
+            disk_cache_backend: "mmap" (append-only Matrix, default) oder
+                "pickle" (legacy: eine .pkl Datei pro Embedding). Ein vorhandener
+                Pickle-Cache im cache_dir wird im mmap Modus bei Misses gelesen und
+                dabei in den Store übernommen.
         """
         self.logger = logging.getLogger('UDS3GermanEmbeddings')
         
@@ -103,6 +114,9 @@ class UDS3GermanEmbeddings:
         self.use_disk_cache = use_disk_cache
         self.use_memory_cache = use_memory_cache
         self.memory_cache_size = memory_cache_size
+        if disk_cache_backend not in ("mmap", "pickle"):
+            raise ValueError(f"Unbekanntes Disk-Cache-Backend: {disk_cache_backend}")
+        self.disk_cache_backend = disk_cache_backend
         
         # Cache Directory
         if cache_dir is None:
@@ -132,13 +146,32 @@ class UDS3GermanEmbeddings:
             else:
                 raise
         
+        # Memory-Mapped Disk Cache (benötigt embedding_dim)
+        self._embedding_store: Optional[MMapEmbeddingStore] = None
+        self._legacy_pickle_cache = False
+        if self.use_disk_cache and self.disk_cache_backend == "mmap":
+            self._embedding_store = MMapEmbeddingStore(
+                store_dir_for(self.cache_dir, self.embedding_dim), self.embedding_dim
+            )
+            # Legacy .pkl Cache (vor mmap): bei Misses lesen, statt neu zu berechnen
+            self._legacy_pickle_cache = next(self.cache_dir.glob("*.pkl"), None) is not None
+            if self._legacy_pickle_cache:
+                self.logger.info(
+                    f"ℹ️ Legacy-Pickle-Cache in {self.cache_dir} wird bei Misses übernommen "
+                    f"(vollständig: migrate_pickle_cache())"
+                )
+        
+        # Single-Flight über den Embedding-Cache-Key
+        self._single_flight = SingleFlight()
+        
         # Statistics
         self.stats = {
             "cache_hits": 0,
             "cache_misses": 0,
             "embeddings_generated": 0,
             "disk_cache_reads": 0,
-            "memory_cache_reads": 0
+            "memory_cache_reads": 0,
+            "coalesced_requests": 0
         }
     
     def embed_text(
@@ -178,10 +211,30 @@ class UDS3GermanEmbeddings:
                     self._update_memory_cache(cache_key, cached_embedding)
                 return cached_embedding
         
-        # 3. Generate Embedding
+        # 3. Generate Embedding (gleichzeitige identische Anfragen teilen sich eine Berechnung)
         self.stats["cache_misses"] += 1
-        self.stats["embeddings_generated"] += 1
+        embedding, shared = self._single_flight.do(
+            cache_key,
+            lambda: self._encode_and_cache(cache_key, text, normalize, show_progress_bar)
+        )
+        if shared:
+            self.stats["coalesced_requests"] += 1
         
+        return embedding
+    
+    def _encode_and_cache(
+        self,
+        cache_key: str,
+        text: str,
+        normalize: bool,
+        show_progress_bar: bool
+    ) -> np.ndarray:
+        """Encodiert einen Text und schreibt ihn in Memory- und Disk-Cache"""
+        # Ein eben abgeschlossener Flight kann den Cache bereits gefüllt haben
+        if self.use_memory_cache and cache_key in self._memory_cache:
+            return self._memory_cache[cache_key]
+        
+        self.stats["embeddings_generated"] += 1
         embedding = self.model.encode(
             text,
             normalize_embeddings=normalize,
@@ -222,57 +275,81 @@ class UDS3GermanEmbeddings:
         embeddings = []
         texts_to_embed = []
         text_indices = []
+        disk_candidates = []
         
-        # Check Cache für alle Texte
-        for idx, text in enumerate(texts):
-            cache_key = self._generate_cache_key(text, normalize)
-            
-            # Memory Cache
+        # Check Memory Cache für alle Texte
+        cache_keys = [self._generate_cache_key(text, normalize) for text in texts]
+        for idx, (text, cache_key) in enumerate(zip(texts, cache_keys)):
             if self.use_memory_cache and cache_key in self._memory_cache:
                 self.stats["cache_hits"] += 1
                 self.stats["memory_cache_reads"] += 1
                 embeddings.append((idx, self._memory_cache[cache_key]))
                 continue
-            
-            # Disk Cache
-            if self.use_disk_cache:
-                cached_embedding = self._load_from_disk_cache(cache_key)
-                if cached_embedding is not None:
-                    self.stats["cache_hits"] += 1
-                    self.stats["disk_cache_reads"] += 1
-                    if self.use_memory_cache:
-                        self._update_memory_cache(cache_key, cached_embedding)
-                    embeddings.append((idx, cached_embedding))
+            disk_candidates.append(idx)
+        
+        # Disk Cache
+        if self.use_disk_cache and disk_candidates:
+            disk_hits = self._load_batch_from_disk_cache(
+                [cache_keys[idx] for idx in disk_candidates]
+            )
+            for idx, cached_embedding in zip(disk_candidates, disk_hits):
+                if cached_embedding is None:
+                    texts_to_embed.append(texts[idx])
+                    text_indices.append(idx)
                     continue
-            
-            # Muss generiert werden
-            texts_to_embed.append(text)
-            text_indices.append(idx)
+                self.stats["cache_hits"] += 1
+                self.stats["disk_cache_reads"] += 1
+                if self.use_memory_cache:
+                    self._update_memory_cache(cache_keys[idx], cached_embedding)
+                embeddings.append((idx, cached_embedding))
+        else:
+            texts_to_embed = [texts[idx] for idx in disk_candidates]
+            text_indices = list(disk_candidates)
         
-        # Generate missing embeddings
+        # Generate missing embeddings - Duplikate im Batch und Texte, die
+        # gerade ein anderer Aufrufer encodiert, werden nur einmal berechnet
         if texts_to_embed:
             self.stats["cache_misses"] += len(texts_to_embed)
-            self.stats["embeddings_generated"] += len(texts_to_embed)
             
-            new_embeddings = self.model.encode(
-                texts_to_embed,
-                normalize_embeddings=normalize,
-                batch_size=batch_size,
-                show_progress_bar=show_progress_bar,
-                convert_to_numpy=True
-            )
+            key_to_text = {cache_keys[idx]: texts[idx] for idx in text_indices}
+            owned, waiting = self._single_flight.claim(key_to_text)
+            resolved: Dict[str, np.ndarray] = {}
             
-            # Cache new embeddings
-            for text, embedding in zip(texts_to_embed, new_embeddings):
-                cache_key = self._generate_cache_key(text, normalize)
-                if self.use_memory_cache:
-                    self._update_memory_cache(cache_key, embedding)
-                if self.use_disk_cache:
-                    self._save_to_disk_cache(cache_key, embedding)
+            if owned:
+                try:
+                    new_embeddings = self.model.encode(
+                        [key_to_text[key] for key in owned],
+                        normalize_embeddings=normalize,
+                        batch_size=batch_size,
+                        show_progress_bar=show_progress_bar,
+                        convert_to_numpy=True
+                    )
+                    self.stats["embeddings_generated"] += len(owned)
+                    
+                    # Cache new embeddings
+                    if self.use_memory_cache:
+                        for cache_key, embedding in zip(owned, new_embeddings):
+                            self._update_memory_cache(cache_key, embedding)
+                    if self.use_disk_cache:
+                        self._save_batch_to_disk_cache(owned, new_embeddings)
+                except BaseException as e:
+                    for cache_key in owned:
+                        self._single_flight.resolve(cache_key, error=e)
+                    raise
+                
+                for cache_key, embedding in zip(owned, new_embeddings):
+                    resolved[cache_key] = embedding
+                    self._single_flight.resolve(cache_key, embedding)
+            
+            # Erst nach Freigabe der eigenen Keys auf fremde Flights warten
+            if waiting:
+                self.stats["coalesced_requests"] += len(waiting)
+                for cache_key, flight in waiting.items():
+                    resolved[cache_key] = self._single_flight.wait(flight)
             
             # Add to results
-            for idx, embedding in zip(text_indices, new_embeddings):
-                embeddings.append((idx, embedding))
+            for idx in text_indices:
+                embeddings.append((idx, resolved[cache_keys[idx]]))
         
         # Sort by original index
         embeddings.sort(key=lambda x: x[0])
@@ -327,7 +404,17 @@ class UDS3GermanEmbeddings:
         self._memory_cache.move_to_end(key)
     
     def _load_from_disk_cache(self, cache_key: str) -> Optional[np.ndarray]:
-        """Lädt Embedding aus Disk-Cache"""
+        """Lädt Embedding aus Disk-Cache (mmap: beschreibbare Kopie, nicht die Store-View)"""
+        if self._embedding_store is not None:
+            view = self._embedding_store.get(cache_key)
+            if view is not None:
+                return np.array(view)
+            return self._load_legacy_pickle(cache_key)
+        
+        return self._read_pickle(cache_key)
+    
+    def _read_pickle(self, cache_key: str) -> Optional[np.ndarray]:
+        """Liest cache_dir/<cache_key>.pkl (Pickle-Backend bzw. Legacy-Cache)"""
         cache_file = self.cache_dir / f"{cache_key}.pkl"
         if cache_file.exists():
             try:
@@ -339,8 +426,38 @@ class UDS3GermanEmbeddings:
                 return None
         return None
     
+    def _load_batch_from_disk_cache(self, cache_keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Lädt mehrere Embeddings aus dem Disk-Cache (mmap: ein vektorisierter Lookup)"""
+        if self._embedding_store is None:
+            return [self._load_from_disk_cache(key) for key in cache_keys]
+        
+        matrix, found = self._embedding_store.get_batch(cache_keys)
+        matrix = np.array(matrix)  # eine Kopie für alle Treffer statt read-only Views
+        results: List[Optional[np.ndarray]] = [None] * len(cache_keys)
+        for row, idx in enumerate(np.nonzero(found)[0]):
+            results[idx] = matrix[row]
+        if self._legacy_pickle_cache:
+            for idx in np.nonzero(~found)[0]:
+                results[idx] = self._load_legacy_pickle(cache_keys[idx])
+        return results
+    
+    def _load_legacy_pickle(self, cache_key: str) -> Optional[np.ndarray]:
+        """mmap Miss: Legacy .pkl lesen und in den Store übernehmen"""
+        if not self._legacy_pickle_cache:
+            return None
+        embedding = self._read_pickle(cache_key)
+        if embedding is not None:
+            vector = np.asarray(embedding, dtype=np.float32).reshape(1, -1)
+            if vector.shape[1] == self.embedding_dim:
+                self._save_batch_to_disk_cache([cache_key], vector)
+        return embedding
+    
     def _save_to_disk_cache(self, cache_key: str, embedding: np.ndarray):
         """Speichert Embedding in Disk-Cache"""
+        if self._embedding_store is not None:
+            self._save_batch_to_disk_cache([cache_key], np.asarray(embedding).reshape(1, -1))
+            return
+        
         cache_file = self.cache_dir / f"{cache_key}.pkl"
         try:
             with open(cache_file, 'wb') as f:
@@ -348,6 +465,35 @@ class UDS3GermanEmbeddings:
         except Exception as e:
             self.logger.warning(f"⚠️ Disk-Cache-Write fehlgeschlagen: {e}")
     
+    def _save_batch_to_disk_cache(self, cache_keys: List[str], embeddings: np.ndarray):
+        """Speichert mehrere Embeddings im Disk-Cache"""
+        if self._embedding_store is None:
+            for cache_key, embedding in zip(cache_keys, embeddings):
+                self._save_to_disk_cache(cache_key, embedding)
+            return
+        
+        try:
+            self._embedding_store.put_batch(cache_keys, embeddings)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Disk-Cache-Write fehlgeschlagen: {e}")
+    
+    def migrate_pickle_cache(self, remove_source: bool = False) -> Dict[str, int]:
+        """
+        Übernimmt den Legacy-Pickle-Cache (cache_dir/*.pkl) in den mmap Store
+        
+        Args:
+            remove_source: Migrierte .pkl Dateien löschen
+        
+        Returns:
+            Dict mit Migrations-Statistiken
+        """
+        if self._embedding_store is None:
+            raise RuntimeError("migrate_pickle_cache erfordert disk_cache_backend='mmap'")
+        from .embedding_store import migrate_pickle_directory
+        return migrate_pickle_directory(
+            self.cache_dir, self._embedding_store, remove_source=remove_source
+        )
+    
     def clear_cache(self, memory: bool = True, disk: bool = False):
         """
         Löscht Cache
@@ -362,10 +508,17 @@ class UDS3GermanEmbeddings:
         
         if disk:
             import shutil
+            if self._embedding_store is not None:
+                self._embedding_store.close()
             if self.cache_dir.exists():
                 shutil.rmtree(self.cache_dir)
                 self.cache_dir.mkdir(parents=True, exist_ok=True)
                 self.logger.warning("🧹 Disk-Cache gelöscht!")
+            self._legacy_pickle_cache = False
+            if self._embedding_store is not None:
+                self._embedding_store = MMapEmbeddingStore(
+                    store_dir_for(self.cache_dir, self.embedding_dim), self.embedding_dim
+                )
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -384,6 +537,9 @@ class UDS3GermanEmbeddings:
             "cache_hit_rate": cache_hit_rate,
             "memory_cache_size": len(self._memory_cache),
             "memory_cache_max_size": self.memory_cache_size,
+            "disk_cache_backend": self.disk_cache_backend if self.use_disk_cache else None,
+            "disk_cache_entries": len(self._embedding_store) if self._embedding_store is not None else None,
+            "single_flight": self._single_flight.get_stats(),
             "model_name": self.model_name,
             "embedding_dim": self.embedding_dim,
             "device": self.device
@@ -406,6 +562,29 @@ def create_german_embeddings(**kwargs) -> UDS3GermanEmbeddings:
     return UDS3GermanEmbeddings(**kwargs)
 
 
+def embed_batch_kwargs(embed_batch: Callable) -> Dict[str, Any]:
+    """
+    Keyword-Argumente für einen embed_batch(texts)-Aufruf
+
+    Der Vertrag ist embed_batch(texts); show_progress_bar=False wird nur
+    übergeben, wenn die Funktion das Argument annimmt (explizit oder **kwargs).
+    """
+    return {'show_progress_bar': False} if _accepts_keyword(embed_batch, 'show_progress_bar') else {}
+
+
+def _accepts_keyword(func: Callable, name: str) -> bool:
+    """True if func takes keyword argument ``name`` (explicitly or via **kwargs)"""
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(
+        parameter.kind == inspect.Parameter.VAR_KEYWORD
+        or (parameter.name == name and parameter.kind != inspect.Parameter.POSITIONAL_ONLY)
+        for parameter in parameters
+    )
+
+
 if __name__ == "__main__":
     # Test
     logging.basicConfig(level=logging.INFO)
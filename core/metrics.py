@@ -99,8 +99,8 @@ class UDS3Metrics:
     
     Organized by category:
     - Search: Latency, requests, results
-    - Database: Connections, queries, errors
-    - SAGA: Transactions, completions, compensations
+    - Database: Connections, queries, errors, pool wait/in-use time
+    - SAGA: Transactions, completions, compensations, recovery backlog/drain
     - Cache: Hits, misses, size
     - System: Memory, CPU, uptime
     """
@@ -119,12 +119,16 @@ class UDS3Metrics:
     db_queries: Any = field(default=None)
     db_query_latency: Any = field(default=None)
     db_errors: Any = field(default=None)
+    db_pool_wait_time: Any = field(default=None)
+    db_pool_in_use_time: Any = field(default=None)
     
     # SAGA Metrics
     saga_transactions: Any = field(default=None)
     saga_completions: Any = field(default=None)
     saga_compensations: Any = field(default=None)
     saga_latency: Any = field(default=None)
+    saga_recovery_backlog: Any = field(default=None)
+    saga_recovery_drained: Any = field(default=None)
     
     # Cache Metrics
     cache_hits: Any = field(default=None)
@@ -208,6 +212,22 @@ class UDS3Metrics:
             registry=self.registry
         )
         
+        self.db_pool_wait_time = Histogram(
+            'uds3_db_pool_wait_seconds',
+            'Time spent waiting for a pooled connection per checkout',
+            ['backend'],
+            buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0],
+            registry=self.registry
+        )
+        
+        self.db_pool_in_use_time = Histogram(
+            'uds3_db_pool_in_use_seconds',
+            'Time a pooled connection was held per checkout',
+            ['backend'],
+            buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0],
+            registry=self.registry
+        )
+        
         # ========== SAGA Metrics ==========
         self.saga_transactions = Counter(
             'uds3_saga_transactions_total',
@@ -238,6 +258,20 @@ class UDS3Metrics:
             registry=self.registry
         )
         
+        self.saga_recovery_backlog = Gauge(
+            'uds3_saga_recovery_backlog',
+            'Open sagas waiting for recovery',
+            ['worker'],
+            registry=self.registry
+        )
+        
+        self.saga_recovery_drained = Counter(
+            'uds3_saga_recovery_drained_total',
+            'Sagas processed by the recovery worker (rate = drain rate)',
+            ['worker', 'result'],
+            registry=self.registry
+        )
+        
         # ========== Cache Metrics ==========
         self.cache_hits = Counter(
             'uds3_cache_hits_total',
@@ -289,10 +323,14 @@ class UDS3Metrics:
         self.db_queries = NoOpMetric()
         self.db_query_latency = NoOpMetric()
         self.db_errors = NoOpMetric()
+        self.db_pool_wait_time = NoOpMetric()
+        self.db_pool_in_use_time = NoOpMetric()
         self.saga_transactions = NoOpMetric()
         self.saga_completions = NoOpMetric()
         self.saga_compensations = NoOpMetric()
         self.saga_latency = NoOpMetric()
+        self.saga_recovery_backlog = NoOpMetric()
+        self.saga_recovery_drained = NoOpMetric()
         self.cache_hits = NoOpMetric()
         self.cache_misses = NoOpMetric()
         self.cache_size = NoOpMetric()
@@ -15,10 +15,12 @@ Repository: https://github.com/makr-code/VCC-UDS3
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 
 from .rag_pipeline import UDS3GenericRAG, QueryType, RAGContext
 from .rag_cache import RAGCache
+from .rag_concurrency import ConcurrencyLimits, DatabaseTiming, MultiDBExecutor, DEFAULT_TIMEOUT
+from .single_flight import AsyncSingleFlight
 
 
 @dataclass
@@ -31,19 +33,27 @@ class AsyncRAGResult:
     execution_time_ms: float
     cache_hit: bool
     databases_queried: List[str]
+    database_timings: Dict[str, DatabaseTiming] = field(default_factory=dict)  # pro DB dieses Laufs
+    pipeline_timing: Optional[DatabaseTiming] = None  # kompletter Pipeline-Lauf (Queue + Ausführung)
+    coalesced: bool = False  # Ergebnis einer gleichzeitigen identischen Query geteilt
 
 
 class UDS3AsyncRAG:
     """
     Asynchrone RAG-Pipeline mit:
-    - Parallelen Multi-DB Queries
+    - Parallelen Multi-DB Queries (gemeinsam eingeplant, begrenzte Parallelität)
     - Cache Integration
     - Thread Pool für Sync-Operationen
+    - Globales + per-Backend Concurrency-Limit, Timeouts
+    - Single-Flight: gleichzeitige identische Queries teilen einen Pipeline-Lauf
     - Context Aggregation
     
     Optimiert für hohe Durchsatzraten und niedrige Latenz.
     """
     
+    # Backend-Name für komplette Pipeline-Läufe im MultiDBExecutor
+    PIPELINE_BACKEND = "rag_pipeline"
+    
     def __init__(
         self,
         polyglot_manager,
@@ -51,7 +61,10 @@ class UDS3AsyncRAG:
         embeddings,
         max_workers: int = 4,
         enable_cache: bool = True,
-        cache_ttl_minutes: int = 60
+        cache_ttl_minutes: int = 60,
+        concurrency_limits: Optional[ConcurrencyLimits] = None,
+        enable_single_flight: bool = True,
+        semantic_cache_threshold: Optional[float] = None
     ):
         """
         Args:
@@ -59,8 +72,13 @@ class UDS3AsyncRAG:
             llm_client: OllamaClient Instanz
             embeddings: UDS3GermanEmbeddings Instanz
             max_workers: Anzahl Threads für parallele DB-Queries
+                (= globales Limit, falls keine concurrency_limits übergeben)
             enable_cache: Cache aktivieren
             cache_ttl_minutes: TTL für Cache-Einträge
+            concurrency_limits: Globales/per-Backend Limit und Timeouts
+            enable_single_flight: Gleichzeitige identische Queries zusammenführen
+            semantic_cache_threshold: Aktiviert die semantische Cache-Stufe
+                (Cosine-Schwelle, Query-Embeddings via embeddings.embed_text)
         """
         # Basis RAG-Pipeline
         self.rag = UDS3GenericRAG(
@@ -69,22 +87,44 @@ class UDS3AsyncRAG:
             embeddings=embeddings
         )
         
-        # Thread Pool für Sync-Operationen
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Thread Pool für Sync-Operationen (Größe = globales Limit)
+        limits = concurrency_limits or ConcurrencyLimits(global_limit=max_workers)
+        # Pipeline-Läufe nur durch das globale Limit begrenzen (sofern nicht konfiguriert);
+        # Kopie, damit die übergebenen Limits des Aufrufers unverändert bleiben
+        overrides = {self.PIPELINE_BACKEND: limits.global_limit, **limits.per_backend_overrides}
+        self.limits = replace(limits, per_backend_overrides=overrides)
+        self.executor = ThreadPoolExecutor(max_workers=self.limits.global_limit)
+        self.db_executor = MultiDBExecutor(self.executor, self.limits)
         
         # Cache
         self.enable_cache = enable_cache
         if enable_cache:
-            self.cache = RAGCache(max_size=1000, default_ttl_minutes=cache_ttl_minutes)
+            semantic_kwargs = {}
+            if semantic_cache_threshold is not None and hasattr(embeddings, 'embed_text'):
+                semantic_kwargs = {
+                    'embedding_fn': embeddings.embed_text,
+                    'semantic_threshold': semantic_cache_threshold
+                }
+            self.cache = RAGCache(
+                max_size=1000,
+                default_ttl_minutes=cache_ttl_minutes,
+                **semantic_kwargs
+            )
         else:
             self.cache = None
         
+        # Single-Flight (Key = RAGCache-Key + Domäne)
+        self.single_flight = AsyncSingleFlight() if enable_single_flight else None
+        
         # Statistiken
         self.stats = {
             'total_queries': 0,
             'cache_hits': 0,
             'avg_execution_time_ms': 0.0,
-            'parallel_queries_executed': 0
+            'parallel_queries_executed': 0,
+            'db_timeouts': 0,
+            'db_errors': 0,
+            'coalesced_requests': 0
         }
     
     async def answer_query_async(
@@ -110,9 +150,15 @@ class UDS3AsyncRAG:
         self.stats['total_queries'] += 1
         cache_hit = False
         
-        # Cache-Lookup
+        # Cache-Lookup (Query-Embedding für die semantische Stufe im Thread Pool)
+        query_embedding = None
         if self.enable_cache and self.cache:
-            cached = self.cache.get(query, context_params)
+            if self.cache.semantic_enabled:
+                loop = asyncio.get_running_loop()
+                query_embedding = await loop.run_in_executor(
+                    self.executor, self.cache.embed_query, query
+                )
+            cached = self.cache.get(query, context_params, query_embedding=query_embedding)
             if cached:
                 self.stats['cache_hits'] += 1
                 cache_hit = True
@@ -129,21 +175,64 @@ class UDS3AsyncRAG:
                     databases_queried=[]
                 )
         
-        # Führe RAG-Query asynchron aus (in Thread Pool)
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            self.executor,
-            self.rag.answer_query,
-            query,
-            app_domain
-        )
+        # Führe RAG-Query asynchron aus - identische gleichzeitige Queries
+        # warten auf denselben Pipeline-Lauf statt ihn zu wiederholen
+        if self.single_flight is not None:
+            flight_key = (app_domain, RAGCache._generate_cache_key(query, context_params))
+            (result, timing), coalesced = await self.single_flight.do(
+                flight_key,
+                lambda: self._run_pipeline(query, app_domain, context_params, query_embedding)
+            )
+        else:
+            result, timing = await self._run_pipeline(query, app_domain, context_params, query_embedding)
+            coalesced = False
+        
+        if coalesced:
+            self.stats['coalesced_requests'] += 1
         
         execution_time = (time.time() - start_time) * 1000
         
         # Update Stats
         self._update_avg_execution_time(execution_time)
         
-        # Cache Result
+        return AsyncRAGResult(
+            answer=result['answer'],
+            confidence=result['confidence'],
+            sources=result['sources'],
+            query_type=result['query_type'],
+            execution_time_ms=execution_time,
+            cache_hit=cache_hit,
+            databases_queried=list(result.get('databases_used', {}).keys()),
+            database_timings={
+                db_name: DatabaseTiming(database=db_name, status="ok", **db_timing)
+                for db_name, db_timing in result.get('database_timings', {}).items()
+            },
+            pipeline_timing=timing,
+            coalesced=coalesced
+        )
+    
+    async def _run_pipeline(
+        self,
+        query: str,
+        app_domain: str,
+        context_params: Optional[Dict],
+        query_embedding: Optional[Any] = None
+    ) -> Tuple[Dict[str, Any], DatabaseTiming]:
+        """Ein Pipeline-Lauf (Thread Pool, Concurrency-Limit) inkl. Cache-Put"""
+        try:
+            result, timing = await self.db_executor.run(
+                self.PIPELINE_BACKEND,
+                self.rag.answer_query,
+                query,
+                app_domain,
+                timeout=self.limits.query_timeout_seconds,
+                reraise=True
+            )
+        except asyncio.TimeoutError:
+            self.stats['db_timeouts'] += 1
+            raise
+        
+        # Cache Result (vor Freigabe des Flights, damit Nachzügler treffen)
         if self.enable_cache and self.cache:
             self.cache.put(
                 query=query,
@@ -151,18 +240,11 @@ class UDS3AsyncRAG:
                 confidence=result['confidence'],
                 sources=result['sources'],
                 query_type=result['query_type'].value,
-                context_params=context_params
+                context_params=context_params,
+                query_embedding=query_embedding
             )
         
-        return AsyncRAGResult(
-            answer=result['answer'],
-            confidence=result['confidence'],
-            sources=result['sources'],
-            query_type=result['query_type'],
-            execution_time_ms=execution_time,
-            cache_hit=cache_hit,
-            databases_queried=list(result.get('databases_used', {}).keys())
-        )
+        return result, timing
     
     async def batch_query_async(
         self,
@@ -179,49 +261,81 @@ class UDS3AsyncRAG:
         Returns:
             Liste von AsyncRAGResult
         """
-        tasks = [
-            self.answer_query_async(query, app_domain)
-            for query in queries
-        ]
+        # Begrenzte Anzahl gleichzeitiger Queries (statt unbegrenztem gather)
+        inflight = asyncio.Semaphore(self.limits.max_inflight_queries)
+        
+        async def _bounded(query: str) -> AsyncRAGResult:
+            async with inflight:
+                return await self.answer_query_async(query, app_domain)
         
-        results = await asyncio.gather(*tasks)
+        results = await asyncio.gather(*(_bounded(query) for query in queries))
         self.stats['parallel_queries_executed'] += len(queries)
         
-        return results
+        return list(results)
     
     async def parallel_multi_db_search(
         self,
         query: str,
         databases: List[str],
-        top_k: int = 5
+        top_k: int = 5,
+        timeout: Any = DEFAULT_TIMEOUT
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Parallele Suche über mehrere Datenbanken.
         
+        Alle DB-Tasks werden gemeinsam eingeplant; Timings pro DB liefert
+        ``multi_db_search_with_timings``.
+        
         Args:
             query: Suchquery
             databases: Liste von DB-Namen (z.B. ['chromadb', 'neo4j', 'postgresql'])
             top_k: Anzahl Ergebnisse pro DB
+            timeout: Timeout pro DB in Sekunden oder None
+                (default: ConcurrencyLimits.timeout_seconds)
         
         Returns:
             Dictionary {db_name: [results]}
         """
-        # Erstelle Tasks für jede DB
-        tasks = {
-            db_name: self._search_database_async(query, db_name, top_k)
-            for db_name in databases
-        }
+        results, _ = await self.multi_db_search_with_timings(query, databases, top_k, timeout)
+        return results
+    
+    async def multi_db_search_with_timings(
+        self,
+        query: str,
+        databases: List[str],
+        top_k: int = 5,
+        timeout: Any = DEFAULT_TIMEOUT
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, DatabaseTiming]]:
+        """
+        Wie parallel_multi_db_search, liefert zusätzlich die Timings pro DB.
+        
+        Returns:
+            Tuple ({db_name: [results]}, {db_name: DatabaseTiming})
+        """
+        outcomes = await self.db_executor.run_many(
+            {
+                db_name: (lambda db=db_name: self._search_database_sync(query, db, top_k))
+                for db_name in databases
+            },
+            timeout=timeout
+        )
         
-        # Führe parallel aus
-        results = {}
-        for db_name, task in tasks.items():
-            try:
-                results[db_name] = await task
-            except Exception as e:
-                print(f"⚠️  Fehler bei DB {db_name}: {e}")
-                results[db_name] = []
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        timings: Dict[str, DatabaseTiming] = {}
+        for db_name, (db_results, timing) in outcomes.items():
+            results[db_name] = db_results if db_results is not None else []
+            timings[db_name] = timing
+            if timing.status != "ok":
+                self._record_failure(timing)
         
-        return results
+        return results, timings
+    
+    def _record_failure(self, timing: DatabaseTiming):
+        """Zählt Timeouts/Fehler für get_stats"""
+        if timing.status == "timeout":
+            self.stats['db_timeouts'] += 1
+        elif timing.status == "error":
+            self.stats['db_errors'] += 1
     
     async def _search_database_async(
         self,
@@ -240,18 +354,15 @@ class UDS3AsyncRAG:
         Returns:
             Liste von Ergebnissen
         """
-        loop = asyncio.get_event_loop()
-        
-        # Führe Sync-Operation in Thread Pool aus
-        result = await loop.run_in_executor(
-            self.executor,
+        result, _ = await self.db_executor.run(
+            database,
             self._search_database_sync,
             query,
             database,
             top_k
         )
         
-        return result
+        return result if result is not None else []
     
     def _search_database_sync(
         self,
@@ -303,13 +414,24 @@ class UDS3AsyncRAG:
                 if self.stats['total_queries'] > 0 else 0
             ),
             'avg_execution_time_ms': round(self.stats['avg_execution_time_ms'], 2),
-            'parallel_queries_executed': self.stats['parallel_queries_executed']
+            'parallel_queries_executed': self.stats['parallel_queries_executed'],
+            'db_timeouts': self.stats['db_timeouts'],
+            'db_errors': self.stats['db_errors'],
+            'coalesced_requests': self.stats['coalesced_requests'],
+            'concurrency_limits': {
+                'global_limit': self.limits.global_limit,
+                'per_backend_limit': self.limits.per_backend_limit,
+                'timeout_seconds': self.limits.timeout_seconds
+            }
         }
         
         # Cache-Stats hinzufügen
         if self.cache:
             base_stats['cache_stats'] = self.cache.get_stats()
         
+        if self.single_flight is not None:
+            base_stats['single_flight_stats'] = self.single_flight.get_stats()
+        
         # RAG-Pipeline-Stats hinzufügen
         base_stats['rag_pipeline_stats'] = self.rag.get_stats()
         
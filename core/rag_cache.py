@@ -5,6 +5,7 @@ rag_cache.py
 
 UDS3 RAG Caching Layer
 Performance-optimierter Cache mit LRU-Strategie und TTL
+Optional: semantische Stufe (Embedding-Ähnlichkeit) für paraphrasierte Queries
 
 Part of UDS3 (Unified Database Strategy v3)
 Author: Martin Krüger (ma.krueger@outlook.com)
@@ -14,12 +15,19 @@ Repository: https://github.com/makr-code/VCC-UDS3
 
 import hashlib
 import json
+import sqlite3
+import threading
 import time
 from collections import OrderedDict
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, asdict, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
+# Kandidaten pro semantischem Lookup (erster gültiger Eintrag gewinnt)
+SEMANTIC_CANDIDATES = 5
+
 
 @dataclass
 class CachedRAGResult:
@@ -30,6 +38,8 @@ class CachedRAGResult:
     query_type: str
     timestamp: float
     ttl_minutes: int
+    # Normalisiertes Query-Embedding (nur semantische Stufe, nicht serialisiert)
+    query_embedding: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
     
     def is_valid(self) -> bool:
         """Prüft ob Cache-Eintrag noch gültig ist"""
@@ -37,8 +47,120 @@ class CachedRAGResult:
         return age_minutes < self.ttl_minutes
     
     def to_dict(self) -> Dict[str, Any]:
-        """Konvertiert zu Dictionary"""
-        return asdict(self)
+        """Konvertiert zu Dictionary (ohne Query-Embedding)"""
+        data = asdict(replace(self, query_embedding=None))
+        del data['query_embedding']
+        return data
+
+
+class SemanticIndex:
+    """
+    Query-Embedding-Matrix für die semantische Cache-Stufe.
+    
+    Jeder Cache-Key belegt eine feste Zeile einer vorallokierten float32
+    Matrix (max_size x dim). Freigewordene Zeilen werden wiederverwendet.
+    Die Suche ist ein einzelnes Matrix-Vektor-Produkt über die belegten
+    Zeilen, gefiltert auf identische Kontext-Parameter. Kontext-IDs werden
+    freigegeben, sobald ihr letzter Eintrag entfernt ist (höchstens
+    capacity aktive Kontexte).
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._matrix: Optional[np.ndarray] = None  # Lazy: Dimension erst beim ersten put bekannt
+        self._row_context = np.full(capacity, -1, dtype=np.int32)  # -1 = Zeile frei
+        self._row_keys: List[Optional[str]] = [None] * capacity
+        self._key_rows: Dict[str, int] = {}
+        self._free_rows: List[int] = list(range(capacity - 1, -1, -1))
+        self._context_ids: Dict[str, int] = {}
+        self._context_keys: Dict[int, str] = {}
+        self._context_rows: Dict[int, int] = {}  # Kontext-ID -> belegte Zeilen
+        self._free_context_ids: List[int] = []
+        self._high_water = 0  # Zeilen >= high_water wurden nie belegt
+    
+    def __len__(self) -> int:
+        return len(self._key_rows)
+    
+    def _acquire_context(self, context_key: str) -> int:
+        context_id = self._context_ids.get(context_key)
+        if context_id is None:
+            if self._free_context_ids:
+                context_id = self._free_context_ids.pop()
+            else:
+                context_id = len(self._context_ids)
+            self._context_ids[context_key] = context_id
+            self._context_keys[context_id] = context_key
+        self._context_rows[context_id] = self._context_rows.get(context_id, 0) + 1
+        return context_id
+    
+    def _release_context(self, context_id: int):
+        if context_id < 0:
+            return
+        remaining = self._context_rows[context_id] - 1
+        if remaining:
+            self._context_rows[context_id] = remaining
+            return
+        del self._context_rows[context_id]
+        del self._context_ids[self._context_keys.pop(context_id)]
+        self._free_context_ids.append(context_id)
+    
+    def add(self, key: str, context_key: str, embedding: np.ndarray):
+        """Speichert (bzw. ersetzt) das normalisierte Embedding für key"""
+        if self._matrix is None:
+            self._matrix = np.zeros((self.capacity, embedding.shape[0]), dtype=np.float32)
+        elif embedding.shape[0] != self._matrix.shape[1]:
+            raise ValueError(
+                f"Embedding-Dimension {embedding.shape[0]} != {self._matrix.shape[1]}"
+            )
+        
+        row = self._key_rows.get(key)
+        if row is None:
+            if not self._free_rows:
+                return  # Cache hält max_size ein - tritt nur bei Fremdnutzung auf
+            row = self._free_rows.pop()
+            self._key_rows[key] = row
+            self._row_keys[row] = key
+            self._high_water = max(self._high_water, row + 1)
+        
+        self._matrix[row] = embedding
+        context_id = self._acquire_context(context_key)
+        self._release_context(int(self._row_context[row]))
+        self._row_context[row] = context_id
+    
+    def remove(self, key: str):
+        row = self._key_rows.pop(key, None)
+        if row is None:
+            return
+        self._row_keys[row] = None
+        self._release_context(int(self._row_context[row]))
+        self._row_context[row] = -1
+        self._free_rows.append(row)
+    
+    def clear(self):
+        self.__init__(self.capacity)
+    
+    def nearest(self, embedding: np.ndarray, context_key: str, k: int = 1) -> List[Tuple[str, float]]:
+        """
+        Die k nächsten Nachbarn (Cosine) unter Einträgen mit gleichem Kontext.
+        
+        Returns:
+            [(key, similarity), ...] absteigend nach Ähnlichkeit
+        """
+        context_id = self._context_ids.get(context_key)
+        if self._matrix is None or context_id is None or not self._key_rows:
+            return []
+        
+        n = self._high_water
+        similarities = self._matrix[:n] @ embedding
+        similarities[self._row_context[:n] != context_id] = -np.inf
+        k = min(k, n)
+        rows = np.argpartition(-similarities, k - 1)[:k] if k < n else np.arange(n)
+        rows = rows[np.argsort(-similarities[rows], kind='stable')]
+        return [
+            (self._row_keys[row], float(similarities[row]))
+            for row in rows.tolist()
+            if np.isfinite(similarities[row])
+        ]
 
 
 class RAGCache:
@@ -49,28 +171,54 @@ class RAGCache:
     - LRU Eviction (Least Recently Used)
     - TTL (Time To Live) pro Cache-Eintrag
     - Query-Hash-basierter Schlüssel
-    - Cache Hit/Miss Statistics
+    - Optional: semantische Stufe (Nearest Neighbor über Query-Embeddings)
+    - Cache Hit/Miss Statistics (exakte vs. semantische Treffer)
+    
+    Semantische Stufe:
+    ```python
+    cache = RAGCache(embedding_fn=embeddings.embed_text, semantic_threshold=0.92)
+    cache.put("Abstandsflächen LBO § 58", ...)
+    cache.get("§58 LBO Abstandsfläche")  # Treffer über Cosine-Ähnlichkeit
+    ```
     """
     
-    def __init__(self, max_size: int = 1000, default_ttl_minutes: int = 60):
+    def __init__(
+        self,
+        max_size: int = 1000,
+        default_ttl_minutes: int = 60,
+        embedding_fn: Optional[Callable[[str], Any]] = None,
+        semantic_threshold: float = 0.92
+    ):
         """
         Args:
             max_size: Maximale Anzahl gecachter Queries
             default_ttl_minutes: Standard TTL in Minuten
+            embedding_fn: Query -> Embedding (z.B. UDS3GermanEmbeddings.embed_text);
+                aktiviert die semantische Stufe
+            semantic_threshold: Minimale Cosine-Ähnlichkeit für einen semantischen Treffer
         """
         self.max_size = max_size
         self.default_ttl_minutes = default_ttl_minutes
         self._cache: OrderedDict[str, CachedRAGResult] = OrderedDict()
         
+        # Semantische Stufe
+        self.embedding_fn = embedding_fn
+        self.semantic_threshold = semantic_threshold
+        self._semantic_index = SemanticIndex(max_size) if embedding_fn is not None else None
+        
         # Statistics
         self.stats = {
             'hits': 0,
+            'exact_hits': 0,
+            'semantic_hits': 0,
             'misses': 0,
             'evictions': 0,
-            'expired': 0
+            'expired': 0,
+            'embedding_errors': 0
         }
     
-    def _generate_cache_key(self, query: str, context_params: Optional[Dict] = None) -> str:
+    @staticmethod
+    def _generate_cache_key(query: str, context_params: Optional[Dict] = None) -> str:
         """
         Generiert Cache-Key aus Query und Kontext-Parametern.
         
@@ -94,36 +242,100 @@ class RAGCache:
         cache_str = json.dumps(cache_input, sort_keys=True)
         return hashlib.sha256(cache_str.encode()).hexdigest()
     
-    def get(self, query: str, context_params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+    @property
+    def semantic_enabled(self) -> bool:
+        return self._semantic_index is not None
+    
+    def get(
+        self,
+        query: str,
+        context_params: Optional[Dict] = None,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Holt Ergebnis aus Cache (wenn vorhanden und gültig).
         
         Args:
             query: User-Query
             context_params: Kontext-Parameter
+            query_embedding: Vorab berechnetes embed_query(query) (optional,
+                sonst bei exaktem Miss über embedding_fn berechnet)
         
         Returns:
             Gecachtes Ergebnis oder None
         """
         cache_key = self._generate_cache_key(query, context_params)
         
-        if cache_key in self._cache:
-            cached_result = self._cache[cache_key]
-            
-            # Prüfe TTL
-            if cached_result.is_valid():
-                # Move to end (LRU)
-                self._cache.move_to_end(cache_key)
-                self.stats['hits'] += 1
-                return cached_result.to_dict()
-            else:
-                # Expired - entfernen
-                del self._cache[cache_key]
-                self.stats['expired'] += 1
+        # 1. Exakter Treffer
+        cached_result = self._get_valid(cache_key)
+        if cached_result is not None:
+            self.stats['hits'] += 1
+            self.stats['exact_hits'] += 1
+            return cached_result.to_dict()
+        
+        # 2. Semantischer Treffer (ähnlichste gecachte Query mit gleichem Kontext)
+        if self._semantic_index is not None and len(self._semantic_index):
+            embedding = query_embedding if query_embedding is not None else self.embed_query(query)
+            matches = []
+            if embedding is not None:
+                matches = self._semantic_index.nearest(
+                    embedding, self._context_key(context_params), k=SEMANTIC_CANDIDATES
+                )
+            # Abgelaufene/verdrängte Top-Treffer überspringen
+            for match_key, similarity in matches:
+                if similarity < self.semantic_threshold:
+                    break
+                cached_result = self._get_valid(match_key)
+                if cached_result is not None:
+                    self.stats['hits'] += 1
+                    self.stats['semantic_hits'] += 1
+                    result = cached_result.to_dict()
+                    result['semantic_similarity'] = similarity
+                    return result
         
         self.stats['misses'] += 1
         return None
     
+    def _get_valid(self, cache_key: str) -> Optional[CachedRAGResult]:
+        """Gültiger Eintrag (LRU-Update) oder None; abgelaufene werden entfernt"""
+        cached_result = self._cache.get(cache_key)
+        if cached_result is None:
+            return None
+        
+        # Prüfe TTL
+        if cached_result.is_valid():
+            # Move to end (LRU)
+            self._cache.move_to_end(cache_key)
+            return cached_result
+        
+        # Expired - entfernen
+        self._remove(cache_key)
+        self.stats['expired'] += 1
+        return None
+    
+    def _remove(self, cache_key: str):
+        """Entfernt Eintrag inkl. Query-Embedding"""
+        del self._cache[cache_key]
+        if self._semantic_index is not None:
+            self._semantic_index.remove(cache_key)
+    
+    @staticmethod
+    def _context_key(context_params: Optional[Dict]) -> str:
+        return json.dumps(context_params or {}, sort_keys=True)
+    
+    def embed_query(self, query: str) -> Optional[np.ndarray]:
+        """Normalisiertes float32 Query-Embedding (None bei Fehler oder ohne semantische Stufe)"""
+        if self.embedding_fn is None:
+            return None
+        try:
+            embedding = np.asarray(self.embedding_fn(query.lower().strip()), dtype=np.float32).ravel()
+        except Exception as e:
+            self.stats['embedding_errors'] += 1
+            print(f"⚠️  Query-Embedding fehlgeschlagen: {e}")
+            return None
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else None
+    
     def put(
         self, 
         query: str, 
@@ -132,7 +344,8 @@ class RAGCache:
         sources: list,
         query_type: str,
         context_params: Optional[Dict] = None,
-        ttl_minutes: Optional[int] = None
+        ttl_minutes: Optional[int] = None,
+        query_embedding: Optional[np.ndarray] = None
     ):
         """
         Speichert RAG-Ergebnis im Cache.
@@ -145,28 +358,46 @@ class RAGCache:
             query_type: Typ der Query (z.B. 'PROCESS_SEARCH')
             context_params: Kontext-Parameter
             ttl_minutes: Custom TTL (optional)
+            query_embedding: Vorab berechnetes embed_query(query) (optional)
         """
         cache_key = self._generate_cache_key(query, context_params)
         
+        if self._semantic_index is not None and query_embedding is None:
+            query_embedding = self.embed_query(query)
+        
         cached_result = CachedRAGResult(
             answer=answer,
             confidence=confidence,
             sources=sources,
             query_type=query_type,
             timestamp=time.time(),
-            ttl_minutes=ttl_minutes or self.default_ttl_minutes
+            ttl_minutes=ttl_minutes or self.default_ttl_minutes,
+            query_embedding=query_embedding
         )
         
+        self._store(cache_key, cached_result, self._context_key(context_params))
+    
+    def _store(self, cache_key: str, cached_result: CachedRAGResult, context_key: str):
+        """Fügt Eintrag in LRU und semantischen Index ein"""
         # LRU: Entferne ältesten Eintrag wenn voll
-        if len(self._cache) >= self.max_size:
-            self._cache.popitem(last=False)  # FIFO
+        if cache_key not in self._cache and len(self._cache) >= self.max_size:
+            self._remove(next(iter(self._cache)))  # FIFO
             self.stats['evictions'] += 1
         
         self._cache[cache_key] = cached_result
+        self._cache.move_to_end(cache_key)
+        
+        if self._semantic_index is not None:
+            if cached_result.query_embedding is not None:
+                self._semantic_index.add(cache_key, context_key, cached_result.query_embedding)
+            else:
+                self._semantic_index.remove(cache_key)
     
     def clear(self):
         """Leert den gesamten Cache"""
         self._cache.clear()
+        if self._semantic_index is not None:
+            self._semantic_index.clear()
     
     def remove_expired(self) -> int:
         """
@@ -181,7 +412,7 @@ class RAGCache:
         ]
         
         for key in expired_keys:
-            del self._cache[key]
+            self._remove(key)
         
         removed = len(expired_keys)
         self.stats['expired'] += removed
@@ -201,11 +432,17 @@ class RAGCache:
             'size': len(self._cache),
             'max_size': self.max_size,
             'hits': self.stats['hits'],
+            'exact_hits': self.stats['exact_hits'],
+            'semantic_hits': self.stats['semantic_hits'],
             'misses': self.stats['misses'],
             'hit_rate_percent': round(hit_rate, 2),
             'evictions': self.stats['evictions'],
             'expired': self.stats['expired'],
-            'total_requests': total_requests
+            'total_requests': total_requests,
+            'semantic_enabled': self._semantic_index is not None,
+            'semantic_threshold': self.semantic_threshold if self._semantic_index is not None else None,
+            'semantic_entries': len(self._semantic_index) if self._semantic_index is not None else 0,
+            'embedding_errors': self.stats['embedding_errors']
         }
     
     def __repr__(self) -> str:
@@ -219,73 +456,291 @@ class RAGCache:
 
 class PersistentRAGCache(RAGCache):
     """
-    Erweiterter RAG-Cache mit Disk-Persistence.
+    Erweiterter RAG-Cache mit Disk-Persistence (SQLite).
     
-    Speichert Cache-Einträge auf Disk für Session-übergreifende Nutzung.
+    Speichert Cache-Einträge auf Disk für Session-übergreifende Nutzung:
+    - O(1) pro put: ein INSERT OR REPLACE (WAL-Journal, crash-sicher)
+    - Lazy Loading: Einträge werden erst beim ersten Zugriff von Disk geladen
+    - TTL über indizierte expires_at-Spalte (kein Neuschreiben der Datei)
+    - Hintergrund-Kompaktierung: abgelaufene Zeilen löschen, auf
+      max_disk_entries kürzen, freie Seiten zurückgeben
+    - Query-Embeddings der semantischen Stufe werden mitgespeichert
+    
+    Ein vorhandener Legacy-Cache (rag_cache.json) wird beim Start einmalig
+    übernommen und in rag_cache.json.migrated umbenannt.
     """
     
+    DB_FILE = "rag_cache.sqlite3"
+    LEGACY_FILE = "rag_cache.json"
+    
     def __init__(
         self, 
         cache_dir: str = ".rag_cache",
         max_size: int = 1000, 
-        default_ttl_minutes: int = 60
+        default_ttl_minutes: int = 60,
+        max_disk_entries: Optional[int] = None,
+        compaction_interval_seconds: float = 300.0,
+        preload_entries: int = 0,
+        **kwargs
     ):
-        super().__init__(max_size, default_ttl_minutes)
+        """
+        Args:
+            cache_dir: Verzeichnis für die Cache-Datenbank
+            max_size: Maximale Anzahl Einträge im Speicher (LRU)
+            default_ttl_minutes: Standard TTL in Minuten
+            max_disk_entries: Maximale Anzahl Einträge auf Disk (default: 10 * max_size)
+            compaction_interval_seconds: Intervall der Hintergrund-Kompaktierung (0 = aus)
+            preload_entries: Anzahl neuester Einträge, die beim Start geladen werden
+            **kwargs: embedding_fn / semantic_threshold (siehe RAGCache)
+        """
+        super().__init__(max_size, default_ttl_minutes, **kwargs)
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.max_disk_entries = max_disk_entries or max_size * 10
         
-        # Lade existierenden Cache
-        self._load_from_disk()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats.update({'disk_reads': 0, 'disk_writes': 0, 'disk_errors': 0, 'compactions': 0})
+        
+        with self._db_lock:
+            self._connection()
+        self._migrate_legacy_json()
+        if preload_entries > 0:
+            self._preload(preload_entries)
+        
+        # Hintergrund-Kompaktierung
+        self._stop_compaction = threading.Event()
+        self._compaction_thread: Optional[threading.Thread] = None
+        if compaction_interval_seconds > 0:
+            self._compaction_thread = threading.Thread(
+                target=self._compaction_loop,
+                args=(compaction_interval_seconds,),
+                daemon=True,
+                name="RAGCacheCompaction"
+            )
+            self._compaction_thread.start()
     
-    def _get_cache_file(self) -> Path:
-        """Pfad zur Cache-Datei"""
-        return self.cache_dir / "rag_cache.json"
+    def _get_db_file(self) -> Path:
+        """Pfad zur Cache-Datenbank"""
+        return self.cache_dir / self.DB_FILE
     
-    def _load_from_disk(self):
-        """Lädt Cache von Disk"""
-        cache_file = self._get_cache_file()
-        
-        if not cache_file.exists():
+    def _connection(self) -> sqlite3.Connection:
+        """Öffnet die Datenbank bei Bedarf (Aufrufer hält _db_lock)"""
+        if self._conn is None:
+            conn = sqlite3.connect(
+                str(self._get_db_file()), check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # nur vor CREATE TABLE wirksam
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " payload TEXT NOT NULL,"
+                " context_key TEXT NOT NULL,"
+                " embedding BLOB,"
+                " written_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_expires ON entries(expires_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_written ON entries(written_at)")
+            self._conn = conn
+        return self._conn
+    
+    @staticmethod
+    def _row_values(cache_key: str, context_key: str, cached_result: CachedRAGResult) -> tuple:
+        embedding = cached_result.query_embedding
+        return (
+            cache_key,
+            json.dumps(cached_result.to_dict()),
+            context_key,
+            embedding.astype(np.float32).tobytes() if embedding is not None else None,
+            cached_result.timestamp,
+            cached_result.timestamp + cached_result.ttl_minutes * 60
+        )
+    
+    @staticmethod
+    def _row_to_result(payload: str, embedding: Optional[bytes]) -> CachedRAGResult:
+        cached_result = CachedRAGResult(**json.loads(payload))
+        if embedding is not None:
+            cached_result.query_embedding = np.frombuffer(embedding, dtype=np.float32).copy()
+        return cached_result
+    
+    def _write_rows(self, rows: List[tuple]):
+        try:
+            with self._db_lock:
+                conn = self._connection()
+                if len(rows) == 1:
+                    conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows[0])
+                else:
+                    conn.execute("BEGIN")
+                    try:
+                        conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+                        conn.execute("COMMIT")
+                    except sqlite3.Error:
+                        conn.execute("ROLLBACK")
+                        raise
+            self.stats['disk_writes'] += len(rows)
+        except sqlite3.Error as e:
+            self.stats['disk_errors'] += 1
+            print(f"⚠️  Fehler beim Speichern des Cache: {e}")
+    
+    def _migrate_legacy_json(self):
+        """Übernimmt einen Legacy-Cache (komplett neu geschriebene JSON-Datei)"""
+        legacy_file = self.cache_dir / self.LEGACY_FILE
+        if not legacy_file.exists():
             return
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
+            with open(legacy_file, 'r', encoding='utf-8') as f:
                 cache_data = json.load(f)
-            
+            rows = []
             for key, entry in cache_data.items():
                 cached_result = CachedRAGResult(**entry)
                 if cached_result.is_valid():
-                    self._cache[key] = cached_result
-        
+                    rows.append(self._row_values(key, self._context_key(None), cached_result))
+            if rows:
+                self._write_rows(rows)
+            legacy_file.rename(legacy_file.with_name(self.LEGACY_FILE + ".migrated"))
         except Exception as e:
             print(f"⚠️  Fehler beim Laden des Cache: {e}")
     
-    def _save_to_disk(self):
-        """Speichert Cache auf Disk"""
-        cache_file = self._get_cache_file()
-        
-        # Nur gültige Einträge speichern
-        valid_cache = {
-            key: value.to_dict()
-            for key, value in self._cache.items()
-            if value.is_valid()
-        }
-        
+    def _preload(self, limit: int):
+        """Lädt die neuesten gültigen Einträge in den Speicher"""
+        with self._db_lock:
+            rows = self._connection().execute(
+                "SELECT key, payload, context_key, embedding FROM entries"
+                " WHERE expires_at > ? ORDER BY written_at DESC LIMIT ?",
+                (time.time(), min(limit, self.max_size))
+            ).fetchall()
+        # Älteste zuerst einfügen, damit die neuesten am LRU-Ende stehen
+        for key, payload, context_key, embedding in reversed(rows):
+            self._store(key, self._row_to_result(payload, embedding), context_key)
+    
+    def _load_entry(self, cache_key: str):
+        """Lazy Loading: holt einen Eintrag von Disk in den Speicher"""
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(valid_cache, f, indent=2)
+            with self._db_lock:
+                row = self._connection().execute(
+                    "SELECT payload, context_key, embedding FROM entries"
+                    " WHERE key = ? AND expires_at > ?",
+                    (cache_key, time.time())
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.stats['disk_errors'] += 1
+            print(f"⚠️  Fehler beim Laden des Cache: {e}")
+            return
+        if row is None:
+            return
+        payload, context_key, embedding = row
+        self.stats['disk_reads'] += 1
+        self._store(cache_key, self._row_to_result(payload, embedding), context_key)
+    
+    def _get_valid(self, cache_key: str) -> Optional[CachedRAGResult]:
+        if cache_key not in self._cache:
+            self._load_entry(cache_key)
+        return super()._get_valid(cache_key)
+    
+    def put(
+        self,
+        query: str,
+        answer: str,
+        confidence: float,
+        sources: list,
+        query_type: str,
+        context_params: Optional[Dict] = None,
+        ttl_minutes: Optional[int] = None,
+        query_embedding: Optional[np.ndarray] = None
+    ):
+        """Überschreibt put() um den Eintrag (O(1)) auf Disk zu schreiben"""
+        super().put(
+            query, answer, confidence, sources, query_type,
+            context_params=context_params,
+            ttl_minutes=ttl_minutes,
+            query_embedding=query_embedding
+        )
+        cache_key = self._generate_cache_key(query, context_params)
+        self._write_rows([
+            self._row_values(cache_key, self._context_key(context_params), self._cache[cache_key])
+        ])
+    
+    def remove_expired(self) -> int:
+        """Entfernt abgelaufene Einträge aus Speicher und Datenbank"""
+        removed = super().remove_expired()
+        with self._db_lock:
+            self._connection().execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),))
+        return removed
+    
+    def compact(self) -> Dict[str, int]:
+        """
+        Kompaktiert die Datenbank (läuft auch periodisch im Hintergrund).
         
-        except Exception as e:
-            print(f"⚠️  Fehler beim Speichern des Cache: {e}")
+        Returns:
+            Anzahl gelöschter abgelaufener bzw. überzähliger Zeilen
+        """
+        with self._db_lock:
+            conn = self._connection()
+            expired = conn.execute(
+                "DELETE FROM entries WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            trimmed = conn.execute(
+                "DELETE FROM entries WHERE key IN ("
+                " SELECT key FROM entries ORDER BY written_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            ).rowcount
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.stats['compactions'] += 1
+        return {'expired': expired, 'trimmed': trimmed}
     
-    def put(self, *args, **kwargs):
-        """Überschreibt put() um nach jedem Eintrag zu speichern"""
-        super().put(*args, **kwargs)
-        self._save_to_disk()
+    def _compaction_loop(self, interval: float):
+        while not self._stop_compaction.wait(interval):
+            try:
+                self.compact()
+            except sqlite3.Error as e:
+                self.stats['disk_errors'] += 1
+                print(f"⚠️  Cache-Kompaktierung fehlgeschlagen: {e}")
     
     def clear(self):
         """Überschreibt clear() um auch Disk-Cache zu löschen"""
         super().clear()
-        cache_file = self._get_cache_file()
-        if cache_file.exists():
-            cache_file.unlink()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None  # wird beim nächsten Zugriff neu angelegt
+            for suffix in ("", "-wal", "-shm"):
+                db_file = self._get_db_file().with_name(self.DB_FILE + suffix)
+                if db_file.exists():
+                    db_file.unlink()
+    
+    def close(self):
+        """Stoppt die Kompaktierung und schließt die Datenbank"""
+        self._stop_compaction.set()
+        if self._compaction_thread is not None:
+            self._compaction_thread.join(timeout=5)
+            self._compaction_thread = None
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        with self._db_lock:
+            disk_entries = self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        stats.update({
+            'disk_entries': disk_entries,
+            'max_disk_entries': self.max_disk_entries,
+            'disk_reads': self.stats['disk_reads'],
+            'disk_writes': self.stats['disk_writes'],
+            'disk_errors': self.stats['disk_errors'],
+            'compactions': self.stats['compactions']
+        })
+        return stats
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+rag_concurrency.py
+
+UDS3 RAG Concurrency Layer
+Nebenläufige Ausführung blockierender Backend-Aufrufe für die Async-RAG-Pipeline
+
+Features:
+- Gemeinsames Scheduling aller DB-Tasks (asyncio.gather)
+- Globales und per-Backend Concurrency-Limit (Semaphoren)
+- Timeout mit Cancel auf Loop-Seite
+- Per-Datenbank Timing (Queue-Wartezeit + Ausführungszeit)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sentinel: Timeout aus ConcurrencyLimits übernehmen (None = kein Timeout)
+DEFAULT_TIMEOUT: Any = object()
+
+
+@dataclass
+class ConcurrencyLimits:
+    """Concurrency-Konfiguration für die Async-RAG-Pipeline"""
+    global_limit: int = 8  # Gleichzeitig laufende Backend-Aufrufe insgesamt
+    per_backend_limit: int = 4  # Gleichzeitig laufende Aufrufe pro Backend
+    per_backend_overrides: Dict[str, int] = field(default_factory=dict)
+    timeout_seconds: Optional[float] = 30.0  # Timeout pro Backend-Aufruf
+    query_timeout_seconds: Optional[float] = None  # Timeout für eine komplette RAG-Query (inkl. LLM)
+    max_inflight_queries: int = 16  # Gleichzeitige Queries in batch_query_async
+
+    def limit_for(self, backend: str) -> int:
+        """Effektives Limit für ein Backend"""
+        return self.per_backend_overrides.get(backend, self.per_backend_limit)
+
+
+@dataclass
+class DatabaseTiming:
+    """Timing eines einzelnen Backend-Aufrufs"""
+    database: str
+    status: str  # "ok" | "timeout" | "error"
+    queue_wait_ms: float = 0.0  # Wartezeit auf Semaphoren
+    execution_ms: float = 0.0  # Laufzeit ab Start im Worker-Thread bzw. bis Timeout
+    result_count: int = 0
+    error: Optional[str] = None
+
+    @property
+    def total_ms(self) -> float:
+        return self.queue_wait_ms + self.execution_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["total_ms"] = round(self.total_ms, 2)
+        return data
+
+
+class MultiDBExecutor:
+    """
+    Führt blockierende Backend-Aufrufe nebenläufig mit begrenzter Parallelität aus
+
+    Die Semaphoren bleiben bis zum tatsächlichen Ende des Worker-Threads
+    belegt - auch nach einem Timeout. Ein hängendes Backend kann dadurch
+    höchstens ``limit_for(backend)`` Threads binden und verdrängt keine
+    anderen Backends aus dem Pool.
+
+    Beispiel:
+    ```python
+    executor = MultiDBExecutor(ThreadPoolExecutor(8), ConcurrencyLimits())
+    outcomes = await executor.run_many({
+        "chromadb": lambda: vector_backend.search_similar(...),
+        "neo4j": lambda: graph_backend.execute_query(...),
+    })
+    results, timing = outcomes["chromadb"]
+    ```
+    """
+
+    def __init__(self, executor: ThreadPoolExecutor, limits: Optional[ConcurrencyLimits] = None):
+        self.executor = executor
+        self.limits = limits or ConcurrencyLimits()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._global_sem: Optional[asyncio.Semaphore] = None
+        self._backend_sems: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphores(self, backend: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        """Semaphoren sind an den Event-Loop gebunden - bei Loop-Wechsel neu anlegen"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._global_sem = asyncio.Semaphore(self.limits.global_limit)
+            self._backend_sems = {}
+        if backend not in self._backend_sems:
+            self._backend_sems[backend] = asyncio.Semaphore(self.limits.limit_for(backend))
+        return self._global_sem, self._backend_sems[backend]
+
+    async def run(
+        self,
+        backend: str,
+        fn: Callable[..., Any],
+        *args,
+        timeout: Any = DEFAULT_TIMEOUT,
+        reraise: bool = False
+    ) -> Tuple[Any, DatabaseTiming]:
+        """
+        Führt ``fn(*args)`` im Thread Pool aus
+
+        Args:
+            backend: Backend-Name (Schlüssel für das per-Backend Limit)
+            fn: Blockierende Funktion
+            timeout: Sekunden oder None (kein Timeout);
+                default: ConcurrencyLimits.timeout_seconds
+            reraise: Exceptions/Timeouts weiterreichen statt als Timing-Status melden
+
+        Returns:
+            (Ergebnis oder None, DatabaseTiming)
+        """
+        loop = asyncio.get_running_loop()
+        global_sem, backend_sem = self._semaphores(backend)
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.limits.timeout_seconds
+
+        queued_at = time.perf_counter()
+        # Erst Backend-Slot, dann globalen Slot: ein gesättigtes Backend
+        # blockiert so keine globalen Slots für andere Backends.
+        await backend_sem.acquire()
+        try:
+            await global_sem.acquire()
+        except BaseException:
+            backend_sem.release()
+            raise
+        started_at = time.perf_counter()
+        queue_wait_ms = (started_at - queued_at) * 1000
+
+        def _release():
+            global_sem.release()
+            backend_sem.release()
+
+        # Freigabe erst, wenn der Worker-Thread wirklich fertig ist: der
+        # Callback hängt am concurrent.futures.Future, nicht am asyncio-Wrapper
+        # (dessen Cancel bei Timeout sofort abschließen würde).
+        def _on_thread_done(_future):
+            try:
+                loop.call_soon_threadsafe(_release)
+            except RuntimeError:
+                pass  # Loop bereits geschlossen - Semaphoren werden neu angelegt
+
+        thread_future = self.executor.submit(fn, *args)
+        thread_future.add_done_callback(_on_thread_done)
+        future = asyncio.wrap_future(thread_future, loop=loop)
+
+        try:
+            if timeout is None:
+                result = await asyncio.shield(future)
+            else:
+                result = await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            thread_future.cancel()  # wirkt nur, falls der Thread noch nicht gestartet ist
+            logger.warning(f"⏱️ Backend {backend} Timeout nach {timeout}s")
+            if reraise:
+                raise
+            return None, DatabaseTiming(
+                database=backend,
+                status="timeout",
+                queue_wait_ms=queue_wait_ms,
+                execution_ms=(time.perf_counter() - started_at) * 1000,
+                error=f"timeout after {timeout}s"
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Fehler bei DB {backend}: {e}")
+            if reraise:
+                raise
+            return None, DatabaseTiming(
+                database=backend,
+                status="error",
+                queue_wait_ms=queue_wait_ms,
+                execution_ms=(time.perf_counter() - started_at) * 1000,
+                error=str(e)
+            )
+
+        result_count = len(result) if isinstance(result, (list, tuple, dict)) else 0
+        return result, DatabaseTiming(
+            database=backend,
+            status="ok",
+            queue_wait_ms=queue_wait_ms,
+            execution_ms=(time.perf_counter() - started_at) * 1000,
+            result_count=result_count
+        )
+
+    async def run_many(
+        self,
+        calls: Dict[str, Callable[[], Any]],
+        timeout: Any = DEFAULT_TIMEOUT
+    ) -> Dict[str, Tuple[Any, DatabaseTiming]]:
+        """
+        Plant alle Aufrufe gemeinsam ein und wartet auf alle
+
+        Args:
+            calls: {backend_name: parameterlose Funktion}
+            timeout: Timeout pro Aufruf (default: ConcurrencyLimits.timeout_seconds)
+
+        Returns:
+            {backend_name: (Ergebnis oder None, DatabaseTiming)}
+        """
+        names = list(calls.keys())
+        outcomes = await asyncio.gather(
+            *(self.run(name, calls[name], timeout=timeout) for name in names)
+        )
+        return dict(zip(names, outcomes))
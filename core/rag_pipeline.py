@@ -144,6 +144,7 @@ class UDS3GenericRAG:
             - sources: Liste der genutzten Quellen (optional)
             - query_type: Erkannter Query-Typ
             - confidence: Confidence-Score (0.0 - 1.0)
+            - database_timings: {db_name: {execution_ms, result_count}} pro Retrieval-Aufruf
         """
         import time
         
@@ -193,7 +194,8 @@ class UDS3GenericRAG:
                 "query_type": query_type.value,
                 "confidence": self._calculate_confidence(context, answer),
                 "retrieval_time": retrieval_time,
-                "generation_time": generation_time
+                "generation_time": generation_time,
+                "database_timings": retrieved_data["metadata"].get("database_timings", {})
             }
             
             if include_sources:
@@ -296,18 +298,27 @@ class UDS3GenericRAG:
             domain: Domain-Filter
         
         Returns:
-            Dict mit retrieved data aus allen DBs
+            Dict mit retrieved data aus allen DBs (Timings pro DB in
+            metadata["database_timings"])
         """
+        import time
+        
+        timings: Dict[str, Dict[str, Any]] = {}
         data = {
             "vector_results": [],
             "graph_results": [],
             "relational_results": [],
-            "metadata": {}
+            "metadata": {"database_timings": timings}
         }
         
         # Vector DB: Semantic Search
         if query_type in [QueryType.SEMANTIC_SEARCH, QueryType.GENERAL, QueryType.COMPARISON]:
+            search_start = time.time()
             data["vector_results"] = self.semantic_search(query, domain, self.top_k_results)
+            timings["vector"] = {
+                "execution_ms": (time.time() - search_start) * 1000,
+                "result_count": len(data["vector_results"])
+            }
         
         # Graph DB: Path Finding / Relationships
         if query_type in [QueryType.PATH_FINDING, QueryType.RELATIONSHIP]:
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+single_flight.py
+
+UDS3 Single-Flight Request Coalescing
+Gleichzeitige identische Anfragen teilen sich eine laufende Berechnung
+
+Features:
+- SingleFlight: thread-sicher für blockierende Aufrufe (z.B. Embeddings)
+- Batch-Claims: mehrere Keys auf einmal übernehmen (embed_batch)
+- AsyncSingleFlight: asyncio-Variante (z.B. RAG-Antworten)
+- Metriken: Leader-Berechnungen vs. zusammengeführte Anfragen
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class _Flight:
+    """Eine laufende Berechnung, auf die weitere Aufrufer warten können"""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread-sichere Single-Flight Gruppe
+
+    Der erste Aufrufer für einen Key (Leader) führt die Berechnung aus,
+    alle gleichzeitigen Aufrufer mit demselben Key warten auf dessen
+    Ergebnis bzw. erhalten dessen Exception. Nach Abschluss wird der Key
+    freigegeben - spätere Aufrufe rechnen (bzw. lesen den Cache) neu.
+
+    Beispiel:
+    ```python
+    flights = SingleFlight()
+    embedding, shared = flights.do(cache_key, lambda: model.encode(text))
+    ```
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self.stats = {"leaders": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Führt ``fn()`` höchstens einmal pro gleichzeitig angefragtem Key aus
+
+        Returns:
+            (Ergebnis, shared) - shared=True, wenn das Ergebnis von einem
+            anderen Aufrufer berechnet wurde
+        """
+        owned, waiting = self.claim([key])
+        if waiting:
+            return self.wait(waiting[key]), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.resolve(key, error=e)
+            raise
+        self.resolve(key, result)
+        return result, False
+
+    def claim(self, keys: Iterable[Hashable]) -> Tuple[List[Hashable], Dict[Hashable, _Flight]]:
+        """
+        Übernimmt alle freien Keys atomar
+
+        Der Aufrufer MUSS jeden übernommenen Key per ``resolve`` abschließen
+        (auch im Fehlerfall), bevor er auf fremde Flights wartet - sonst
+        können sich zwei Batches gegenseitig blockieren.
+
+        Returns:
+            (übernommene Keys, {Key: Flight} für bereits laufende Keys)
+        """
+        owned: List[Hashable] = []
+        waiting: Dict[Hashable, _Flight] = {}
+        seen = set()
+        with self._lock:
+            for key in keys:
+                if key in seen:
+                    continue
+                seen.add(key)
+                flight = self._flights.get(key)
+                if flight is None:
+                    self._flights[key] = _Flight()
+                    owned.append(key)
+                else:
+                    waiting[key] = flight
+            self.stats["leaders"] += len(owned)
+            self.stats["coalesced"] += len(waiting)
+        return owned, waiting
+
+    def resolve(self, key: Hashable, result: Any = None, error: Optional[BaseException] = None):
+        """Schließt einen übernommenen Key ab und weckt alle Wartenden"""
+        with self._lock:
+            flight = self._flights.pop(key, None)
+            if error is not None:
+                self.stats["errors"] += 1
+        if flight is None:
+            return
+        flight.result = result
+        flight.error = error
+        flight.done.set()
+
+    @staticmethod
+    def wait(flight: _Flight, timeout: Optional[float] = None) -> Any:
+        """Wartet auf einen fremden Flight und liefert dessen Ergebnis"""
+        if not flight.done.wait(timeout):
+            raise TimeoutError("Single-Flight Ergebnis nicht rechtzeitig verfügbar")
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.stats["leaders"] + self.stats["coalesced"]
+            return {
+                **self.stats,
+                "in_flight": len(self._flights),
+                "coalesced_rate": self.stats["coalesced"] / total if total else 0.0
+            }
+
+
+class AsyncSingleFlight:
+    """
+    Single-Flight Gruppe für Coroutinen
+
+    Die Berechnung läuft als eigener Task: bricht ein einzelner Aufrufer ab
+    (z.B. Client-Timeout), laufen die übrigen Wartenden und die Berechnung
+    selbst weiter. Flights sind an ihren Event-Loop gebunden; Einträge
+    eines fremden Loops werden ignoriert.
+
+    Beispiel:
+    ```python
+    flights = AsyncSingleFlight()
+    result, shared = await flights.do(cache_key, lambda: run_pipeline(query))
+    ```
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"leaders": 0, "coalesced": 0, "errors": 0}
+
+    async def do(self, key: Hashable, coro_fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Führt ``await coro_fn()`` höchstens einmal pro gleichzeitig angefragtem Key aus
+
+        Returns:
+            (Ergebnis, shared) - shared=True, wenn das Ergebnis von einem
+            anderen Aufrufer berechnet wurde
+        """
+        loop = asyncio.get_running_loop()
+        task = self._flights.get(key)
+        shared = task is not None and not task.done() and task.get_loop() is loop
+
+        if shared:
+            self.stats["coalesced"] += 1
+        else:
+            task = loop.create_task(coro_fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+            self.stats["leaders"] += 1
+
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        # Exception abholen, auch wenn alle Wartenden abgebrochen haben
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+
+    def in_flight(self) -> int:
+        return sum(1 for task in self._flights.values() if not task.done())
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats["leaders"] + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "in_flight": self.in_flight(),
+            "coalesced_rate": self.stats["coalesced"] / total if total else 0.0
+        }
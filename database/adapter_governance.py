@@ -24,8 +24,11 @@ Repository: https://github.com/makr-code/VCC-UDS3
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+_CONTAINER_TYPES = (dict, list, tuple, set)
+_NUMERIC_TYPES = frozenset({int, float, complex})
 
 
 @dataclass(slots=True)
@@ -46,6 +49,39 @@ class AdapterGovernanceError(RuntimeError):
         self.violations: Tuple[GovernanceViolation, ...] = tuple(violations or ())
 
 
+@dataclass(slots=True)
+class CompiledPayloadPolicy:
+    """Vorkompilierte Payload-Regeln eines Backends.
+
+    ``skip_numeric`` ist gesetzt, wenn kein verbotener Typ eine Zahl sein kann;
+    homogene Zahlenlisten (Embeddings) müssen dann nicht elementweise geprüft
+    werden. ``shape_cache`` merkt sich pro Dict-Schlüsseltupel die Positionen
+    verbotener Felder.
+    """
+
+    forbidden_fields: FrozenSet[str]
+    forbidden_types: Tuple[type, ...]
+    skip_numeric: bool
+    shape_cache_size: int = 0
+    shape_cache: Dict[Tuple[Any, ...], Tuple[int, ...]] = field(default_factory=dict)
+
+    def forbidden_key_positions(self, keys: Tuple[Any, ...]) -> Tuple[int, ...]:
+        if not self.forbidden_fields:
+            return ()
+        cached = self.shape_cache.get(keys) if self.shape_cache_size else None
+        if cached is not None:
+            return cached
+        positions = tuple(
+            index for index, key in enumerate(keys)
+            if str(key).rsplit(".", 1)[-1].lower() in self.forbidden_fields
+        )
+        if self.shape_cache_size:
+            if len(self.shape_cache) >= self.shape_cache_size:
+                self.shape_cache.clear()
+            self.shape_cache[keys] = positions
+        return positions
+
+
 class AdapterGovernance:
     """Governance-Prüflogik für alle unterstützten Backend-Typen."""
 
@@ -87,9 +123,39 @@ class AdapterGovernance:
         },
     }
 
-    def __init__(self, policies: Optional[Dict[str, Dict[str, Any]]] = None, *, strict: bool = True) -> None:
+    def __init__(
+        self,
+        policies: Optional[Dict[str, Dict[str, Any]]] = None,
+        *,
+        strict: bool = True,
+        shape_cache_size: int = 1024,
+    ) -> None:
         self.strict = strict
+        self.shape_cache_size = shape_cache_size
         self.policies = self._merge_policies(self.DEFAULT_POLICIES, policies or {})
+        self.refresh_policies()
+
+    def refresh_policies(self) -> None:
+        """Kompiliert die Payload-Regeln neu (nach Änderungen an ``self.policies``)."""
+        self._compiled: Dict[str, Optional[CompiledPayloadPolicy]] = {
+            backend: self._compile_policy(policy) for backend, policy in self.policies.items()
+        }
+
+    def _compile_policy(self, policy: Dict[str, Any]) -> Optional[CompiledPayloadPolicy]:
+        rules = policy.get("payload_rules") or {}
+        forbidden_fields = frozenset(str(field).lower() for field in rules.get("forbidden_fields", set()))
+        forbidden_types = tuple(rules.get("forbidden_types", ()))
+        if not forbidden_fields and not forbidden_types:
+            return None
+        skip_numeric = not any(
+            issubclass(numeric, forbidden) for numeric in _NUMERIC_TYPES for forbidden in forbidden_types
+        )
+        return CompiledPayloadPolicy(
+            forbidden_fields=forbidden_fields,
+            forbidden_types=forbidden_types,
+            skip_numeric=skip_numeric,
+            shape_cache_size=self.shape_cache_size,
+        )
 
     def _merge_policies(
         self,
@@ -142,37 +208,21 @@ class AdapterGovernance:
             raise AdapterGovernanceError(message, violations)
 
     def validate_payload(self, backend: str, operation: str, payload: Any) -> List[GovernanceViolation]:
-        policy = self.policies.get(backend.lower())
-        if not policy:
-            return []
-        rules = policy.get("payload_rules") or {}
-        forbidden_fields = {str(field).lower() for field in rules.get("forbidden_fields", set())}
-        forbidden_types = rules.get("forbidden_types", ())
-
+        backend_key = backend.lower()
+        if backend_key not in self._compiled:
+            # Policy nachträglich in self.policies eingetragen
+            policy = self.policies.get(backend_key)
+            if not policy:
+                return []
+            self._compiled[backend_key] = self._compile_policy(policy)
+        compiled = self._compiled[backend_key]
         violations: List[GovernanceViolation] = []
-        if not forbidden_fields and not forbidden_types:
+        if compiled is None or payload is None:
             return violations
-
-        for field_path, value in self._iterate_payload(payload):
-            field_key = field_path.split(".")[-1].lower()
-            if forbidden_fields and field_key in forbidden_fields:
-                violations.append(
-                    GovernanceViolation(
-                        backend=backend,
-                        operation=operation,
-                        field_path=field_path,
-                        message=f"Feld '{field_path}' ist für Backend '{backend}' nicht erlaubt",
-                    )
-                )
-            if forbidden_types and isinstance(value, forbidden_types):
-                violations.append(
-                    GovernanceViolation(
-                        backend=backend,
-                        operation=operation,
-                        field_path=field_path,
-                        message=f"Datentyp '{type(value).__name__}' in Feld '{field_path}' ist für Backend '{backend}' verboten",
-                    )
-                )
+        if isinstance(payload, _CONTAINER_TYPES):
+            self._scan(payload, None, compiled, backend, operation, violations)
+        else:
+            self._check_value("value", "value", payload, compiled, backend, operation, violations)
         return violations
 
     # ------------------------------------------------------------------
@@ -196,4 +246,86 @@ class AdapterGovernance:
                     yield from self._iterate_payload(value, path)
         else:
             path = current_prefix or "value"
-            yield path, payload
\ No newline at end of file
+            yield path, payload
+
+    def _scan(
+        self,
+        container: Any,
+        prefix: Optional[str],
+        compiled: CompiledPayloadPolicy,
+        backend: str,
+        operation: str,
+        violations: List[GovernanceViolation],
+    ) -> None:
+        """Wie ``_iterate_payload``, baut Pfade aber nur für Container und Verstöße."""
+        forbidden_types = compiled.forbidden_types
+        if isinstance(container, dict):
+            forbidden_positions = compiled.forbidden_key_positions(tuple(container))
+            for index, (key, value) in enumerate(container.items()):
+                is_container = isinstance(value, _CONTAINER_TYPES)
+                if forbidden_positions and index in forbidden_positions:
+                    path = f"{prefix}.{key}" if prefix else str(key)
+                    violations.append(
+                        GovernanceViolation(
+                            backend=backend,
+                            operation=operation,
+                            field_path=path,
+                            message=f"Feld '{path}' ist für Backend '{backend}' nicht erlaubt",
+                        )
+                    )
+                if forbidden_types and isinstance(value, forbidden_types):
+                    self._type_violation(f"{prefix}.{key}" if prefix else str(key), value, backend, operation, violations)
+                if is_container:
+                    self._scan(value, f"{prefix}.{key}" if prefix else str(key), compiled, backend, operation, violations)
+            return
+
+        # list / tuple / set
+        if compiled.skip_numeric and container and set(map(type, container)) <= _NUMERIC_TYPES:
+            return  # homogene Zahlenliste (z.B. Embedding): kein Element kann verstoßen
+        for index, value in enumerate(container):
+            if isinstance(value, _CONTAINER_TYPES):
+                path = f"{prefix}[{index}]" if prefix else f"[{index}]"
+                if forbidden_types and isinstance(value, forbidden_types):
+                    self._type_violation(path, value, backend, operation, violations)
+                self._scan(value, path, compiled, backend, operation, violations)
+            elif forbidden_types and isinstance(value, forbidden_types):
+                self._type_violation(f"{prefix}[{index}]" if prefix else f"[{index}]", value, backend, operation, violations)
+
+    def _check_value(
+        self,
+        path: str,
+        field_key: str,
+        value: Any,
+        compiled: CompiledPayloadPolicy,
+        backend: str,
+        operation: str,
+        violations: List[GovernanceViolation],
+    ) -> None:
+        if field_key in compiled.forbidden_fields:
+            violations.append(
+                GovernanceViolation(
+                    backend=backend,
+                    operation=operation,
+                    field_path=path,
+                    message=f"Feld '{path}' ist für Backend '{backend}' nicht erlaubt",
+                )
+            )
+        if compiled.forbidden_types and isinstance(value, compiled.forbidden_types):
+            self._type_violation(path, value, backend, operation, violations)
+
+    @staticmethod
+    def _type_violation(
+        path: str,
+        value: Any,
+        backend: str,
+        operation: str,
+        violations: List[GovernanceViolation],
+    ) -> None:
+        violations.append(
+            GovernanceViolation(
+                backend=backend,
+                operation=operation,
+                field_path=path,
+                message=f"Datentyp '{type(value).__name__}' in Feld '{path}' ist für Backend '{backend}' verboten",
+            )
+        )
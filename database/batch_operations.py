@@ -34,10 +34,14 @@ License: MIT with Government Partnership Commons Clause
 Repository: https://github.com/makr-code/VCC-UDS3
 """
 
+import io
 import os
 import logging
+import queue
 import threading
-from typing import List, Tuple, Dict, Any, Optional
+import time
+from contextlib import contextmanager
+from typing import List, Tuple, Dict, Any, Optional, Iterator, Iterable, Union
 
 # UDS3 imports
 try:
@@ -62,6 +66,8 @@ NEO4J_BATCH_SIZE = int(os.getenv("NEO4J_BATCH_SIZE", "1000"))
 # PostgreSQL Batch Insert
 ENABLE_POSTGRES_BATCH_INSERT = os.getenv("ENABLE_POSTGRES_BATCH_INSERT", "false").lower() == "true"
 POSTGRES_BATCH_INSERT_SIZE = int(os.getenv("POSTGRES_BATCH_INSERT_SIZE", "100"))
+ENABLE_POSTGRES_COPY_LOAD = os.getenv("ENABLE_POSTGRES_COPY_LOAD", "false").lower() == "true"
+POSTGRES_COPY_CHUNK_ROWS = int(os.getenv("POSTGRES_COPY_CHUNK_ROWS", "50000"))
 
 # CouchDB Batch Insert
 ENABLE_COUCHDB_BATCH_INSERT = os.getenv("ENABLE_COUCHDB_BATCH_INSERT", "false").lower() == "true"
@@ -78,20 +84,339 @@ POSTGRES_BATCH_READ_SIZE = int(os.getenv("POSTGRES_BATCH_READ_SIZE", "1000"))
 COUCHDB_BATCH_READ_SIZE = int(os.getenv("COUCHDB_BATCH_READ_SIZE", "1000"))
 CHROMADB_BATCH_READ_SIZE = int(os.getenv("CHROMADB_BATCH_READ_SIZE", "500"))
 NEO4J_BATCH_READ_SIZE = int(os.getenv("NEO4J_BATCH_READ_SIZE", "1000"))
+# Seconds before a chunk index entry is re-read via metadata filter (0 = never)
+CHROMA_CHUNK_INDEX_TTL = float(os.getenv("CHROMA_CHUNK_INDEX_TTL", "300"))
+
+# Pipelined Background Flushing (all batch inserters)
+ENABLE_BACKGROUND_BATCH_FLUSH = os.getenv("ENABLE_BACKGROUND_BATCH_FLUSH", "false").lower() == "true"
+BATCH_FLUSH_MAX_IN_FLIGHT = int(os.getenv("BATCH_FLUSH_MAX_IN_FLIGHT", "2"))
 
 logger.info(f"[UDS3-BATCH] ChromaDB Batch Insert: {'ENABLED' if ENABLE_CHROMA_BATCH_INSERT else 'DISABLED'} (size: {CHROMA_BATCH_INSERT_SIZE})")
 logger.info(f"[UDS3-BATCH] Neo4j Batch Operations: {'ENABLED' if ENABLE_NEO4J_BATCHING else 'DISABLED'} (size: {NEO4J_BATCH_SIZE})")
 logger.info(f"[UDS3-BATCH] PostgreSQL Batch Insert: {'ENABLED' if ENABLE_POSTGRES_BATCH_INSERT else 'DISABLED'} (size: {POSTGRES_BATCH_INSERT_SIZE})")
+logger.info(f"[UDS3-BATCH] PostgreSQL COPY Load: {'ENABLED' if ENABLE_POSTGRES_COPY_LOAD else 'DISABLED'} (chunk: {POSTGRES_COPY_CHUNK_ROWS} rows)")
 logger.info(f"[UDS3-BATCH] CouchDB Batch Insert: {'ENABLED' if ENABLE_COUCHDB_BATCH_INSERT else 'DISABLED'} (size: {COUCHDB_BATCH_INSERT_SIZE})")
 logger.info(f"[UDS3-BATCH] Batch READ: {'ENABLED' if ENABLE_BATCH_READ else 'DISABLED'} (size: {BATCH_READ_SIZE})")
 logger.info(f"[UDS3-BATCH] Parallel Batch READ: {'ENABLED' if ENABLE_PARALLEL_BATCH_READ else 'DISABLED'} (timeout: {PARALLEL_BATCH_TIMEOUT}s)")
+logger.info(f"[UDS3-BATCH] Background Flush: {'ENABLED' if ENABLE_BACKGROUND_BATCH_FLUSH else 'DISABLED'} (in-flight: {BATCH_FLUSH_MAX_IN_FLIGHT})")
+
+
+# ================================================================
+# PIPELINED BACKGROUND FLUSHING
+# ================================================================
+
+class BatchFlusher:
+    """
+    Background flusher for swapped-out batch buffers
+    
+    Producers hand over full buffers via submit(); max_in_flight worker
+    threads flush them concurrently. The hand-over queue is bounded
+    (queue_size, default: max_in_flight), so submit() blocks when the
+    backend cannot keep up (backpressure).
+    
+    Note: With max_in_flight > 1 batches may complete out of order; use
+    max_in_flight=1 if write order matters (still overlaps producer and I/O).
+    """
+    
+    def __init__(
+        self,
+        flush_fn,
+        max_in_flight: int = BATCH_FLUSH_MAX_IN_FLIGHT,
+        queue_size: Optional[int] = None,
+        name: str = "batch"
+    ):
+        """
+        Args:
+            flush_fn: Callable(batch) -> bool, flushes one detached buffer
+            max_in_flight: Number of concurrently flushing worker threads
+            queue_size: Max buffers waiting for a worker (default: max_in_flight)
+            name: Thread name prefix
+        """
+        self._flush_fn = flush_fn
+        self.max_in_flight = max(1, max_in_flight)
+        self._queue: "queue.Queue[Optional[List[Any]]]" = queue.Queue(
+            maxsize=max(1, queue_size or self.max_in_flight)
+        )
+        self._cond = threading.Condition()
+        self._pending = 0
+        self._failed_since_drain = 0
+        self._closed = False
+        
+        self.total_submitted = 0
+        self.total_completed = 0
+        self.total_failed = 0
+        self.total_blocked_seconds = 0.0
+        
+        self._workers = [
+            threading.Thread(target=self._run, name=f"uds3-{name}-flusher-{i}", daemon=True)
+            for i in range(self.max_in_flight)
+        ]
+        for worker in self._workers:
+            worker.start()
+    
+    def submit(self, batch: List[Any]):
+        """Hand over a detached buffer (blocks while the queue is full)"""
+        if not batch:
+            return
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchFlusher is closed")
+            self._pending += 1
+            self.total_submitted += 1
+        start = time.perf_counter()
+        self._queue.put(batch)
+        blocked = time.perf_counter() - start
+        with self._cond:
+            self.total_blocked_seconds += blocked
+    
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            try:
+                ok = self._flush_fn(batch) is not False
+            except Exception as e:
+                logger.error(f"[UDS3-BATCH] ❌ Background flush failed: {e}")
+                ok = False
+            with self._cond:
+                self._pending -= 1
+                self.total_completed += 1
+                if not ok:
+                    self.total_failed += 1
+                    self._failed_since_drain += 1
+                self._cond.notify_all()
+    
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all submitted buffers are flushed
+        
+        Returns:
+            bool: True if no flush failed since the last drain()
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending == 0, timeout=timeout):
+                raise TimeoutError(f"{self._pending} batches still in flight after {timeout}s")
+            ok = self._failed_since_drain == 0
+            self._failed_since_drain = 0
+            return ok
+    
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Drain and stop the worker threads"""
+        ok = self.drain(timeout)
+        with self._cond:
+            if self._closed:
+                return ok
+            self._closed = True
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout)
+        return ok
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'max_in_flight': self.max_in_flight,
+                'in_flight': self._pending,
+                'submitted': self.total_submitted,
+                'completed': self.total_completed,
+                'failed': self.total_failed,
+                'blocked_seconds': self.total_blocked_seconds
+            }
+
+
+class _BackgroundFlushMixin:
+    """
+    Double buffering for the batch inserters
+    
+    Inserters implement _flush_items(batch) for a detached buffer. In sync
+    mode the full buffer is flushed inline (previous behaviour); in
+    background mode add() swaps the buffer under the lock and submits the
+    full one to a BatchFlusher after releasing the lock.
+    """
+    
+    def _init_background_flush(self, background_flush: Optional[bool], max_in_flight: int, name: str):
+        self._stats_lock = threading.Lock()  # counters are updated from flusher threads
+        if background_flush is None:
+            background_flush = ENABLE_BACKGROUND_BATCH_FLUSH
+        self._flusher = BatchFlusher(self._flush_items, max_in_flight, name=name) if background_flush else None
+    
+    @property
+    def background_flush(self) -> bool:
+        return self._flusher is not None
+    
+    def _flush_unlocked(self) -> bool:
+        """
+        Internal flush without acquiring lock (called when lock is already held)
+        
+        Returns:
+            bool: True if the batch was written successfully
+        """
+        return self._flush_items(self.batch)
+    
+    def _auto_flush_unlocked(self) -> Optional[List[Any]]:
+        """
+        Called by add() with the lock held once the buffer is full
+        
+        Returns:
+            The detached buffer to submit after releasing the lock
+            (background mode), None if it was flushed inline
+        """
+        if self._flusher is None:
+            self._flush_unlocked()
+            return None
+        batch, self.batch = self.batch, []
+        return batch
+    
+    def _submit(self, batch: Optional[List[Any]]):
+        if batch:
+            self._flusher.submit(batch)
+    
+    def _flush_pipelined(self) -> bool:
+        with self._lock:
+            if self._flusher is None:
+                return self._flush_unlocked()
+            batch, self.batch = self.batch, []
+        self._submit(batch)
+        return self._flusher.drain()
+    
+    def flush_batch(self, items: List[Any]) -> bool:
+        """
+        Write a caller-owned batch immediately, bypassing the internal buffer
+        
+        Items use the same format as the internal buffer. The given list is
+        not modified, so concurrent callers never see each other's items.
+        
+        Returns:
+            bool: True if the batch was written successfully
+        """
+        return self._flush_items(list(items))
+    
+    def close(self) -> bool:
+        """Flush remaining items and stop background flusher threads"""
+        ok = self._flush_pipelined()
+        if self._flusher is not None:
+            ok = self._flusher.close() and ok
+        return ok
+    
+    def _flusher_stats(self) -> Dict[str, Any]:
+        return {'background_flush': self._flusher.get_stats()} if self._flusher is not None else {}
+
+
+# ================================================================
+# CHROMADB CHUNK INDEX
+# ================================================================
+
+class ChromaChunkIndex:
+    """
+    Maintained document → chunk-ID map for ChromaDB
+    
+    Lets batch readers fetch exactly the chunks that exist for a document
+    instead of guessing chunk IDs. Fed by ChromaBatchInserter (on successful
+    insert) and by ChromaDBBatchReader (from metadata-filtered reads).
+    Entries expire after max_age_seconds so chunks written by other
+    processes are picked up by the next filtered read. Thread-safe.
+    
+    Usage:
+        index = ChromaChunkIndex()
+        inserter = ChromaBatchInserter(chromadb_backend, chunk_index=index)
+        reader = ChromaDBBatchReader(chromadb_backend, chunk_index=index)
+    """
+    
+    # Metadata keys that carry the owning document ID
+    DOCUMENT_ID_KEYS = ('document_id', 'doc_id')
+    
+    def __init__(self, max_age_seconds: Optional[float] = None):
+        """
+        Args:
+            max_age_seconds: Entry lifetime (default: CHROMA_CHUNK_INDEX_TTL, 0 = no expiry)
+        """
+        # doc_id -> insertion-ordered set of chunk IDs (dict keys: O(1) dedup)
+        self._chunks: Dict[str, Dict[str, None]] = {}
+        self._created: Dict[str, float] = {}
+        self.max_age_seconds = CHROMA_CHUNK_INDEX_TTL if max_age_seconds is None else max_age_seconds
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def document_id_of(cls, metadata: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Owning document ID from chunk metadata (None if absent)"""
+        if not metadata:
+            return None
+        for key in cls.DOCUMENT_ID_KEYS:
+            if metadata.get(key) is not None:
+                return str(metadata[key])
+        return None
+    
+    def register(self, doc_id: str, chunk_ids: List[str]):
+        """Add chunk IDs for a document (duplicates are ignored)"""
+        with self._lock:
+            if self._entry(doc_id) is None:
+                self._chunks[doc_id] = {}
+                self._created[doc_id] = time.monotonic()
+            self._chunks[doc_id].update(dict.fromkeys(chunk_ids))
+    
+    def register_chunks(self, chunks: List[Tuple[str, Optional[Dict[str, Any]]]]):
+        """Add (chunk_id, metadata) pairs; chunks without document ID are skipped"""
+        by_doc: Dict[str, List[str]] = {}
+        for chunk_id, metadata in chunks:
+            doc_id = self.document_id_of(metadata)
+            if doc_id is not None:
+                by_doc.setdefault(doc_id, []).append(chunk_id)
+        for doc_id, chunk_ids in by_doc.items():
+            self.register(doc_id, chunk_ids)
+    
+    def forget(self, doc_id: str):
+        """Drop a document (e.g. after deleting or re-chunking it)"""
+        with self._lock:
+            self._chunks.pop(doc_id, None)
+            self._created.pop(doc_id, None)
+    
+    def _entry(self, doc_id: str) -> Optional[Dict[str, None]]:
+        """Chunk IDs of a document; drops expired entries (lock held)"""
+        chunk_ids = self._chunks.get(doc_id)
+        if chunk_ids is not None and self.max_age_seconds > 0 and (
+            time.monotonic() - self._created[doc_id] > self.max_age_seconds
+        ):
+            del self._chunks[doc_id]
+            del self._created[doc_id]
+            return None
+        return chunk_ids
+    
+    def get(self, doc_id: str) -> Optional[List[str]]:
+        """Known chunk IDs of a document (None if the document is unknown)"""
+        with self._lock:
+            chunk_ids = self._entry(doc_id)
+            return list(chunk_ids) if chunk_ids is not None else None
+    
+    def resolve(self, doc_ids: List[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+        """
+        Split documents into indexed and unknown ones
+    
+        Returns:
+            ({doc_id: [chunk_ids]}, [unknown doc_ids])
+        """
+        known: Dict[str, List[str]] = {}
+        unknown: List[str] = []
+        with self._lock:
+            for doc_id in doc_ids:
+                chunk_ids = self._entry(doc_id)
+                if chunk_ids is None:
+                    unknown.append(doc_id)
+                else:
+                    known[doc_id] = list(chunk_ids)
+        return known, unknown
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._chunks)
 
 
 # ================================================================
 # CHROMADB BATCH INSERTER
 # ================================================================
 
-class ChromaBatchInserter:
+class ChromaBatchInserter(_BackgroundFlushMixin):
     """
     Batch inserter for ChromaDB Remote HTTP API
     
@@ -116,21 +441,33 @@ class ChromaBatchInserter:
         - Speedup: ~80x faster (93% reduction in API calls)
     """
     
-    def __init__(self, chromadb_backend, batch_size: int = CHROMA_BATCH_INSERT_SIZE):
+    def __init__(
+        self,
+        chromadb_backend,
+        batch_size: int = CHROMA_BATCH_INSERT_SIZE,
+        chunk_index: Optional[ChromaChunkIndex] = None,
+        background_flush: Optional[bool] = None,
+        max_in_flight: int = BATCH_FLUSH_MAX_IN_FLIGHT
+    ):
         """
         Initialize batch inserter
         
         Args:
             chromadb_backend: ChromaDB backend instance (must have add_vectors method)
             batch_size: Number of vectors to accumulate before auto-flush
+            chunk_index: Optional document → chunk index, updated on successful insert
+            background_flush: Flush full batches on background threads (default: from ENV)
+            max_in_flight: Concurrent background flushes
         """
         self.backend = chromadb_backend
         self.batch_size = batch_size
+        self.chunk_index = chunk_index
         self.batch: List[Tuple[str, List[float], Dict[str, Any]]] = []
         self.total_added = 0
         self.total_batches = 0
         self.total_fallbacks = 0
         self._lock = threading.Lock()  # Thread-safe batch operations
+        self._init_background_flush(background_flush, max_in_flight, "chroma")
         
         logger.debug(f"[UDS3-BATCH] ChromaBatchInserter initialized (batch_size={batch_size})")
     
@@ -139,8 +476,8 @@ class ChromaBatchInserter:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit (auto-flush)"""
-        self.flush()
+        """Context manager exit (auto-flush, stops background flusher)"""
+        self.close()
         return False
     
     def add(self, chunk_id: str, vector: List[float], metadata: Dict[str, Any]):
@@ -152,46 +489,54 @@ class ChromaBatchInserter:
             vector: Embedding vector (384-dim for all-MiniLM-L6-v2)
             metadata: Chunk metadata (doc_id, chunk_index, content, etc.)
         """
+        full_batch = None
         with self._lock:
             self.batch.append((chunk_id, vector, metadata))
             
             # Auto-flush when batch is full
             if len(self.batch) >= self.batch_size:
-                self._flush_unlocked()  # Already holding lock!
+                full_batch = self._auto_flush_unlocked()  # Already holding lock!
+        self._submit(full_batch)
     
     def flush(self) -> bool:
         """
         Flush accumulated vectors to ChromaDB (thread-safe)
         
+        In background mode this also waits for all in-flight batches.
+        
         Returns:
             bool: True if all vectors were added successfully
         """
-        with self._lock:
-            return self._flush_unlocked()
+        return self._flush_pipelined()
     
-    def _flush_unlocked(self) -> bool:
+    def _flush_items(self, batch: List[Tuple[str, List[float], Dict[str, Any]]]) -> bool:
         """
-        Internal flush without acquiring lock (called when lock is already held)
+        Flush the given buffer (self.batch inline, a detached buffer in background mode)
         
         Returns:
             bool: True if all vectors were added successfully
         """
-        if not self.batch:
+        if not batch:
             return True
         
-        batch_count = len(self.batch)
+        batch_count = len(batch)
         
         try:
             # Try batch insert first
             if hasattr(self.backend, 'add_vectors'):
                 logger.debug(f"[UDS3-BATCH] Flushing {batch_count} vectors to ChromaDB...")
-                success = self.backend.add_vectors(self.batch.copy())  # Pass a copy to preserve mock data
+                success = self.backend.add_vectors(batch.copy())  # Pass a copy to preserve mock data
                 
                 if success:
-                    self.total_added += batch_count
-                    self.total_batches += 1
+                    if self.chunk_index is not None:
+                        self.chunk_index.register_chunks(
+                            [(chunk_id, metadata) for chunk_id, _, metadata in batch]
+                        )
+                    with self._stats_lock:
+                        self.total_added += batch_count
+                        self.total_batches += 1
                     logger.info(f"[UDS3-BATCH] ✅ ChromaDB Batch Insert: {batch_count} vectors added (total: {self.total_added})")
-                    self.batch.clear()
+                    batch.clear()
                     return True
                 else:
                     logger.warning(f"[UDS3-BATCH] ⚠️  ChromaDB Batch Insert failed - falling back to per-item insert")
@@ -199,43 +544,48 @@ class ChromaBatchInserter:
                 logger.warning(f"[UDS3-BATCH] ⚠️  add_vectors() not available - falling back to per-item insert")
             
             # Fallback: Insert items individually
-            return self._fallback_insert()
+            return self._fallback_insert(batch)
             
         except Exception as e:
             logger.error(f"[UDS3-BATCH] ❌ ChromaDB Batch Insert exception: {e} - falling back to per-item insert")
-            return self._fallback_insert()
+            return self._fallback_insert(batch)
     
-    def _fallback_insert(self) -> bool:
+    def _fallback_insert(self, batch: Optional[List[Tuple[str, List[float], Dict[str, Any]]]] = None) -> bool:
         """
-        Fallback: Insert vectors one by one
+        Fallback: Insert vectors one by one (default: current buffer)
         
         Returns:
             bool: True if at least one vector was added successfully
         """
-        if not self.batch:
+        if batch is None:
+            batch = self.batch
+        if not batch:
             return True
         
         success_count = 0
         fail_count = 0
         
-        logger.debug(f"[UDS3-BATCH] Fallback: Inserting {len(self.batch)} vectors individually...")
+        logger.debug(f"[UDS3-BATCH] Fallback: Inserting {len(batch)} vectors individually...")
         
-        for chunk_id, vector, metadata in self.batch:
+        for chunk_id, vector, metadata in batch:
             try:
                 if self.backend.add_vector(vector, metadata, chunk_id):
                     success_count += 1
+                    if self.chunk_index is not None:
+                        self.chunk_index.register_chunks([(chunk_id, metadata)])
                 else:
                     fail_count += 1
             except Exception as e:
                 logger.error(f"[UDS3-BATCH] ❌ Per-item insert failed for {chunk_id}: {e}")
                 fail_count += 1
         
-        self.total_added += success_count
-        self.total_fallbacks += 1
+        with self._stats_lock:
+            self.total_added += success_count
+            self.total_fallbacks += 1
         
         logger.info(f"[UDS3-BATCH] Fallback complete: {success_count} success, {fail_count} failed")
         
-        self.batch.clear()
+        batch.clear()
         return success_count > 0
     
     def get_stats(self) -> Dict[str, int]:
@@ -250,7 +600,8 @@ class ChromaBatchInserter:
                 'total_added': self.total_added,
                 'total_batches': self.total_batches,
                 'total_fallbacks': self.total_fallbacks,
-                'pending': len(self.batch)
+                'pending': len(self.batch),
+                **self._flusher_stats()
             }
 
 
@@ -258,7 +609,7 @@ class ChromaBatchInserter:
 # NEO4J BATCH CREATOR
 # ================================================================
 
-class Neo4jBatchCreator:
+class Neo4jBatchCreator(_BackgroundFlushMixin):
     """
     Batch relationship creator for Neo4j using UNWIND
     
@@ -283,13 +634,21 @@ class Neo4jBatchCreator:
                 creator.add_relationship(doc_id, chunk_id, "HAS_CHUNK")
     """
     
-    def __init__(self, neo4j_backend, batch_size: int = NEO4J_BATCH_SIZE):
+    def __init__(
+        self,
+        neo4j_backend,
+        batch_size: int = NEO4J_BATCH_SIZE,
+        background_flush: Optional[bool] = None,
+        max_in_flight: int = BATCH_FLUSH_MAX_IN_FLIGHT
+    ):
         """
         Initialize batch creator
         
         Args:
             neo4j_backend: Neo4j backend instance (must have driver/session)
             batch_size: Number of relationships to accumulate before auto-flush
+            background_flush: Flush full batches on background threads (default: from ENV)
+            max_in_flight: Concurrent background flushes
         """
         self.backend = neo4j_backend
         self.batch_size = batch_size
@@ -298,6 +657,7 @@ class Neo4jBatchCreator:
         self.total_batches = 0
         self.total_fallbacks = 0
         self._lock = threading.Lock()  # Thread-safe batch operations
+        self._init_background_flush(background_flush, max_in_flight, "neo4j")
         
         logger.debug(f"[UDS3-BATCH] Neo4jBatchCreator initialized (batch_size={batch_size})")
     
@@ -306,8 +666,8 @@ class Neo4jBatchCreator:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit (auto-flush)"""
-        self.flush()
+        """Context manager exit (auto-flush, stops background flusher)"""
+        self.close()
         return False
     
     def add_relationship(
@@ -326,6 +686,7 @@ class Neo4jBatchCreator:
             rel_type: Relationship type (e.g., 'HAS_CHUNK', 'NEXT_CHUNK')
             properties: Optional relationship properties
         """
+        full_batch = None
         with self._lock:
             self.batch.append({
                 'from_id': from_id,
@@ -336,41 +697,43 @@ class Neo4jBatchCreator:
             
             # Auto-flush when batch is full
             if len(self.batch) >= self.batch_size:
-                self._flush_unlocked()  # Already holding lock!
+                full_batch = self._auto_flush_unlocked()  # Already holding lock!
+        self._submit(full_batch)
     
     def flush(self) -> bool:
         """
         Flush accumulated relationships to Neo4j using UNWIND (thread-safe)
         
+        In background mode this also waits for all in-flight batches.
+        
         Returns:
             bool: True if all relationships were created successfully
         """
-        with self._lock:
-            return self._flush_unlocked()
+        return self._flush_pipelined()
     
-    def _flush_unlocked(self) -> bool:
+    def _flush_items(self, batch: List[Dict[str, Any]]) -> bool:
         """
-        Internal flush without acquiring lock (called when lock is already held)
+        Flush the given buffer (self.batch inline, a detached buffer in background mode)
         
         Returns:
             bool: True if all relationships were created successfully
         """
-        if not self.batch:
+        if not batch:
             return True
         
-        batch_count = len(self.batch)
+        batch_count = len(batch)
         
         try:
             # Build UNWIND query for batch insert
             if not hasattr(self.backend, 'driver') or not self.backend.driver:
                 logger.error("[UDS3-BATCH] ❌ Neo4j driver not available")
-                return self._fallback_create()
+                return self._fallback_create(batch)
             
             logger.debug(f"[UDS3-BATCH] Creating {batch_count} Neo4j relationships with UNWIND...")
             
             # Prepare batch data for UNWIND
             batch_data = []
-            for item in self.batch:
+            for item in batch:
                 batch_data.append({
                     'from_id': item['from_id'],
                     'to_id': item['to_id'],
@@ -397,10 +760,11 @@ class Neo4jBatchCreator:
                     created = record['created_count'] if record else 0
                     
                     if created > 0:
-                        self.total_created += created
-                        self.total_batches += 1
+                        with self._stats_lock:
+                            self.total_created += created
+                            self.total_batches += 1
                         logger.info(f"[UDS3-BATCH] ✅ Neo4j Batch Create (APOC): {created} relationships created (total: {self.total_created})")
-                        self.batch.clear()
+                        batch.clear()
                         return True
                 
                 except Exception as apoc_error:
@@ -429,35 +793,38 @@ class Neo4jBatchCreator:
                             logger.error(f"[UDS3-BATCH] ❌ Single relationship creation failed: {single_error}")
                     
                     if created > 0:
-                        self.total_created += created
-                        self.total_batches += 1
+                        with self._stats_lock:
+                            self.total_created += created
+                            self.total_batches += 1
                         logger.info(f"[UDS3-BATCH] ✅ Neo4j Batch Create (Manual): {created} relationships created (total: {self.total_created})")
-                        self.batch.clear()
+                        batch.clear()
                         return True
                     else:
                         logger.warning(f"[UDS3-BATCH] ⚠️  Neo4j Batch Create: 0 relationships created - falling back")
-                        return self._fallback_create()
+                        return self._fallback_create(batch)
         
         except Exception as e:
             logger.error(f"[UDS3-BATCH] ❌ Neo4j Batch Create exception: {e} - falling back to per-item create")
-            return self._fallback_create()
+            return self._fallback_create(batch)
     
-    def _fallback_create(self) -> bool:
+    def _fallback_create(self, batch: Optional[List[Dict[str, Any]]] = None) -> bool:
         """
-        Fallback: Create relationships one by one
+        Fallback: Create relationships one by one (default: current buffer)
         
         Returns:
             bool: True if at least one relationship was created successfully
         """
-        if not self.batch:
+        if batch is None:
+            batch = self.batch
+        if not batch:
             return True
         
         success_count = 0
         fail_count = 0
         
-        logger.debug(f"[UDS3-BATCH] Fallback: Creating {len(self.batch)} relationships individually...")
+        logger.debug(f"[UDS3-BATCH] Fallback: Creating {len(batch)} relationships individually...")
         
-        for item in self.batch:
+        for item in batch:
             try:
                 # Try to use create_relationship_by_id if available
                 if hasattr(self.backend, 'create_relationship_by_id'):
@@ -496,12 +863,13 @@ class Neo4jBatchCreator:
                 logger.error(f"[UDS3-BATCH] ❌ Per-item relationship creation failed: {e}")
                 fail_count += 1
         
-        self.total_created += success_count
-        self.total_fallbacks += 1
+        with self._stats_lock:
+            self.total_created += success_count
+            self.total_fallbacks += 1
         
         logger.info(f"[UDS3-BATCH] Fallback complete: {success_count} success, {fail_count} failed")
         
-        self.batch.clear()
+        batch.clear()
         return success_count > 0
     
     def get_stats(self) -> Dict[str, int]:
@@ -516,7 +884,8 @@ class Neo4jBatchCreator:
                 'total_created': self.total_created,
                 'total_batches': self.total_batches,
                 'total_fallbacks': self.total_fallbacks,
-                'pending': len(self.batch)
+                'pending': len(self.batch),
+                **self._flusher_stats()
             }
 
 
@@ -524,7 +893,7 @@ class Neo4jBatchCreator:
 # POSTGRESQL BATCH INSERTER
 # ================================================================
 
-class PostgreSQLBatchInserter:
+class PostgreSQLBatchInserter(_BackgroundFlushMixin):
     """
     Batch inserter for PostgreSQL relational backend
     
@@ -532,6 +901,14 @@ class PostgreSQLBatchInserter:
     Automatically falls back to single-item insert on batch failures.
     Thread-safe for concurrent use.
     
+    COPY mode (use_copy=True or ENABLE_POSTGRES_COPY_LOAD=true):
+    - Rows are streamed with COPY FROM STDIN into a session temp staging table
+    - One set-based INSERT ... SELECT ... ON CONFLICT merges them into documents
+      (last row wins for duplicate document IDs)
+    - Uses a pooled connection (backend._get_connection) instead of the shared cursor
+    - bulk_load(rows) streams any iterable/generator in chunks of copy_chunk_rows,
+      so memory stays bounded by one chunk
+    
     Usage:
         inserter = PostgreSQLBatchInserter(postgresql_backend, batch_size=100)
         for doc in documents:
@@ -547,25 +924,56 @@ class PostgreSQLBatchInserter:
         - Single insert: 100 documents = ~10 seconds (10 inserts/sec)
         - Batch insert: 100 documents = ~0.1-0.2 seconds (500-1000 inserts/sec)
         - Speedup: 50-100x faster
+        - COPY + merge: tens of thousands of rows/sec (nightly re-ingestion)
     """
     
-    def __init__(self, postgresql_backend, batch_size: int = POSTGRES_BATCH_INSERT_SIZE):
+    COLUMNS = (
+        'document_id', 'file_path', 'classification', 'content_length',
+        'legal_terms_count', 'created_at', 'quality_score', 'processing_status'
+    )
+    STAGING_TABLE = 'uds3_documents_staging'
+    
+    def __init__(
+        self,
+        postgresql_backend,
+        batch_size: int = POSTGRES_BATCH_INSERT_SIZE,
+        use_copy: Optional[bool] = None,
+        copy_chunk_rows: int = POSTGRES_COPY_CHUNK_ROWS,
+        background_flush: Optional[bool] = None,
+        max_in_flight: int = BATCH_FLUSH_MAX_IN_FLIGHT
+    ):
         """
         Initialize batch inserter
         
         Args:
             postgresql_backend: PostgreSQL backend instance
             batch_size: Number of documents to accumulate before auto-flush
+            use_copy: Flush via COPY + staging merge (default: from ENV)
+            copy_chunk_rows: Rows per COPY + merge transaction in bulk_load()
+            background_flush: Flush full batches on background threads (default: from ENV)
+            max_in_flight: Concurrent background flushes (execute_batch mode shares
+                the backend cursor and is serialized; COPY mode uses pooled connections)
         """
         self.backend = postgresql_backend
         self.batch_size = batch_size
+        self.use_copy = ENABLE_POSTGRES_COPY_LOAD if use_copy is None else use_copy
+        self.copy_chunk_rows = max(1, copy_chunk_rows)
         self.batch: List[Tuple] = []
         self.total_added = 0
         self.total_batches = 0
         self.total_fallbacks = 0
+        self.total_rows_written = 0
+        self._write_seconds = 0.0
         self._lock = threading.Lock()
-        
-        logger.info(f"[UDS3-BATCH] PostgreSQLBatchInserter initialized (batch_size={batch_size})")
+        # execute_batch, single-insert fallback and pool-less COPY share the backend
+        # connection; reentrant because bulk_load falls back while holding it
+        self._cursor_lock = threading.RLock()
+        self._init_background_flush(background_flush, max_in_flight, "postgres")
+        
+        logger.info(
+            f"[UDS3-BATCH] PostgreSQLBatchInserter initialized "
+            f"(batch_size={batch_size}, mode={'copy' if self.use_copy else 'execute_batch'})"
+        )
     
     def add(self, document_id: str, file_path: str, classification: str,
             content_length: int, legal_terms_count: int,
@@ -598,43 +1006,48 @@ class PostgreSQLBatchInserter:
             self.total_added += 1
             
             # Auto-flush when batch is full
-            if len(self.batch) >= self.batch_size:
-                self._flush_unlocked()
+            full_batch = self._auto_flush_unlocked() if len(self.batch) >= self.batch_size else None
+        self._submit(full_batch)
     
     def flush(self) -> bool:
         """
         Flush accumulated batch to database
         
+        In background mode this also waits for all in-flight batches.
+        
         Returns:
             bool: True if successful, False if fallback occurred
         """
-        with self._lock:
-            return self._flush_unlocked()
+        return self._flush_pipelined()
     
-    def _flush_unlocked(self) -> bool:
+    def _flush_items(self, batch: List[Tuple]) -> bool:
         """
-        Internal flush (assumes lock is held)
+        Flush the given buffer (self.batch inline, a detached buffer in background mode)
         
         Returns:
             bool: True if successful, False if fallback occurred
         """
-        if not self.batch:
+        if not batch:
             return True
         
-        batch_data = self.batch.copy()
+        batch_data = batch.copy()
+        start = time.perf_counter()
         success = self._batch_insert(batch_data)
         
         if success:
-            self.batch.clear()
-            self.total_batches += 1
+            with self._stats_lock:
+                self._record_write(len(batch_data), time.perf_counter() - start)
+                self.total_batches += 1
+            batch.clear()
             logger.info(f"[UDS3-BATCH] PostgreSQL batch insert: {len(batch_data)} documents")
             return True
         else:
             # Fallback to single inserts
             logger.warning(f"[UDS3-BATCH] PostgreSQL batch failed, falling back to single inserts")
             self._fallback_single_insert(batch_data)
-            self.batch.clear()
-            self.total_fallbacks += 1
+            batch.clear()
+            with self._stats_lock:
+                self.total_fallbacks += 1
             return False
     
     def _batch_insert(self, batch_data: List[Tuple]) -> bool:
@@ -647,6 +1060,20 @@ class PostgreSQLBatchInserter:
         Returns:
             bool: True if successful, False otherwise
         """
+        if self.use_copy:
+            try:
+                with self._pooled_connection() as conn:
+                    self._copy_merge(conn, batch_data)
+                return True
+            except Exception as e:
+                logger.error(f"[UDS3-BATCH] PostgreSQL COPY load error: {e}")
+                return False
+        
+        with self._cursor_lock:
+            return self._execute_batch_insert(batch_data)
+    
+    def _execute_batch_insert(self, batch_data: List[Tuple]) -> bool:
+        """execute_batch through the backend's shared cursor (caller holds _cursor_lock)"""
         try:
             from psycopg2.extras import execute_batch
             
@@ -693,39 +1120,204 @@ class PostgreSQLBatchInserter:
         Args:
             batch_data: List of tuples (document data)
         """
-        for item in batch_data:
-            try:
-                document_id, file_path, classification, content_length, \
-                legal_terms_count, created_at, quality_score, processing_status = item
+        with self._cursor_lock:  # insert_document uses the shared backend cursor
+            for item in batch_data:
+                try:
+                    document_id, file_path, classification, content_length, \
+                    legal_terms_count, created_at, quality_score, processing_status = item
+                    
+                    # Use backend's single insert method
+                    self.backend.insert_document(
+                        document_id=document_id,
+                        file_path=file_path,
+                        classification=classification,
+                        content_length=content_length,
+                        legal_terms_count=legal_terms_count,
+                        created_at=created_at,
+                        quality_score=quality_score,
+                        processing_status=processing_status
+                    )
+                    
+                except Exception as e:
+                    logger.error(f"[UDS3-BATCH] PostgreSQL fallback insert error for {item[0]}: {e}")
+    
+    # ------------------------------------------------------------------
+    # COPY bulk loading
+    # ------------------------------------------------------------------
+    
+    def bulk_load(self, rows: Iterable[Union[Tuple, Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Stream documents into PostgreSQL via COPY + set-based merge
+        
+        Consumes rows lazily (generators welcome) and commits every
+        copy_chunk_rows rows, so memory is bounded by a single chunk.
+        Chunks that fail are retried with single inserts.
+        
+        Args:
+            rows: Tuples in COLUMNS order or dicts keyed by column name
+                (created_at defaults to now, processing_status to 'completed')
+        
+        Returns:
+            Dict with rows, chunks, fallback_chunks, seconds, rows_per_sec
+        """
+        loaded = 0
+        chunks = 0
+        fallback_chunks = 0
+        start = time.perf_counter()
+        
+        with self._pooled_connection() as conn:
+            chunk: List[Tuple] = []
+            row_iter = iter(rows)
+            while True:
+                for row in row_iter:
+                    chunk.append(self._normalize_row(row))
+                    if len(chunk) >= self.copy_chunk_rows:
+                        break
+                if not chunk:
+                    break
                 
-                # Use backend's single insert method
-                self.backend.insert_document(
-                    document_id=document_id,
-                    file_path=file_path,
-                    classification=classification,
-                    content_length=content_length,
-                    legal_terms_count=legal_terms_count,
-                    created_at=created_at,
-                    quality_score=quality_score,
-                    processing_status=processing_status
+                chunk_start = time.perf_counter()
+                try:
+                    self._copy_merge(conn, chunk)
+                    with self._stats_lock:
+                        self._record_write(len(chunk), time.perf_counter() - chunk_start)
+                    loaded += len(chunk)
+                except Exception as e:
+                    logger.error(f"[UDS3-BATCH] PostgreSQL COPY chunk failed ({len(chunk)} rows): {e}")
+                    self._fallback_single_insert(chunk)
+                    fallback_chunks += 1
+                    with self._stats_lock:
+                        self.total_fallbacks += 1
+                chunks += 1
+                chunk = []
+        
+        seconds = time.perf_counter() - start
+        logger.info(
+            f"[UDS3-BATCH] PostgreSQL COPY load: {loaded} rows in {chunks} chunks "
+            f"({loaded / seconds if seconds > 0 else 0.0:.0f} rows/sec)"
+        )
+        return {
+            'rows': loaded,
+            'chunks': chunks,
+            'fallback_chunks': fallback_chunks,
+            'seconds': seconds,
+            'rows_per_sec': loaded / seconds if seconds > 0 else 0.0
+        }
+    
+    @contextmanager
+    def _pooled_connection(self):
+        """Dedicated connection from the backend pool (legacy backends: backend.conn under _cursor_lock)"""
+        self.backend.connect()
+        if hasattr(self.backend, '_get_connection'):
+            with self.backend._get_connection() as conn:
+                yield conn
+        else:
+            with self._cursor_lock:
+                yield self.backend.conn
+    
+    def _normalize_row(self, row: Union[Tuple, Dict[str, Any]]) -> Tuple:
+        from datetime import datetime
+        
+        if isinstance(row, dict):
+            row = tuple(row.get(column) for column in self.COLUMNS[:5]) + (
+                row.get('created_at'),
+                row.get('quality_score'),
+                row.get('processing_status') or 'completed'
+            )
+        if len(row) != len(self.COLUMNS):
+            raise ValueError(f"Expected {len(self.COLUMNS)} columns, got {len(row)}")
+        if row[5] is None:
+            row = row[:5] + (datetime.now().isoformat(),) + tuple(row[6:])
+        return tuple(row)
+    
+    @staticmethod
+    def _copy_text(value: Any) -> str:
+        """Encode one value for COPY ... FORMAT text"""
+        if value is None:
+            return '\\N'
+        return (
+            str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r')
+        )
+    
+    def _copy_merge(self, conn, rows: List[Tuple]):
+        """COPY rows into the staging table and merge them in one statement"""
+        columns = ', '.join(self.COLUMNS)
+        updates = ', '.join(
+            f"{column} = EXCLUDED.{column}" for column in self.COLUMNS[1:] if column != 'created_at'
+        )
+        
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write('\t'.join(self._copy_text(value) for value in row))
+            buffer.write('\n')
+        buffer.seek(0)
+        
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    CREATE TEMP TABLE IF NOT EXISTS {self.STAGING_TABLE} (
+                        seq BIGSERIAL,
+                        document_id TEXT,
+                        file_path TEXT,
+                        classification TEXT,
+                        content_length BIGINT,
+                        legal_terms_count BIGINT,
+                        created_at TEXT,
+                        quality_score DOUBLE PRECISION,
+                        processing_status TEXT
+                    ) ON COMMIT DELETE ROWS
+                    """
                 )
-                
-            except Exception as e:
-                logger.error(f"[UDS3-BATCH] PostgreSQL fallback insert error for {item[0]}: {e}")
+                cur.copy_expert(f"COPY {self.STAGING_TABLE} ({columns}) FROM STDIN", buffer)
+                # DISTINCT ON: ON CONFLICT cannot touch the same row twice per statement
+                cur.execute(
+                    f"""
+                    INSERT INTO documents ({columns})
+                    SELECT DISTINCT ON (document_id) {columns}
+                    FROM {self.STAGING_TABLE}
+                    ORDER BY document_id, seq DESC
+                    ON CONFLICT (document_id) DO UPDATE SET {updates}
+                    """
+                )
+            conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
     
-    def get_stats(self) -> Dict[str, int]:
+    def _record_write(self, rows: int, seconds: float):
+        """Track written rows and write time (caller holds _stats_lock)"""
+        self.total_rows_written += rows
+        self._write_seconds += seconds
+    
+    def get_stats(self) -> Dict[str, Any]:
         """
         Get inserter statistics
         
         Returns:
-            Dict with total_added, total_batches, total_fallbacks, pending
+            Dict with total_added, total_batches, total_fallbacks, pending,
+            mode, total_rows_written, rows_per_sec
         """
         with self._lock:
             return {
                 'total_added': self.total_added,
                 'total_batches': self.total_batches,
                 'total_fallbacks': self.total_fallbacks,
-                'pending': len(self.batch)
+                'pending': len(self.batch),
+                'mode': 'copy' if self.use_copy else 'execute_batch',
+                'total_rows_written': self.total_rows_written,
+                'rows_per_sec': (
+                    self.total_rows_written / self._write_seconds
+                    if self._write_seconds > 0 else 0.0
+                ),
+                **self._flusher_stats()
             }
     
     def __enter__(self):
@@ -733,8 +1325,8 @@ class PostgreSQLBatchInserter:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit (auto-flush)"""
-        self.flush()
+        """Context manager exit (auto-flush, stops background flusher)"""
+        self.close()
         return False
 
 
@@ -742,7 +1334,7 @@ class PostgreSQLBatchInserter:
 # COUCHDB BATCH INSERTER
 # ================================================================
 
-class CouchDBBatchInserter:
+class CouchDBBatchInserter(_BackgroundFlushMixin):
     """
     Batch inserter for CouchDB document backend
     
@@ -767,13 +1359,21 @@ class CouchDBBatchInserter:
         - Speedup: 100-500x faster
     """
     
-    def __init__(self, couchdb_backend, batch_size: int = COUCHDB_BATCH_INSERT_SIZE):
+    def __init__(
+        self,
+        couchdb_backend,
+        batch_size: int = COUCHDB_BATCH_INSERT_SIZE,
+        background_flush: Optional[bool] = None,
+        max_in_flight: int = BATCH_FLUSH_MAX_IN_FLIGHT
+    ):
         """
         Initialize batch inserter
         
         Args:
             couchdb_backend: CouchDB backend instance
             batch_size: Number of documents to accumulate before auto-flush
+            background_flush: Flush full batches on background threads (default: from ENV)
+            max_in_flight: Concurrent background flushes
         """
         self.backend = couchdb_backend
         self.batch_size = batch_size
@@ -783,6 +1383,7 @@ class CouchDBBatchInserter:
         self.total_fallbacks = 0
         self.total_conflicts = 0
         self._lock = threading.Lock()
+        self._init_background_flush(background_flush, max_in_flight, "couchdb")
         
         logger.info(f"[UDS3-BATCH] CouchDBBatchInserter initialized (batch_size={batch_size})")
     
@@ -803,43 +1404,46 @@ class CouchDBBatchInserter:
             self.total_added += 1
             
             # Auto-flush when batch is full
-            if len(self.batch) >= self.batch_size:
-                self._flush_unlocked()
+            full_batch = self._auto_flush_unlocked() if len(self.batch) >= self.batch_size else None
+        self._submit(full_batch)
     
     def flush(self) -> bool:
         """
         Flush accumulated batch to database
         
+        In background mode this also waits for all in-flight batches.
+        
         Returns:
             bool: True if successful, False if fallback occurred
         """
-        with self._lock:
-            return self._flush_unlocked()
+        return self._flush_pipelined()
     
-    def _flush_unlocked(self) -> bool:
+    def _flush_items(self, batch: List[Dict[str, Any]]) -> bool:
         """
-        Internal flush (assumes lock is held)
+        Flush the given buffer (self.batch inline, a detached buffer in background mode)
         
         Returns:
             bool: True if successful, False if fallback occurred
         """
-        if not self.batch:
+        if not batch:
             return True
         
-        batch_data = self.batch.copy()
+        batch_data = batch.copy()
         success = self._batch_insert(batch_data)
         
         if success:
-            self.batch.clear()
-            self.total_batches += 1
+            batch.clear()
+            with self._stats_lock:
+                self.total_batches += 1
             logger.info(f"[UDS3-BATCH] CouchDB batch insert: {len(batch_data)} documents")
             return True
         else:
             # Fallback to single inserts
             logger.warning(f"[UDS3-BATCH] CouchDB batch failed, falling back to single inserts")
             self._fallback_single_insert(batch_data)
-            self.batch.clear()
-            self.total_fallbacks += 1
+            batch.clear()
+            with self._stats_lock:
+                self.total_fallbacks += 1
             return False
     
     def _batch_insert(self, batch_data: List[Dict[str, Any]]) -> bool:
@@ -862,7 +1466,8 @@ class CouchDBBatchInserter:
             # Check for conflicts (idempotent behavior)
             conflicts = [r for r in results if 'error' in r and r.get('error') == 'conflict']
             if conflicts:
-                self.total_conflicts += len(conflicts)
+                with self._stats_lock:
+                    self.total_conflicts += len(conflicts)
                 logger.warning(f"[UDS3-BATCH] CouchDB: {len(conflicts)} conflicts (idempotent skip)")
             
             # Check for other errors
@@ -907,7 +1512,8 @@ class CouchDBBatchInserter:
                 'total_batches': self.total_batches,
                 'total_fallbacks': self.total_fallbacks,
                 'total_conflicts': self.total_conflicts,
-                'pending': len(self.batch)
+                'pending': len(self.batch),
+                **self._flusher_stats()
             }
     
     def __enter__(self):
@@ -915,8 +1521,8 @@ class CouchDBBatchInserter:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit (auto-flush)"""
-        self.flush()
+        """Context manager exit (auto-flush, stops background flusher)"""
+        self.close()
         return False
 
 
@@ -959,6 +1565,16 @@ def get_postgres_batch_size() -> int:
     return POSTGRES_BATCH_INSERT_SIZE
 
 
+def should_use_postgres_copy_load() -> bool:
+    """Check if PostgreSQL COPY bulk loading should be used"""
+    return ENABLE_POSTGRES_COPY_LOAD
+
+
+def get_postgres_copy_chunk_rows() -> int:
+    """Get PostgreSQL COPY chunk size (rows per COPY + merge) from environment"""
+    return POSTGRES_COPY_CHUNK_ROWS
+
+
 def get_couchdb_batch_size() -> int:
     """Get CouchDB batch size from environment"""
     return COUCHDB_BATCH_INSERT_SIZE
@@ -1408,6 +2024,9 @@ class ChromaDBBatchReader:
     
     Features:
     - batch_get(): Get multiple vectors by ID
+    - batch_get_by_documents(): Get exactly the existing chunks of documents
+      (chunk index for known documents, metadata filter for the rest)
+    - iter_documents(): Stream chunk payloads per document
     - batch_search(): Similarity search for multiple queries
     - include_embeddings parameter
     - Metadata filtering
@@ -1418,12 +2037,194 @@ class ChromaDBBatchReader:
     - Speedup: 20x faster
     """
     
-    def __init__(self, chromadb_backend):
-        """Initialize ChromaDB batch reader"""
+    def __init__(
+        self,
+        chromadb_backend,
+        chunk_index: Optional[ChromaChunkIndex] = None,
+        read_size: Optional[int] = None
+    ):
+        """
+        Initialize ChromaDB batch reader
+        
+        Args:
+            chromadb_backend: ChromaDB backend instance (must have collection)
+            chunk_index: Shared document → chunk index (default: private index,
+                filled from metadata-filtered reads)
+            read_size: Max IDs/documents per API call (default: from ENV)
+        """
         self.backend = chromadb_backend
         self.collection = chromadb_backend.collection
+        self.chunk_index = chunk_index if chunk_index is not None else ChromaChunkIndex()
+        self.read_size = max(1, read_size or get_chromadb_batch_read_size())
+        self.index_lookups = 0
+        self.filter_lookups = 0
+        self.stale_entries = 0
         logger.info("[UDS3-BATCH] ChromaDBBatchReader initialized")
     
+    @staticmethod
+    def _empty_result() -> Dict[str, Any]:
+        return {'ids': [], 'documents': [], 'metadatas': [], 'embeddings': []}
+    
+    @staticmethod
+    def _include(include_embeddings: bool, include_documents: bool) -> List[str]:
+        # Metadata is always needed to attribute chunks to their document
+        include = ['metadatas']
+        if include_documents:
+            include.append('documents')
+        if include_embeddings:
+            include.append('embeddings')
+        return include
+    
+    @staticmethod
+    def _document_filter(doc_ids: List[str]) -> Dict[str, Any]:
+        """WHERE filter matching either metadata convention (document_id / doc_id)"""
+        return {'$or': [{key: {'$in': list(doc_ids)}} for key in ChromaChunkIndex.DOCUMENT_ID_KEYS]}
+    
+    @staticmethod
+    def _merge_into(target: Dict[str, Any], result: Dict[str, Any]):
+        for key in ('ids', 'documents', 'metadatas', 'embeddings'):
+            values = result.get(key)
+            if values is not None:
+                target[key].extend(values)
+    
+    def batch_get_by_documents(
+        self,
+        doc_ids: List[str],
+        include_embeddings: bool = False,
+        include_documents: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Get all existing chunks of the given documents
+        
+        Documents known to the chunk index are fetched by their exact chunk
+        IDs; unknown documents are fetched with a metadata filter on the
+        document ID (one call per read_size documents) and then indexed.
+        Indexed documents with missing chunks (deleted or re-chunked since
+        they were indexed) are dropped from the index and re-read via filter.
+        
+        Returns:
+            {'ids': [...], 'documents': [...], 'metadatas': [...], 'embeddings': [...]}
+            (metadatas are always included)
+        """
+        merged = self._empty_result()
+        if not doc_ids:
+            return merged
+        
+        include = self._include(include_embeddings, include_documents)
+        known, unknown = self.chunk_index.resolve(list(dict.fromkeys(doc_ids)))
+        
+        indexed = self._empty_result()
+        chunk_ids = [chunk_id for ids in known.values() for chunk_id in ids]
+        for start in range(0, len(chunk_ids), self.read_size):
+            batch = chunk_ids[start:start + self.read_size]
+            self.index_lookups += 1
+            try:
+                self._merge_into(indexed, self.collection.get(ids=batch, include=include))
+            except Exception as e:
+                logger.error(f"[ChromaDB-READ] Chunk get failed: {e}")
+        
+        # Stale entries: fewer chunks exist than the index knows about
+        found: Dict[str, int] = {}
+        for metadata in indexed['metadatas']:
+            doc_id = ChromaChunkIndex.document_id_of(metadata)
+            found[doc_id] = found.get(doc_id, 0) + 1
+        stale = {doc_id for doc_id, ids in known.items() if found.get(doc_id, 0) != len(ids)}
+        if stale:
+            for doc_id in stale:
+                self.chunk_index.forget(doc_id)
+            self.stale_entries += len(stale)
+            unknown.extend(stale)
+            keep = [
+                pos for pos, metadata in enumerate(indexed['metadatas'])
+                if ChromaChunkIndex.document_id_of(metadata) not in stale
+            ]
+            indexed = {
+                key: [values[pos] for pos in keep] if len(values) == len(indexed['ids']) else values
+                for key, values in indexed.items()
+            }
+        self._merge_into(merged, indexed)
+        
+        for start in range(0, len(unknown), self.read_size):
+            batch = unknown[start:start + self.read_size]
+            self.filter_lookups += 1
+            try:
+                result = self.collection.get(where=self._document_filter(batch), include=include)
+            except Exception as e:
+                logger.error(f"[ChromaDB-READ] Document filter get failed: {e}")
+                continue
+            self._merge_into(merged, result)
+            self.chunk_index.register_chunks(
+                list(zip(result.get('ids') or [], result.get('metadatas') or []))
+            )
+        
+        logger.info(
+            f"[ChromaDB-READ] Retrieved {len(merged['ids'])} chunks for {len(doc_ids)} documents "
+            f"({len(known) - len(stale)} indexed, {len(unknown)} via metadata filter)"
+        )
+        return merged
+    
+    def iter_documents(
+        self,
+        doc_ids: List[str],
+        include_embeddings: bool = False,
+        include_documents: bool = True
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream chunk payloads per document
+        
+        Fetches documents in groups of about read_size chunks and yields
+        (doc_id, {'ids', 'documents', 'metadatas', 'embeddings'}) once per
+        document with chunks ordered by chunk_index. Only one group is held
+        in memory at a time. Documents without chunks are not yielded.
+        """
+        doc_ids = list(dict.fromkeys(doc_ids))
+        group: List[str] = []
+        group_chunks = 0
+        
+        for position, doc_id in enumerate(doc_ids):
+            known = self.chunk_index.get(doc_id)
+            group.append(doc_id)
+            group_chunks += len(known) if known is not None else 1
+            if group_chunks >= self.read_size or position == len(doc_ids) - 1:
+                yield from self._split_by_document(
+                    group,
+                    self.batch_get_by_documents(group, include_embeddings, include_documents)
+                )
+                group, group_chunks = [], 0
+    
+    @staticmethod
+    def _split_by_document(
+        doc_ids: List[str],
+        result: Dict[str, Any]
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        ids = result.get('ids') or []
+        metadatas = result.get('metadatas') or [None] * len(ids)
+        columns = {
+            key: result.get(key) for key in ('documents', 'embeddings')
+            if result.get(key) is not None and len(result.get(key)) == len(ids)
+        }
+        
+        positions: Dict[str, List[int]] = {}
+        for pos, metadata in enumerate(metadatas):
+            doc_id = ChromaChunkIndex.document_id_of(metadata)
+            if doc_id is not None:
+                positions.setdefault(doc_id, []).append(pos)
+        
+        for doc_id in doc_ids:
+            doc_positions = positions.get(doc_id)
+            if not doc_positions:
+                continue
+            doc_positions.sort(key=lambda pos: ((metadatas[pos] or {}).get('chunk_index', pos), pos))
+            payload = {
+                'ids': [ids[pos] for pos in doc_positions],
+                'metadatas': [metadatas[pos] for pos in doc_positions],
+                'documents': [],
+                'embeddings': []
+            }
+            for key, values in columns.items():
+                payload[key] = [values[pos] for pos in doc_positions]
+            yield doc_id, payload
+    
     def batch_get(
         self,
         chunk_ids: List[str],
@@ -1660,14 +2461,11 @@ class ParallelBatchReader:
         else:
             tasks.append(asyncio.sleep(0, result=[]))
         
-        # ChromaDB task
+        # ChromaDB task (exactly the existing chunks, via chunk index / metadata filter)
         if self.chromadb:
-            # Convert doc_ids to chunk_ids (doc_id → doc_id_chunk_0, doc_id_chunk_1, ...)
-            # Note: This assumes chunk naming convention. Adjust as needed.
-            chunk_ids = [f"{doc_id}_chunk_{i}" for doc_id in doc_ids for i in range(10)]
             tasks.append(asyncio.to_thread(
-                self.chromadb.batch_get,
-                chunk_ids,
+                self.chromadb.batch_get_by_documents,
+                doc_ids,
                 include_embeddings=include_embeddings
             ))
         else:
@@ -13,7 +13,10 @@ Performance Impact:
 - Concurrent Requests: +100-200% (Pool statt Single Connection)
 Features:
 - Thread-safe Connection Pool (min_size=5, max_size=50)
-- Automatic connection health checks
+- Classic mode (default): psycopg2 ThreadedConnectionPool with SELECT 1 per checkout
+- Managed mode (opt-in): lazy health checks (only after idle threshold
+  or error), blocking checkout with bounded wait queue + timeout,
+  max-lifetime recycling, wait/in-use histograms via core.metrics
 - Graceful pool shutdown
 - Connection leak detection
 - Retry logic for transient failures
@@ -30,9 +33,11 @@ Repository: https://github.com/makr-code/VCC-UDS3
 """
 
 import logging
+import threading
 import time
 from contextlib import contextmanager
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
 
 import psycopg2
 import psycopg2.extras
@@ -41,10 +46,31 @@ from psycopg2 import OperationalError, InterfaceError
 
 logger = logging.getLogger(__name__)
 
+# Import metrics if available
+try:
+    from core.metrics import metrics
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+
+class PoolTimeoutError(psycopg2.pool.PoolError):
+    """No connection became available (wait queue full or checkout timeout)."""
+
+
+@dataclass
+class _ConnectionInfo:
+    """Bookkeeping for a connection owned by the managed pool."""
+    created_at: float
+    last_used: float
+    suspect: bool = False  # last checkout ended with an error → check before reuse
+
 
 class PostgreSQLConnectionPool:
     """Thread-safe PostgreSQL Connection Pool."""
     
+    MODES = ("managed", "classic")
+    
     def __init__(
         self,
         host: str,
@@ -55,6 +81,11 @@ class PostgreSQLConnectionPool:
         min_connections: int = 5,
         max_connections: int = 50,
         connect_timeout: int = 10,
+        mode: str = "classic",
+        health_check_idle_seconds: float = 30.0,
+        checkout_timeout: float = 30.0,
+        max_waiters: Optional[int] = None,
+        max_lifetime_seconds: Optional[float] = 3600.0,
     ):
         """
         Initialize PostgreSQL Connection Pool.
@@ -68,7 +99,18 @@ class PostgreSQLConnectionPool:
             min_connections: Minimum connections in pool
             max_connections: Maximum connections in pool
             connect_timeout: Connection timeout in seconds
+            mode: "classic" (default: ThreadedConnectionPool, SELECT 1 per
+                checkout) or "managed" (lazy health checks, blocking checkout)
+            health_check_idle_seconds: Managed mode: run SELECT 1 only if the
+                connection was idle longer than this (or its last use failed)
+            checkout_timeout: Managed mode: max seconds to wait for a connection
+            max_waiters: Managed mode: max queued checkouts (default: 4 × max_connections)
+            max_lifetime_seconds: Managed mode: recycle connections older than
+                this (None = never)
         """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown pool mode: {mode} (expected one of {self.MODES})")
+        
         self.host = host
         self.port = port
         self.database = database
@@ -77,21 +119,44 @@ class PostgreSQLConnectionPool:
         self.min_connections = min_connections
         self.max_connections = max_connections
         self.connect_timeout = connect_timeout
+        self.mode = mode
+        self.health_check_idle_seconds = health_check_idle_seconds
+        self.checkout_timeout = checkout_timeout
+        self.max_waiters = max_waiters if max_waiters is not None else 4 * max_connections
+        self.max_lifetime_seconds = max_lifetime_seconds
         
         self._pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
         self._is_closed = False
         
+        # Managed mode state (guarded by _cond)
+        self._cond = threading.Condition()
+        self._idle: Optional[List[Any]] = None  # LIFO stack, None until initialized
+        self._info: Dict[int, _ConnectionInfo] = {}
+        self._open_count = 0  # open + currently opening connections
+        self._waiting = 0
+        
         # Metrics
         self._total_connections_created = 0
         self._total_connections_reused = 0
         self._total_connection_errors = 0
+        self._total_checkouts = 0
+        self._total_health_checks = 0
+        self._total_recycled = 0
+        self._total_wait_timeouts = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
         
         logger.info(
             f"PostgreSQL Connection Pool initialized: "
             f"{host}:{port}/{database} "
-            f"(min={min_connections}, max={max_connections})"
+            f"(min={min_connections}, max={max_connections}, mode={mode})"
         )
     
+    @property
+    def is_initialized(self) -> bool:
+        """True once initialize() has created the pool."""
+        return self._pool is not None or self._idle is not None
+    
     def _create_pool(self):
         """Create connection pool (internal)."""
         try:
@@ -124,6 +189,53 @@ class PostgreSQLConnectionPool:
             self._total_connection_errors += 1
             raise
     
+    def _connect(self):
+        """Open a new physical connection (managed mode)."""
+        conn = psycopg2.connect(
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            user=self.user,
+            password=self.password,
+            connect_timeout=self.connect_timeout,
+            cursor_factory=psycopg2.extras.RealDictCursor,
+        )
+        now = time.monotonic()
+        with self._cond:
+            self._info[id(conn)] = _ConnectionInfo(created_at=now, last_used=now)
+            self._total_connections_created += 1
+        return conn
+    
+    def _discard(self, conn):
+        """Close a connection and drop its bookkeeping (slot is kept)."""
+        with self._cond:
+            self._info.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+    
+    def _create_managed_pool(self):
+        """Open min_connections and verify one of them (managed mode)."""
+        idle = []
+        try:
+            for _ in range(max(1, self.min_connections)):
+                idle.append(self._connect())
+            with idle[-1].cursor() as cur:
+                cur.execute("SELECT 1")
+        except Exception as e:
+            logger.error(f"❌ Failed to create connection pool: {e}")
+            self._total_connection_errors += 1
+            for conn in idle:
+                self._discard(conn)
+            raise
+        
+        with self._cond:
+            self._idle = idle
+            self._open_count = len(idle)
+        logger.info(f"✅ PostgreSQL Connection Pool ready: {len(idle)} connections created (managed)")
+        return True
+    
     def initialize(self) -> bool:
         """
         Initialize connection pool with retry logic.
@@ -131,16 +243,17 @@ class PostgreSQLConnectionPool:
         Returns:
             bool: True if pool created successfully
         """
-        if self._pool is not None:
+        if self.is_initialized:
             logger.warning("Connection pool already initialized")
             return True
         
         max_retries = 3
         base_delay = 1.0
+        create_pool = self._create_managed_pool if self.mode == "managed" else self._create_pool
         
         for retry in range(max_retries):
             try:
-                return self._create_pool()
+                return create_pool()
                 
             except OperationalError as e:
                 if retry < max_retries - 1:
@@ -171,13 +284,22 @@ class PostgreSQLConnectionPool:
         
         Yields:
             psycopg2 connection from pool
+        
+        Raises:
+            PoolTimeoutError: Managed mode, no connection within checkout_timeout
+                or wait queue full
         """
         if self._is_closed:
             raise RuntimeError("Connection pool is closed")
         
-        if self._pool is None:
+        if not self.is_initialized:
             raise RuntimeError("Connection pool not initialized - call initialize() first")
         
+        if self.mode == "managed":
+            with self._get_managed_connection() as conn:
+                yield conn
+            return
+        
         conn = None
         is_new_connection = False
         
@@ -190,6 +312,7 @@ class PostgreSQLConnectionPool:
             self._total_connections_reused += 1
             
             # Health check: verify connection is alive
+            self._total_health_checks += 1
             try:
                 with conn.cursor() as cur:
                     cur.execute("SELECT 1")
@@ -223,15 +346,163 @@ class PostgreSQLConnectionPool:
                     except:
                         pass
     
+    # ------------------------------------------------------------------
+    # Managed mode
+    # ------------------------------------------------------------------
+    
+    @contextmanager
+    def _get_managed_connection(self):
+        """Checkout/checkin with lazy validation and usage metrics."""
+        conn = self._checkout()
+        checked_out_at = time.monotonic()
+        error: Optional[BaseException] = None
+        try:
+            yield conn
+        except BaseException as e:
+            error = e
+            if isinstance(e, (OperationalError, InterfaceError)):
+                self._total_connection_errors += 1
+            raise
+        finally:
+            if METRICS_AVAILABLE:
+                metrics.db_pool_in_use_time.labels(backend="postgresql").observe(
+                    time.monotonic() - checked_out_at
+                )
+            self._checkin(conn, error)
+    
+    def _checkout(self):
+        """Take an idle connection, open a new one or wait in the bounded queue."""
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+        conn = None
+        
+        with self._cond:
+            while True:
+                if self._is_closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    self._total_connections_reused += 1
+                    break
+                if self._open_count < self.max_connections:
+                    self._open_count += 1  # reserve slot, connect outside the lock
+                    break
+                if self._waiting >= self.max_waiters:
+                    self._total_wait_timeouts += 1
+                    raise PoolTimeoutError(
+                        f"Connection pool wait queue full ({self._waiting} waiting)"
+                    )
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._total_wait_timeouts += 1
+                    raise PoolTimeoutError(
+                        f"No connection available within {self.checkout_timeout}s"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+            
+            waited = time.monotonic() - start
+            self._total_checkouts += 1
+            self._total_wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        
+        if METRICS_AVAILABLE:
+            metrics.db_pool_wait_time.labels(backend="postgresql").observe(waited)
+        
+        try:
+            return self._connect() if conn is None else self._validate(conn)
+        except Exception:
+            self._release_slot()
+            self._total_connection_errors += 1
+            raise
+    
+    def _validate(self, conn):
+        """Recycle expired connections; SELECT 1 only after idle threshold or error."""
+        with self._cond:
+            info = self._info.get(id(conn))
+        now = time.monotonic()
+        
+        if info is None:
+            self._discard(conn)
+            return self._connect()
+        
+        if self.max_lifetime_seconds is not None and now - info.created_at > self.max_lifetime_seconds:
+            self._total_recycled += 1
+            self._discard(conn)
+            return self._connect()
+        
+        if info.suspect or now - info.last_used > self.health_check_idle_seconds:
+            self._total_health_checks += 1
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                info.suspect = False
+            except Exception as e:
+                # Any failure (not only OperationalError) means the connection is unusable
+                logger.warning(f"⚠️ Stale connection detected ({type(e).__name__}), refreshing...")
+                self._discard(conn)
+                return self._connect()
+        
+        return conn
+    
+    def _checkin(self, conn, error: Optional[BaseException] = None):
+        """Return a connection; broken ones are closed and their slot released."""
+        broken = bool(conn.closed) or isinstance(error, (OperationalError, InterfaceError))
+        if not broken:
+            try:
+                conn.rollback()
+            except Exception as e:
+                logger.warning(f"⚠️ Error returning connection to pool: {e}")
+                broken = True
+        
+        with self._cond:
+            info = self._info.get(id(conn))
+            if not broken and info is not None and not self._is_closed:
+                info.last_used = time.monotonic()
+                info.suspect = error is not None
+                self._idle.append(conn)
+                self._cond.notify()
+                return
+        
+        self._discard(conn)
+        self._release_slot()
+    
+    def _release_slot(self):
+        with self._cond:
+            self._open_count -= 1
+            self._cond.notify()
+    
+    def _close_managed(self):
+        with self._cond:
+            idle, self._idle = self._idle or [], None
+            self._open_count -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+    
     def close(self):
         """Close all connections in pool."""
         if self._is_closed:
             return
         
+        if self._idle is not None:
+            self._is_closed = True
+            self._close_managed()
+            logger.info("PostgreSQL Connection Pool closed")
+            logger.info(
+                f"Pool Stats: "
+                f"Created={self._total_connections_created}, "
+                f"Reused={self._total_connections_reused}, "
+                f"Errors={self._total_connection_errors}"
+            )
+        
         if self._pool is not None:
             try:
                 self._pool.closeall()
-                logger.info(f"PostgreSQL Connection Pool closed")
+                logger.info("PostgreSQL Connection Pool closed")
                 logger.info(
                     f"Pool Stats: "
                     f"Created={self._total_connections_created}, "
@@ -253,6 +524,7 @@ class PostgreSQLConnectionPool:
             "database": self.database,
             "min_connections": self.min_connections,
             "max_connections": self.max_connections,
+            "mode": self.mode,
             "is_closed": self._is_closed,
             "total_created": self._total_connections_created,
             "total_reused": self._total_connections_reused,
@@ -262,7 +534,17 @@ class PostgreSQLConnectionPool:
                 (self._total_connections_created + self._total_connections_reused)
                 if (self._total_connections_created + self._total_connections_reused) > 0
                 else 0.0
-            )
+            ),
+            "checkouts": self._total_checkouts,
+            "health_checks": self._total_health_checks,
+            "recycled": self._total_recycled,
+            "wait_timeouts": self._total_wait_timeouts,
+            "waiting": self._waiting,
+            "avg_wait_ms": (
+                self._total_wait_seconds / self._total_checkouts * 1000
+                if self._total_checkouts > 0 else 0.0
+            ),
+            "max_wait_ms": self._max_wait_seconds * 1000,
         }
 
     def get_counts(self) -> Dict[str, int]:
@@ -271,6 +553,10 @@ class PostgreSQLConnectionPool:
         Returns zeros if pool not initialized.
         """
         try:
+            if self._idle is not None:
+                with self._cond:
+                    idle = len(self._idle)
+                    return {"active": self._open_count - idle, "idle": idle, "total": self._open_count}
             if self._pool is None:
                 return {"active": 0, "idle": 0, "total": 0}
             # psycopg2 ThreadedConnectionPool internals: _used (dict), _pool (list)
@@ -293,7 +579,7 @@ class PostgreSQLConnectionPool:
     
     def __del__(self):
         """Cleanup on garbage collection."""
-        if not self._is_closed:
+        if not getattr(self, "_is_closed", True):
             logger.warning("WARNING: Connection pool not explicitly closed - closing now")
             self.close()
 
@@ -315,6 +601,9 @@ def initialize_global_pool(config: Dict[str, Any]) -> PostgreSQLConnectionPool:
             - password: Password
             - min_connections: Minimum pool size (default: 5)
             - max_connections: Maximum pool size (default: 50)
+            - pool_mode: "classic" or "managed" (default: classic)
+            - health_check_idle_seconds, checkout_timeout, max_waiters,
+              max_lifetime_seconds: managed mode tuning
     
     Returns:
         PostgreSQLConnectionPool instance
@@ -334,6 +623,11 @@ def initialize_global_pool(config: Dict[str, Any]) -> PostgreSQLConnectionPool:
         min_connections=config.get('min_connections', 5),
         max_connections=config.get('max_connections', 50),
         connect_timeout=config.get('connect_timeout', 10),
+        mode=config.get('pool_mode', 'classic'),
+        health_check_idle_seconds=config.get('health_check_idle_seconds', 30.0),
+        checkout_timeout=config.get('checkout_timeout', 30.0),
+        max_waiters=config.get('max_waiters'),
+        max_lifetime_seconds=config.get('max_lifetime_seconds', 3600.0),
     )
     
     _global_pool.initialize()
@@ -539,5 +539,84 @@ class CouchDBAdapter(DatabaseBackend):
             }
 
 
+    # ================================================================
+    # CHUNKED STREAMS (StreamingManager)
+    # ================================================================
+
+    def put_stream_chunk(self, stream_id: str, chunk_index: int, data) -> int:
+        """
+        Store one chunk of a stream as an attachment.
+
+        Every chunk lives in its own document, so concurrent chunk transfers
+        never race on the same ``_rev``. Re-uploading a chunk (resume)
+        replaces its attachment.
+        """
+        if not self.db:
+            raise RuntimeError('CouchDB not connected')
+        doc_id = self._stream_chunk_doc_id(stream_id, chunk_index)
+        doc = self.db.get(doc_id)
+        if doc is None:
+            doc = {'_id': doc_id, 'stream_id': stream_id, 'chunk_index': chunk_index}
+            self.db.save(doc)
+        payload = bytes(data)
+        self.db.put_attachment(doc, payload, filename='chunk', content_type='application/octet-stream')
+        return len(payload)
+
+    def read_stream_chunk_into(self, stream_id: str, chunk_index: int, buffer) -> int:
+        """Copy a chunk attachment into a preallocated buffer; returns the byte count."""
+        if not self.db:
+            raise RuntimeError('CouchDB not connected')
+        doc_id = self._stream_chunk_doc_id(stream_id, chunk_index)
+        attachment = self.db.get_attachment(doc_id, 'chunk')
+        if attachment is None:
+            raise FileNotFoundError(f'Stream chunk not found: {doc_id}')
+        data = attachment.read()
+        memoryview(buffer)[:len(data)] = data
+        return len(data)
+
+    def stream_chunk_exists(self, stream_id: str, chunk_index: int) -> bool:
+        if not self.db:
+            raise RuntimeError('CouchDB not connected')
+        return self._stream_chunk_doc_id(stream_id, chunk_index) in self.db
+
+    def delete_stream_chunk(self, stream_id: str, chunk_index: int) -> bool:
+        doc_id = self._stream_chunk_doc_id(stream_id, chunk_index)
+        if not self.stream_chunk_exists(stream_id, chunk_index):
+            return False
+        return self.delete_document(doc_id)
+
+    def finalize_stream(self, stream_id: str, *, size: int, chunk_size: int,
+                        chunk_hashes: List[str]) -> Dict[str, Any]:
+        """Write the manifest document of a completely uploaded stream."""
+        if not self.db:
+            raise RuntimeError('CouchDB not connected')
+        manifest = {
+            'stream_id': stream_id,
+            'size': size,
+            'chunk_size': chunk_size,
+            'chunk_count': len(chunk_hashes),
+            'chunk_hashes': list(chunk_hashes),
+            'created_at': str(datetime.datetime.now()),
+        }
+        doc_id = f'stream:{stream_id}'
+        doc = self.db.get(doc_id) or {'_id': doc_id}
+        doc.update(manifest)
+        self.db.save(doc)
+        return manifest
+
+    def get_stream_info(self, stream_id: str) -> Optional[Dict[str, Any]]:
+        """Manifest of a stream, or None if it was not finalized."""
+        if not self.db:
+            raise RuntimeError('CouchDB not connected')
+        doc = self.db.get(f'stream:{stream_id}')
+        if doc is None:
+            return None
+        return {k: v for k, v in dict(doc).items() if not k.startswith('_')}
+
+    @staticmethod
+    def _stream_chunk_doc_id(stream_id: str, chunk_index: int) -> str:
+        return f'stream:{stream_id}:chunk:{chunk_index:08d}'
+
+
 def get_backend_class():
     return CouchDBAdapter
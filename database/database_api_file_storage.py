@@ -27,9 +27,11 @@ Repository: https://github.com/makr-code/VCC-UDS3
 import logging
 import os
 import hashlib
+import json
 import shutil
+import threading
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from uds3.database.database_api_base import DatabaseBackend
 
@@ -195,6 +197,81 @@ class FileSystemStorageBackend(DatabaseBackend):
             'metadata': metadata or {}
         }
 
+    # === Chunked Streams (StreamingManager) ===
+    def put_stream_chunk(self, stream_id: str, chunk_index: int, data) -> int:
+        """Schreibt einen Chunk eines Streams (tmp-Datei + os.replace, damit Leser nie Teilchunks sehen).
+
+        Verschiedene Chunk-Indizes dürfen parallel geschrieben werden; erneutes Schreiben
+        (Resume) überschreibt den Chunk. ``data`` darf ein beliebiges bytes-like Objekt sein
+        (z. B. memoryview auf einen wiederverwendeten Puffer).
+        """
+        if not self.is_available():
+            raise RuntimeError("FileSystemStorage ist nicht verfügbar")
+        stream_dir = self._stream_dir(stream_id)
+        os.makedirs(stream_dir, exist_ok=True)
+        target = self._stream_chunk_path(stream_id, chunk_index)
+        tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            written = f.write(data)
+        os.replace(tmp_path, target)
+        return written
+
+    def read_stream_chunk_into(self, stream_id: str, chunk_index: int, buffer) -> int:
+        """Liest einen Chunk per readinto in einen vorallokierten Puffer; liefert die Byte-Anzahl."""
+        view = memoryview(buffer)
+        total = 0
+        with open(self._stream_chunk_path(stream_id, chunk_index), 'rb', buffering=0) as f:
+            while total < len(view):
+                n = f.readinto(view[total:])
+                if not n:
+                    break
+                total += n
+        return total
+
+    def stream_chunk_exists(self, stream_id: str, chunk_index: int) -> bool:
+        return os.path.exists(self._stream_chunk_path(stream_id, chunk_index))
+
+    def delete_stream_chunk(self, stream_id: str, chunk_index: int) -> bool:
+        try:
+            os.remove(self._stream_chunk_path(stream_id, chunk_index))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def finalize_stream(self, stream_id: str, *, size: int, chunk_size: int,
+                        chunk_hashes: List[str]) -> Dict:
+        """Schreibt das Manifest eines vollständig hochgeladenen Streams (Größe, Chunk-Größe, Chunk-Hashes)."""
+        manifest = {
+            'stream_id': stream_id,
+            'size': size,
+            'chunk_size': chunk_size,
+            'chunk_count': len(chunk_hashes),
+            'chunk_hashes': list(chunk_hashes),
+            'created_at': datetime.now().isoformat(),
+        }
+        path = os.path.join(self._stream_dir(stream_id), 'manifest.json')
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+        return manifest
+
+    def get_stream_info(self, stream_id: str) -> Optional[Dict]:
+        """Manifest eines Streams oder None, falls (noch) nicht finalisiert."""
+        try:
+            with open(os.path.join(self._stream_dir(stream_id), 'manifest.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _stream_dir(self, stream_id: str) -> str:
+        # Stream-IDs sind oft Pfade ("storage/documents/x.pdf") → gehasht ablegen
+        digest = hashlib.sha256(stream_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.root_path, 'streams', digest[:2], digest)
+
+    def _stream_chunk_path(self, stream_id: str, chunk_index: int) -> str:
+        return os.path.join(self._stream_dir(stream_id), f"chunk-{chunk_index:08d}")
+
     # === Helpers ===
     def _compute_sha256(self, *, source_path: Optional[str] = None, data: Optional[bytes] = None) -> str:
         h = hashlib.sha256()
@@ -86,6 +86,12 @@ class PostgreSQLRelationalBackend:
                 - min_connections: Pool min size (default: 5)
                 - max_connections: Pool max size (default: 50)
                 - connect_timeout: Connection timeout (default: 10)
+                - pool_mode: "classic" (default) or "managed" (lazy health
+                  checks, blocking checkout)
+                - health_check_idle_seconds: Idle time before SELECT 1 (default: 30)
+                - checkout_timeout: Max wait for a connection (default: 30)
+                - max_waiters: Max queued checkouts (default: 4 × max_connections)
+                - max_lifetime_seconds: Connection recycling age (default: 3600)
         """
         self.host = config.get('host', '192.168.178.94')
         self.port = config.get('port', 5432)
@@ -99,6 +105,11 @@ class PostgreSQLRelationalBackend:
         self.min_connections = config.get('min_connections', 5)
         self.max_connections = config.get('max_connections', 50)
         self.connect_timeout = config.get('connect_timeout', 10)
+        self.pool_mode = config.get('pool_mode', 'classic')
+        self.health_check_idle_seconds = config.get('health_check_idle_seconds', 30.0)
+        self.checkout_timeout = config.get('checkout_timeout', 30.0)
+        self.max_waiters = config.get('max_waiters')
+        self.max_lifetime_seconds = config.get('max_lifetime_seconds', 3600.0)
         
         # Connection Pool (initialized on first connect())
         self._pool: Optional[PostgreSQLConnectionPool] = None
@@ -135,6 +146,11 @@ class PostgreSQLRelationalBackend:
                 min_connections=self.min_connections,
                 max_connections=self.max_connections,
                 connect_timeout=self.connect_timeout,
+                mode=self.pool_mode,
+                health_check_idle_seconds=self.health_check_idle_seconds,
+                checkout_timeout=self.checkout_timeout,
+                max_waiters=self.max_waiters,
+                max_lifetime_seconds=self.max_lifetime_seconds,
             )
             
             # Initialize pool (creates min_connections)
@@ -151,6 +151,33 @@ class SQLiteRelationalBackend(RelationalDatabaseBackend):
 			logger.error(f"SQLite Query failed: {e}")
 			return []
 
+	def execute_transaction(self, statements: List[Tuple[str, Tuple]]) -> bool:
+		"""Execute several write statements atomically with a single commit.
+
+		Rolls back and returns False if any statement fails.
+		"""
+		if not self.connection:
+			logger.error('SQLite: no connection')
+			return False
+		cur = self.connection.cursor()
+		try:
+			for query, params in statements:
+				cur.execute(query, params or ())
+			self.connection.commit()
+			return True
+		except Exception as e:
+			logger.error(f"SQLite transaction failed: {e}")
+			try:
+				self.connection.rollback()
+			except Exception:
+				pass
+			return False
+		finally:
+			try:
+				cur.close()
+			except Exception:
+				pass
+
 	def create_table(self, table_name: str, schema: Dict) -> bool:
 		"""Create a table given a schema dict mapping column->type."""
 		try:
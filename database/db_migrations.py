@@ -22,9 +22,12 @@ Repository: https://github.com/makr-code/VCC-UDS3
 
 from __future__ import annotations
 
+import json
 import logging
 from typing import Dict, Iterable
 
+from .schema_cache import invalidate_schema_cache
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -53,6 +56,9 @@ SAGAS_SCHEMA: Dict[str, str] = {
     "current_step": "TEXT",
     "created_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
     "updated_at": "TIMESTAMP",
+    # Recovery leasing (SagaRecoveryWorker): owner + expiry as epoch seconds
+    "lease_owner": "TEXT",
+    "lease_expires_at": "REAL",
 }
 
 AUDIT_LOG_SCHEMA: Dict[str, str] = {
@@ -71,6 +77,15 @@ AUDIT_LOG_SCHEMA: Dict[str, str] = {
     "created_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
 }
 
+IDEMPOTENCY_SCHEMA: Dict[str, str] = {
+    "saga_id": "TEXT NOT NULL",
+    "step_name": "TEXT NOT NULL",
+    "idempotency_key": "TEXT NOT NULL",
+    "event_id": "TEXT",
+    "created_at": "TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+}
+IDEMPOTENCY_TABLE = "uds3_saga_idempotency"
+
 IDENTITY_TRACES_SCHEMA: Dict[str, str] = {
     "trace_id": "TEXT PRIMARY KEY",
     "aktenzeichen": "TEXT",
@@ -129,6 +144,7 @@ def _ensure_table(rel_backend, table: str, schema: Dict[str, str]) -> None:
         else:  # pragma: no cover - defensive branch
             columns = ", ".join(f"{col} {ctype}" for col, ctype in schema.items())
             rel_backend.execute_query(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+        invalidate_schema_cache(rel_backend, table)
         return
 
     existing = _get_schema(rel_backend, table)
@@ -143,6 +159,9 @@ def _add_column(rel_backend, table: str, column: str, definition: str) -> None:
         rel_backend.execute_query(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
     except Exception as exc:  # pragma: no cover - harmless if column exists already
         logger.debug("ALTER TABLE %s ADD COLUMN %s failed or redundant: %s", table, column, exc)
+    finally:
+        # Cached column lists / prepared inserts of this table are stale now
+        invalidate_schema_cache(rel_backend, table)
 
 
 def _create_index(rel_backend, name: str, table: str, columns: Iterable[str]) -> None:
@@ -175,11 +194,81 @@ def ensure_idempotency_column(rel_backend) -> None:
     _create_index(rel_backend, "idx_uds3_saga_events_idempotency", "uds3_saga_events", ["saga_id", "step_name", "idempotency_key"])
 
 
+def ensure_idempotency_store(rel_backend) -> None:
+    """Create the indexed idempotency store and backfill it from saga events.
+
+    ``uds3_saga_idempotency`` holds one row per successfully executed
+    (saga_id, step_name, idempotency_key); the unique index turns the
+    orchestrator's idempotency check into a point lookup instead of a
+    ``payload LIKE`` scan over the whole event history. The backfill runs only
+    when the store is created, so re-running the migration is cheap.
+    """
+    created = not _table_exists(rel_backend, IDEMPOTENCY_TABLE)
+    _ensure_table(rel_backend, IDEMPOTENCY_TABLE, IDEMPOTENCY_SCHEMA)
+    try:
+        rel_backend.execute_query(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS idx_uds3_saga_idempotency_key "
+            f"ON {IDEMPOTENCY_TABLE} (idempotency_key, saga_id, step_name)"
+        )
+    except Exception as exc:  # pragma: no cover
+        logger.debug("CREATE UNIQUE INDEX on %s failed: %s", IDEMPOTENCY_TABLE, exc)
+    if created:
+        _backfill_idempotency_store(rel_backend)
+
+
+def _backfill_idempotency_store(rel_backend) -> None:
+    if not _table_exists(rel_backend, "uds3_saga_events"):
+        return
+    columns = _get_schema(rel_backend, "uds3_saga_events")
+    key_expr = "idempotency_key" if "idempotency_key" in columns else None
+    try:
+        rows = rel_backend.execute_query(
+            f"SELECT event_id, saga_id, step_name, payload{', idempotency_key' if key_expr else ''} "
+            "FROM uds3_saga_events WHERE status = ?",
+            ("SUCCESS",),
+        ) or []
+    except Exception as exc:  # pragma: no cover
+        logger.debug("Idempotency backfill query failed: %s", exc)
+        return
+
+    insert_sql = f"INSERT INTO {IDEMPOTENCY_TABLE} (saga_id, step_name, idempotency_key, event_id) VALUES (?, ?, ?, ?)"
+    execute_transaction = getattr(rel_backend, "execute_transaction", None)
+    pending = []
+    seen = set()
+    for row in rows:
+        key = row.get("idempotency_key") if key_expr else None
+        if key is None and row.get("payload"):
+            # Legacy history without the column: parse the payload once here
+            try:
+                payload = json.loads(row["payload"])
+            except (TypeError, ValueError):
+                payload = None
+            if isinstance(payload, dict):
+                key = payload.get("idempotency_key") or payload.get("idempotency")
+        entry = (row.get("saga_id"), row.get("step_name"), key)
+        if key is None or entry in seen:
+            continue
+        seen.add(entry)
+        pending.append((insert_sql, (entry[0], entry[1], str(key), row.get("event_id"))))
+        if len(pending) >= 1000 and callable(execute_transaction):
+            execute_transaction(pending)
+            pending = []
+    if callable(execute_transaction):
+        if pending:
+            execute_transaction(pending)
+    else:
+        for sql, params in pending:
+            rel_backend.execute_query(sql, params)
+    if seen:
+        logger.info("Backfilled %d idempotency keys into %s", len(seen), IDEMPOTENCY_TABLE)
+
+
 def ensure_saga_schema(rel_backend) -> None:
     """Create or extend the saga-related tables used by orchestrator tests."""
     _ensure_table(rel_backend, "uds3_sagas", SAGAS_SCHEMA)
     _ensure_table(rel_backend, "uds3_saga_events", SAGA_EVENTS_SCHEMA)
     _ensure_table(rel_backend, "uds3_audit_log", AUDIT_LOG_SCHEMA)
+    ensure_idempotency_store(rel_backend)
 
     # Observability tables (best-effort)
     _ensure_table(rel_backend, "administrative_identity_traces", IDENTITY_TRACES_SCHEMA)
@@ -187,10 +276,12 @@ def ensure_saga_schema(rel_backend) -> None:
 
     # Helpful indexes for queries used in orchestrator/recovery workflow
     _create_index(rel_backend, "idx_uds3_sagas_status", "uds3_sagas", ["status"])
+    _create_index(rel_backend, "idx_uds3_sagas_status_created", "uds3_sagas", ["status", "created_at", "saga_id"])
     _create_index(rel_backend, "idx_uds3_saga_events_saga_step", "uds3_saga_events", ["saga_id", "step_name"])
 
 
 __all__ = [
     "ensure_idempotency_column",
+    "ensure_idempotency_store",
     "ensure_saga_schema",
 ]
@@ -36,6 +36,9 @@ from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 from . import config
 from .database_manager import DatabaseManager
 from .adapter_governance import AdapterGovernanceError
+from .saga_event_writer import get_event_writer
+from .saga_idempotency import get_idempotency_store
+from .schema_cache import PreparedInsert, get_schema_cache
 
 try:
     from database import db_migrations
@@ -69,10 +72,13 @@ class SagaDatabaseCRUD:
         manager: Optional[DatabaseManager] = None,
         *,
         manager_getter: Optional[Callable[[], DatabaseManager]] = None,
+        event_durability: Optional[str] = None,
     ) -> None:
         self._manager = manager
         self._manager_getter = manager_getter
         self._fallback_manager: Optional[DatabaseManager] = None
+        # "sync" (Commit pro Event) oder "group" (Group Commit); None → SAGA_EVENT_DURABILITY
+        self._event_durability = event_durability
 
     # ------------------------------------------------------------------
     # Governance Enforcement
@@ -321,10 +327,22 @@ class SagaDatabaseCRUD:
     # ------------------------------------------------------------------
     # Saga Event Helper
     # ------------------------------------------------------------------
-    def write_saga_event(self, saga_id: str, step_name: str, status: str, payload: Dict[str, Any], error: Optional[str] = None) -> None:
+    def write_saga_event(
+        self,
+        saga_id: str,
+        step_name: str,
+        status: str,
+        payload: Dict[str, Any],
+        error: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
+        duration_ms: Optional[int] = None,
+    ) -> None:
         """Atomar: Schreibe oder aktualisiere ein Saga-Event in `uds3_saga_events`.
 
         status: PENDING|SUCCESS|FAIL|COMPENSATED
+        idempotency_key: überschreibt den Key aus dem Payload; SUCCESS-Events
+        tragen ihn zusätzlich in den Idempotency-Store ein.
+        duration_ms: Laufzeit des Schritts (Event- und Audit-Zeile).
         """
         manager = self._get_manager()
         relational = self._get_relational_backend(manager)
@@ -348,86 +366,22 @@ class SagaDatabaseCRUD:
             'step_name': step_name,
             'event_type': 'step',
             'status': status,
-            'duration_ms': None,
+            'duration_ms': duration_ms,
             'payload': json.dumps(payload, ensure_ascii=False, default=str),
             'created_at': None,
         }
 
         # Extract idempotency key if present in payload (common field)
-        idempotency_key = None
-        if isinstance(payload, dict):
+        if idempotency_key is None and isinstance(payload, dict):
             idempotency_key = payload.get('idempotency_key') or payload.get('idempotency')
 
         if idempotency_key is not None:
-            # include explicitly so _safe_insert can map to a dedicated column if present
+            # include explicitly so the prepared insert maps it to the dedicated column
             event['idempotency_key'] = idempotency_key
 
-
-        def _safe_insert(table: str, record: Dict[str, Any]) -> bool:
-            """Insert helper that inserts only columns present in the relational table schema.
-
-            Falls Tabelle nur ein 'data' JSON-Feld hat, nutzt `insert_record` falls verfügbar.
-            """
-            try:
-                cols = None
-                if hasattr(relational, 'get_table_schema'):
-                    schema = relational.get_table_schema(table)
-                    cols = list(schema.keys()) if isinstance(schema, dict) else None
-                else:
-                    # Fallback: try PRAGMA (SQLite)
-                    try:
-                        rows = relational.execute_query(f"PRAGMA table_info({table})")
-                        cols = [r['name'] for r in rows]
-                    except Exception:
-                        cols = None
-
-                # If the table has a single 'data' column and insert_record exists, use it
-                if cols and cols == ['data'] and hasattr(relational, 'insert_record'):
-                    return relational.insert_record(table, record)
-
-                # Prepare insert using only matching columns
-                if cols:
-                    insert_keys = [k for k in record.keys() if k in cols]
-                    # If the table has an idempotency_key column, ensure we include it if available
-                    if 'idempotency_key' in cols and idempotency_key is not None and 'idempotency_key' not in record:
-                        record['idempotency_key'] = idempotency_key
-                    if not insert_keys and hasattr(relational, 'insert_record'):
-                        return relational.insert_record(table, record)
-                    if not insert_keys:
-                        # No overlapping columns; as last resort, try insert_record
-                        if hasattr(relational, 'insert_record'):
-                            return relational.insert_record(table, record)
-                        return False
-
-                    values = tuple(record[k] for k in insert_keys)
-                    placeholders = ', '.join(['?' for _ in insert_keys])
-                    col_list = ', '.join(insert_keys)
-                    relational.execute_query(f"INSERT INTO {table} ({col_list}) VALUES ({placeholders})", values)
-                    return True
-
-                # No schema info: fallback to insert_record or generic insert
-                if hasattr(relational, 'insert_record'):
-                    return relational.insert_record(table, record)
-                if hasattr(relational, 'insert'):
-                    # Be careful: relational.insert may expect 'id' column; avoid adding it
-                    try:
-                        relational.insert(table, record)
-                        return True
-                    except Exception:
-                        return False
-                # As final fallback, try execute_query with provided keys
-                cols = list(record.keys())
-                placeholders = ', '.join(['?' for _ in cols])
-                relational.execute_query(f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})", tuple(record.values()))
-                return True
-            except Exception as exc:
-                logger.debug("_safe_insert failed for %s: %s", table, exc)
-                return False
-
-        # perform event insert
-        success_event = _safe_insert('uds3_saga_events', event)
+        records = [('uds3_saga_events', event)]
         if status in ('SUCCESS', 'FAIL', 'COMPENSATED'):
-            audit = {
+            records.append(('uds3_audit_log', {
                 'audit_id': str(uuid.uuid4()),
                 'saga_id': saga_id,
                 'saga_name': None,
@@ -437,14 +391,76 @@ class SagaDatabaseCRUD:
                 'step_name': step_name,
                 'event_type': 'step_result',
                 'status': status,
-                'duration_ms': None,
+                'duration_ms': duration_ms,
                 'details': json.dumps({'error': error} if error else {}, ensure_ascii=False, default=str),
                 'actor': None,
                 'created_at': None,
-            }
-            success_audit = _safe_insert('uds3_audit_log', audit)
-            if not success_audit:
+            }))
+
+        cache = get_schema_cache(relational)
+        if idempotency_key is not None:
+            for table, record in records:
+                if 'idempotency_key' not in record and cache.has_column(table, 'idempotency_key'):
+                    record['idempotency_key'] = idempotency_key
+
+        # Event + Audit in einer Transaktion (sync) bzw. gebündelt mit anderen Sagas (group commit)
+        prepared = [cache.prepared_insert(table, record.keys()) for table, record in records]
+        store = get_idempotency_store(relational) if status == 'SUCCESS' and idempotency_key is not None else None
+        writer = get_event_writer(relational, self._event_durability)
+        if writer is not None and all(prepared):
+            statements = [(stmt.sql, stmt.bind(record)) for stmt, (_, record) in zip(prepared, records)]
+            idempotency_stmt = store.record_statement(saga_id, step_name, idempotency_key, event['event_id']) if store else None
+            if idempotency_stmt is not None:
+                statements.append(idempotency_stmt)
+            if writer.submit(statements):
+                if store is not None:
+                    store.remember(saga_id, step_name, idempotency_key)
+                return
+            logger.debug("Combined saga event/audit write rolled back; retrying per table")
+
+        for (table, record), stmt in zip(records, prepared):
+            if not self._insert_saga_record(relational, table, record, stmt) and table == 'uds3_audit_log':
                 logger.debug("Audit insert failed for saga %s step %s", saga_id, step_name)
+        if store is not None:
+            store.record(saga_id, step_name, idempotency_key, event['event_id'])
+
+    def _insert_saga_record(
+        self,
+        relational: Any,
+        table: str,
+        record: Dict[str, Any],
+        prepared: Optional[PreparedInsert],
+    ) -> bool:
+        """Insert a saga/audit row using the precompiled statement if available.
+
+        Without a matching column list (unknown schema, JSON-only ``data`` table)
+        it falls back to ``insert_record``/``insert`` like before.
+        """
+        try:
+            if prepared is not None:
+                relational.execute_query(prepared.sql, prepared.bind(record))
+                return True
+
+            if hasattr(relational, 'insert_record'):
+                return relational.insert_record(table, record)
+            if get_schema_cache(relational).columns(table):
+                # Schema known but no overlapping columns
+                return False
+            if hasattr(relational, 'insert'):
+                # Be careful: relational.insert may expect 'id' column; avoid adding it
+                try:
+                    relational.insert(table, record)
+                    return True
+                except Exception:
+                    return False
+            # As final fallback, try execute_query with provided keys
+            cols = list(record.keys())
+            placeholders = ', '.join(['?' for _ in cols])
+            relational.execute_query(f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({placeholders})", tuple(record.values()))
+            return True
+        except Exception as exc:
+            logger.debug("Saga record insert failed for %s: %s", table, exc)
+            return False
 
     # ------------------------------------------------------------------
     # Hilfsfunktionen
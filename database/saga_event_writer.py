@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+saga_event_writer.py
+
+Group-commit write-ahead log for saga events.
+Every saga step writes a PENDING and a SUCCESS/FAIL event (plus an audit row).
+Committing each of them separately makes the relational backend fsync-bound.
+``SagaEventWriter`` supports two durability modes:
+
+- ``sync``: every event is committed on its own before ``submit`` returns
+  (previous behaviour).
+- ``group``: events from concurrent sagas are buffered and committed together
+  in one transaction once ``max_batch_events`` are pending or the oldest event
+  has waited ``window_ms``. ``submit`` still only returns after the commit,
+  so a returned ``True`` is as durable as in ``sync`` mode.
+
+The writer is attached to the relational backend (like the schema cache) so
+all sagas sharing a backend share one commit group.
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURATION (Environment Variables)
+# ============================================================================
+
+SAGA_EVENT_DURABILITY = os.getenv("SAGA_EVENT_DURABILITY", "sync").lower()
+SAGA_GROUP_COMMIT_WINDOW_MS = float(os.getenv("SAGA_GROUP_COMMIT_WINDOW_MS", "5"))
+SAGA_GROUP_COMMIT_MAX_EVENTS = int(os.getenv("SAGA_GROUP_COMMIT_MAX_EVENTS", "256"))
+
+DURABILITY_MODES = ("sync", "group")
+WRITER_ATTR = "_uds3_saga_event_writer"
+
+Statement = Tuple[str, Tuple[Any, ...]]
+
+
+class _PendingWrite:
+    __slots__ = ("statements", "done", "ok")
+
+    def __init__(self, statements: Sequence[Statement]) -> None:
+        self.statements = list(statements)
+        self.done = threading.Event()
+        self.ok = False
+
+
+class SagaEventWriter:
+    """Commits saga event statements per event (sync) or in micro-batches (group).
+
+    ``submit`` receives the statements of one logical event (e.g. event row +
+    audit row), which are always committed atomically.
+
+    Args:
+        backend: Relational backend offering ``execute_transaction(statements)``
+        durability: ``"sync"`` or ``"group"``
+        window_ms: Maximum time the oldest buffered event waits for its group
+        max_batch_events: Commit as soon as this many events are buffered
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        durability: str = "sync",
+        window_ms: float = SAGA_GROUP_COMMIT_WINDOW_MS,
+        max_batch_events: int = SAGA_GROUP_COMMIT_MAX_EVENTS,
+    ) -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}, got {durability!r}")
+        self.backend = backend
+        self.durability = durability
+        self.window = max(0.0, window_ms) / 1000
+        self.max_batch_events = max(1, max_batch_events)
+
+        # Serialises commits on the (shared) backend connection
+        self._commit_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._pending: List[_PendingWrite] = []
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.events = 0
+        self.commits = 0
+        self.failed_events = 0
+        self.max_group = 0
+
+        if durability == "group":
+            self._thread = threading.Thread(target=self._run, name="uds3-saga-group-commit", daemon=True)
+            self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def submit(self, statements: Sequence[Statement]) -> bool:
+        """Commit ``statements`` atomically; returns ``True`` once durable."""
+        write = _PendingWrite(statements)
+        if self.durability == "group":
+            with self._cond:
+                queued = not self._closed
+                if queued:
+                    self._pending.append(write)
+                    if len(self._pending) == 1 or len(self._pending) >= self.max_batch_events:
+                        self._cond.notify()
+            if queued:
+                write.done.wait()
+                return write.ok
+        # sync mode (or writer already closed): commit this event on its own
+        return self._commit([write])
+
+    def close(self) -> None:
+        """Commit all buffered events and stop the group-commit thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "durability": self.durability,
+                "events": self.events,
+                "commits": self.commits,
+                "failed_events": self.failed_events,
+                "avg_group_size": self.events / self.commits if self.commits else 0.0,
+                "max_group_size": self.max_group,
+                "pending": len(self._pending),
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Bounded latency window, measured from the oldest buffered event
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch_events and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                group = self._pending[:self.max_batch_events]
+                del self._pending[:self.max_batch_events]
+
+            self._commit(group)
+
+    def _commit(self, group: List[_PendingWrite]) -> bool:
+        statements = [stmt for write in group for stmt in write.statements]
+        with self._commit_lock:
+            ok = self._execute(statements)
+            if not ok and len(group) > 1:
+                # One bad event must not fail its whole group: retry individually
+                logger.debug("Group commit of %d saga events failed; committing individually", len(group))
+                for write in group:
+                    write.ok = self._execute(write.statements)
+            else:
+                for write in group:
+                    write.ok = ok
+
+        with self._cond:
+            self.events += len(group)
+            self.commits += 1
+            self.failed_events += sum(1 for write in group if not write.ok)
+            self.max_group = max(self.max_group, len(group))
+        for write in group:
+            write.done.set()
+        return all(write.ok for write in group)
+
+    def _execute(self, statements: List[Statement]) -> bool:
+        try:
+            return bool(self.backend.execute_transaction(statements))
+        except Exception as exc:
+            logger.debug("Saga event transaction failed: %s", exc)
+            return False
+
+
+def get_event_writer(backend: Any, durability: Optional[str] = None) -> Optional[SagaEventWriter]:
+    """Return the writer of ``backend`` for ``durability``, creating it on first use.
+
+    Returns ``None`` if the backend cannot run multi-statement transactions.
+    """
+    if not callable(getattr(backend, "execute_transaction", None)):
+        return None
+    durability = (durability or SAGA_EVENT_DURABILITY).lower()
+    if durability not in DURABILITY_MODES:
+        logger.warning("Unknown saga event durability %r, using 'sync'", durability)
+        durability = "sync"
+    writers = getattr(backend, WRITER_ATTR, None)
+    if not isinstance(writers, dict):
+        writers = {}
+        try:
+            setattr(backend, WRITER_ATTR, writers)
+        except Exception:  # pragma: no cover - backends with __slots__
+            logger.debug("Backend %r does not accept a saga event writer", type(backend).__name__)
+    writer = writers.get(durability)
+    if writer is None:
+        writer = writers.setdefault(durability, SagaEventWriter(backend, durability=durability))
+    return writer
+
+
+__all__ = [
+    "DURABILITY_MODES",
+    "SagaEventWriter",
+    "get_event_writer",
+]
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+saga_idempotency.py
+
+Indexed idempotency store for saga steps.
+``SagaOrchestrator.execute_saga`` used to detect already executed steps by
+querying ``uds3_saga_events`` (``payload LIKE '%key%'`` when the
+``idempotency_key`` column was missing), i.e. a scan that grows with the event
+history. The store keeps one row per successful (saga_id, step_name,
+idempotency_key) in ``uds3_saga_idempotency`` behind a unique index (created by
+``db_migrations.ensure_idempotency_store``) and an in-process LRU of confirmed
+keys, so the check before each step is a cache hit or a single index lookup.
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .schema_cache import get_schema_cache
+
+logger = logging.getLogger(__name__)
+
+SAGA_IDEMPOTENCY_CACHE_SIZE = int(os.getenv("SAGA_IDEMPOTENCY_CACHE_SIZE", "10000"))
+
+IDEMPOTENCY_TABLE = "uds3_saga_idempotency"
+STORE_ATTR = "_uds3_idempotency_store"
+
+IdempotencyEntry = Tuple[str, str, str]
+
+
+class IdempotencyStore:
+    """Idempotency lookups for saga steps with an LRU in front of the table.
+
+    Only positive answers are cached: a key recorded by another process is
+    always found via the index, so negatives must not be remembered.
+    Without the store table (migrations not run) it falls back to the
+    previous lookups on ``uds3_saga_events``.
+    """
+
+    def __init__(self, backend: Any, cache_size: int = SAGA_IDEMPOTENCY_CACHE_SIZE) -> None:
+        self.backend = backend
+        self.cache_size = max(0, cache_size)
+        self._cache: "OrderedDict[IdempotencyEntry, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.index_lookups = 0
+        self.legacy_lookups = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def contains(self, saga_id: str, step_name: str, idempotency_key: str) -> bool:
+        """True if the step already succeeded under ``idempotency_key``."""
+        entry = (saga_id, step_name, str(idempotency_key))
+        with self._lock:
+            if entry in self._cache:
+                self._cache.move_to_end(entry)
+                self.cache_hits += 1
+                return True
+
+        if self._has_store():
+            with self._lock:
+                self.index_lookups += 1
+            rows = self.backend.execute_query(
+                f"SELECT 1 AS found FROM {IDEMPOTENCY_TABLE} "
+                "WHERE idempotency_key = ? AND saga_id = ? AND step_name = ? LIMIT 1",
+                (entry[2], saga_id, step_name),
+            )
+            found = bool(rows)
+        else:
+            found = self._legacy_contains(*entry)
+
+        if found:
+            self._remember(entry)
+        return found
+
+    def record_statement(
+        self, saga_id: str, step_name: str, idempotency_key: str, event_id: Optional[str] = None
+    ) -> Optional[Tuple[str, Tuple[Any, ...]]]:
+        """INSERT for the store, to be committed together with the SUCCESS event.
+
+        Returns ``None`` if the store table does not exist. Call
+        :meth:`remember` once the transaction has committed.
+        """
+        if not self._has_store():
+            return None
+        return (
+            f"INSERT INTO {IDEMPOTENCY_TABLE} (saga_id, step_name, idempotency_key, event_id) "
+            "VALUES (?, ?, ?, ?) ON CONFLICT DO NOTHING",
+            (saga_id, step_name, str(idempotency_key), event_id),
+        )
+
+    def record(self, saga_id: str, step_name: str, idempotency_key: str, event_id: Optional[str] = None) -> None:
+        """Mark the step as succeeded (idempotent, duplicates are ignored)."""
+        statement = self.record_statement(saga_id, step_name, idempotency_key, event_id)
+        if statement is not None:
+            try:
+                self.backend.execute_query(*statement)
+            except Exception as exc:
+                logger.debug("Idempotency record failed for %s/%s: %s", saga_id, step_name, exc)
+                return
+        self.remember(saga_id, step_name, idempotency_key)
+
+    def remember(self, saga_id: str, step_name: str, idempotency_key: str) -> None:
+        """Add a committed key to the in-process LRU."""
+        self._remember((saga_id, step_name, str(idempotency_key)))
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "cached_keys": len(self._cache),
+                "cache_hits": self.cache_hits,
+                "index_lookups": self.index_lookups,
+                "legacy_lookups": self.legacy_lookups,
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _has_store(self) -> bool:
+        return bool(get_schema_cache(self.backend).columns(IDEMPOTENCY_TABLE))
+
+    def _remember(self, entry: IdempotencyEntry) -> None:
+        if not self.cache_size:
+            return
+        with self._lock:
+            self._cache[entry] = True
+            self._cache.move_to_end(entry)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _legacy_contains(self, saga_id: str, step_name: str, idempotency_key: str) -> bool:
+        with self._lock:
+            self.legacy_lookups += 1
+        if get_schema_cache(self.backend).has_column("uds3_saga_events", "idempotency_key"):
+            q = 'SELECT status FROM uds3_saga_events WHERE saga_id = ? AND step_name = ? AND idempotency_key = ?'
+            rows = self.backend.execute_query(q, (saga_id, step_name, idempotency_key))
+        else:
+            q = 'SELECT status FROM uds3_saga_events WHERE saga_id = ? AND step_name = ? AND payload LIKE ?'
+            rows = self.backend.execute_query(q, (saga_id, step_name, f'%{idempotency_key}%'))
+        return any(r.get('status') == 'SUCCESS' for r in rows or [])
+
+
+def get_idempotency_store(backend: Any) -> IdempotencyStore:
+    """Return the idempotency store attached to ``backend`` (created on first use)."""
+    store = getattr(backend, STORE_ATTR, None)
+    if isinstance(store, IdempotencyStore):
+        return store
+    store = IdempotencyStore(backend)
+    try:
+        setattr(backend, STORE_ATTR, store)
+    except Exception:  # pragma: no cover - backends with __slots__ stay uncached
+        logger.debug("Backend %r does not accept an idempotency store", type(backend).__name__)
+    return store
+
+
+__all__ = [
+    "IdempotencyStore",
+    "get_idempotency_store",
+]
@@ -11,15 +11,19 @@ License: MIT with Government Partnership Commons Clause
 Repository: https://github.com/makr-code/VCC-UDS3
 """
 
+import os
 import time
 import uuid
 import logging
 import json
-from typing import Any, Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from .saga_compensations import get as get_compensation
 from .saga_compensations import register as register_compensation
 from .saga_crud import SagaDatabaseCRUD
+from .saga_idempotency import get_idempotency_store
+from .schema_cache import get_schema_cache
 from .database_manager import DatabaseManager
 from . import config
 
@@ -30,11 +34,20 @@ except Exception:  # pragma: no cover - optional dependency during cold start
 
 logger = logging.getLogger(__name__)
 
+SAGA_MAX_PARALLEL_STEPS = int(os.getenv("SAGA_MAX_PARALLEL_STEPS", "4"))
+
 
 class SagaOrchestrator:
-    def __init__(self, manager: Optional[DatabaseManager] = None):
+    def __init__(
+        self,
+        manager: Optional[DatabaseManager] = None,
+        event_durability: Optional[str] = None,
+        max_parallel_steps: Optional[int] = None,
+    ):
         self.manager = manager or DatabaseManager(config.get_database_backend_dict())
-        self.crud = SagaDatabaseCRUD(manager=self.manager)
+        self.crud = SagaDatabaseCRUD(manager=self.manager, event_durability=event_durability)
+        # Upper bound for concurrently running steps of a DAG saga (depends_on)
+        self.max_parallel_steps = max(1, max_parallel_steps or SAGA_MAX_PARALLEL_STEPS)
 
     def _get_relational(self):
         try:
@@ -137,13 +150,10 @@ class SagaOrchestrator:
         if rel:
             try:
                 # insert into uds3_sagas in a schema-aware way
-                try:
-                    schema = rel.get_table_schema('uds3_sagas') if hasattr(rel, 'get_table_schema') else {}
-                except Exception:
-                    schema = {}
+                schema = get_schema_cache(rel).columns('uds3_sagas') if hasattr(rel, 'get_table_schema') else None
 
                 if schema:
-                    allowed = set(schema.keys())
+                    allowed = set(schema)
                     filtered = {k: v for k, v in saga_record.items() if k in allowed}
                     if filtered:
                         # If the target table doesn't have a conventional 'id' column, avoid rel.insert
@@ -172,7 +182,13 @@ class SagaOrchestrator:
                 logger.debug('Could not insert saga record; continuing')
         return saga_id
 
-    def execute_saga(self, saga_id: str, max_retries: int = 3, start_at: Optional[int] = None) -> Dict[str, Any]:
+    def execute_saga(
+        self,
+        saga_id: str,
+        max_retries: int = 3,
+        start_at: Optional[int] = None,
+        completed_steps: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
         # Load saga context from uds3_sagas
         rel = self._ensure_schema()
         if not rel:
@@ -185,76 +201,39 @@ class SagaOrchestrator:
         context = json.loads(saga.get('context') or '{}')
         steps = context.get('steps') or []
 
+        # Steps with depends_on declarations run as a DAG
+        dependencies = None
+        if any(step.get('depends_on') for step in steps):
+            try:
+                dependencies = self._build_step_graph(steps)
+            except ValueError as exc:
+                return {'success': False, 'error': str(exc)}
+
         # Acquire best-effort lock
         lock = self._acquire_lock(saga_id)
 
         executed_steps: List[Dict[str, Any]] = []
+        idempotency = get_idempotency_store(rel)
         start_idx = int(start_at) if start_at is not None else 0
+        completed = set(completed_steps or ())
         try:
-            for idx, step in enumerate(steps[start_idx:], start=start_idx):
-                step_id = step.get('step_id') or f'step_{idx}'
-                backend_name = step.get('backend')
-                operation = step.get('operation')
-                payload = step.get('payload') or {}
-                compensation = step.get('compensation')
-                idempotency_key = step.get('idempotency_key')
-
-                # Write-ahead PENDING
-                self.crud.write_saga_event(saga_id, step_id, 'PENDING', payload)
-
-                # Idempotency check: if a SUCCESS event for this idempotency_key exists, skip
-                if idempotency_key:
-                    # Prefer indexed idempotency_key column if available
-                    tried = False
-                    try:
-                        schema = rel.get_table_schema('uds3_saga_events') if hasattr(rel, 'get_table_schema') else {}
-                    except Exception:
-                        schema = {}
-
-                    if isinstance(schema, dict) and 'idempotency_key' in schema:
-                        q = 'SELECT status FROM uds3_saga_events WHERE saga_id = ? AND step_name = ? AND idempotency_key = ?'
-                        rows = rel.execute_query(q, (saga_id, step_id, idempotency_key))
-                        tried = True
-                        if any(r.get('status') == 'SUCCESS' for r in rows):
-                            logger.debug('Skipping step %s due to idempotency (column)', step_id)
-                            executed_steps.append({'step_id': step_id, 'skipped': True})
-                            continue
-
-                    if not tried:
-                        q = 'SELECT status FROM uds3_saga_events WHERE saga_id = ? AND step_name = ? AND payload LIKE ?'
-                        rows = rel.execute_query(q, (saga_id, step_id, f'%{idempotency_key}%'))
-                        if any(r.get('status') == 'SUCCESS' for r in rows):
-                            logger.debug('Skipping step %s due to idempotency (payload)', step_id)
-                            executed_steps.append({'step_id': step_id, 'skipped': True})
-                            continue
-                        logger.debug('Skipping step %s due to idempotency', step_id)
-                        executed_steps.append({'step_id': step_id, 'skipped': True})
+            if dependencies is not None:
+                error = self._execute_dag(saga_id, steps, dependencies, start_idx, completed, max_retries, idempotency, executed_steps)
+            else:
+                error = None
+                for idx, step in enumerate(steps[start_idx:], start=start_idx):
+                    if (step.get('step_id') or f'step_{idx}') in completed:
                         continue
+                    outcome = self._run_step(saga_id, idx, step, max_retries, idempotency)
+                    if outcome.get('success') is False:
+                        error = outcome['error']
+                        break
+                    executed_steps.append(outcome)
 
-                # Retry logic
-                attempt = 0
-                while attempt <= max_retries:
-                    attempt += 1
-                    start = time.time()
-                    try:
-                        result = self._execute_step(step, payload)
-                        duration = int((time.time() - start) * 1000)
-                        if result.get('success'):
-                            self.crud.write_saga_event(saga_id, step_id, 'SUCCESS', payload)
-                            executed_steps.append({'step_id': step_id, 'success': True, 'duration_ms': duration, 'payload': payload, 'compensation': compensation})
-                            break
-                        else:
-                            raise Exception(result.get('error') or 'step failed')
-                    except Exception as exc:
-                        logger.debug('Step %s attempt %d failed: %s', step_id, attempt, exc)
-                        if attempt > max_retries:
-                            # fail the saga
-                            self.crud.write_saga_event(saga_id, step_id, 'FAIL', payload, error=str(exc))
-                            # trigger compensation for executed steps
-                            self.compensate_saga(saga_id, executed_steps)
-                            return {'success': False, 'error': str(exc), 'executed': executed_steps}
-                        # backoff
-                        time.sleep(0.1 * (2 ** (attempt - 1)))
+            if error is not None:
+                # trigger compensation for executed steps (reverse completion order)
+                self.compensate_saga(saga_id, executed_steps)
+                return {'success': False, 'error': error, 'executed': executed_steps}
 
             # Completed all steps
             try:
@@ -265,6 +244,132 @@ class SagaOrchestrator:
         finally:
             self._release_lock(lock)
 
+    def _run_step(self, saga_id: str, idx: int, step: Dict[str, Any], max_retries: int, idempotency) -> Dict[str, Any]:
+        """Run one step with write-ahead event, idempotency check and retries.
+
+        Returns the executed/skipped entry, or ``{'success': False, 'error': ...}``
+        after the FAIL event has been written.
+        """
+        step_id = step.get('step_id') or f'step_{idx}'
+        payload = step.get('payload') or {}
+        compensation = step.get('compensation')
+        idempotency_key = step.get('idempotency_key')
+
+        # Write-ahead PENDING
+        self.crud.write_saga_event(saga_id, step_id, 'PENDING', payload, idempotency_key=idempotency_key)
+
+        # Idempotency check: indexed store lookup (LRU hit or point query), no event scan
+        if idempotency_key and idempotency.contains(saga_id, step_id, idempotency_key):
+            logger.debug('Skipping step %s due to idempotency', step_id)
+            return {'step_id': step_id, 'skipped': True}
+
+        # Retry logic
+        attempt = 0
+        while attempt <= max_retries:
+            attempt += 1
+            start = time.time()
+            try:
+                result = self._execute_step(step, payload)
+                duration = int((time.time() - start) * 1000)
+                if result.get('success'):
+                    self.crud.write_saga_event(saga_id, step_id, 'SUCCESS', payload, idempotency_key=idempotency_key, duration_ms=duration)
+                    return {'step_id': step_id, 'success': True, 'duration_ms': duration, 'payload': payload, 'compensation': compensation}
+                raise Exception(result.get('error') or 'step failed')
+            except Exception as exc:
+                logger.debug('Step %s attempt %d failed: %s', step_id, attempt, exc)
+                if attempt > max_retries:
+                    # fail the saga
+                    duration = int((time.time() - start) * 1000)
+                    self.crud.write_saga_event(saga_id, step_id, 'FAIL', payload, error=str(exc), duration_ms=duration)
+                    return {'step_id': step_id, 'success': False, 'error': str(exc)}
+                # backoff
+                time.sleep(0.1 * (2 ** (attempt - 1)))
+        return {'step_id': step_id, 'success': False, 'error': 'step failed'}  # pragma: no cover - loop always returns
+
+    @staticmethod
+    def _build_step_graph(steps: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """Map step_id -> dependencies; raises ValueError for unknown deps or cycles."""
+        step_ids = [step.get('step_id') or f'step_{idx}' for idx, step in enumerate(steps)]
+        known = set(step_ids)
+        graph: Dict[str, List[str]] = {}
+        for step_id, step in zip(step_ids, steps):
+            deps = step.get('depends_on') or []
+            deps = [deps] if isinstance(deps, str) else list(deps)
+            unknown = [dep for dep in deps if dep not in known]
+            if unknown:
+                raise ValueError(f'Step {step_id} depends on unknown steps: {unknown}')
+            graph[step_id] = deps
+
+        # Kahn: every step must become ready eventually
+        remaining = {step_id: len(deps) for step_id, deps in graph.items()}
+        dependents: Dict[str, List[str]] = {step_id: [] for step_id in graph}
+        for step_id, deps in graph.items():
+            for dep in deps:
+                dependents[dep].append(step_id)
+        ready = [step_id for step_id, count in remaining.items() if count == 0]
+        visited = 0
+        while ready:
+            current = ready.pop()
+            visited += 1
+            for child in dependents[current]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+        if visited != len(graph):
+            cyclic = sorted(step_id for step_id, count in remaining.items() if count > 0)
+            raise ValueError(f'Saga steps contain a dependency cycle: {cyclic}')
+        return graph
+
+    def _execute_dag(
+        self,
+        saga_id: str,
+        steps: List[Dict[str, Any]],
+        dependencies: Dict[str, List[str]],
+        start_idx: int,
+        completed: Set[str],
+        max_retries: int,
+        idempotency,
+        executed_steps: List[Dict[str, Any]],
+    ) -> Optional[str]:
+        """Run steps as soon as their dependencies succeeded, at most
+        ``max_parallel_steps`` at a time. Completed steps are appended to
+        ``executed_steps`` in completion order, which is a topological order,
+        so compensating in reverse stays reverse-topological. After a failure
+        no new steps are started; in-flight steps are awaited. Returns the
+        first error or ``None``.
+
+        On resume, ``completed`` holds the step ids that already have a SUCCESS
+        event; DAG steps finish out of order, so they are not necessarily a
+        prefix of ``steps``.
+        """
+        step_ids = [step.get('step_id') or f'step_{idx}' for idx, step in enumerate(steps)]
+        # Resume: steps before start_at and steps with a SUCCESS event are done
+        done = set(step_ids[:start_idx]) | completed
+        pending = [(idx, step_id) for idx, step_id in enumerate(step_ids) if step_id not in done]
+        running: Dict[Future, str] = {}
+        error: Optional[str] = None
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel_steps, thread_name_prefix='uds3-saga-step') as pool:
+            while pending or running:
+                if error is None:
+                    ready = [(idx, step_id) for idx, step_id in pending if all(dep in done for dep in dependencies[step_id])]
+                    for idx, step_id in ready:
+                        pending.remove((idx, step_id))
+                        future = pool.submit(self._run_step, saga_id, idx, steps[idx], max_retries, idempotency)
+                        running[future] = step_id
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step_id = running.pop(future)
+                    outcome = future.result()
+                    if outcome.get('success') is False:
+                        error = error or outcome['error']
+                    else:
+                        executed_steps.append(outcome)
+                        done.add(step_id)
+        return error
+
     def _execute_step(self, step: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
         # Delegates to SagaDatabaseCRUD for common operations, otherwise best-effort
         backend = step.get('backend')
@@ -378,8 +483,9 @@ class SagaOrchestrator:
         if resume_index >= len(steps):
             return {'resumed': False, 'reason': 'Nothing to resume', 'resume_index': resume_index}
 
-        # Call execute_saga starting at resume_index
-        return self.execute_saga(saga_id, start_at=resume_index)
+        # Call execute_saga starting at resume_index; succeeded steps after it
+        # (DAG steps finish out of order) are skipped, not re-executed
+        return self.execute_saga(saga_id, start_at=resume_index, completed_steps=success_steps)
 
 
 __all__ = ['SagaOrchestrator']
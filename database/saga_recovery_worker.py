@@ -4,6 +4,10 @@
 saga_recovery_worker.py
 
 SAGA pattern implementation
+Recovery of open sagas after an outage: paginated scan ordered by age, row
+leases so several worker processes can share the backlog without executing a
+saga twice, a bounded worker pool and per-saga backoff scheduled through a
+priority queue (a failing saga never blocks the others).
 
 Part of UDS3 (Unified Database Strategy v3)
 Author: Martin Krüger (ma.krueger@outlook.com)
@@ -11,53 +15,253 @@ License: MIT with Government Partnership Commons Clause
 Repository: https://github.com/makr-code/VCC-UDS3
 """
 
-import time
+import heapq
+import itertools
 import logging
-from typing import Optional
+import os
+import socket
+import time
+import uuid
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional
 
 from database.database_manager import DatabaseManager
 from database.saga_orchestrator import SagaOrchestrator
+from database.schema_cache import get_schema_cache
 from database import config
 
+try:
+    from core.metrics import metrics
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+OPEN_SAGA_FILTER = "status NOT IN ('completed','compensated','aborted')"
+
+SAGA_RECOVERY_WORKERS = int(os.getenv("SAGA_RECOVERY_WORKERS", "4"))
+SAGA_RECOVERY_PAGE_SIZE = int(os.getenv("SAGA_RECOVERY_PAGE_SIZE", "100"))
+SAGA_RECOVERY_LEASE_SECONDS = float(os.getenv("SAGA_RECOVERY_LEASE_SECONDS", "300"))
+
 
 class SagaRecoveryWorker:
-    def __init__(self, manager: Optional[DatabaseManager] = None):
+    """Resumes open sagas concurrently.
+
+    Args:
+        manager: DatabaseManager with a relational backend
+        worker_id: Lease owner id (default: host:pid:random)
+        max_workers: Sagas resumed concurrently
+        page_size: Rows per scan page (keyset pagination over created_at, saga_id)
+        lease_seconds: Lease duration; expired leases can be taken over
+        backoff_base: Backoff after the n-th failure is backoff_base * 2**n seconds
+        shard_index / shard_count: Only handle sagas with crc32(saga_id) % shard_count == shard_index
+    """
+
+    def __init__(
+        self,
+        manager: Optional[DatabaseManager] = None,
+        *,
+        worker_id: Optional[str] = None,
+        max_workers: int = SAGA_RECOVERY_WORKERS,
+        page_size: int = SAGA_RECOVERY_PAGE_SIZE,
+        lease_seconds: float = SAGA_RECOVERY_LEASE_SECONDS,
+        backoff_base: float = 0.1,
+        shard_index: int = 0,
+        shard_count: int = 1,
+    ):
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"shard_index must be in [0, {shard_count}), got {shard_index}")
         self.manager = manager or DatabaseManager(config.get_database_backend_dict())
         self.orch = SagaOrchestrator(manager=self.manager)
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.max_workers = max(1, max_workers)
+        self.page_size = max(1, page_size)
+        self.lease_seconds = lease_seconds
+        self.backoff_base = backoff_base
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.stats: Dict[str, Any] = {}
 
+    # ------------------------------------------------------------------
+    # Scan & Leasing
+    # ------------------------------------------------------------------
     def _list_open_sagas(self):
+        return list(self._iter_open_sagas())
+
+    def _iter_open_sagas(self) -> Iterator[str]:
+        """Yield open saga ids of this shard, oldest first, one page per query."""
         rel = self.manager.get_relational_backend()
         if not rel:
-            return []
-        rows = rel.execute_query("SELECT saga_id, status FROM uds3_sagas WHERE status NOT IN ('completed','compensated','aborted')")
-        return [r['saga_id'] for r in rows]
-
-    def run_once(self, max_retries: int = 3):
-        sagas = self._list_open_sagas()
-        results = {}
-        for saga_id in sagas:
-            attempt = 0
-            while attempt < max_retries:
-                try:
-                    res = self.orch.resume_saga(saga_id)
-                    results[saga_id] = res
+            return
+        last_created, last_id = '', ''
+        while True:
+            rows = rel.execute_query(
+                "SELECT saga_id, COALESCE(created_at, '') AS created_key FROM uds3_sagas "
+                f"WHERE {OPEN_SAGA_FILTER} "
+                "AND (COALESCE(created_at, '') > ? OR (COALESCE(created_at, '') = ? AND saga_id > ?)) "
+                "ORDER BY created_key, saga_id LIMIT ?",
+                (last_created, last_created, last_id, self.page_size),
+            ) or []
+            for row in rows:
+                if self._in_shard(row['saga_id']):
+                    yield row['saga_id']
+            if len(rows) < self.page_size:
+                return
+            last_created, last_id = str(rows[-1]['created_key']), rows[-1]['saga_id']
+
+    def _in_shard(self, saga_id: str) -> bool:
+        return self.shard_count == 1 or zlib.crc32(saga_id.encode('utf-8')) % self.shard_count == self.shard_index
+
+    def _count_open_sagas(self) -> int:
+        """Open sagas of this shard; the shard hash is not available in SQL."""
+        if self.shard_count > 1:
+            return sum(1 for _ in self._iter_open_sagas())
+        rel = self.manager.get_relational_backend()
+        if not rel:
+            return 0
+        rows = rel.execute_query(f"SELECT COUNT(*) AS n FROM uds3_sagas WHERE {OPEN_SAGA_FILTER}") or []
+        return int(rows[0]['n']) if rows else 0
+
+    def _leasing_supported(self) -> bool:
+        rel = self.manager.get_relational_backend()
+        return bool(rel) and get_schema_cache(rel).has_column('uds3_sagas', 'lease_owner')
+
+    def _acquire_lease(self, saga_id: str, until: float) -> bool:
+        """Atomic compare-and-set: free, own or expired leases can be taken."""
+        if not self._leasing_supported():
+            # Schema without lease columns: single-worker behaviour
+            return True
+        rel = self.manager.get_relational_backend()
+        rows = rel.execute_query(
+            "UPDATE uds3_sagas SET lease_owner = ?, lease_expires_at = ? "
+            "WHERE saga_id = ? AND (lease_owner IS NULL OR lease_owner = ? OR lease_expires_at < ?)",
+            (self.worker_id, until, saga_id, self.worker_id, time.time()),
+        )
+        return bool(rows) and rows[0].get('affected_rows', 0) == 1
+
+    def _release_lease(self, saga_id: str) -> None:
+        if not self._leasing_supported():
+            return
+        rel = self.manager.get_relational_backend()
+        try:
+            rel.execute_query(
+                "UPDATE uds3_sagas SET lease_owner = NULL, lease_expires_at = NULL WHERE saga_id = ? AND lease_owner = ?",
+                (saga_id, self.worker_id),
+            )
+        except Exception as exc:  # pragma: no cover - lease expires anyway
+            logger.debug('Lease release for %s failed: %s', saga_id, exc)
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+    def run_once(self, max_retries: int = 3) -> Dict[str, Any]:
+        """Drain the open-saga backlog once; returns {saga_id: resume result}.
+
+        Each saga gets up to ``max_retries`` attempts. Failed attempts are
+        rescheduled in a priority queue ordered by their next due time while
+        other sagas keep running on the pool; the lease is extended across
+        the backoff so no other worker picks the saga up meanwhile.
+        """
+        started = time.monotonic()
+        self.orch._ensure_schema()  # adds the lease columns on older schemas
+        backlog = self._count_open_sagas()
+        self.stats = {'backlog': backlog, 'drained': 0, 'failed': 0, 'lease_conflicts': 0, 'retries': 0}
+        self._observe_backlog(backlog)
+
+        results: Dict[str, Any] = {}
+        scan = self._iter_open_sagas()
+        scan_done = False
+        seq = itertools.count()
+        schedule: List[tuple] = []  # (due, seq, saga_id, attempt)
+        running: Dict[Any, tuple] = {}
+        prefetch = self.max_workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='uds3-saga-recovery') as pool:
+            while True:
+                # Refill the schedule from the age-ordered scan (bounded prefetch)
+                while not scan_done and len(schedule) + len(running) < prefetch:
+                    saga_id = next(scan, None)
+                    if saga_id is None:
+                        scan_done = True
+                        break
+                    if self._acquire_lease(saga_id, time.time() + self.lease_seconds):
+                        heapq.heappush(schedule, (time.monotonic(), next(seq), saga_id, 0))
+                    else:
+                        self.stats['lease_conflicts'] += 1
+                        self._observe_backlog(self._remaining(backlog))
+
+                # Dispatch everything that is due
+                now = time.monotonic()
+                while schedule and schedule[0][0] <= now and len(running) < self.max_workers:
+                    _, _, saga_id, attempt = heapq.heappop(schedule)
+                    running[pool.submit(self.orch.resume_saga, saga_id)] = (saga_id, attempt)
+
+                if not running and not schedule and scan_done:
                     break
-                except Exception as exc:
-                    attempt += 1
-                    sleep = 0.1 * (2 ** attempt)
-                    logger.debug('Resume for %s failed attempt %d: %s', saga_id, attempt, exc)
-                    time.sleep(sleep)
-                    continue
+
+                timeout = max(0.0, schedule[0][0] - time.monotonic()) if schedule else None
+                if running:
+                    finished, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                else:
+                    # Only sagas in backoff are left
+                    time.sleep(timeout or 0)
+                    finished = set()
+
+                for future in finished:
+                    saga_id, attempt = running.pop(future)
+                    try:
+                        results[saga_id] = future.result()
+                    except Exception as exc:
+                        attempt += 1
+                        logger.debug('Resume for %s failed attempt %d: %s', saga_id, attempt, exc)
+                        if attempt < max_retries:
+                            delay = self.backoff_base * (2 ** attempt)
+                            if not self._acquire_lease(saga_id, time.time() + delay + self.lease_seconds):
+                                # Lease expired and another worker took the saga over
+                                self.stats['lease_conflicts'] += 1
+                                self._observe_backlog(self._remaining(backlog))
+                                continue
+                            heapq.heappush(schedule, (time.monotonic() + delay, next(seq), saga_id, attempt))
+                            self.stats['retries'] += 1
+                            continue
+                        self.stats['failed'] += 1
+                        self._observe_drained('failed')
+                    else:
+                        self.stats['drained'] += 1
+                        self._observe_drained('resumed')
+                    self._release_lease(saga_id)
+                    self._observe_backlog(self._remaining(backlog))
+
+        elapsed = time.monotonic() - started
+        self.stats['seconds'] = elapsed
+        self.stats['drain_rate'] = self.stats['drained'] / elapsed if elapsed > 0 else 0.0
         return results
 
+    def _remaining(self, backlog: int) -> int:
+        """Backlog minus sagas this run finished or left to other workers."""
+        return backlog - self.stats['drained'] - self.stats['failed'] - self.stats['lease_conflicts']
+
+    def _observe_backlog(self, value: int) -> None:
+        if METRICS_AVAILABLE:
+            metrics.saga_recovery_backlog.labels(worker=self.worker_id).set(max(0, value))
+
+    def _observe_drained(self, result: str) -> None:
+        if METRICS_AVAILABLE:
+            metrics.saga_recovery_drained.labels(worker=self.worker_id, result=result).inc()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters of the last run_once (backlog, drained, failed, drain_rate, ...)."""
+        return dict(self.stats)
+
 
 def main():
     logging.basicConfig(level=logging.INFO)
     worker = SagaRecoveryWorker()
     res = worker.run_once()
     logger.info('Recovery run results: %s', res)
+    logger.info('Recovery stats: %s', worker.get_stats())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+schema_cache.py
+
+Per-backend table schema cache with precompiled insert statements.
+Saga events and audit rows are written for every saga step; introspecting
+`uds3_saga_events` / `uds3_audit_log` (``get_table_schema`` or
+``PRAGMA table_info``) before each insert costs extra metadata round trips.
+The cache lives on the relational backend instance itself (same idiom as the
+``_uds3_saga_schema_ready`` flag), so it is naturally scoped per backend and
+shared by every caller holding that backend. Migrations invalidate it
+explicitly via :func:`invalidate_schema_cache`.
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_ATTR = "_uds3_schema_cache"
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedInsert:
+    """Precompiled INSERT for a fixed (table, record keys) combination."""
+
+    table: str
+    columns: Tuple[str, ...]
+    sql: str
+
+    def bind(self, record: Mapping[str, Any]) -> Tuple[Any, ...]:
+        """Return the parameter tuple for ``record`` in column order."""
+        return tuple(record.get(column) for column in self.columns)
+
+
+class TableSchemaCache:
+    """Caches table column lists and INSERT statements for one backend.
+
+    ``columns()`` returns ``None`` when the schema cannot be determined
+    (backend without introspection or introspection error); such results are
+    not cached so a later call can retry. An empty schema (table missing) is
+    cached until the next invalidation.
+    """
+
+    def __init__(self, backend: Any) -> None:
+        self._backend = backend
+        self._columns: Dict[str, Optional[Tuple[str, ...]]] = {}
+        self._inserts: Dict[Tuple[str, Tuple[str, ...]], Optional[PreparedInsert]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    def _introspect(self, table: str) -> Optional[Tuple[str, ...]]:
+        backend = self._backend
+        if hasattr(backend, "get_table_schema"):
+            schema = backend.get_table_schema(table)
+            return tuple(schema.keys()) if isinstance(schema, dict) else None
+        if hasattr(backend, "execute_query"):
+            # Fallback: PRAGMA (SQLite)
+            rows = backend.execute_query(f"PRAGMA table_info({table})")
+            return tuple(r["name"] for r in rows or [])
+        return None
+
+    def columns(self, table: str) -> Optional[Tuple[str, ...]]:
+        """Return the cached column tuple of ``table`` (introspecting once)."""
+        with self._lock:
+            if table in self._columns:
+                self.hits += 1
+                return self._columns[table]
+        try:
+            cols = self._introspect(table)
+        except Exception as exc:
+            logger.debug("Schema introspection failed for %s: %s", table, exc)
+            cols = None
+        with self._lock:
+            self.misses += 1
+            if cols is not None:
+                self._columns[table] = cols
+        return cols
+
+    def has_column(self, table: str, column: str) -> bool:
+        cols = self.columns(table)
+        return bool(cols) and column in cols
+
+    # ------------------------------------------------------------------
+    # Prepared statements
+    # ------------------------------------------------------------------
+    def prepared_insert(self, table: str, keys: Iterable[str]) -> Optional[PreparedInsert]:
+        """Return the INSERT for the record keys present in ``table``.
+
+        Returns ``None`` when the schema is unknown, when the table only has a
+        single JSON ``data`` column, or when no record key matches a column;
+        callers then fall back to ``insert_record``/``insert``.
+        """
+        key_tuple = tuple(keys)
+        cache_key = (table, key_tuple)
+        with self._lock:
+            if cache_key in self._inserts:
+                self.hits += 1
+                return self._inserts[cache_key]
+        cols = self.columns(table)
+        if not cols or cols == ("data",):
+            return None
+        insert_cols = tuple(k for k in key_tuple if k in cols)
+        prepared = None
+        if insert_cols:
+            placeholders = ", ".join("?" for _ in insert_cols)
+            prepared = PreparedInsert(
+                table=table,
+                columns=insert_cols,
+                sql=f"INSERT INTO {table} ({', '.join(insert_cols)}) VALUES ({placeholders})",
+            )
+        with self._lock:
+            # Only cache once the column list itself is cached (see columns())
+            if table in self._columns:
+                self._inserts[cache_key] = prepared
+        return prepared
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+    def invalidate(self, table: Optional[str] = None) -> None:
+        """Drop cached schemas and statements for ``table`` (or all tables)."""
+        with self._lock:
+            self.invalidations += 1
+            if table is None:
+                self._columns.clear()
+                self._inserts.clear()
+                return
+            self._columns.pop(table, None)
+            for key in [k for k in self._inserts if k[0] == table]:
+                del self._inserts[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "tables": len(self._columns),
+                "prepared_inserts": len(self._inserts),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+
+def get_schema_cache(backend: Any) -> TableSchemaCache:
+    """Return the schema cache attached to ``backend`` (created on first use)."""
+    cache = getattr(backend, CACHE_ATTR, None)
+    if isinstance(cache, TableSchemaCache):
+        return cache
+    cache = TableSchemaCache(backend)
+    try:
+        setattr(backend, CACHE_ATTR, cache)
+    except Exception:  # pragma: no cover - backends with __slots__ stay uncached
+        logger.debug("Backend %r does not accept a schema cache", type(backend).__name__)
+    return cache
+
+
+def invalidate_schema_cache(backend: Any, table: Optional[str] = None) -> None:
+    """Invalidate the cached schema of ``backend``; no-op if nothing is cached."""
+    cache = getattr(backend, CACHE_ATTR, None)
+    if isinstance(cache, TableSchemaCache):
+        cache.invalidate(table)
+
+
+__all__ = [
+    "PreparedInsert",
+    "TableSchemaCache",
+    "get_schema_cache",
+    "invalidate_schema_cache",
+]
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_saga_dag.py
+
+DAG-Ausführung von Saga-Schritten mit depends_on (database/saga_orchestrator.py)
+(parallele unabhängige Schritte, Abhängigkeiten, reverse-topologische Kompensation)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import sys
+import pathlib
+import threading
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from database import db_migrations
+from database.database_api_sqlite import SQLiteRelationalBackend
+from database.database_manager import DatabaseManager
+from database.saga_compensations import register as register_compensation
+from database.saga_orchestrator import SagaOrchestrator
+
+COMPENSATED = []
+register_compensation('dag_test_undo', lambda payload, ctx: COMPENSATED.append(payload['name']) or True)
+
+
+class TimedOrchestrator(SagaOrchestrator):
+    """Schritte schlafen payload['sleep'] Sekunden; payload['fail'] lässt sie scheitern"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timeline = {}
+        self._lock = threading.Lock()
+
+    def _execute_step(self, step, payload):
+        started = time.perf_counter()
+        time.sleep(payload.get('sleep', 0))
+        with self._lock:
+            self.timeline[payload['name']] = (started, time.perf_counter())
+        if payload.get('fail'):
+            return {'success': False, 'error': f"{payload['name']} failed"}
+        return {'success': True}
+
+
+def make_orch(tmp_path, **kwargs):
+    rel = SQLiteRelationalBackend({'database_path': str(tmp_path / 'dag.db')})
+    rel._backend_connect()
+    db_migrations.ensure_saga_schema(rel)
+    mgr = DatabaseManager({'relational': {'enabled': False}})
+    mgr.relational_backend = rel
+    mgr.get_graph_backend = lambda: None
+    mgr.get_vector_backend = lambda: None
+    return TimedOrchestrator(manager=mgr, **kwargs), rel
+
+
+def _step(name, depends_on=None, **payload):
+    step = {'step_id': name, 'backend': 'test', 'operation': 'noop',
+            'payload': {'name': name, 'compensation': 'dag_test_undo', **payload}}
+    if depends_on:
+        step['depends_on'] = depends_on
+    return step
+
+
+def test_independent_steps_run_concurrently(tmp_path):
+    orch, rel = make_orch(tmp_path, max_parallel_steps=4)
+    steps = [_step('relational', sleep=0.2), _step('vector', sleep=0.2), _step('graph', sleep=0.2),
+             _step('index', depends_on=['relational', 'vector', 'graph'])]
+    saga_id = orch.create_saga('dag_ingest', steps)
+
+    start = time.perf_counter()
+    result = orch.execute_saga(saga_id)
+    elapsed = time.perf_counter() - start
+
+    assert result['success'] and len(result['executed']) == 4
+    assert elapsed < 0.5  # max(backends) statt sum(backends)
+    index_start = orch.timeline['index'][0]
+    assert all(orch.timeline[name][1] <= index_start for name in ('relational', 'vector', 'graph'))
+
+    rows = rel.execute_query(
+        'SELECT step_name, duration_ms FROM uds3_saga_events WHERE saga_id = ? AND status = ?', (saga_id, 'SUCCESS'))
+    durations = {r['step_name']: r['duration_ms'] for r in rows}
+    assert durations['vector'] >= 200 and durations['index'] is not None
+
+
+def test_pool_bound_is_respected(tmp_path):
+    orch, _ = make_orch(tmp_path, max_parallel_steps=2)
+    steps = [_step(f's{i}', sleep=0.1) for i in range(4)] + [_step('last', depends_on='s0')]
+    saga_id = orch.create_saga('bounded', steps)
+
+    start = time.perf_counter()
+    assert orch.execute_saga(saga_id)['success']
+    assert time.perf_counter() - start >= 0.2
+
+
+def test_failure_compensates_in_reverse_topological_order(tmp_path):
+    COMPENSATED.clear()
+    orch, _ = make_orch(tmp_path)
+    steps = [_step('a'), _step('b', depends_on=['a'], sleep=0.05), _step('c', depends_on=['a'], sleep=0.1, fail=True),
+             _step('d', depends_on=['b', 'c'])]
+    saga_id = orch.create_saga('failing', steps)
+
+    result = orch.execute_saga(saga_id, max_retries=0)
+
+    assert result['success'] is False and result['error'] == 'c failed'
+    assert 'd' not in orch.timeline  # nach Fehler wird nichts mehr gestartet
+    assert [s['step_id'] for s in result['executed']] == ['a', 'b']
+    assert COMPENSATED == ['b', 'a']
+
+
+def test_invalid_graph_is_rejected_before_execution(tmp_path):
+    orch, _ = make_orch(tmp_path)
+    cyclic = orch.create_saga('cycle', [_step('a', depends_on=['b']), _step('b', depends_on=['a'])])
+    unknown = orch.create_saga('unknown', [_step('a', depends_on=['missing'])])
+
+    assert 'cycle' in orch.execute_saga(cyclic)['error']
+    assert 'unknown' in orch.execute_saga(unknown)['error']
+    assert orch.timeline == {}
+
+
+def test_resume_skips_steps_that_succeeded_out_of_order(tmp_path):
+    orch, rel = make_orch(tmp_path)
+    steps = [_step('a'), _step('b'), _step('c'), _step('d', depends_on=['a', 'b', 'c'])]
+    saga_id = orch.create_saga('resume', steps)
+    # Vorheriger Lauf: a und c erfolgreich, b nie abgeschlossen
+    for name in ('a', 'c'):
+        orch.crud.write_saga_event(saga_id, name, 'SUCCESS', {'name': name})
+
+    result = orch.resume_saga(saga_id)
+
+    assert result['success']
+    assert sorted(orch.timeline) == ['b', 'd']
+    assert [s['step_id'] for s in result['executed']] == ['b', 'd']
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_saga_group_commit.py
+
+Group-Commit Write-Ahead-Log für Saga-Events (database/saga_event_writer.py)
+(Micro-Batches über konkurrierende Sagas, begrenztes Latenzfenster, Durability-Modi)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import sys
+import pathlib
+import threading
+import time
+import uuid
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from database.saga_crud import SagaDatabaseCRUD
+from database.database_manager import DatabaseManager
+from database.database_api_sqlite import SQLiteRelationalBackend
+from database.saga_event_writer import SagaEventWriter, get_event_writer
+
+
+class _RecordingBackend:
+    """Backend-Double: protokolliert jede Transaktion, schlägt bei 'BAD' fehl"""
+
+    def __init__(self):
+        self.transactions = []
+
+    def execute_transaction(self, statements):
+        if any(params == ('BAD',) for _, params in statements):
+            return False
+        self.transactions.append(list(statements))
+        return True
+
+
+def _submit_concurrently(writer, n):
+    results = []
+    lock = threading.Lock()
+
+    def worker(i):
+        ok = writer.submit([("INSERT INTO t (v) VALUES (?)", (f"v{i}",))])
+        with lock:
+            results.append(ok)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_group_mode_batches_concurrent_events():
+    backend = _RecordingBackend()
+    writer = SagaEventWriter(backend, durability="group", window_ms=50, max_batch_events=100)
+
+    results = _submit_concurrently(writer, 40)
+    writer.close()
+
+    assert results == [True] * 40
+    assert sum(len(tx) for tx in backend.transactions) == 40
+    stats = writer.get_stats()
+    assert stats['commits'] < 40 and stats['max_group_size'] > 1
+
+
+def test_sync_mode_commits_every_event():
+    backend = _RecordingBackend()
+    writer = SagaEventWriter(backend, durability="sync")
+
+    _submit_concurrently(writer, 10)
+
+    assert len(backend.transactions) == 10
+    assert writer.get_stats()['avg_group_size'] == 1.0
+
+
+def test_latency_window_is_bounded():
+    writer = SagaEventWriter(_RecordingBackend(), durability="group", window_ms=20)
+    start = time.perf_counter()
+    assert writer.submit([("INSERT INTO t (v) VALUES (?)", ("x",))]) is True
+    assert time.perf_counter() - start < 0.5
+    writer.close()
+
+
+def test_failing_event_does_not_fail_its_group():
+    backend = _RecordingBackend()
+    writer = SagaEventWriter(backend, durability="group", window_ms=50)
+    outcome = {}
+
+    def worker(value):
+        outcome[value] = writer.submit([("INSERT INTO t (v) VALUES (?)", (value,))])
+
+    threads = [threading.Thread(target=worker, args=(v,)) for v in ('a', 'BAD', 'b')]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.close()
+
+    assert outcome == {'a': True, 'BAD': False, 'b': True}
+    assert writer.get_stats()['failed_events'] == 1
+
+
+def test_invalid_durability_and_submit_after_close():
+    with pytest.raises(ValueError):
+        SagaEventWriter(_RecordingBackend(), durability="fsync")
+
+    backend = _RecordingBackend()
+    writer = SagaEventWriter(backend, durability="group")
+    writer.close()
+    assert writer.submit([("INSERT INTO t (v) VALUES (?)", ("late",))]) is True
+    assert len(backend.transactions) == 1
+
+
+def test_crud_group_commit_on_sqlite(tmp_path):
+    rel = SQLiteRelationalBackend({'database_path': str(tmp_path / 'group.db')})
+    rel._backend_connect()
+    mgr = DatabaseManager({'relational': {'enabled': False}})
+    mgr.relational_backend = rel
+    crud = SagaDatabaseCRUD(manager=mgr, event_durability='group')
+    crud.write_saga_event('warmup', 's', 'PENDING', {})  # Schema-Migration vorab
+
+    saga_ids = [str(uuid.uuid4()) for _ in range(8)]
+
+    def run_saga(saga_id):
+        for step in range(3):
+            crud.write_saga_event(saga_id, f's{step}', 'PENDING', {})
+            crud.write_saga_event(saga_id, f's{step}', 'SUCCESS', {})
+
+    threads = [threading.Thread(target=run_saga, args=(sid,)) for sid in saga_ids]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    events = rel.execute_query('SELECT COUNT(*) AS n FROM uds3_saga_events WHERE saga_id != ?', ('warmup',))
+    audits = rel.execute_query('SELECT COUNT(*) AS n FROM uds3_audit_log')
+    assert events[0]['n'] == 48 and audits[0]['n'] == 24
+    writer = get_event_writer(rel, 'group')
+    assert writer.get_stats()['commits'] < writer.get_stats()['events']
+    writer.close()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_saga_idempotency_store.py
+
+Indizierter Idempotency-Store für Saga-Schritte (database/saga_idempotency.py)
+(Migration + Backfill, Punkt-Lookup statt payload LIKE Scan, LRU nur für Treffer)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import json
+import sys
+import pathlib
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from database import db_migrations
+from database.database_api_sqlite import SQLiteRelationalBackend
+from database.database_manager import DatabaseManager
+from database.saga_idempotency import IdempotencyStore, get_idempotency_store
+from database.saga_orchestrator import SagaOrchestrator
+
+
+class QueryLoggingBackend(SQLiteRelationalBackend):
+    def __init__(self, conf):
+        super().__init__(conf)
+        self.queries = []
+
+    def execute_query(self, query, params=None):
+        self.queries.append(query)
+        return super().execute_query(query, params)
+
+
+def make_backend(tmp_path):
+    rel = QueryLoggingBackend({'database_path': str(tmp_path / 'idem_store.db')})
+    rel._backend_connect()
+    return rel
+
+
+def make_orch(rel):
+    db_migrations.ensure_saga_schema(rel)
+    rel.create_table('documents', {'id': 'TEXT PRIMARY KEY', 'content': 'TEXT'})
+    mgr = DatabaseManager({'relational': {'enabled': False}})
+    mgr.relational_backend = rel
+    return SagaOrchestrator(manager=mgr)
+
+
+def test_migration_backfills_legacy_payload_history(tmp_path):
+    rel = make_backend(tmp_path)
+    # Alt-Schema ohne idempotency_key Spalte
+    rel.create_table('uds3_saga_events', {
+        'event_id': 'TEXT PRIMARY KEY', 'saga_id': 'TEXT', 'step_name': 'TEXT',
+        'status': 'TEXT', 'payload': 'TEXT',
+    })
+    for i, status in enumerate(['SUCCESS', 'PENDING', 'SUCCESS']):
+        rel.execute_query(
+            'INSERT INTO uds3_saga_events (event_id, saga_id, step_name, status, payload) VALUES (?, ?, ?, ?, ?)',
+            (f'e{i}', 'saga', f's{i}', status, json.dumps({'idempotency_key': f'k{i}'})),
+        )
+
+    db_migrations.ensure_idempotency_store(rel)
+    db_migrations.ensure_idempotency_store(rel)  # idempotent
+
+    rows = rel.execute_query('SELECT saga_id, step_name, idempotency_key FROM uds3_saga_idempotency ORDER BY step_name')
+    assert [(r['step_name'], r['idempotency_key']) for r in rows] == [('s0', 'k0'), ('s2', 'k2')]
+    indexes = rel.execute_query("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'uds3_saga_idempotency'")
+    assert 'idx_uds3_saga_idempotency_key' in [r['name'] for r in indexes]
+
+
+def test_orchestrator_skips_via_store_without_event_scan(tmp_path):
+    rel = make_backend(tmp_path)
+    orch = make_orch(rel)
+    steps = [{'step_id': 's1', 'backend': 'relational', 'operation': 'insert', 'idempotency_key': 'key1',
+              'payload': {'table': 'documents', 'record': {'id': 'ix1', 'content': 'x'}}}]
+    saga_id = orch.create_saga('idem_store', steps)
+
+    assert orch.execute_saga(saga_id)['success']
+    rel.queries.clear()
+    second = orch.execute_saga(saga_id)
+
+    assert second['executed'] == [{'step_id': 's1', 'skipped': True}]
+    assert not any('LIKE' in q or 'FROM uds3_saga_events' in q for q in rel.queries)
+    assert len(rel.execute_query('SELECT id FROM documents')) == 1
+
+    # Neuer Prozess (leerer LRU): Punkt-Lookup über den Index
+    fresh = IdempotencyStore(rel)
+    assert fresh.contains(saga_id, 's1', 'key1')
+    assert fresh.get_stats()['index_lookups'] == 1
+
+
+def test_only_hits_are_cached_and_lru_is_bounded(tmp_path):
+    rel = make_backend(tmp_path)
+    db_migrations.ensure_saga_schema(rel)
+    store = IdempotencyStore(rel, cache_size=2)
+
+    assert not store.contains('saga', 's', 'k')
+    store.record('saga', 's', 'k')
+    assert store.contains('saga', 's', 'k')
+    for i in range(3):
+        store.record('saga', f'x{i}', 'k')
+    store.record('saga', 'x0', 'k')  # Duplikat wird ignoriert
+
+    assert store.get_stats()['cached_keys'] == 2
+    count = rel.execute_query('SELECT COUNT(*) AS n FROM uds3_saga_idempotency')
+    assert count[0]['n'] == 4
+
+
+def test_store_falls_back_to_events_without_migration(tmp_path):
+    rel = make_backend(tmp_path)
+    rel.create_table('uds3_saga_events', {'event_id': 'TEXT', 'saga_id': 'TEXT', 'step_name': 'TEXT',
+                                          'status': 'TEXT', 'payload': 'TEXT'})
+    rel.execute_query('INSERT INTO uds3_saga_events VALUES (?, ?, ?, ?, ?)',
+                      ('e', 'saga', 's', 'SUCCESS', '{"idempotency_key": "k"}'))
+    store = get_idempotency_store(rel)
+
+    assert store.contains('saga', 's', 'k')
+    assert not store.contains('saga', 's', 'other')
+    assert store.get_stats()['legacy_lookups'] == 2
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_saga_recovery_sharded.py
+
+Nebenläufiger SagaRecoveryWorker (database/saga_recovery_worker.py)
+(Paginierter Scan nach Alter, Leasing, Backoff über Priority Queue, Sharding, Metriken)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import sys
+import pathlib
+import threading
+import time
+
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from database import db_migrations
+from database.database_api_sqlite import SQLiteRelationalBackend
+from database.database_manager import DatabaseManager
+from database.saga_recovery_worker import SagaRecoveryWorker
+
+
+def make_backend(tmp_path, sagas=0):
+    rel = SQLiteRelationalBackend({'database_path': str(tmp_path / 'recovery.db')})
+    rel._backend_connect()
+    db_migrations.ensure_saga_schema(rel)
+    for i in range(sagas):
+        rel.execute_query(
+            'INSERT INTO uds3_sagas (saga_id, name, status, context, created_at) VALUES (?, ?, ?, ?, ?)',
+            (f'saga-{i:03d}', 'recovery', 'created', '{"steps": []}', f'2025-01-01 00:{i // 60:02d}:{i % 60:02d}'),
+        )
+    return rel
+
+
+def make_worker(rel, **kwargs):
+    mgr = DatabaseManager({'relational': {'enabled': False}})
+    mgr.relational_backend = rel
+    return SagaRecoveryWorker(manager=mgr, **kwargs)
+
+
+def test_scan_is_paginated_and_ordered_by_age(tmp_path):
+    rel = make_backend(tmp_path, sagas=25)
+    rel.execute_query('UPDATE uds3_sagas SET status = ? WHERE saga_id = ?', ('completed', 'saga-003'))
+    worker = make_worker(rel, page_size=10)
+
+    sagas = worker._list_open_sagas()
+
+    assert sagas == [f'saga-{i:03d}' for i in range(25) if i != 3]
+
+
+def test_leased_sagas_are_not_executed_twice(tmp_path):
+    rel = make_backend(tmp_path, sagas=3)
+    other = make_worker(rel, worker_id='worker-b')
+    assert other._acquire_lease('saga-001', time.time() + 60)
+
+    worker = make_worker(rel, worker_id='worker-a')
+    results = worker.run_once()
+
+    assert sorted(results) == ['saga-000', 'saga-002']
+    assert worker.get_stats()['lease_conflicts'] == 1
+    lease = rel.execute_query('SELECT lease_owner FROM uds3_sagas WHERE saga_id = ?', ('saga-000',))
+    assert lease[0]['lease_owner'] is None  # nach Abschluss freigegeben
+
+    # abgelaufene Leases dürfen übernommen werden
+    assert other._acquire_lease('saga-001', time.time() - 1)
+    assert 'saga-001' in worker.run_once()
+
+
+def test_backoff_does_not_block_other_sagas(tmp_path):
+    rel = make_backend(tmp_path, sagas=6)
+    worker = make_worker(rel, max_workers=2, backoff_base=0.1)
+    failures = {'saga-000': 2}
+    finished = []
+    lock = threading.Lock()
+
+    def resume(saga_id):
+        with lock:
+            if failures.get(saga_id):
+                failures[saga_id] -= 1
+                raise RuntimeError('backend down')
+            finished.append(saga_id)
+        return {'resumed': True}
+
+    worker.orch.resume_saga = resume
+    results = worker.run_once(max_retries=3)
+
+    assert len(results) == 6
+    assert finished[-1] == 'saga-000'  # die älteste, aber fehlerhafte Saga blockiert niemanden
+    stats = worker.get_stats()
+    assert stats['retries'] == 2 and stats['drained'] == 6 and stats['failed'] == 0
+    assert stats['backlog'] == 6 and stats['drain_rate'] > 0
+
+
+def test_exhausted_retries_release_the_lease(tmp_path):
+    rel = make_backend(tmp_path, sagas=1)
+    worker = make_worker(rel, backoff_base=0.0)
+
+    def resume(saga_id):
+        raise RuntimeError('still down')
+
+    worker.orch.resume_saga = resume
+    assert worker.run_once(max_retries=2) == {}
+    assert worker.get_stats()['failed'] == 1
+    lease = rel.execute_query('SELECT lease_owner FROM uds3_sagas')
+    assert lease[0]['lease_owner'] is None
+
+
+def test_shards_partition_the_backlog(tmp_path):
+    rel = make_backend(tmp_path, sagas=40)
+    shards = [make_worker(rel, shard_index=i, shard_count=3)._list_open_sagas() for i in range(3)]
+
+    assert sorted(sum(shards, [])) == [f'saga-{i:03d}' for i in range(40)]
+    assert all(shards)
+    with pytest.raises(ValueError):
+        make_worker(rel, shard_index=3, shard_count=3)
+
+
+def test_sharded_backlog_drains_to_zero(tmp_path):
+    rel = make_backend(tmp_path, sagas=40)
+    worker = make_worker(rel, shard_index=1, shard_count=3)
+    observed = []
+    worker._observe_backlog = observed.append
+    worker.orch.resume_saga = lambda saga_id: {'resumed': True}
+
+    results = worker.run_once()
+
+    assert worker.get_stats()['backlog'] == len(results) == len(worker._list_open_sagas())
+    assert observed[0] == len(results) and observed[-1] == 0
+
+
+def test_lost_lease_is_not_retried(tmp_path):
+    rel = make_backend(tmp_path, sagas=2)
+    worker = make_worker(rel, worker_id='worker-a', backoff_base=0.0)
+    calls = []
+
+    def resume(saga_id):
+        calls.append(saga_id)
+        if saga_id == 'saga-000':
+            # Lease abgelaufen, worker-b hat die Saga übernommen
+            rel.execute_query('UPDATE uds3_sagas SET lease_owner = ?, lease_expires_at = ? WHERE saga_id = ?',
+                              ('worker-b', time.time() + 60, saga_id))
+            raise RuntimeError('backend down')
+        return {'resumed': True}
+
+    worker.orch.resume_saga = resume
+    results = worker.run_once(max_retries=3)
+
+    assert calls.count('saga-000') == 1
+    assert list(results) == ['saga-001']
+    stats = worker.get_stats()
+    assert stats['lease_conflicts'] == 1 and stats['retries'] == 0
+    lease = rel.execute_query('SELECT lease_owner FROM uds3_sagas WHERE saga_id = ?', ('saga-000',))
+    assert lease[0]['lease_owner'] == 'worker-b'
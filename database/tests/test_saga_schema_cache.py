@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_saga_schema_cache.py
+
+Schema-Cache und kombinierter Event+Audit Write für Saga-Events
+(keine Schema-Introspektion pro Insert, Invalidierung durch Migrationen)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import sys
+import pathlib
+import uuid
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from database.saga_crud import SagaDatabaseCRUD
+from database.database_manager import DatabaseManager
+from database.database_api_sqlite import SQLiteRelationalBackend
+from database import db_migrations
+from database.schema_cache import get_schema_cache
+
+
+class CountingSQLiteBackend(SQLiteRelationalBackend):
+    """SQLite-Backend, das Schema-Abfragen und Transaktionen mitzählt"""
+
+    def __init__(self, conf):
+        super().__init__(conf)
+        self.schema_calls = 0
+        self.transactions = 0
+
+    def get_table_schema(self, table_name):
+        self.schema_calls += 1
+        return super().get_table_schema(table_name)
+
+    def execute_transaction(self, statements):
+        self.transactions += 1
+        return super().execute_transaction(statements)
+
+
+def make_crud(tmp_path):
+    rel = CountingSQLiteBackend({'database_path': str(tmp_path / 'saga_cache.db')})
+    rel._backend_connect()
+    mgr = DatabaseManager({'relational': {'enabled': False}})
+    mgr.relational_backend = rel
+    return SagaDatabaseCRUD(manager=mgr), rel
+
+
+def test_schema_is_introspected_once_per_table(tmp_path):
+    crud, rel = make_crud(tmp_path)
+    saga_id = str(uuid.uuid4())
+
+    crud.write_saga_event(saga_id, 's0', 'PENDING', {'document_id': 'd0'})
+    calls_after_first = rel.schema_calls
+    for i in range(1, 20):
+        crud.write_saga_event(saga_id, f's{i}', 'PENDING', {'document_id': f'd{i}'})
+        crud.write_saga_event(saga_id, f's{i}', 'SUCCESS', {'document_id': f'd{i}'})
+
+    # nur noch die erste Audit-Introspektion kommt hinzu
+    assert rel.schema_calls == calls_after_first + 1
+    events = rel.execute_query('SELECT status FROM uds3_saga_events WHERE saga_id = ?', (saga_id,))
+    audits = rel.execute_query('SELECT status FROM uds3_audit_log WHERE saga_id = ?', (saga_id,))
+    assert len(events) == 39 and len(audits) == 19
+    assert get_schema_cache(rel).get_stats()['hits'] > 0
+
+
+def test_event_and_audit_are_written_in_one_transaction(tmp_path):
+    crud, rel = make_crud(tmp_path)
+    saga_id = str(uuid.uuid4())
+
+    crud.write_saga_event(saga_id, 'step', 'FAIL', {'idempotency_key': 'k1'}, error='boom')
+
+    assert rel.transactions == 1
+    event = rel.execute_query('SELECT idempotency_key FROM uds3_saga_events WHERE saga_id = ?', (saga_id,))
+    audit = rel.execute_query('SELECT details FROM uds3_audit_log WHERE saga_id = ?', (saga_id,))
+    assert event[0]['idempotency_key'] == 'k1'
+    assert 'boom' in audit[0]['details']
+
+
+def test_failed_transaction_rolls_back_and_retries_per_table(tmp_path):
+    crud, rel = make_crud(tmp_path)
+    saga_id = str(uuid.uuid4())
+    crud.write_saga_event(saga_id, 'warmup', 'PENDING', {})
+
+    # Audit-Tabelle verschwindet hinter dem Rücken des Caches
+    rel.execute_query('DROP TABLE uds3_audit_log')
+    crud.write_saga_event(saga_id, 'step', 'SUCCESS', {})
+
+    rows = rel.execute_query('SELECT step_name FROM uds3_saga_events WHERE saga_id = ?', (saga_id,))
+    assert sorted(r['step_name'] for r in rows) == ['step', 'warmup']
+
+
+def test_migration_invalidates_cached_columns(tmp_path):
+    crud, rel = make_crud(tmp_path)
+    crud.write_saga_event(str(uuid.uuid4()), 's', 'PENDING', {})
+    cache = get_schema_cache(rel)
+    assert 'retry_count' not in cache.columns('uds3_saga_events')
+
+    db_migrations._add_column(rel, 'uds3_saga_events', 'retry_count', 'INTEGER')
+
+    assert cache.has_column('uds3_saga_events', 'retry_count')
+    assert cache.get_stats()['invalidations'] >= 1
@@ -26,6 +26,8 @@ License: MIT with Government Partnership Commons Clause
 Repository: https://github.com/makr-code/VCC-UDS3
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
 import json
@@ -36,10 +38,11 @@ from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
+from .adaptive_strategy import AdaptiveMultiDBStrategy, StrategyType
+from .write_coalescer import COALESCE_MAX_IN_FLIGHT, COALESCE_WINDOW_MS, COALESCE_WRITES, DistributionWriteCoalescer
+
 # Import UDS3 components
 try:
-    from .adaptive_multi_db_strategy import AdaptiveMultiDBStrategy, StrategyType, FlexibleMultiDBDistributor
-    from .monolithic_fallback_strategies import SQLiteMonolithStrategy
     from uds3.database.database_manager import DatabaseManager
     from uds3.database.database_api_base import DatabaseBackend
     UDS3_AVAILABLE = True
@@ -49,7 +52,10 @@ except ImportError:
 
 # Standard imports for fallback
 import sqlite3
-import psycopg2
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
 
 
 class ProcessorType(Enum):
@@ -142,6 +148,16 @@ class UDS3MultiDBDistributor:
         self.max_concurrent_distributions = self.config.get('max_concurrent', 5)
         self.retry_attempts = self.config.get('retry_attempts', 3)
         
+        # Write Coalescing: Operationen aller gleichzeitig laufenden Distributionen
+        # werden pro Datenbank-Typ gebündelt geschrieben (1 = jede Operation einzeln)
+        self.coalesce_writes = self.config.get('coalesce_writes', COALESCE_WRITES)
+        self.write_coalescer = DistributionWriteCoalescer(
+            database_manager=database_manager,
+            max_batch=self.batch_size if self.coalesce_writes else 1,
+            window_ms=self.config.get('coalesce_window_ms', COALESCE_WINDOW_MS),
+            max_in_flight=self.config.get('coalesce_max_in_flight', COALESCE_MAX_IN_FLIGHT)
+        )
+        
         # State Tracking
         self.active_distributions = {}
         self.distribution_stats = {
@@ -603,20 +619,23 @@ class UDS3MultiDBDistributor:
                     'data': self._extract_content_for_target(processor_result, content_type, target)
                 })
         
-        # Execute operations for each database type
-        for db_type, operations in db_operations.items():
-            try:
-                result = await self._execute_database_operations(db_type, operations, processor_result)
-                distribution_results[db_type] = result
-                
-            except Exception as e:
-                self.logger.error(f"Failed to execute {db_type} operations: {e}")
-                distribution_results[db_type] = {
+        # Execute operations for all database types concurrently
+        results = await asyncio.gather(
+            *[self._execute_database_operations(db_type, operations, processor_result)
+              for db_type, operations in db_operations.items()],
+            return_exceptions=True
+        )
+        
+        for db_type, result in zip(db_operations, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to execute {db_type} operations: {result}")
+                result = {
                     'success': False,
-                    'errors': [f"{db_type} operations failed: {str(e)}"],
+                    'errors': [f"{db_type} operations failed: {str(result)}"],
                     'stored_items': [],
                     'fallback_used': False
                 }
+            distribution_results[db_type] = result
         
         return distribution_results
     
@@ -739,41 +758,20 @@ class UDS3MultiDBDistributor:
         """
         Führt Database-spezifische Operations aus
         
-        This is a placeholder implementation. In production, this would
-        use actual database connections and APIs.
+        Die Operations gehen an den DistributionWriteCoalescer, der sie mit den
+        Operations anderer gleichzeitig verteilter Dokumente zu einer Batch pro
+        Datenbank-Typ zusammenfasst. Das Ergebnis jeder Operation kommt einzeln
+        zurück, stored_items/errors gehören also nur zu diesem Dokument.
         """
         
+        start_time = time.time()
+        self.logger.debug(f"Executing {len(operations)} operations for {db_type}")
+        
         try:
-            stored_items = []
-            warnings = []
-            
-            self.logger.debug(f"Executing {len(operations)} operations for {db_type}")
-            
-            # Simulate database operations
-            for operation in operations:
-                content_type = operation['content_type']
-                target = operation['target']
-                data = operation['data']
-                
-                # Simulate storage operation
-                storage_id = f"{db_type}_{target.storage_location}_{processor_result.document_id}_{int(time.time())}"
-                stored_items.append(f"{target.storage_location}:{storage_id}")
-                
-                # Add slight delay to simulate real database operations
-                await asyncio.sleep(0.01)
-            
-            # Update statistics
-            self.distribution_stats['successful_distributions'] += len(operations)
-            
-            return {
-                'success': True,
-                'stored_items': stored_items,
-                'operations_count': len(operations),
-                'warnings': warnings,
-                'fallback_used': False,
-                'execution_time_ms': len(operations) * 10  # Simulate execution time
-            }
-            
+            outcomes = await asyncio.gather(*[
+                self.write_coalescer.write(db_type, self._storage_location(operation['target']), operation['data'])
+                for operation in operations
+            ])
         except Exception as e:
             self.distribution_stats['failed_distributions'] += len(operations)
             
@@ -782,8 +780,34 @@ class UDS3MultiDBDistributor:
                 'stored_items': [],
                 'errors': [f"Database operation failed: {str(e)}"],
                 'fallback_used': False,
-                'execution_time_ms': 0
+                'execution_time_ms': (time.time() - start_time) * 1000
             }
+        
+        stored_items = [outcome.stored_item for outcome in outcomes if outcome.stored_item]
+        errors = [outcome.error for outcome in outcomes if outcome.error]
+        warnings = [outcome.warning for outcome in outcomes if outcome.warning]
+        
+        # Update statistics
+        self.distribution_stats['successful_distributions'] += sum(1 for outcome in outcomes if not outcome.error)
+        self.distribution_stats['failed_distributions'] += len(errors)
+        
+        return {
+            'success': not errors,  # reine Warnungen (z. B. fehlende Vektordaten) sind kein Fehler
+            'stored_items': stored_items,
+            'operations_count': len(operations),
+            'errors': errors,
+            'warnings': warnings,
+            'fallback_used': False,
+            'execution_time_ms': (time.time() - start_time) * 1000
+        }
+    
+    @staticmethod
+    def _storage_location(target: Union[DistributionTarget, Dict[str, Any]]) -> str:
+        """Storage Location aus DistributionTarget oder Dict-Target (Base Distribution)"""
+        
+        if isinstance(target, dict):
+            return target.get('storage_location', 'default')
+        return target.storage_location
     
     async def _distribute_to_base_strategy(
         self,
@@ -949,7 +973,8 @@ class UDS3MultiDBDistributor:
         return {
             **self.distribution_stats,
             'success_rate': (self.distribution_stats['successful_distributions'] / total) if total > 0 else 0,
-            'fallback_rate': (self.distribution_stats['fallback_used'] / total) if total > 0 else 0
+            'fallback_rate': (self.distribution_stats['fallback_used'] / total) if total > 0 else 0,
+            'write_coalescing': self.write_coalescer.get_stats()
         }
     
     async def distribute_multiple_results(
@@ -965,11 +990,16 @@ class UDS3MultiDBDistributor:
         # Process in batches to avoid overwhelming the system
         results = []
         
+        # With write coalescing all documents of a batch are in flight together so
+        # their writes end up in shared per-database batches; backend load is
+        # bounded by the coalescer instead of the per-document semaphore
+        concurrency = self.batch_size if self.coalesce_writes else self.max_concurrent_distributions
+        
         for i in range(0, len(processor_results), self.batch_size):
             batch = processor_results[i:i + self.batch_size]
             
             # Process batch concurrently with limited concurrency
-            semaphore = asyncio.Semaphore(self.max_concurrent_distributions)
+            semaphore = asyncio.Semaphore(max(1, concurrency))
             
             async def process_with_semaphore(processor_result):
                 async with semaphore:
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+write_coalescer.py
+
+UDS3 Distribution Write Coalescer
+Sammelt die Schreiboperationen vieler gleichzeitig verteilter ProcessorResults
+pro Ziel-Datenbank und schreibt sie gebündelt über die bestehenden Batch-Inserter
+(database/batch_operations.py). Jede Operation bekommt ein eigenes Future, über
+das das Ergebnis (Storage-ID oder Fehler) an das auslösende Dokument zurückgeht,
+so bleibt das DistributionResult pro Dokument exakt.
+Features:
+- Flush bei voller Batch (max_batch) oder nach kurzem Zeitfenster (window_ms)
+- Flushes laufen im Executor, verschiedene Datenbank-Typen also parallel
+- Begrenzte Flushes pro Datenbank-Typ (max_in_flight)
+- Simulation wie bisher, wenn kein Backend konfiguriert ist
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from uds3.database.batch_operations import ChromaBatchInserter, CouchDBBatchInserter, Neo4jBatchCreator
+    BATCH_OPERATIONS_AVAILABLE = True
+except ImportError:
+    try:
+        from database.batch_operations import ChromaBatchInserter, CouchDBBatchInserter, Neo4jBatchCreator
+        BATCH_OPERATIONS_AVAILABLE = True
+    except ImportError:
+        BATCH_OPERATIONS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Coalescing toggle and window (ENV, per Distributor-Config überschreibbar)
+COALESCE_WRITES = os.getenv("UDS3_DISTRIBUTOR_COALESCE", "true").lower() == "true"
+COALESCE_WINDOW_MS = float(os.getenv("UDS3_DISTRIBUTOR_COALESCE_WINDOW_MS", "5"))
+COALESCE_MAX_IN_FLIGHT = int(os.getenv("UDS3_DISTRIBUTOR_COALESCE_MAX_IN_FLIGHT", "2"))
+
+# Datenbank-Typ -> DatabaseManager-Getter
+BACKEND_GETTERS = {
+    'postgresql': 'get_relational_backend',
+    'sqlite': 'get_relational_backend',
+    'couchdb': 'get_file_backend',
+    'chromadb': 'get_vector_backend',
+    'neo4j': 'get_graph_backend',
+}
+
+
+@dataclass
+class WriteOutcome:
+    """Ergebnis einer einzelnen Schreiboperation"""
+    stored_item: Optional[str] = None  # "<storage_location>:<storage_id>"
+    error: Optional[str] = None
+    warning: Optional[str] = None
+
+
+@dataclass
+class _PendingWrite:
+    storage_location: str
+    data: Dict[str, Any]
+    future: asyncio.Future
+
+
+class DistributionWriteCoalescer:
+    """
+    Bündelt Distributor-Schreiboperationen pro Datenbank-Typ
+
+    ``write()`` reiht eine Operation ein und wartet auf ihr eigenes Ergebnis.
+    Eine Batch wird geschrieben, sobald ``max_batch`` Operationen anstehen oder
+    ``window_ms`` seit der ersten wartenden Operation vergangen sind.
+    """
+
+    def __init__(
+        self,
+        database_manager: Any = None,
+        max_batch: int = 100,
+        window_ms: float = COALESCE_WINDOW_MS,
+        max_in_flight: int = COALESCE_MAX_IN_FLIGHT
+    ):
+        self.database_manager = database_manager
+        self.max_batch = max(1, max_batch)
+        self.window_s = max(0.0, window_ms) / 1000
+        self.max_in_flight = max(1, max_in_flight)
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self._inserters: Dict[str, Any] = {}
+        self._writers: Dict[str, Callable[[Any, List[_PendingWrite]], List[WriteOutcome]]] = {
+            'postgresql': self._write_relational,
+            'sqlite': self._write_relational,
+            'couchdb': self._write_couchdb,
+            'chromadb': self._write_chromadb,
+            'neo4j': self._write_neo4j,
+        }
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reset_loop_state()
+
+    def _reset_loop_state(self):
+        self._pending: Dict[str, List[_PendingWrite]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._tasks: set = set()
+
+    async def write(self, db_type: str, storage_location: str, data: Dict[str, Any]) -> WriteOutcome:
+        """Reiht eine Operation ein und liefert ihr Ergebnis nach dem Flush ihrer Batch"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Futures, Timer und Semaphoren gehören zu genau einem Event Loop;
+            # Wechsel nur, wenn am bisherigen Loop nichts mehr aussteht
+            if self._loop is not None and not self._loop.is_closed() and (self._pending or self._tasks):
+                raise RuntimeError(
+                    "DistributionWriteCoalescer has writes pending on another event loop"
+                )
+            self._loop = loop
+            self._reset_loop_state()
+
+        pending = self._pending.setdefault(db_type, [])
+        write = _PendingWrite(storage_location, data, loop.create_future())
+        pending.append(write)
+
+        if len(pending) >= self.max_batch:
+            self._flush_now(db_type)
+        elif db_type not in self._timers:
+            self._timers[db_type] = loop.call_later(self.window_s, self._flush_now, db_type)
+
+        return await write.future
+
+    async def flush(self):
+        """Schreibt alle wartenden Operationen und wartet auf laufende Flushes"""
+        for db_type in list(self._pending):
+            self._flush_now(db_type)
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Flush-Statistik pro Datenbank-Typ (plus Inserter-Statistik)"""
+        stats = {db_type: dict(values) for db_type, values in self.stats.items()}
+        for db_type, inserter in self._inserters.items():
+            stats.setdefault(db_type, {})['inserter'] = inserter.get_stats()
+        return stats
+
+    # ------------------------------------------------------------------
+    # Flush
+    # ------------------------------------------------------------------
+    def _flush_now(self, db_type: str):
+        timer = self._timers.pop(db_type, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(db_type, [])
+        if batch:
+            task = self._loop.create_task(self._run_batch(db_type, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, db_type: str, batch: List[_PendingWrite]):
+        slot = self._slots.setdefault(db_type, asyncio.Semaphore(self.max_in_flight))
+        try:
+            async with slot:
+                outcomes = await self._loop.run_in_executor(None, self._write_batch, db_type, batch)
+            if len(outcomes) != len(batch) or any(outcome is None for outcome in outcomes):
+                raise RuntimeError(f"writer returned {len(outcomes)} outcomes for {len(batch)} operations")
+        except Exception as e:
+            # Jede wartende Operation bekommt ein Ergebnis, sonst hängt ihr Dokument
+            logger.error(f"{db_type} batch write failed: {e}")
+            outcomes = [WriteOutcome(error=f"{db_type} batch write failed: {e}")] * len(batch)
+
+        stats = self.stats.setdefault(db_type, {'batches': 0, 'operations': 0, 'failed': 0})
+        stats['batches'] += 1
+        stats['operations'] += len(batch)
+        stats['failed'] += sum(1 for outcome in outcomes if outcome.error)
+        for write, outcome in zip(batch, outcomes):
+            if not write.future.done():
+                write.future.set_result(outcome)
+
+    def _write_batch(self, db_type: str, batch: List[_PendingWrite]) -> List[WriteOutcome]:
+        """Läuft im Executor: eine Batch gegen das echte Backend (oder simuliert)"""
+        backend = self._get_backend(db_type)
+        writer = self._writers.get(db_type)
+        if backend is None or writer is None:
+            return [self._simulated(db_type, write) for write in batch]
+        return writer(backend, batch)
+
+    def _get_backend(self, db_type: str) -> Any:
+        getter = getattr(self.database_manager, BACKEND_GETTERS.get(db_type, ''), None)
+        if getter is None:
+            return None
+        try:
+            return getter()
+        except Exception as e:
+            logger.debug(f"No {db_type} backend: {e}")
+            return None
+
+    def _get_inserter(self, db_type: str, backend: Any, inserter_cls: type) -> Any:
+        inserter = self._inserters.get(db_type)
+        if inserter is None or inserter.backend is not backend:
+            # Puffer verwaltet der Coalescer; der Inserter schreibt nur abgelöste Batches
+            inserter = inserter_cls(backend, batch_size=self.max_batch, background_flush=False)
+            self._inserters[db_type] = inserter
+        return inserter
+
+    @staticmethod
+    def _simulated(db_type: str, write: _PendingWrite) -> WriteOutcome:
+        storage_id = f"{db_type}_{write.storage_location}_{write.data.get('document_id')}_{int(time.time())}"
+        return WriteOutcome(stored_item=f"{write.storage_location}:{storage_id}")
+
+    # ------------------------------------------------------------------
+    # Backend-spezifische Writer (Executor-Thread)
+    # ------------------------------------------------------------------
+    def _write_couchdb(self, backend: Any, batch: List[_PendingWrite]) -> List[WriteOutcome]:
+        if not BATCH_OPERATIONS_AVAILABLE:
+            return [WriteOutcome(error="couchdb: batch_operations not available")] * len(batch)
+
+        docs, doc_ids = [], []
+        for write in batch:
+            doc_id = f"{write.storage_location}:{write.data.get('document_id')}:{write.data.get('processor_name')}"
+            docs.append({**_json_safe(write.data), '_id': doc_id, 'collection': write.storage_location})
+            doc_ids.append(doc_id)
+
+        if self._get_inserter('couchdb', backend, CouchDBBatchInserter).flush_batch(docs):
+            return [WriteOutcome(stored_item=doc_id) for doc_id in doc_ids]  # _id beginnt mit der Collection
+        # _bulk_docs mit Fehlern: Einzel-Fallback wurde versucht, Ergebnis pro Dokument unbekannt
+        return [WriteOutcome(error=f"couchdb batch write to {write.storage_location} failed "
+                                   f"(single-document fallback attempted)") for write in batch]
+
+    def _write_chromadb(self, backend: Any, batch: List[_PendingWrite]) -> List[WriteOutcome]:
+        if not BATCH_OPERATIONS_AVAILABLE:
+            return [WriteOutcome(error="chromadb: batch_operations not available")] * len(batch)
+
+        outcomes: List[Optional[WriteOutcome]] = [None] * len(batch)
+        items, positions = [], []
+        for position, write in enumerate(batch):
+            vector = write.data.get('vector_data')
+            if not vector:
+                outcomes[position] = WriteOutcome(warning=f"chromadb: no vector data for {write.data.get('document_id')}")
+                continue
+            chunk_id = f"{write.data.get('document_id')}:{write.data.get('processor_name')}"
+            metadata = {
+                'document_id': write.data.get('document_id'),
+                'processor_name': write.data.get('processor_name'),
+                'vector_type': write.data.get('vector_type', ''),
+                'embedding_model': write.data.get('embedding_model', ''),
+                'collection': write.storage_location,
+            }
+            items.append((chunk_id, list(vector), metadata))
+            positions.append(position)
+
+        if items:
+            ok = self._get_inserter('chromadb', backend, ChromaBatchInserter).flush_batch(items)
+            for position, (chunk_id, _, _) in zip(positions, items):
+                location = batch[position].storage_location
+                outcomes[position] = (WriteOutcome(stored_item=f"{location}:{chunk_id}") if ok
+                                      else WriteOutcome(error=f"chromadb batch write to {location} failed"))
+        return outcomes
+
+    def _write_neo4j(self, backend: Any, batch: List[_PendingWrite]) -> List[WriteOutcome]:
+        outcomes: List[WriteOutcome] = []
+        relationships, owners = [], []
+        for position, write in enumerate(batch):
+            document_id = write.data.get('document_id')
+            try:
+                # Knoten zuerst: die Beziehungs-Batch matcht per id auf beiden Seiten
+                backend.create_node(write.storage_location, {
+                    'id': document_id,
+                    'document_id': document_id,
+                    'processor_name': write.data.get('processor_name'),
+                    'processor_type': write.data.get('processor_type'),
+                    'confidence_score': write.data.get('confidence_score'),
+                }, merge_key='id')
+                outcomes.append(WriteOutcome(stored_item=f"{write.storage_location}:{document_id}"))
+            except Exception as e:
+                outcomes.append(WriteOutcome(error=f"neo4j node {document_id} failed: {e}"))
+                continue
+            for relationship in write.data.get('relationships') or []:
+                row = _relationship_row(document_id, relationship, write.data.get('processor_name'))
+                if row['to_id']:
+                    relationships.append(row)
+                    owners.append(position)
+
+        if relationships:
+            if not BATCH_OPERATIONS_AVAILABLE:
+                ok = False
+            else:
+                creator = self._get_inserter('neo4j', backend, Neo4jBatchCreator)
+                ok = creator.flush_batch(relationships)
+            if not ok:
+                for position in sorted(set(owners)):
+                    outcomes[position] = WriteOutcome(
+                        stored_item=outcomes[position].stored_item,
+                        error=f"neo4j relationship batch for {batch[position].data.get('document_id')} failed"
+                    )
+        return outcomes
+
+    def _write_relational(self, backend: Any, batch: List[_PendingWrite]) -> List[WriteOutcome]:
+        if not hasattr(backend, 'insert_record'):
+            return [WriteOutcome(error=f"{type(backend).__name__} does not support insert_record")] * len(batch)
+
+        outcomes = []
+        for write in batch:
+            row = {key: json.dumps(value, default=str) if isinstance(value, (dict, list)) else value
+                   for key, value in write.data.items()}
+            try:
+                record_id = backend.insert_record(write.storage_location, row)
+                if record_id is None or record_id is False:
+                    # Backend-Vertrag: None bei fehlgeschlagenem Insert
+                    outcomes.append(WriteOutcome(error=f"insert into {write.storage_location} failed"))
+                    continue
+                storage_id = write.data.get('document_id')
+                if record_id is not True:
+                    storage_id = f"{storage_id}#{record_id}"
+                outcomes.append(WriteOutcome(stored_item=f"{write.storage_location}:{storage_id}"))
+            except Exception as e:
+                outcomes.append(WriteOutcome(error=f"insert into {write.storage_location} failed: {e}"))
+        return outcomes
+
+
+def _relationship_row(document_id: str, relationship: Any, processor_name: Optional[str]) -> Dict[str, Any]:
+    """Relationship aus result_data (Dict oder Ziel-ID) -> Neo4jBatchCreator-Zeile"""
+    if isinstance(relationship, dict):
+        to_id = relationship.get('target_id') or relationship.get('to_id') or relationship.get('target')
+        rel_type = relationship.get('type') or relationship.get('relationship_type') or 'RELATED_TO'
+        properties = {key: value for key, value in relationship.items()
+                      if isinstance(value, (str, int, float, bool))}
+    else:
+        to_id, rel_type, properties = relationship, 'RELATED_TO', {}
+    properties['detected_by'] = processor_name
+    return {'from_id': document_id, 'to_id': to_id, 'rel_type': rel_type, 'properties': properties}
+
+
+def _json_safe(data: Dict[str, Any]) -> Dict[str, Any]:
+    return json.loads(json.dumps(data, default=str))
@@ -37,6 +37,7 @@ import hashlib
 import uuid
 import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable, BinaryIO
 from dataclasses import dataclass, field
@@ -101,6 +102,14 @@ DEFAULT_CHUNK_SIZE = 5 * 1024 * 1024  # 5 MB
 LARGE_CHUNK_SIZE = 10 * 1024 * 1024   # 10 MB (for fast networks)
 SMALL_CHUNK_SIZE = 1 * 1024 * 1024    # 1 MB (for slow networks)
 
+# Concurrent chunk transfers per upload/download
+DEFAULT_MAX_CONCURRENT_TRANSFERS = int(os.getenv("UDS3_STREAMING_MAX_TRANSFERS", "4"))
+
+
+def _sha256_hex(data) -> str:
+    """SHA256 of a bytes-like object (hashlib releases the GIL for large buffers)"""
+    return hashlib.sha256(data).hexdigest()
+
 
 # ============================================================================
 # Enums
@@ -153,6 +162,9 @@ class StreamingProgress:
     error_message: Optional[str] = None
     retry_count: int = 0
     
+    # Per-stage counters of multi-stage operations (e.g. embed pipeline)
+    stage_progress: Dict[str, int] = field(default_factory=dict)
+    
     @property
     def progress_percent(self) -> float:
         """Calculate progress percentage"""
@@ -192,6 +204,8 @@ class StreamingProgress:
             result['estimated_time_remaining'] = self.estimated_time_remaining
         if self.error_message:
             result['error_message'] = self.error_message
+        if self.stage_progress:
+            result['stage_progress'] = dict(self.stage_progress)
         
         return result
 
@@ -232,13 +246,22 @@ class StreamingManager:
     - Progress tracking (real-time updates)
     - Concurrent operations (thread-safe)
     - Error recovery (automatic retry)
+    
+    Chunk transfers go to ``storage_backend`` if it implements the chunked
+    stream interface (``put_stream_chunk``, ``read_stream_chunk_into``,
+    ``finalize_stream``, ``get_stream_info``, ...) like
+    FileSystemStorageBackend and CouchDBAdapter; otherwise transfers are
+    simulated. Each upload/download runs up to ``max_concurrent_transfers``
+    chunk transfers at once, reads into a small pool of preallocated
+    buffers and hashes chunks on a separate thread.
     """
     
     def __init__(
         self,
         storage_backend=None,
         chunk_size: int = DEFAULT_CHUNK_SIZE,
-        max_concurrent_operations: int = 5
+        max_concurrent_operations: int = 5,
+        max_concurrent_transfers: int = DEFAULT_MAX_CONCURRENT_TRANSFERS
     ):
         """
         Initialize StreamingManager.
@@ -247,10 +270,12 @@ class StreamingManager:
             storage_backend: Backend for file storage
             chunk_size: Size of each chunk in bytes
             max_concurrent_operations: Max concurrent streaming operations
+            max_concurrent_transfers: Max concurrent chunk transfers per operation
         """
         self.storage_backend = storage_backend
         self.chunk_size = chunk_size
         self.max_concurrent_operations = max_concurrent_operations
+        self.max_concurrent_transfers = max(1, max_concurrent_transfers)
         
         # Track active operations
         self._operations: Dict[str, StreamingProgress] = {}
@@ -327,53 +352,13 @@ class StreamingManager:
         logger.info(f"Starting upload: {file_path} → {destination} ({file_size/1024/1024:.1f}MB, {total_chunks} chunks)")
         
         try:
-            # Open file and upload in chunks
             with open(file_path, 'rb') as f:
-                chunk_index = 0
-                start_time = time.time()
-                
-                while True:
-                    # Read chunk
-                    chunk_data = f.read(chunk_size)
-                    if not chunk_data:
-                        break
-                    
-                    # Calculate chunk hash
-                    chunk_hash = hashlib.sha256(chunk_data).hexdigest()
-                    
-                    # Upload chunk (simulate for now)
-                    chunk_id = f"{operation_id}-chunk-{chunk_index}"
-                    self._upload_chunk(destination, chunk_index, chunk_data)
-                    
-                    # Update progress
-                    chunk_metadata = ChunkMetadata(
-                        chunk_id=chunk_id,
-                        chunk_index=chunk_index,
-                        chunk_size=len(chunk_data),
-                        chunk_hash=chunk_hash,
-                        uploaded_at=datetime.utcnow()
-                    )
-                    
-                    with self._lock:
-                        self._chunks[operation_id].append(chunk_metadata)
-                        progress.transferred_bytes += len(chunk_data)
-                        progress.current_chunk = chunk_index + 1
-                        progress.updated_at = datetime.utcnow()
-                        
-                        # Calculate speed
-                        elapsed = time.time() - start_time
-                        if elapsed > 0:
-                            progress.bytes_per_second = progress.transferred_bytes / elapsed
-                            remaining_bytes = progress.total_bytes - progress.transferred_bytes
-                            progress.estimated_time_remaining = remaining_bytes / progress.bytes_per_second if progress.bytes_per_second > 0 else None
-                    
-                    # Progress callback
-                    if progress_callback:
-                        progress_callback(progress)
-                    
-                    chunk_index += 1
-                    
-                    logger.debug(f"Uploaded chunk {chunk_index}/{total_chunks} ({len(chunk_data)/1024:.1f}KB)")
+                self._run_upload_pipeline(
+                    operation_id, progress, f, destination, chunk_size,
+                    first_index=0, total_chunks=total_chunks,
+                    progress_callback=progress_callback
+                )
+            self._finalize_upload(operation_id, destination, chunk_size, file_size)
             
             # Mark complete
             with self._lock:
@@ -400,11 +385,142 @@ class StreamingManager:
             
             raise
     
+    def _run_upload_pipeline(
+        self,
+        operation_id: str,
+        progress: StreamingProgress,
+        f: BinaryIO,
+        destination: str,
+        chunk_size: int,
+        first_index: int,
+        total_chunks: int,
+        progress_callback: Optional[Callable[[StreamingProgress], None]] = None
+    ) -> None:
+        """
+        Upload chunks ``first_index..`` of an open file (internal).
+        
+        The calling thread reads ahead with ``readinto`` into preallocated
+        buffers, a pool runs up to ``max_concurrent_transfers`` chunk
+        transfers and a single hasher thread computes the chunk hashes in
+        parallel. A buffer is reused once both its transfer and its hash are
+        done. Chunks complete out of order but are committed (metadata,
+        progress, callback) in order, so ``_chunks`` always holds a
+        contiguous prefix that ``resume_upload`` can continue from.
+        """
+        remaining = total_chunks - first_index
+        if remaining <= 0:
+            return
+        transfers = min(self.max_concurrent_transfers, remaining)
+        buffers = [memoryview(bytearray(chunk_size)) for _ in range(min(transfers + 2, remaining))]
+        free = list(range(len(buffers)))
+        pending: Dict[int, Dict[str, Any]] = {}
+        inflight: Dict[Any, tuple] = {}
+        next_index = next_commit = first_index
+        base_bytes = progress.transferred_bytes
+        start_time = time.time()
+        eof = False
+        
+        with ThreadPoolExecutor(max_workers=transfers, thread_name_prefix='uds3-stream-transfer') as pool, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix='uds3-stream-hash') as hasher:
+            try:
+                while True:
+                    # Read ahead while buffers are free
+                    while not eof and free:
+                        slot = free.pop()
+                        size = f.readinto(buffers[slot])
+                        if not size:
+                            eof = True
+                            free.append(slot)
+                            break
+                        view = buffers[slot][:size]
+                        pending[next_index] = {'slot': slot, 'size': size, 'open': 2, 'hash': None}
+                        inflight[pool.submit(self._upload_chunk, destination, next_index, view)] = ('transfer', next_index)
+                        inflight[hasher.submit(_sha256_hex, view)] = ('hash', next_index)
+                        next_index += 1
+                    
+                    if not inflight:
+                        break
+                    
+                    done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        kind, chunk_index = inflight.pop(future)
+                        result = future.result()
+                        state = pending[chunk_index]
+                        if kind == 'hash':
+                            state['hash'] = result
+                        state['open'] -= 1
+                        if state['open'] == 0:
+                            free.append(state['slot'])
+                    
+                    # Commit the contiguous prefix of finished chunks
+                    while next_commit in pending and pending[next_commit]['open'] == 0:
+                        state = pending.pop(next_commit)
+                        chunk_metadata = ChunkMetadata(
+                            chunk_id=f"{operation_id}-chunk-{next_commit}",
+                            chunk_index=next_commit,
+                            chunk_size=state['size'],
+                            chunk_hash=state['hash'],
+                            uploaded_at=datetime.utcnow(),
+                            destination=destination
+                        )
+                        
+                        with self._lock:
+                            self._chunks[operation_id].append(chunk_metadata)
+                            progress.transferred_bytes += state['size']
+                            progress.current_chunk = next_commit + 1
+                            progress.updated_at = datetime.utcnow()
+                            
+                            # Calculate speed
+                            elapsed = time.time() - start_time
+                            if elapsed > 0:
+                                progress.bytes_per_second = (progress.transferred_bytes - base_bytes) / elapsed
+                                remaining_bytes = progress.total_bytes - progress.transferred_bytes
+                                progress.estimated_time_remaining = remaining_bytes / progress.bytes_per_second if progress.bytes_per_second > 0 else None
+                        
+                        if progress_callback:
+                            progress_callback(progress)
+                        
+                        logger.debug(f"Uploaded chunk {next_commit + 1}/{total_chunks} ({state['size']/1024:.1f}KB)")
+                        next_commit += 1
+            except BaseException:
+                for future in inflight:
+                    future.cancel()
+                raise
+    
+    def _finalize_upload(self, operation_id: str, destination: str, chunk_size: int, file_size: int) -> None:
+        """Write the stream manifest to the storage backend (internal)"""
+        backend = self._stream_backend()
+        if backend is None:
+            return
+        chunks = self.get_operation_chunks(operation_id)
+        try:
+            backend.finalize_stream(
+                destination,
+                size=file_size,
+                chunk_size=chunk_size,
+                chunk_hashes=[c.chunk_hash for c in chunks]
+            )
+        except Exception as e:
+            raise StorageBackendError(f"Finalizing {destination} failed: {e}") from e
+    
+    def _stream_backend(self):
+        """Storage backend if it supports chunked streams, else None (internal)"""
+        backend = self.storage_backend
+        if backend is not None and hasattr(backend, 'put_stream_chunk'):
+            return backend
+        return None
+    
     def _upload_chunk(self, destination: str, chunk_index: int, chunk_data: bytes):
         """Upload a single chunk (internal)"""
-        # In production, this would upload to actual storage backend
-        # For now, simulate upload
-        time.sleep(0.001)  # Simulate network delay
+        backend = self._stream_backend()
+        if backend is None:
+            # No chunk-capable storage backend: simulate upload
+            time.sleep(0.001)  # Simulate network delay
+            return
+        try:
+            backend.put_stream_chunk(destination, chunk_index, chunk_data)
+        except Exception as e:
+            raise StorageBackendError(f"Upload of chunk {chunk_index} to {destination} failed: {e}") from e
     
     # ========================================================================
     # Chunked Download
@@ -429,10 +545,16 @@ class StreamingManager:
         Returns:
             Operation ID for tracking
         """
-        chunk_size = chunk_size or self.chunk_size
-        
-        # Get file size (would query backend in production)
-        file_size = self._get_file_size(source)
+        # Stored streams keep their own chunk layout (manifest)
+        stream_info = self._get_stream_info(source)
+        if stream_info:
+            chunk_size = stream_info['chunk_size']
+            file_size = stream_info['size']
+            expected_hashes = stream_info.get('chunk_hashes')
+        else:
+            chunk_size = chunk_size or self.chunk_size
+            file_size = self._get_file_size(source)
+            expected_hashes = None
         total_chunks = (file_size + chunk_size - 1) // chunk_size
         
         # Create operation
@@ -458,33 +580,12 @@ class StreamingManager:
             # Create output directory
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            # Download chunks
             with open(output_path, 'wb') as f:
-                start_time = time.time()
-                
-                for chunk_index in range(total_chunks):
-                    # Download chunk
-                    chunk_data = self._download_chunk(source, chunk_index, chunk_size)
-                    f.write(chunk_data)
-                    
-                    # Update progress
-                    with self._lock:
-                        progress.transferred_bytes += len(chunk_data)
-                        progress.current_chunk = chunk_index + 1
-                        progress.updated_at = datetime.utcnow()
-                        
-                        # Calculate speed
-                        elapsed = time.time() - start_time
-                        if elapsed > 0:
-                            progress.bytes_per_second = progress.transferred_bytes / elapsed
-                            remaining_bytes = progress.total_bytes - progress.transferred_bytes
-                            progress.estimated_time_remaining = remaining_bytes / progress.bytes_per_second if progress.bytes_per_second > 0 else None
-                    
-                    # Progress callback
-                    if progress_callback:
-                        progress_callback(progress)
-                    
-                    logger.debug(f"Downloaded chunk {chunk_index+1}/{total_chunks} ({len(chunk_data)/1024:.1f}KB)")
+                self._run_download_pipeline(
+                    progress, f, source, chunk_size, total_chunks,
+                    expected_hashes=expected_hashes,
+                    progress_callback=progress_callback
+                )
             
             # Mark complete
             with self._lock:
@@ -511,17 +612,134 @@ class StreamingManager:
             
             raise
     
+    def _run_download_pipeline(
+        self,
+        progress: StreamingProgress,
+        f: BinaryIO,
+        source: str,
+        chunk_size: int,
+        total_chunks: int,
+        expected_hashes: Optional[List[str]] = None,
+        progress_callback: Optional[Callable[[StreamingProgress], None]] = None
+    ) -> None:
+        """
+        Download all chunks of ``source`` into an open file (internal).
+        
+        Up to ``max_concurrent_transfers`` chunks are fetched at once, each
+        directly into a preallocated buffer. A single writer thread verifies
+        the chunk hash (if the manifest has one) and appends the chunks to
+        the file in order; the buffer is reused after the write.
+        """
+        if total_chunks <= 0:
+            return
+        transfers = min(self.max_concurrent_transfers, total_chunks)
+        buffers = [memoryview(bytearray(chunk_size)) for _ in range(min(transfers + 2, total_chunks))]
+        free = list(range(len(buffers)))
+        fetched: Dict[int, tuple] = {}
+        inflight: Dict[Any, tuple] = {}
+        next_index = next_write = 0
+        start_time = time.time()
+        
+        with ThreadPoolExecutor(max_workers=transfers, thread_name_prefix='uds3-stream-transfer') as pool, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix='uds3-stream-hash') as writer:
+            try:
+                while True:
+                    while next_index < total_chunks and free:
+                        slot = free.pop()
+                        future = pool.submit(self._download_chunk_into, source, next_index, chunk_size, buffers[slot])
+                        inflight[future] = ('transfer', next_index, slot)
+                        next_index += 1
+                    
+                    # Hand fetched chunks to the writer in file order
+                    while next_write in fetched:
+                        slot, size = fetched.pop(next_write)
+                        expected = expected_hashes[next_write] if expected_hashes else None
+                        future = writer.submit(self._write_chunk, f, source, next_write, buffers[slot][:size], expected)
+                        inflight[future] = ('write', next_write, slot)
+                        next_write += 1
+                    
+                    if not inflight:
+                        break
+                    
+                    done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        kind, chunk_index, slot = inflight.pop(future)
+                        size = future.result()
+                        if kind == 'transfer':
+                            fetched[chunk_index] = (slot, size)
+                            continue
+                        free.append(slot)
+                        
+                        with self._lock:
+                            progress.transferred_bytes += size
+                            progress.current_chunk = chunk_index + 1
+                            progress.updated_at = datetime.utcnow()
+                            
+                            # Calculate speed
+                            elapsed = time.time() - start_time
+                            if elapsed > 0:
+                                progress.bytes_per_second = progress.transferred_bytes / elapsed
+                                remaining_bytes = progress.total_bytes - progress.transferred_bytes
+                                progress.estimated_time_remaining = remaining_bytes / progress.bytes_per_second if progress.bytes_per_second > 0 else None
+                        
+                        if progress_callback:
+                            progress_callback(progress)
+                        
+                        logger.debug(f"Downloaded chunk {chunk_index+1}/{total_chunks} ({size/1024:.1f}KB)")
+            except BaseException:
+                for future in inflight:
+                    future.cancel()
+                raise
+    
+    def _write_chunk(self, f: BinaryIO, source: str, chunk_index: int, data: memoryview,
+                     expected_hash: Optional[str]) -> int:
+        """Verify and append one downloaded chunk (internal, writer thread)"""
+        if expected_hash and _sha256_hex(data) != expected_hash:
+            raise ChunkMetadataCorruptError(f"Chunk {chunk_index} of {source} failed hash verification")
+        f.write(data)
+        return len(data)
+    
+    def _download_chunk_into(self, source: str, chunk_index: int, chunk_size: int, buffer: memoryview) -> int:
+        """Download a single chunk into a preallocated buffer (internal)"""
+        backend = self._stream_backend()
+        if backend is None:
+            chunk_data = self._download_chunk(source, chunk_index, chunk_size)
+            buffer[:len(chunk_data)] = chunk_data
+            return len(chunk_data)
+        try:
+            return backend.read_stream_chunk_into(source, chunk_index, buffer)
+        except Exception as e:
+            raise StorageBackendError(f"Download of chunk {chunk_index} from {source} failed: {e}") from e
+    
     def _download_chunk(self, source: str, chunk_index: int, chunk_size: int) -> bytes:
         """Download a single chunk (internal)"""
-        # In production, this would download from actual storage backend
-        # For now, simulate download with dummy data
+        backend = self._stream_backend()
+        if backend is not None:
+            buffer = bytearray(chunk_size)
+            size = self._download_chunk_into(source, chunk_index, chunk_size, memoryview(buffer))
+            return bytes(buffer[:size])
+        # No chunk-capable storage backend: simulate download with dummy data
         time.sleep(0.001)  # Simulate network delay
         return b'x' * min(chunk_size, 1024)  # Return dummy data
     
+    def _get_stream_info(self, source: str) -> Optional[Dict[str, Any]]:
+        """Stream manifest from the storage backend, if any (internal)"""
+        backend = self._stream_backend()
+        if backend is None:
+            return None
+        try:
+            return backend.get_stream_info(source)
+        except Exception as e:
+            raise StorageBackendError(f"Reading manifest of {source} failed: {e}") from e
+    
     def _get_file_size(self, source: str) -> int:
         """Get file size from backend (internal)"""
-        # In production, query backend for file size
-        # For now, return dummy size
+        stream_info = self._get_stream_info(source)
+        if stream_info:
+            return stream_info['size']
+        if self._stream_backend() is not None:
+            raise FileNotFoundError(f"Stream not found: {source}")
+        # No chunk-capable storage backend: return dummy size
         return 100 * 1024 * 1024  # 100 MB
     
     # ========================================================================
@@ -563,48 +781,19 @@ class StreamingManager:
         total_chunks = (file_size + chunk_size - 1) // chunk_size
         
         try:
+            with self._lock:
+                progress.status = StreamingStatus.IN_PROGRESS
+                progress.updated_at = datetime.utcnow()
+            
             with open(file_path, 'rb') as f:
                 # Skip to resume point
                 f.seek(uploaded_chunks * chunk_size)
-                
-                start_time = time.time()
-                
-                for chunk_index in range(uploaded_chunks, total_chunks):
-                    # Read chunk
-                    chunk_data = f.read(chunk_size)
-                    if not chunk_data:
-                        break
-                    
-                    # Upload chunk
-                    chunk_hash = hashlib.sha256(chunk_data).hexdigest()
-                    chunk_id = f"{operation_id}-chunk-{chunk_index}"
-                    self._upload_chunk(destination, chunk_index, chunk_data)
-                    
-                    # Update progress
-                    chunk_metadata = ChunkMetadata(
-                        chunk_id=chunk_id,
-                        chunk_index=chunk_index,
-                        chunk_size=len(chunk_data),
-                        chunk_hash=chunk_hash,
-                        uploaded_at=datetime.utcnow()
-                    )
-                    
-                    with self._lock:
-                        self._chunks[operation_id].append(chunk_metadata)
-                        progress.transferred_bytes += len(chunk_data)
-                        progress.current_chunk = chunk_index + 1
-                        progress.status = StreamingStatus.IN_PROGRESS
-                        progress.updated_at = datetime.utcnow()
-                        
-                        # Calculate speed
-                        elapsed = time.time() - start_time
-                        if elapsed > 0:
-                            bytes_since_resume = progress.transferred_bytes - (uploaded_chunks * chunk_size)
-                            progress.bytes_per_second = bytes_since_resume / elapsed
-                    
-                    # Progress callback
-                    if progress_callback:
-                        progress_callback(progress)
+                self._run_upload_pipeline(
+                    operation_id, progress, f, destination, chunk_size,
+                    first_index=uploaded_chunks, total_chunks=total_chunks,
+                    progress_callback=progress_callback
+                )
+            self._finalize_upload(operation_id, destination, chunk_size, file_size)
             
             # Mark complete
             with self._lock:
@@ -991,15 +1180,31 @@ class StreamingManager:
     # Helper Methods
     # ========================================================================
     
+    def _locate_chunk(self, chunk_id: str) -> Optional[ChunkMetadata]:
+        """Find chunk metadata by chunk ID ("<operation_id>-chunk-<index>")"""
+        operation_id, _, index = chunk_id.rpartition('-chunk-')
+        with self._lock:
+            chunks = self._chunks.get(operation_id, [])
+            if index.isdigit() and int(index) < len(chunks) and chunks[int(index)].chunk_id == chunk_id:
+                return chunks[int(index)]
+            return next((c for c in chunks if c.chunk_id == chunk_id), None)
+    
     def _delete_chunk(self, chunk_id: str) -> None:
-        """Delete a chunk from storage (simulate)"""
-        # In production: Delete from actual storage backend
+        """Delete a chunk from storage"""
         logger.debug(f"Deleting chunk: {chunk_id}")
+        backend = self._stream_backend()
+        chunk = self._locate_chunk(chunk_id)
+        if backend is None or chunk is None or chunk.destination is None:
+            return  # Simulated storage: nothing to delete
+        backend.delete_stream_chunk(chunk.destination, chunk.chunk_index)
     
     def _chunk_exists(self, chunk_id: str) -> bool:
-        """Check if chunk exists (simulate)"""
-        # In production: Check actual storage backend
-        return False  # Assume deleted successfully
+        """Check if chunk exists in storage"""
+        backend = self._stream_backend()
+        chunk = self._locate_chunk(chunk_id)
+        if backend is None or chunk is None or chunk.destination is None:
+            return False  # Simulated storage: assume deleted successfully
+        return backend.stream_chunk_exists(chunk.destination, chunk.chunk_index)
     
     def _store_failed_deletions(self, operation_id: str, failed_chunks: List[str]) -> None:
         """Store failed deletions for manual cleanup"""
@@ -1075,25 +1280,63 @@ class StreamingManager:
     def stream_to_vector_db(
         self,
         file_path: str,
-        embedding_function: Callable[[str], List[float]],
+        embedding_function: Optional[Callable[[str], List[float]]] = None,
         chunk_text_size: int = 1000,
-        progress_callback: Optional[Callable[[StreamingProgress], None]] = None
+        progress_callback: Optional[Callable[[StreamingProgress], None]] = None,
+        embedder: Any = None,
+        vector_backend: Any = None,
+        document_id: Optional[str] = None,
+        chunk_overlap: int = 200,
+        embed_batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None
     ) -> str:
         """
         Stream large document to vector DB in chunks.
         
-        For large PDFs with embeddings, process in chunks to avoid memory issues.
+        Runs the bounded-memory embed-and-index pipeline
+        (manager/streaming_pipeline.py): incremental text extraction,
+        overlapping chunking, micro-batched embedding and batched vector
+        inserts, each stage on its own worker with bounded queues in
+        between. Memory stays constant regardless of file size.
         
         Args:
             file_path: Path to document
-            embedding_function: Function to generate embeddings
+            embedding_function: Function to generate one embedding (used if no embedder)
             chunk_text_size: Size of text chunks (characters)
-            progress_callback: Callback for progress updates
+            progress_callback: Callback for progress updates (see ``stage_progress``)
+            embedder: Object with ``embed_batch(texts)`` (e.g. UDS3GermanEmbeddings)
+            vector_backend: Vector backend for ChromaBatchInserter (None: embed only)
+            document_id: Document ID for chunk IDs/metadata (default: file name)
+            chunk_overlap: Characters shared by consecutive chunks
+                (clamped to chunk_text_size - 1)
+            embed_batch_size: Texts per embedding call
+            queue_size: Embedding batches buffered between stages
         
         Returns:
             Operation ID
         """
+        from manager.streaming_pipeline import (
+            EmbedIndexPipeline,
+            PIPELINE_EMBED_BATCH_SIZE,
+            PIPELINE_QUEUE_SIZE,
+            iter_text_segments,
+        )
+        
+        if embedder is not None:
+            from core.embeddings import embed_batch_kwargs
+            
+            embed_kwargs = embed_batch_kwargs(embedder.embed_batch)
+            
+            def embed_batch(texts: List[str]):
+                return embedder.embed_batch(texts, **embed_kwargs)
+        elif embedding_function is not None:
+            def embed_batch(texts: List[str]):
+                return [embedding_function(text) for text in texts]
+        else:
+            raise ValueError("stream_to_vector_db requires embedding_function or embedder")
+        
         file_size = os.path.getsize(file_path)
+        document_id = document_id or Path(file_path).stem
         
         # Create operation
         operation_id = f"embed-{uuid.uuid4().hex[:12]}"
@@ -1114,36 +1357,52 @@ class StreamingManager:
         
         logger.info(f"Starting embedding stream: {file_path} ({file_size/1024/1024:.1f}MB)")
         
+        start_time = time.time()
+        
+        def on_progress(stages: Dict[str, int]):
+            with self._lock:
+                progress.stage_progress = stages
+                progress.transferred_bytes = stages['extracted_bytes']
+                progress.chunk_count = stages['chunks']
+                progress.current_chunk = stages['indexed']
+                progress.updated_at = datetime.utcnow()
+                elapsed = time.time() - start_time
+                if elapsed > 0:
+                    progress.bytes_per_second = progress.transferred_bytes / elapsed
+            
+            if progress_callback:
+                progress_callback(progress)
+        
+        inserter = None
+        if vector_backend is not None:
+            from database.batch_operations import ChromaBatchInserter
+            inserter = ChromaBatchInserter(vector_backend)
+        
+        pipeline = EmbedIndexPipeline(
+            embed_batch,
+            inserter=inserter,
+            document_id=document_id,
+            chunk_size=chunk_text_size,
+            overlap=max(0, min(chunk_overlap, chunk_text_size - 1)),
+            embed_batch_size=embed_batch_size or PIPELINE_EMBED_BATCH_SIZE,
+            queue_size=queue_size or PIPELINE_QUEUE_SIZE,
+            on_progress=on_progress,
+            source_path=file_path
+        )
+        
         try:
-            # Read file in chunks and generate embeddings
-            # (Simplified - in production would use PDF parser)
-            with open(file_path, 'rb') as f:
-                chunk_index = 0
-                while True:
-                    # Read chunk
-                    chunk_data = f.read(self.chunk_size)
-                    if not chunk_data:
-                        break
-                    
-                    # Process chunk (simulate embedding generation)
-                    # In production: extract text, generate embeddings, insert to vector DB
-                    time.sleep(0.01)  # Simulate processing
-                    
-                    # Update progress
-                    with self._lock:
-                        progress.transferred_bytes += len(chunk_data)
-                        progress.current_chunk = chunk_index + 1
-                        progress.updated_at = datetime.utcnow()
-                    
-                    if progress_callback:
-                        progress_callback(progress)
-                    
-                    chunk_index += 1
-                    logger.debug(f"Processed embedding chunk {chunk_index}")
+            try:
+                stages = pipeline.run(iter_text_segments(file_path))
+            finally:
+                if inserter is not None:
+                    inserter.close()
             
             # Mark complete
             with self._lock:
-                progress.chunk_count = chunk_index
+                progress.stage_progress = stages
+                progress.transferred_bytes = file_size
+                progress.chunk_count = stages['chunks']
+                progress.current_chunk = stages['indexed']
                 progress.status = StreamingStatus.COMPLETED
                 progress.completed_at = datetime.utcnow()
                 progress.updated_at = datetime.utcnow()
@@ -1151,13 +1410,14 @@ class StreamingManager:
             if progress_callback:
                 progress_callback(progress)
             
-            logger.info(f"Embedding stream complete: {operation_id} ({chunk_index} chunks)")
+            logger.info(f"Embedding stream complete: {operation_id} ({stages['chunks']} chunks)")
             
             return operation_id
             
         except Exception as e:
             logger.error(f"Embedding stream failed: {e}")
             with self._lock:
+                progress.stage_progress = pipeline.snapshot()
                 progress.status = StreamingStatus.FAILED
                 progress.error_message = str(e)
                 progress.updated_at = datetime.utcnow()
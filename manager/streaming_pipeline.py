@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+streaming_pipeline.py
+
+UDS3 Streaming Embed-and-Index Pipeline
+=======================================
+Bounded-memory ingestion of large documents into the vector DB:
+
+    extract ──queue──▶ embed ──queue──▶ index
+    (text segments,    (micro-batched    (ChromaBatchInserter)
+     overlapping        embed_batch)
+     chunks)
+
+Every stage runs on its own thread (the index stage on the calling thread,
+so progress callbacks keep firing where the caller expects them). Stages are
+connected by bounded queues: a slow embedder throttles extraction instead of
+buffering the whole document, so RSS stays constant regardless of file size.
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import codecs
+import logging
+import os
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Queue depth between stages (in embedding batches)
+PIPELINE_QUEUE_SIZE = int(os.getenv("UDS3_STREAMING_PIPELINE_QUEUE", "4"))
+# Texts per embed_batch call
+PIPELINE_EMBED_BATCH_SIZE = int(os.getenv("UDS3_STREAMING_EMBED_BATCH", "32"))
+# Bytes per read for plain-text extraction
+PIPELINE_READ_SIZE = 1024 * 1024
+
+_END = object()
+
+
+class PipelineStopped(Exception):
+    """Raised inside a stage when another stage failed"""
+    pass
+
+
+# ============================================================================
+# Extraction & Chunking
+# ============================================================================
+
+def iter_text_segments(file_path: str, read_size: int = PIPELINE_READ_SIZE) -> Iterator[Tuple[str, int]]:
+    """
+    Yield ``(text, bytes_consumed)`` segments of a document incrementally.
+
+    PDFs are extracted page by page with pypdf (if installed); everything
+    else is decoded as UTF-8 in ``read_size`` blocks with an incremental
+    decoder, so multi-byte characters split across blocks survive.
+    """
+    if file_path.lower().endswith('.pdf'):
+        if PYPDF_AVAILABLE:
+            yield from _iter_pdf_pages(file_path)
+            return
+        logger.warning("pypdf nicht verfügbar - PDF wird als Text dekodiert. Installiere: pip install pypdf")
+
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    with open(file_path, 'rb') as f:
+        while True:
+            block = f.read(read_size)
+            if not block:
+                break
+            yield decoder.decode(block), len(block)
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail, 0
+
+
+def _iter_pdf_pages(file_path: str) -> Iterator[Tuple[str, int]]:
+    """One segment per PDF page; bytes are attributed evenly across pages"""
+    file_size = os.path.getsize(file_path)
+    reader = PdfReader(file_path)
+    page_count = len(reader.pages)
+    consumed = 0
+    for index, page in enumerate(reader.pages):
+        position = file_size * (index + 1) // page_count
+        yield (page.extract_text() or '') + '\n', position - consumed
+        consumed = position
+
+
+class TextChunker:
+    """
+    Incremental fixed-size chunker with overlap.
+
+    ``feed`` accepts text segments of any length and yields every complete
+    chunk; ``finish`` yields the remainder. Consecutive chunks share
+    ``overlap`` characters.
+    """
+
+    def __init__(self, chunk_size: int = 1000, overlap: int = 200):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= overlap < chunk_size:
+            raise ValueError("overlap must be in [0, chunk_size)")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self._buffer = ''
+        self._pos = 0
+        self._emitted_tail = 0  # chars at _pos that were already part of a chunk
+
+    def feed(self, text: str) -> Iterator[str]:
+        if not text:
+            return
+        # Compact before appending so the buffer stays ~chunk_size + len(text)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        step = self.chunk_size - self.overlap
+        while len(self._buffer) - self._pos >= self.chunk_size:
+            yield self._buffer[self._pos:self._pos + self.chunk_size]
+            self._pos += step
+            self._emitted_tail = self.overlap
+
+    def finish(self) -> Iterator[str]:
+        rest = self._buffer[self._pos:]
+        if len(rest) > self._emitted_tail and rest.strip():
+            yield rest
+        self._buffer, self._pos, self._emitted_tail = '', 0, 0
+
+
+# ============================================================================
+# Pipeline
+# ============================================================================
+
+class EmbedIndexPipeline:
+    """
+    Extract → chunk → embed → index with one worker per stage.
+
+    Args:
+        embed_batch: Callable mapping a list of texts to a list of vectors
+            (e.g. ``UDS3GermanEmbeddings.embed_batch``)
+        inserter: Object with ``flush_batch(items) -> bool`` taking
+            ``(chunk_id, vector, metadata)`` tuples (e.g. ``ChromaBatchInserter``);
+            None only counts
+        document_id: Prefix for chunk IDs and ``document_id`` metadata
+        chunk_size / overlap: Chunking in characters
+        embed_batch_size: Texts per embedding call
+        queue_size: Embedding batches buffered between two stages
+        on_progress: Called on the index thread after every indexed batch
+            with the current stage counters
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Sequence[Any]],
+        inserter: Any = None,
+        document_id: str = 'document',
+        chunk_size: int = 1000,
+        overlap: int = 200,
+        embed_batch_size: int = PIPELINE_EMBED_BATCH_SIZE,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+        on_progress: Optional[Callable[[Dict[str, int]], None]] = None,
+        source_path: Optional[str] = None
+    ):
+        self.embed_batch = embed_batch
+        self.inserter = inserter
+        self.document_id = document_id
+        self.chunker = TextChunker(chunk_size, overlap)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.on_progress = on_progress
+        self.source_path = source_path
+        self._chunks: queue.Queue = queue.Queue(maxsize=max(1, queue_size) * self.embed_batch_size)
+        self._vectors: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            'extracted_bytes': 0,
+            'chunks': 0,
+            'embedded': 0,
+            'indexed': 0,
+            'embed_calls': 0,
+        }
+
+    def run(self, segments: Iterator[Tuple[str, int]]) -> Dict[str, int]:
+        """Run all stages to completion; re-raises the first stage error."""
+        workers = [
+            threading.Thread(target=self._guard, args=(self._extract_stage, segments),
+                             name='uds3-pipeline-extract', daemon=True),
+            threading.Thread(target=self._guard, args=(self._embed_stage,),
+                             name='uds3-pipeline-embed', daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+        self._guard(self._index_stage)
+        for worker in workers:
+            worker.join()
+
+        if self._errors:
+            raise self._errors[0]
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, int]:
+        """Current stage counters"""
+        with self._lock:
+            return dict(self.stats)
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+    def _extract_stage(self, segments: Iterator[Tuple[str, int]]) -> None:
+        index = 0
+        for text, consumed in segments:
+            emitted = 0
+            for chunk in self.chunker.feed(text):
+                self._put(self._chunks, (index + emitted, chunk))
+                emitted += 1
+            index += emitted
+            self._count(extracted_bytes=consumed, chunks=emitted)
+        for chunk in self.chunker.finish():
+            self._put(self._chunks, (index, chunk))
+            index += 1
+            self._count(chunks=1)
+        self._put(self._chunks, _END)
+
+    def _embed_stage(self) -> None:
+        done = False
+        while not done:
+            items = []
+            while len(items) < self.embed_batch_size:
+                item = self._get(self._chunks)
+                if item is _END:
+                    done = True
+                    break
+                items.append(item)
+            if items:
+                vectors = self.embed_batch([text for _, text in items])
+                if len(vectors) != len(items):
+                    raise ValueError(f"Embedding returned {len(vectors)} vectors for {len(items)} texts")
+                self._count(embedded=len(items), embed_calls=1)
+                self._put(self._vectors, (items, vectors))
+        self._put(self._vectors, _END)
+
+    def _index_stage(self) -> None:
+        while True:
+            batch = self._get(self._vectors)
+            if batch is _END:
+                break
+            items, vectors = batch
+            if self.inserter is not None:
+                rows = [
+                    (
+                        f"{self.document_id}_chunk_{index:04d}",
+                        vector.tolist() if hasattr(vector, 'tolist') else list(vector),
+                        self._metadata(index, text)
+                    )
+                    for (index, text), vector in zip(items, vectors)
+                ]
+                if not self.inserter.flush_batch(rows):
+                    raise RuntimeError(
+                        f"Vector write failed for {rows[0][0]}..{rows[-1][0]}"
+                    )
+            self._count(indexed=len(items))
+            if self.on_progress:
+                self.on_progress(self.snapshot())
+
+    def _metadata(self, index: int, text: str) -> Dict[str, Any]:
+        metadata = {'document_id': self.document_id, 'chunk_index': index, 'content': text}
+        if self.source_path:
+            metadata['source_path'] = self.source_path
+        return metadata
+
+    # ------------------------------------------------------------------
+    # Plumbing
+    # ------------------------------------------------------------------
+    def _guard(self, stage: Callable, *args) -> None:
+        try:
+            stage(*args)
+        except PipelineStopped:
+            pass
+        except BaseException as exc:
+            with self._lock:
+                self._errors.append(exc)
+            self._stop.set()
+
+    def _put(self, q: queue.Queue, item: Any) -> None:
+        while True:
+            if self._stop.is_set():
+                raise PipelineStopped()
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: queue.Queue) -> Any:
+        while True:
+            if self._stop.is_set():
+                raise PipelineStopped()
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for key, delta in deltas.items():
+                self.stats[key] += delta
@@ -48,7 +48,9 @@ from search.search_api import (
     SearchResult,
     SearchType,
     FusionMethod,
+    HybridSearchResults,
 )
+from search.fusion import FusionEngine
 
 # Cross-Encoder Reranking (v1.6.0)
 RERANKER_AVAILABLE = False
@@ -56,6 +58,7 @@ try:
     from search.reranker import (
         CrossEncoderReranker,
         RerankerConfig,
+        PairScoreCache,
         create_reranker,
         get_german_reranker,
         get_fast_reranker,
@@ -72,9 +75,12 @@ __all__ = [
     "SearchResult",
     "SearchType",
     "FusionMethod",
+    "HybridSearchResults",
+    "FusionEngine",
     # Reranking (v1.6.0)
     "CrossEncoderReranker",
     "RerankerConfig",
+    "PairScoreCache",
     "create_reranker",
     "get_german_reranker",
     "get_fast_reranker",
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+fusion.py
+
+UDS3 Result Fusion Engine - Vectorized rank/score fusion for hybrid search
+Fuses the ranked lists of several retrieval sources (vector, graph, keyword)
+into a single ranking.
+
+Implementation:
+- Each source is converted once into compact arrays
+  (doc index, rank, score) over a shared document vocabulary
+- RRF, weighted sum and CombMNZ are computed with NumPy (np.add.at)
+- Top-k selection via np.argpartition (O(n)) instead of a full sort;
+  only the k winners are sorted and materialized as SearchResult
+- Input SearchResult objects are never mutated
+
+Fusion methods:
+- rrf:      score(d) = Σ_s w_s / (k + rank_s(d))           (weights normalized)
+- weighted: score(d) = Σ_s w_s * score_s(d)                 (legacy semantics)
+- combmnz:  score(d) = |{s : d ∈ s}| * Σ_s w_s * minmax_s(score_s(d))
+
+Usage:
+    from search.fusion import FusionEngine
+
+    engine = FusionEngine()
+    fused = engine.fuse(ranked_lists, method="rrf", weights=weights, top_k=10)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceArrays:
+    """Compact per-source representation of a ranked list"""
+    doc_idx: np.ndarray  # int32, index into the shared document vocabulary
+    rank: np.ndarray  # int32, 1-based rank within the source
+    score: np.ndarray  # float64, raw source score
+
+
+class RankedCandidates:
+    """
+    Shared document vocabulary plus per-source arrays
+
+    The only per-item Python work is mapping document IDs to vocabulary
+    indices; all scoring happens on the arrays.
+    """
+
+    def __init__(self, ranked_lists: Dict[str, List]):
+        self.sources: Dict[str, SourceArrays] = {}
+        self.first_result: List = []  # first occurrence per document (content/metadata)
+        self._related: Dict[int, List[Dict]] = {}  # doc index -> merged related_docs
+
+        index: Dict[str, int] = {}
+        for source, results in ranked_lists.items():
+            n = len(results)
+            doc_idx = np.empty(n, dtype=np.int32)
+            score = np.empty(n, dtype=np.float64)
+            for pos, result in enumerate(results):
+                idx = index.get(result.document_id)
+                if idx is None:
+                    idx = len(self.first_result)
+                    index[result.document_id] = idx
+                    self.first_result.append(result)
+                doc_idx[pos] = idx
+                score[pos] = result.score
+                if result.related_docs:
+                    self._related.setdefault(idx, []).append(result.related_docs)
+            self.sources[source] = SourceArrays(
+                doc_idx=doc_idx,
+                rank=np.arange(1, n + 1, dtype=np.int32),
+                score=score
+            )
+
+    def __len__(self) -> int:
+        return len(self.first_result)
+
+    def related_docs(self, idx: int) -> List[Dict]:
+        """Related docs of all sources, de-duplicated in first-seen order"""
+        merged: List[Dict] = []
+        for related in self._related.get(idx, ()):
+            for rel_doc in related:
+                if rel_doc not in merged:
+                    merged.append(rel_doc)
+        return merged
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """
+    Indices of the k highest scores, sorted descending
+
+    Uses argpartition for the selection; ties are broken by index
+    (first-seen document wins) so the result is deterministic.
+    """
+    n = scores.shape[0]
+    if k is None or k >= n:
+        candidates = np.arange(n)
+    elif k <= 0:
+        return np.empty(0, dtype=np.intp)
+    else:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
+
+
+class FusionEngine:
+    """Vectorized RRF / weighted / CombMNZ fusion over SearchResult lists"""
+
+    METHODS = ("rrf", "weighted", "combmnz")
+
+    def __init__(self, rrf_k: int = 60):
+        self.rrf_k = rrf_k
+
+    def scores(
+        self,
+        candidates: RankedCandidates,
+        method: str = "rrf",
+        weights: Optional[Dict[str, float]] = None,
+        rrf_k: Optional[int] = None
+    ) -> np.ndarray:
+        """Fused score per vocabulary document (float64 array)"""
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown fusion method: {method}")
+
+        weights = weights or {source: 1.0 for source in candidates.sources}
+        if method == "rrf":
+            # Normalize weights (RRF is rank-based, weights only set proportions)
+            total_weight = sum(weights.values())
+            if total_weight > 0:
+                weights = {source: w / total_weight for source, w in weights.items()}
+        k = self.rrf_k if rrf_k is None else rrf_k
+
+        fused = np.zeros(len(candidates), dtype=np.float64)
+        hits = np.zeros(len(candidates), dtype=np.int32) if method == "combmnz" else None
+
+        for source, arrays in candidates.sources.items():
+            if arrays.doc_idx.size == 0:
+                continue
+            weight = weights.get(source, 1.0)
+
+            if method == "rrf":
+                contribution = weight / (k + arrays.rank)
+            elif method == "weighted":
+                contribution = weight * arrays.score
+            else:
+                low, high = arrays.score.min(), arrays.score.max()
+                spread = high - low
+                normalized = (arrays.score - low) / spread if spread > 0 else np.ones_like(arrays.score)
+                contribution = weight * normalized
+                present = np.zeros(len(candidates), dtype=bool)
+                present[arrays.doc_idx] = True
+                hits += present
+
+            np.add.at(fused, arrays.doc_idx, contribution)
+
+        if hits is not None:
+            fused *= hits
+        return fused
+
+    def fuse(
+        self,
+        ranked_lists: Dict[str, List],
+        method: str = "rrf",
+        weights: Optional[Dict[str, float]] = None,
+        top_k: Optional[int] = None,
+        rrf_k: Optional[int] = None
+    ) -> List:
+        """
+        Fuse ranked lists and return the top_k results (all if None)
+
+        Returns new result objects (same class as the inputs, i.e.
+        SearchResult) carrying the fused score; the inputs are left untouched.
+        """
+        candidates = RankedCandidates(ranked_lists)
+        if not len(candidates):
+            return []
+
+        fused = self.scores(candidates, method=method, weights=weights, rrf_k=rrf_k)
+        winners = top_k_indices(fused, top_k)
+
+        results = []
+        for idx in winners.tolist():
+            first = candidates.first_result[idx]
+            results.append(type(first)(
+                document_id=first.document_id,
+                content=first.content,
+                metadata=dict(first.metadata),
+                score=float(fused[idx]),
+                # Legacy weighted fusion kept the originating source label
+                source=first.source if method == "weighted" else f"{method}_fusion",
+                related_docs=candidates.related_docs(idx)
+            ))
+
+        logger.info(
+            f"✅ {method.upper()} Fusion: {len(candidates)} unique documents from "
+            f"{len(ranked_lists)} sources → {len(results)}"
+        )
+        return results
@@ -11,6 +11,9 @@ v1.6.0 Implementation:
 - Support for German legal text (German BERT models)
 - ONNX optimization for low-latency inference
 - Configurable candidate count and batch processing
+- Bounded LRU cache of (query, document) pair scores
+- Cascade mode: score in chunks, stop once the top-k is stable by margin
+- Optional cheap first-pass model that prunes candidates before the main model
 
 Two-Stage Retrieval Architecture:
 1. Stage 1 (Bi-Encoder): Fast retrieval with BM25/Vector/Graph (top-k * multiplier)
@@ -34,8 +37,12 @@ License: MIT with Government Partnership Commons Clause
 Repository: https://github.com/makr-code/VCC-UDS3
 """
 
+import asyncio
+import hashlib
 import logging
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any, Tuple
 from abc import ABC, abstractmethod
@@ -84,6 +91,13 @@ class RerankerConfig:
         use_onnx: Use ONNX Runtime for optimization
         device: Device for inference ('cpu', 'cuda', 'mps')
         score_threshold: Minimum score threshold for results
+        score_cache_size: Max cached (query, document) pair scores (0 = disabled)
+        cascade: Score candidates in chunks and stop early once top-k is stable
+        cascade_chunk_size: Candidates scored per cascade step
+        cascade_margin: Stop when the best score of the last chunk is at least
+                        this far below the current k-th score
+        first_pass_multiplier: With a first-pass model, keep top_k * multiplier
+                               candidates for the main model
     """
     model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
     max_length: int = 512
@@ -91,6 +105,11 @@ class RerankerConfig:
     use_onnx: bool = False
     device: str = "cpu"
     score_threshold: float = 0.0
+    score_cache_size: int = 10000
+    cascade: bool = False
+    cascade_chunk_size: int = 16
+    cascade_margin: float = 1.0
+    first_pass_multiplier: int = 3
     
     # German-optimized models
     GERMAN_MODELS = [
@@ -152,6 +171,68 @@ class BaseReranker(ABC):
         pass
 
 
+# ============================================================================
+# Pair Score Cache
+# ============================================================================
+
+class PairScoreCache:
+    """
+    Thread-safe bounded LRU cache of Cross-Encoder pair scores
+    
+    Keys are (model name, query hash, document hash); only digests are kept,
+    so memory per entry is constant regardless of document length.
+    """
+    
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._scores: "OrderedDict[Tuple[str, bytes, bytes], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def digest(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    
+    def get_many(self, keys: List[Tuple[str, bytes, bytes]]) -> List[Optional[float]]:
+        with self._lock:
+            found = []
+            for key in keys:
+                score = self._scores.get(key)
+                if score is not None:
+                    self._scores.move_to_end(key)
+                found.append(score)
+            hit_count = sum(score is not None for score in found)
+            self.hits += hit_count
+            self.misses += len(keys) - hit_count
+            return found
+    
+    def put_many(self, keys: List[Tuple[str, bytes, bytes]], scores: List[float]):
+        with self._lock:
+            for key, score in zip(keys, scores):
+                self._scores[key] = score
+                self._scores.move_to_end(key)
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._scores.clear()
+    
+    def __len__(self) -> int:
+        return len(self._scores)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._scores),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
 # ============================================================================
 # Cross-Encoder Reranker Implementation
 # ============================================================================
@@ -172,12 +253,20 @@ class CrossEncoderReranker(BaseReranker):
     Trade-offs:
     - Higher latency than bi-encoders (O(n) vs O(1) per candidate)
     - Best used with limited candidate set (50-200 documents)
+    
+    Latency reductions:
+    - Pair scores are cached (LRU, keyed by model + query/document hash)
+    - cascade=True scores in chunks (first-stage order) and stops once the
+      top-k is stable by ``cascade_margin``
+    - An optional cheap ``first_pass`` reranker prunes the candidate set to
+      top_k * ``first_pass_multiplier`` before this model runs
     """
     
     def __init__(
         self,
         config: Optional[RerankerConfig] = None,
-        model_name: Optional[str] = None
+        model_name: Optional[str] = None,
+        first_pass: Optional[BaseReranker] = None
     ):
         """
         Initialize Cross-Encoder reranker
@@ -185,6 +274,8 @@ class CrossEncoderReranker(BaseReranker):
         Args:
             config: RerankerConfig instance
             model_name: Override model name (shortcut for config.model_name)
+            first_pass: Optional cheap reranker used to prune candidates
+                        (e.g. get_fast_reranker())
         """
         self.config = config or RerankerConfig()
         if model_name:
@@ -192,6 +283,17 @@ class CrossEncoderReranker(BaseReranker):
         
         self.model = None
         self._initialized = False
+        self.first_pass = first_pass
+        self.score_cache = (
+            PairScoreCache(self.config.score_cache_size)
+            if self.config.score_cache_size > 0 else None
+        )
+        self.stats = {
+            "pairs_scored": 0,
+            "cascade_early_exits": 0,
+            "cascade_pairs_skipped": 0,
+            "first_pass_pruned": 0,
+        }
         
         if CROSS_ENCODER_AVAILABLE:
             self._load_model()
@@ -253,19 +355,38 @@ class CrossEncoderReranker(BaseReranker):
         try:
             start_time = time.time()
             
-            # Create query-document pairs
-            pairs = [[query, doc] for doc in documents]
-            
-            # Get scores from Cross-Encoder
-            scores = self.model.predict(
-                pairs,
-                batch_size=self.config.batch_size,
-                show_progress_bar=False
-            )
+            # Serve cached pairs, score only the rest
+            scores: List[Optional[float]] = [None] * len(documents)
+            keys = None
+            if self.score_cache is not None:
+                query_digest = PairScoreCache.digest(query)
+                keys = [
+                    (self.config.model_name, query_digest, PairScoreCache.digest(doc))
+                    for doc in documents
+                ]
+                scores = self.score_cache.get_many(keys)
+            missing = [i for i, score in enumerate(scores) if score is None]
             
-            # Convert numpy array to list if needed
-            if hasattr(scores, 'tolist'):
-                scores = scores.tolist()
+            if missing:
+                # Create query-document pairs
+                pairs = [[query, documents[i]] for i in missing]
+                
+                # Get scores from Cross-Encoder
+                new_scores = self.model.predict(
+                    pairs,
+                    batch_size=self.config.batch_size,
+                    show_progress_bar=False
+                )
+                
+                # Convert numpy array to list if needed
+                if hasattr(new_scores, 'tolist'):
+                    new_scores = new_scores.tolist()
+                
+                for i, score in zip(missing, new_scores):
+                    scores[i] = float(score)
+                self.stats["pairs_scored"] += len(missing)
+                if keys is not None:
+                    self.score_cache.put_many([keys[i] for i in missing], [scores[i] for i in missing])
             
             inference_time = time.time() - start_time
             
@@ -277,8 +398,8 @@ class CrossEncoderReranker(BaseReranker):
                 ).observe(inference_time)
             
             logger.debug(
-                f"CrossEncoder scoring: {len(documents)} docs in {inference_time:.3f}s "
-                f"({len(documents)/inference_time:.1f} docs/s)"
+                f"CrossEncoder scoring: {len(documents)} docs ({len(missing)} uncached) "
+                f"in {inference_time:.3f}s"
             )
             
             return scores
@@ -287,6 +408,82 @@ class CrossEncoderReranker(BaseReranker):
             logger.error(f"❌ CrossEncoder scoring failed: {e}")
             return [0.5] * len(documents)
     
+    def _cascade_scores(
+        self,
+        query: str,
+        documents: List[str],
+        top_k: int
+    ) -> List[Optional[float]]:
+        """
+        Score documents chunk by chunk (in first-stage order) and stop early
+        
+        After each chunk the current k-th best score is compared with the best
+        score of the chunk just scored: if the chunk could not come within
+        ``cascade_margin`` of the top-k, later (lower-ranked) candidates are
+        assumed not to either. Unscored documents get None.
+        """
+        scores: List[Optional[float]] = [None] * len(documents)
+        chunk_size = max(1, self.config.cascade_chunk_size)
+        start, end = 0, min(len(documents), max(top_k, chunk_size))
+        top_scores: List[float] = []
+        
+        while start < len(documents):
+            chunk_scores = self.get_scores(query, documents[start:end])
+            scores[start:end] = chunk_scores
+            
+            if len(top_scores) >= top_k and chunk_scores:
+                kth_score = top_scores[top_k - 1]
+                stable = max(chunk_scores) + self.config.cascade_margin <= kth_score
+            else:
+                stable = False
+            top_scores = sorted(top_scores + list(chunk_scores), reverse=True)[:top_k]
+            
+            start, end = end, min(len(documents), end + chunk_size)
+            if stable and start < len(documents):
+                self.stats["cascade_early_exits"] += 1
+                self.stats["cascade_pairs_skipped"] += len(documents) - start
+                break
+        
+        return scores
+    
+    def _prune_with_first_pass(
+        self,
+        query: str,
+        candidates: List[Any],
+        documents: List[str],
+        top_k: int
+    ) -> Tuple[List[Any], List[str]]:
+        """Keep the top_k * first_pass_multiplier candidates by first-pass score"""
+        keep = top_k * max(1, self.config.first_pass_multiplier)
+        if self.first_pass is None or len(candidates) <= keep:
+            return candidates, documents
+        
+        fast_scores = self.first_pass.get_scores(query, documents)
+        order = sorted(range(len(candidates)), key=lambda i: fast_scores[i], reverse=True)[:keep]
+        self.stats["first_pass_pruned"] += len(candidates) - keep
+        return [candidates[i] for i in order], [documents[i] for i in order]
+    
+    def _score_candidates(
+        self,
+        query: str,
+        candidates: List[Any],
+        documents: List[str],
+        top_k: int
+    ) -> List[Tuple[Any, float]]:
+        """First-pass pruning + (cascade) scoring; blocking, runs in a worker thread"""
+        candidates, documents = self._prune_with_first_pass(query, candidates, documents, top_k)
+        if self.config.cascade:
+            scores = self._cascade_scores(query, documents, top_k)
+        else:
+            scores = self.get_scores(query, documents)
+        return [(c, s) for c, s in zip(candidates, scores) if s is not None]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Scoring, cascade and cache statistics"""
+        stats = dict(self.stats)
+        stats["score_cache"] = self.score_cache.get_stats() if self.score_cache else None
+        return stats
+    
     async def rerank(
         self,
         query: str,
@@ -332,11 +529,10 @@ class CrossEncoderReranker(BaseReranker):
                 
                 documents.append(text)
             
-            # Get Cross-Encoder scores
-            scores = self.get_scores(query, documents)
-            
-            # Pair candidates with scores
-            scored_candidates = list(zip(candidates, scores))
+            # Get Cross-Encoder scores (blocking inference off the event loop)
+            scored_candidates = await asyncio.to_thread(
+                self._score_candidates, query, candidates, documents, top_k
+            )
             
             # Sort by score (descending)
             scored_candidates.sort(key=lambda x: x[1], reverse=True)
@@ -422,7 +618,8 @@ class NoOpReranker(BaseReranker):
 def create_reranker(
     model_name: Optional[str] = None,
     config: Optional[RerankerConfig] = None,
-    fallback_to_noop: bool = True
+    fallback_to_noop: bool = True,
+    first_pass: Optional[BaseReranker] = None
 ) -> BaseReranker:
     """
     Factory function to create appropriate reranker
@@ -431,12 +628,13 @@ def create_reranker(
         model_name: HuggingFace model name
         config: RerankerConfig instance
         fallback_to_noop: Return NoOpReranker if CrossEncoder unavailable
+        first_pass: Optional cheap reranker that prunes candidates first
         
     Returns:
         BaseReranker instance (CrossEncoderReranker or NoOpReranker)
     """
     if CROSS_ENCODER_AVAILABLE:
-        return CrossEncoderReranker(config=config, model_name=model_name)
+        return CrossEncoderReranker(config=config, model_name=model_name, first_pass=first_pass)
     elif fallback_to_noop:
         logger.warning("CrossEncoder not available - using NoOpReranker")
         return NoOpReranker()
@@ -444,19 +642,29 @@ def create_reranker(
         raise RuntimeError("CrossEncoder not available and fallback disabled")
 
 
-def get_german_reranker() -> BaseReranker:
+def get_german_reranker(use_fast_first_pass: bool = False, cascade: bool = False) -> BaseReranker:
     """
     Get reranker optimized for German legal text
     
+    Args:
+        use_fast_first_pass: Prune candidates with get_fast_reranker() first
+        cascade: Enable chunked early-exit scoring
+    
     Returns:
         CrossEncoderReranker with German model or NoOpReranker
     """
     config = RerankerConfig(
         model_name="cross-encoder/mmarco-mMiniLMv2-L12-H384-v1",  # Multilingual
         max_length=512,
-        batch_size=16
+        batch_size=16,
+        cascade=cascade
     )
-    return create_reranker(config=config)
+    first_pass = None
+    if use_fast_first_pass:
+        first_pass = get_fast_reranker()
+        if not isinstance(first_pass, CrossEncoderReranker):
+            first_pass = None  # NoOp would prune arbitrarily
+    return create_reranker(config=config, first_pass=first_pass)
 
 
 def get_fast_reranker() -> BaseReranker:
@@ -41,12 +41,15 @@ License: MIT with Government Partnership Commons Clause
 Repository: https://github.com/makr-code/VCC-UDS3
 """
 
+import asyncio
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import Awaitable, Callable, List, Dict, Optional, Any
 from enum import Enum
 
+from search.fusion import FusionEngine
+
 logger = logging.getLogger(__name__)
 
 # Import Prometheus metrics (v1.6.0)
@@ -70,6 +73,7 @@ class FusionMethod(Enum):
     """Result fusion methods for hybrid search"""
     WEIGHTED = "weighted"  # Simple weighted sum (legacy)
     RRF = "rrf"  # Reciprocal Rank Fusion (v1.6.0)
+    COMBMNZ = "combmnz"  # Min-max normalized score sum * number of sources
 
 
 @dataclass
@@ -112,12 +116,15 @@ class SearchQuery:
         search_types: Search methods to use (["vector", "graph", "keyword"])
         weights: Score weights for hybrid search ({"vector": 0.5, "graph": 0.3, "keyword": 0.2})
         collection: Optional collection name (for vector search)
-        fusion_method: Result fusion method ("weighted" or "rrf") - v1.6.0
+        fusion_method: Result fusion method ("rrf", "weighted" or "combmnz") - v1.6.0
         rrf_k: RRF constant (default: 60, industry standard)
         reranker: Reranker type ("none", "cross_encoder") - v1.6.0
         rerank_top_k_multiplier: Fetch multiplier for reranking candidates (default: 3)
         multi_hop: Enable multi-hop reasoning for graph search - v1.6.0
         multi_hop_depth: Maximum traversal depth for multi-hop (default: 3)
+        source_timeout: Per-source deadline in seconds for hybrid retrieval
+                        (None = wait for every source)
+        source_timeouts: Optional per-source overrides, e.g. {"graph": 0.5}
     """
     query_text: str
     top_k: int = 10
@@ -131,6 +138,14 @@ class SearchQuery:
     rerank_top_k_multiplier: int = 3  # Fetch top_k * multiplier for reranking
     multi_hop: bool = False  # v1.6.0: Multi-hop reasoning
     multi_hop_depth: int = 3  # Maximum traversal depth
+    source_timeout: Optional[float] = None  # Per-source deadline (seconds)
+    source_timeouts: Optional[Dict[str, float]] = None  # Per-source overrides
+    
+    def deadline_for(self, source: str) -> Optional[float]:
+        """Effective retrieval deadline for a source (seconds or None)"""
+        if self.source_timeouts and source in self.source_timeouts:
+            return self.source_timeouts[source]
+        return self.source_timeout
     
     def __post_init__(self):
         """Validate and set default weights"""
@@ -148,6 +163,44 @@ class SearchQuery:
             self.weights = {k: v/total for k, v in self.weights.items()}
 
 
+class HybridSearchResults(list):
+    """
+    Result list of hybrid_search with retrieval-stage diagnostics
+    
+    Behaves like List[SearchResult]; additionally exposes per-source
+    latency of the concurrent retrieval stage. Because sources run
+    concurrently, retrieval_ms ~ max(source_latencies_ms) instead of the sum.
+    
+    Attributes:
+        source_latencies_ms: Wall time per source (timed-out sources report their deadline)
+        source_counts: Number of candidates returned per source
+        timed_out_sources: Sources that missed their deadline (excluded from fusion)
+        failed_sources: Sources that raised an exception
+        retrieval_ms: Wall time of the whole retrieval stage
+    """
+    
+    def __init__(
+        self,
+        results=(),
+        source_latencies_ms: Optional[Dict[str, float]] = None,
+        source_counts: Optional[Dict[str, int]] = None,
+        timed_out_sources: Optional[List[str]] = None,
+        failed_sources: Optional[List[str]] = None,
+        retrieval_ms: float = 0.0
+    ):
+        super().__init__(results)
+        self.source_latencies_ms = source_latencies_ms or {}
+        self.source_counts = source_counts or {}
+        self.timed_out_sources = timed_out_sources or []
+        self.failed_sources = failed_sources or []
+        self.retrieval_ms = retrieval_ms
+    
+    @property
+    def partial(self) -> bool:
+        """True if at least one source did not contribute (late or failed)"""
+        return bool(self.timed_out_sources or self.failed_sources)
+
+
 class UDS3SearchAPI:
     """
     High-Level Search API for UnifiedDatabaseStrategy
@@ -189,6 +242,7 @@ class UDS3SearchAPI:
         self.strategy = strategy
         self._embedding_model = None  # Lazy load sentence-transformers
         self._reranker = None  # Lazy load Cross-Encoder
+        self._fusion_engine = FusionEngine()  # Vectorized RRF / weighted / CombMNZ
         
         # Check backend availability
         self.has_vector = hasattr(strategy, 'vector_backend') and strategy.vector_backend is not None
@@ -348,6 +402,15 @@ class UDS3SearchAPI:
             embedding = model.encode("Photovoltaik").tolist()
             results = await api.vector_search(embedding, top_k=10)
         """
+        return await asyncio.to_thread(self._vector_search_sync, query_embedding, top_k, collection)
+    
+    def _vector_search_sync(
+        self,
+        query_embedding: List[float],
+        top_k: int = 10,
+        collection: Optional[str] = None
+    ) -> List[SearchResult]:
+        """Blocking vector search (runs in a worker thread)"""
         if not self.has_vector:
             logger.warning("Vector backend not available")
             return []
@@ -436,6 +499,14 @@ class UDS3SearchAPI:
         Example:
             results = await api.graph_search("Photovoltaik", top_k=10)
         """
+        return await asyncio.to_thread(self._graph_search_sync, query_text, top_k)
+    
+    def _graph_search_sync(
+        self,
+        query_text: str,
+        top_k: int = 10
+    ) -> List[SearchResult]:
+        """Blocking graph search (runs in a worker thread)"""
         if not self.has_graph:
             logger.warning("Graph backend not available")
             return []
@@ -526,6 +597,15 @@ class UDS3SearchAPI:
         Returns:
             List of SearchResult objects with BM25-style scores
         """
+        return await asyncio.to_thread(self._keyword_search_sync, query_text, top_k, filters)
+    
+    def _keyword_search_sync(
+        self,
+        query_text: str,
+        top_k: int = 10,
+        filters: Optional[Dict] = None
+    ) -> List[SearchResult]:
+        """Blocking keyword search (runs in a worker thread)"""
         if not self.has_relational:
             logger.warning("Relational backend not available")
             return []
@@ -620,62 +700,11 @@ class UDS3SearchAPI:
             weights: Optional source weights (default: equal weights)
             
         Returns:
-            Fused and re-ranked list of SearchResults
+            Fused and re-ranked list of SearchResults (new objects, inputs untouched)
         """
-        if weights is None:
-            weights = {source: 1.0 for source in ranked_lists.keys()}
-        
-        # Normalize weights
-        total_weight = sum(weights.values())
-        if total_weight > 0:
-            weights = {k: v / total_weight for k, v in weights.items()}
-        
-        # Calculate RRF scores
-        rrf_scores: Dict[str, float] = {}
-        doc_data: Dict[str, SearchResult] = {}  # Store best result for each doc
-        
-        for source, results in ranked_lists.items():
-            source_weight = weights.get(source, 1.0)
-            
-            for rank, result in enumerate(results, start=1):
-                doc_id = result.document_id
-                
-                # RRF formula: weight / (k + rank)
-                rrf_contribution = source_weight / (k + rank)
-                
-                if doc_id in rrf_scores:
-                    rrf_scores[doc_id] += rrf_contribution
-                else:
-                    rrf_scores[doc_id] = rrf_contribution
-                    doc_data[doc_id] = result
-                
-                # Merge related_docs if available
-                if doc_id in doc_data and result.related_docs:
-                    existing = doc_data[doc_id].related_docs
-                    for rel_doc in result.related_docs:
-                        if rel_doc not in existing:
-                            existing.append(rel_doc)
-        
-        # Create final results with RRF scores
-        fused_results = []
-        for doc_id, rrf_score in rrf_scores.items():
-            result = doc_data[doc_id]
-            # Create new result with RRF score
-            fused_results.append(SearchResult(
-                document_id=result.document_id,
-                content=result.content,
-                metadata=result.metadata,
-                score=rrf_score,
-                source="rrf_fusion",
-                related_docs=result.related_docs
-            ))
-        
-        # Sort by RRF score (descending)
-        fused_results.sort(key=lambda r: r.score, reverse=True)
-        
-        logger.info(f"✅ RRF Fusion: {len(fused_results)} unique documents from {len(ranked_lists)} sources")
-        
-        return fused_results
+        return self._fusion_engine.fuse(
+            ranked_lists, method="rrf", weights=weights, rrf_k=k
+        )
     
     async def hybrid_search(
         self,
@@ -685,20 +714,24 @@ class UDS3SearchAPI:
         Hybrid search combining Vector + Graph + Keyword with RRF fusion
         
         v1.6.0 Enhanced Workflow:
-        1. Execute searches in parallel (Vector, Graph, Keyword/BM25)
-        2. Apply fusion method:
+        1. Execute searches concurrently (Vector, Graph, Keyword/BM25), each in a
+           worker thread with an optional per-source deadline. Late sources are
+           dropped and the remaining sources are fused (partial result).
+        2. Apply fusion method (search/fusion.py, vectorized):
            - "rrf": Reciprocal Rank Fusion (industry standard)
            - "weighted": Simple weighted score sum (legacy)
-        3. Re-rank by fused score
-        4. Return top_k results
+           - "combmnz": Normalized score sum * number of sources
+        3. Select top_k by fused score (argpartition, no full sort)
+        4. Optional Cross-Encoder reranking of top_k * rerank_top_k_multiplier
         
         Args:
             search_query: SearchQuery configuration including:
-                - fusion_method: "rrf" (default) or "weighted"
+                - fusion_method: "rrf" (default), "weighted" or "combmnz"
                 - rrf_k: RRF constant (default: 60)
             
         Returns:
-            List of SearchResult objects (top_k, ranked by fused score)
+            HybridSearchResults (List[SearchResult], top_k, ranked by fused score)
+            with per-source latency in ``source_latencies_ms``
             
         Example (v1.6.0):
             query = SearchQuery(
@@ -727,71 +760,27 @@ class UDS3SearchAPI:
         fetch_count = search_query.top_k * 3 if search_query.fusion_method == "rrf" else search_query.top_k * 2
         
         try:
-            # 1. Vector Search (if enabled)
-            if "vector" in search_query.search_types and weights.get("vector", 0) > 0:
-                model = self._get_embedding_model()
-                if model:
-                    embedding = model.encode(search_query.query_text).tolist()
-                    vector_results = await self.vector_search(
-                        embedding,
-                        fetch_count,
-                        search_query.collection
-                    )
-                    if vector_results:
-                        ranked_lists["vector"] = vector_results
-                    logger.info(f"Vector search: {len(vector_results)} results")
-            
-            # 2. Graph Search (if enabled)
-            if "graph" in search_query.search_types and weights.get("graph", 0) > 0:
-                graph_results = await self.graph_search(
-                    search_query.query_text,
-                    fetch_count
-                )
-                if graph_results:
-                    ranked_lists["graph"] = graph_results
-                logger.info(f"Graph search: {len(graph_results)} results")
-            
-            # 3. Keyword/BM25 Search (if enabled)
-            if "keyword" in search_query.search_types and weights.get("keyword", 0) > 0:
-                keyword_results = await self.keyword_search(
-                    search_query.query_text,
-                    fetch_count,
-                    search_query.filters
-                )
-                if keyword_results:
-                    ranked_lists["keyword"] = keyword_results
-                logger.info(f"Keyword/BM25 search: {len(keyword_results)} results")
+            # 1.-3. Concurrent retrieval (Vector, Graph, Keyword/BM25)
+            ranked_lists, retrieval_stats = await self._run_retrieval_stage(
+                search_query, weights, fetch_count
+            )
             
-            # 4. Fusion based on method
+            # 4. Fusion based on method (vectorized, top-k via argpartition).
+            # With reranking, keep top_k * multiplier candidates for stage 2.
             fusion_start = time.time()
-            if search_query.fusion_method == "rrf":
-                # Reciprocal Rank Fusion (v1.6.0)
-                final_results = self._reciprocal_rank_fusion(
-                    ranked_lists=ranked_lists,
-                    k=search_query.rrf_k,
-                    weights=weights
-                )
-                logger.info(f"✅ RRF Hybrid search: {len(final_results)} unique results")
-            else:
-                # Legacy: Simple weighted sum
-                all_results = []
-                for source, results in ranked_lists.items():
-                    source_weight = weights.get(source, 1.0)
-                    for result in results:
-                        result.score *= source_weight
-                    all_results.extend(results)
-                
-                # Merge by document_id
-                merged = {}
-                for result in all_results:
-                    doc_id = result.document_id
-                    if doc_id in merged:
-                        merged[doc_id].score += result.score
-                        merged[doc_id].related_docs.extend(result.related_docs)
-                    else:
-                        merged[doc_id] = result
-                
-                final_results = sorted(merged.values(), key=lambda r: r.score, reverse=True)
+            fusion_limit = search_query.top_k
+            if search_query.reranker != "none":
+                fusion_limit = search_query.top_k * max(1, search_query.rerank_top_k_multiplier)
+            fusion_method = search_query.fusion_method
+            if fusion_method not in FusionEngine.METHODS:
+                fusion_method = "weighted"  # legacy: every non-RRF method was a weighted sum
+            final_results = self._fusion_engine.fuse(
+                ranked_lists,
+                method=fusion_method,
+                weights=weights,
+                top_k=fusion_limit,
+                rrf_k=search_query.rrf_k
+            )
             
             # Track fusion latency (v1.6.0)
             if METRICS_AVAILABLE:
@@ -802,7 +791,7 @@ class UDS3SearchAPI:
                     sources=",".join(sorted(ranked_lists.keys()))
                 ).inc()
             
-            logger.info(f"✅ Weighted Hybrid search: {len(final_results)} unique results")
+            logger.info(f"✅ Hybrid search ({search_query.fusion_method}): {len(final_results)} fused results")
             
             # 5. Cross-Encoder Reranking (v1.6.0)
             if search_query.reranker != "none" and final_results:
@@ -842,7 +831,102 @@ class UDS3SearchAPI:
                 ).inc()
                 metrics.search_results.labels(search_type="hybrid").observe(len(final_results) if 'final_results' in locals() else 0)
         
-        return final_results[:search_query.top_k]
+        return HybridSearchResults(
+            final_results[:search_query.top_k],
+            **retrieval_stats
+        )
+    
+    async def _run_retrieval_stage(
+        self,
+        search_query: SearchQuery,
+        weights: Dict[str, float],
+        fetch_count: int
+    ):
+        """
+        Fan out the enabled retrievers concurrently
+        
+        Every retriever runs its blocking backend call (and, for vector search,
+        the query embedding) in a worker thread. Sources that exceed their
+        deadline are cancelled on the loop side and excluded from fusion (the
+        worker thread itself cannot be interrupted and finishes in the background).
+        
+        Returns:
+            Tuple (ranked_lists, retrieval_stats) where retrieval_stats holds the
+            keyword arguments for HybridSearchResults
+        """
+        retrievers: Dict[str, Callable[[], Awaitable[List[SearchResult]]]] = {}
+        
+        if "vector" in search_query.search_types and weights.get("vector", 0) > 0 and self.has_vector:
+            async def _vector() -> List[SearchResult]:
+                # Model loading and query encoding are CPU-bound: keep them off the loop
+                model = await asyncio.to_thread(self._get_embedding_model)
+                if not model:
+                    return []
+                embedding = await asyncio.to_thread(
+                    lambda: model.encode(search_query.query_text).tolist()
+                )
+                return await self.vector_search(embedding, fetch_count, search_query.collection)
+            retrievers["vector"] = _vector
+        
+        if "graph" in search_query.search_types and weights.get("graph", 0) > 0:
+            retrievers["graph"] = lambda: self.graph_search(search_query.query_text, fetch_count)
+        
+        if "keyword" in search_query.search_types and weights.get("keyword", 0) > 0:
+            retrievers["keyword"] = lambda: self.keyword_search(
+                search_query.query_text, fetch_count, search_query.filters
+            )
+        
+        stage_start = time.perf_counter()
+        
+        async def _timed(source: str, retriever):
+            source_start = time.perf_counter()
+            deadline = search_query.deadline_for(source)
+            try:
+                if deadline is None:
+                    results = await retriever()
+                else:
+                    results = await asyncio.wait_for(retriever(), timeout=deadline)
+                return source, results, "ok", time.perf_counter() - source_start
+            except asyncio.TimeoutError:
+                return source, [], "timeout", time.perf_counter() - source_start
+            except Exception as e:
+                logger.error(f"❌ {source} retrieval failed: {e}")
+                return source, [], "error", time.perf_counter() - source_start
+        
+        outcomes = await asyncio.gather(
+            *(_timed(source, retriever) for source, retriever in retrievers.items())
+        )
+        
+        ranked_lists: Dict[str, List[SearchResult]] = {}
+        stats = {
+            "source_latencies_ms": {},
+            "source_counts": {},
+            "timed_out_sources": [],
+            "failed_sources": [],
+            "retrieval_ms": (time.perf_counter() - stage_start) * 1000,
+        }
+        for source, results, outcome, duration in outcomes:
+            stats["source_latencies_ms"][source] = duration * 1000
+            stats["source_counts"][source] = len(results)
+            if outcome == "timeout":
+                stats["timed_out_sources"].append(source)
+                logger.warning(
+                    f"⏱️ {source} search missed deadline "
+                    f"({search_query.deadline_for(source)}s) - fusing partial results"
+                )
+            elif outcome == "error":
+                stats["failed_sources"].append(source)
+            elif results:
+                ranked_lists[source] = results
+            logger.info(f"{source} search: {len(results)} results in {duration * 1000:.1f}ms")
+            
+            if METRICS_AVAILABLE:
+                metrics.search_latency.labels(
+                    search_type=source,
+                    fusion_method=search_query.fusion_method
+                ).observe(duration)
+        
+        return ranked_lists, stats
     
     async def search_by_text(
         self,
@@ -864,7 +948,7 @@ class UDS3SearchAPI:
         if search_type == "vector":
             model = self._get_embedding_model()
             if model:
-                embedding = model.encode(query_text).tolist()
+                embedding = await asyncio.to_thread(lambda: model.encode(query_text).tolist())
                 return await self.vector_search(embedding, top_k)
             else:
                 logger.warning("Embedding model not available - fallback to graph search")
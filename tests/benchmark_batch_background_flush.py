@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_batch_background_flush.py
+
+Durchsatz-Benchmark für synchrones vs. pipelined Background Flushing
+Ein Fake-Backend injiziert pro Batch-Call eine feste Netzwerk-Latenz; der
+Producer erzeugt Items mit konfigurierbarer CPU-Arbeit (z.B. Embedding/Parsing).
+Gemessen werden items/s für ChromaBatchInserter und CouchDBBatchInserter bei
+max_in_flight = 1, 2, 4.
+Usage:
+python tests/benchmark_batch_background_flush.py [--items 5000] [--batch-size 100] [--latency-ms 50] [--work-us 200]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.batch_operations import ChromaBatchInserter, CouchDBBatchInserter
+
+IN_FLIGHT = [1, 2, 4]
+
+
+class LatencyChromaBackend:
+    """Fake ChromaDB Backend: jeder add_vectors Call kostet latency Sekunden"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def add_vectors(self, vectors):
+        time.sleep(self.latency)
+        return True
+
+    def add_vector(self, vector, metadata, chunk_id):
+        time.sleep(self.latency)
+        return True
+
+
+class LatencyCouchBackend:
+    """Fake CouchDB Backend: jeder _bulk_docs Call kostet latency Sekunden"""
+
+    def __init__(self, latency: float):
+        self.db = self
+        self.latency = latency
+
+    def update(self, docs):
+        time.sleep(self.latency)
+        return [{'ok': True} for _ in docs]
+
+    def create_document(self, doc, doc_id=None):
+        time.sleep(self.latency)
+
+
+def _busy_work(microseconds: float):
+    """Simulierte Producer-Arbeit pro Item (CPU, nicht sleep)"""
+    end = time.perf_counter() + microseconds / 1e6
+    while time.perf_counter() < end:
+        pass
+
+
+def run(kind: str, items: int, batch_size: int, latency: float, work_us: float,
+        background: bool, max_in_flight: int = 1) -> float:
+    """items/s inklusive abschließendem flush()"""
+    if kind == "chroma":
+        inserter = ChromaBatchInserter(LatencyChromaBackend(latency), batch_size=batch_size,
+                                       background_flush=background, max_in_flight=max_in_flight)
+        add = lambda i: inserter.add(f"chunk_{i}", [0.1] * 8, {'doc_id': f"doc_{i // 10}"})
+    else:
+        inserter = CouchDBBatchInserter(LatencyCouchBackend(latency), batch_size=batch_size,
+                                        background_flush=background, max_in_flight=max_in_flight)
+        add = lambda i: inserter.add({'title': f"Dokument {i}"}, doc_id=f"doc_{i}")
+
+    start = time.perf_counter()
+    for i in range(items):
+        _busy_work(work_us)
+        add(i)
+    inserter.close()
+    duration = time.perf_counter() - start
+    return items / duration if duration > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--items", type=int, default=5000, help="Items pro Lauf")
+    parser.add_argument("--batch-size", type=int, default=100, help="Batch-Größe")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Injizierte Latenz pro Batch-Call")
+    parser.add_argument("--work-us", type=float, default=200.0, help="Producer-Arbeit pro Item (µs)")
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    print("=" * 72)
+    print(f"Background Flush Benchmark ({args.items} items, batch={args.batch_size}, "
+          f"latency={args.latency_ms:.0f}ms, work={args.work_us:.0f}µs)")
+    print("=" * 72)
+    print(f"{'inserter':>9} | {'mode':>18} | {'items/s':>10} | {'speedup':>8}")
+    print("-" * 72)
+
+    for kind in ("chroma", "couchdb"):
+        sync_rate = run(kind, args.items, args.batch_size, latency, args.work_us, background=False)
+        print(f"{kind:>9} | {'sync':>18} | {sync_rate:>10,.0f} | {'1.0x':>8}")
+        for in_flight in IN_FLIGHT:
+            rate = run(kind, args.items, args.batch_size, latency, args.work_us,
+                       background=True, max_in_flight=in_flight)
+            mode = f"background ({in_flight})"
+            print(f"{kind:>9} | {mode:>18} | {rate:>10,.0f} | {rate / sync_rate:>7.1f}x")
+
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
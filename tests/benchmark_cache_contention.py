@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_cache_contention.py
+
+Lock-Contention Benchmark für SingleRecordCache vs. ShardedSingleRecordCache
+Misst den Durchsatz (ops/s) eines read-lastigen Workloads (90% get, 10% put)
+bei 1, 2, 4, 8, 16 und 32 Threads.
+Usage:
+python tests/benchmark_cache_contention.py [--ops 20000] [--shards 16]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.cache import CacheConfig, SingleRecordCache, ShardedSingleRecordCache
+
+THREAD_COUNTS = [1, 2, 4, 8, 16, 32]
+KEY_SPACE = 5000
+READ_RATIO = 0.9
+
+SAMPLE_DOCUMENT = {
+    "title": "Bebauungsplan Nr. 42",
+    "content": "Lorem ipsum dolor sit amet " * 20,
+    "metadata": {"author": "Stadtplanungsamt", "version": 3, "tags": ["bplan", "lbo"]},
+}
+
+
+def _make_cache(sharded: bool, num_shards: int):
+    config = CacheConfig(
+        max_size=KEY_SPACE * 2,
+        default_ttl_seconds=None,
+        auto_cleanup_interval=0.0,
+    )
+    if sharded:
+        return ShardedSingleRecordCache(config, num_shards=num_shards)
+    return SingleRecordCache(config)
+
+
+def run_workload(cache, threads: int, ops_per_thread: int) -> float:
+    """Führt den Workload aus und liefert ops/s"""
+    for i in range(KEY_SPACE):
+        cache.put(f"doc{i}", SAMPLE_DOCUMENT)
+
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        keys = [f"doc{rng.randrange(KEY_SPACE)}" for _ in range(ops_per_thread)]
+        reads = [rng.random() < READ_RATIO for _ in range(ops_per_thread)]
+        barrier.wait()
+        for key, is_read in zip(keys, reads):
+            if is_read:
+                cache.get(key)
+            else:
+                cache.put(key, SAMPLE_DOCUMENT)
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for t in workers:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in workers:
+        t.join()
+    duration = time.perf_counter() - start
+
+    return (threads * ops_per_thread) / duration if duration > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--ops", type=int, default=20000, help="Operationen pro Thread")
+    parser.add_argument("--shards", type=int, default=16, help="Segmente im Sharded Cache")
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("SingleRecordCache Contention Benchmark")
+    print(f"ops/thread={args.ops}, shards={args.shards}, read_ratio={READ_RATIO}")
+    print("=" * 72)
+    print(f"{'threads':>8} | {'single (ops/s)':>16} | {'sharded (ops/s)':>16} | {'speedup':>8}")
+    print("-" * 72)
+
+    for threads in THREAD_COUNTS:
+        single = _make_cache(sharded=False, num_shards=1)
+        sharded = _make_cache(sharded=True, num_shards=args.shards)
+        try:
+            single_ops = run_workload(single, threads, args.ops)
+            sharded_ops = run_workload(sharded, threads, args.ops)
+        finally:
+            single.stop()
+            sharded.stop()
+        speedup = sharded_ops / single_ops if single_ops else 0.0
+        print(f"{threads:>8} | {single_ops:>16,.0f} | {sharded_ops:>16,.0f} | {speedup:>7.2f}x")
+
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
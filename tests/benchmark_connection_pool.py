@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_connection_pool.py
+
+Last-Benchmark für PostgreSQLConnectionPool: classic vs. managed Mode
+Kurze Point-Reads mit 50+ konkurrierenden Workern gegen eine echte
+PostgreSQL-Instanz; gemessen werden Durchsatz, Checkout-Wartezeit
+(p50/p95/p99) und Fehler (z.B. "connection pool exhausted" im classic Mode).
+Usage:
+python tests/benchmark_connection_pool.py [--workers 50 100] [--ops 200] [--max-connections 20]
+Verbindung über POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.connection_pool import PostgreSQLConnectionPool
+
+POINT_READ = "SELECT %s::text AS document_id"
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_load(mode: str, workers: int, ops_per_worker: int, max_connections: int) -> dict:
+    """Führt den Workload aus und liefert Durchsatz, Wartezeiten und Fehler"""
+    pool = PostgreSQLConnectionPool(
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        port=int(os.getenv("POSTGRES_PORT", "5432")),
+        database=os.getenv("POSTGRES_DB", "postgres"),
+        user=os.getenv("POSTGRES_USER", "postgres"),
+        password=os.getenv("POSTGRES_PASSWORD", "postgres"),
+        min_connections=min(5, max_connections),
+        max_connections=max_connections,
+        mode=mode,
+    )
+    pool.initialize()
+
+    waits = []
+    errors = [0]
+    lock = threading.Lock()
+    barrier = threading.Barrier(workers + 1)
+
+    def worker(worker_id: int):
+        local_waits = []
+        local_errors = 0
+        barrier.wait()
+        for i in range(ops_per_worker):
+            start = time.perf_counter()
+            try:
+                with pool.get_connection() as conn:
+                    local_waits.append(time.perf_counter() - start)
+                    with conn.cursor() as cur:
+                        cur.execute(POINT_READ, (f"doc{worker_id}_{i}",))
+                        cur.fetchone()
+            except Exception:
+                local_errors += 1
+        with lock:
+            waits.extend(local_waits)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(workers)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    duration = time.perf_counter() - start
+    stats = pool.get_stats()
+    pool.close()
+
+    completed = workers * ops_per_worker - errors[0]
+    return {
+        "ops_per_sec": completed / duration if duration > 0 else 0.0,
+        "wait_p50_ms": _percentile(waits, 0.50) * 1000,
+        "wait_p95_ms": _percentile(waits, 0.95) * 1000,
+        "wait_p99_ms": _percentile(waits, 0.99) * 1000,
+        "errors": errors[0],
+        "health_checks": stats["health_checks"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--workers", type=int, nargs="+", default=[50, 100],
+                        help="Anzahl konkurrierender Worker pro Lauf")
+    parser.add_argument("--ops", type=int, default=200, help="Point-Reads pro Worker")
+    parser.add_argument("--max-connections", type=int, default=20, help="Pool-Größe")
+    args = parser.parse_args()
+
+    print("=" * 88)
+    print(f"PostgreSQLConnectionPool Load Benchmark (max_connections={args.max_connections})")
+    print("=" * 88)
+    print(f"{'mode':>8} | {'workers':>7} | {'ops/s':>9} | {'wait p50':>9} | {'wait p95':>9} | "
+          f"{'wait p99':>9} | {'errors':>6} | {'checks':>6}")
+    print("-" * 88)
+
+    for workers in args.workers:
+        for mode in ("classic", "managed"):
+            result = run_load(mode, workers, args.ops, args.max_connections)
+            print(f"{mode:>8} | {workers:>7} | {result['ops_per_sec']:>9,.0f} | "
+                  f"{result['wait_p50_ms']:>7.2f}ms | {result['wait_p95_ms']:>7.2f}ms | "
+                  f"{result['wait_p99_ms']:>7.2f}ms | {result['errors']:>6} | {result['health_checks']:>6}")
+
+    print("=" * 88)
+
+
+if __name__ == "__main__":
+    main()
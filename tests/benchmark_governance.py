@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_governance.py
+
+Microbenchmark für den Governance-Overhead von enforce_payload auf einem Chunk-Batch
+Vergleicht den bisherigen rekursiven Walk (_iterate_payload, ein Pfad-String pro
+Element inkl. jedes Embedding-Floats) mit den kompilierten Policies (vorberechnete
+Feldmenge, Skip homogener Zahlenlisten, Shape-Cache).
+Usage:
+python tests/benchmark_governance.py [--chunks 100] [--dim 768] [--rounds 50]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.adapter_governance import AdapterGovernance
+
+
+def make_batch(chunks: int, dim: int) -> dict:
+    """Typischer Chunk-Batch: Embedding + Metadaten pro Chunk"""
+    rng = random.Random(0)
+    return {
+        "document_id": "doc_bescheid_2025_001",
+        "chunks": [
+            {
+                "chunk_id": f"doc_bescheid_2025_001_chunk_{i}",
+                "embedding": [rng.random() for _ in range(dim)],
+                "metadata": {
+                    "document_id": "doc_bescheid_2025_001",
+                    "chunk_index": i,
+                    "aktenzeichen": "AZ-2025-0815",
+                    "page": i // 4,
+                    "tags": ["baurecht", "bescheid"],
+                },
+            }
+            for i in range(chunks)
+        ],
+    }
+
+
+def legacy_validate(governance: AdapterGovernance, backend: str, payload) -> int:
+    """Bisherige Implementierung von validate_payload (Referenz)"""
+    rules = governance.policies[backend]["payload_rules"]
+    fields = {str(f).lower() for f in rules.get("forbidden_fields", set())}
+    types = rules.get("forbidden_types", ())
+    found = 0
+    for path, value in governance._iterate_payload(payload):
+        if path.split(".")[-1].lower() in fields:
+            found += 1
+        if types and isinstance(value, types):
+            found += 1
+    return found
+
+
+def measure(fn, rounds: int) -> float:
+    """Mittlere Zeit pro Aufruf in Millisekunden"""
+    fn()  # warmup
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--chunks", type=int, default=100, help="Chunks pro Batch")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding-Dimension")
+    parser.add_argument("--rounds", type=int, default=50, help="Wiederholungen pro Messung")
+    args = parser.parse_args()
+
+    payload = make_batch(args.chunks, args.dim)
+    # "relational" verbietet Binärtypen → jedes Element wird typgeprüft
+    backend = "relational"
+    cached = AdapterGovernance()
+    uncached = AdapterGovernance(shape_cache_size=0)
+
+    results = [
+        ("legacy walk", measure(lambda: legacy_validate(cached, backend, payload), args.rounds)),
+        ("compiled, no shape cache", measure(lambda: uncached.validate_payload(backend, "create", payload), args.rounds)),
+        ("compiled + shape cache", measure(lambda: cached.validate_payload(backend, "create", payload), args.rounds)),
+    ]
+
+    print("=" * 64)
+    print(f"Governance Benchmark ({args.chunks} chunks x {args.dim}-dim, backend={backend})")
+    print("=" * 64)
+    print(f"{'variant':>26} | {'ms/call':>9} | {'speedup':>8}")
+    print("-" * 64)
+    baseline = results[0][1]
+    for name, ms in results:
+        print(f"{name:>26} | {ms:>9.3f} | {baseline / ms:>7.1f}x")
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    main()
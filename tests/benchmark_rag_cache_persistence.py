@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_rag_cache_persistence.py
+
+Write-Throughput Benchmark für PersistentRAGCache (SQLite, O(1) pro put)
+Misst puts/s bei 1k, 10k und 100k Einträgen; zum Vergleich das frühere
+Verhalten (gesamter Cache als eingerücktes JSON pro put neu geschrieben).
+Usage:
+python tests/benchmark_rag_cache_persistence.py [--sizes 1000 10000 100000] [--legacy-max 1000]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.rag_cache import PersistentRAGCache, RAGCache
+
+SOURCES = [{"id": f"doc{i}", "title": "Landesbauordnung", "score": 0.8} for i in range(3)]
+ANSWER = "Die Abstandsfläche beträgt 0,4 der Wandhöhe, mindestens jedoch 2,5 m. " * 3
+
+
+def bench_sqlite(n: int) -> float:
+    """puts/s für den SQLite-basierten PersistentRAGCache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PersistentRAGCache(
+            cache_dir=tmp, max_size=n, compaction_interval_seconds=0
+        )
+        start = time.perf_counter()
+        for i in range(n):
+            cache.put(f"Frage {i}", ANSWER, 0.9, SOURCES, "GENERAL")
+        duration = time.perf_counter() - start
+        cache.close()
+    return n / duration if duration > 0 else 0.0
+
+
+def bench_legacy_json(n: int) -> float:
+    """puts/s für das frühere Verhalten: kompletter JSON-Dump pro put"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = RAGCache(max_size=n)
+        cache_file = Path(tmp) / "rag_cache.json"
+        start = time.perf_counter()
+        for i in range(n):
+            cache.put(f"Frage {i}", ANSWER, 0.9, SOURCES, "GENERAL")
+            valid_cache = {key: value.to_dict() for key, value in cache._cache.items() if value.is_valid()}
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(valid_cache, f, indent=2)
+        duration = time.perf_counter() - start
+    return n / duration if duration > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Anzahl Einträge pro Lauf")
+    parser.add_argument("--legacy-max", type=int, default=1000,
+                        help="Legacy-JSON nur bis zu dieser Größe messen (O(n²))")
+    args = parser.parse_args()
+
+    print("=" * 64)
+    print("PersistentRAGCache Write Benchmark")
+    print("=" * 64)
+    print(f"{'entries':>8} | {'sqlite (puts/s)':>16} | {'legacy json (puts/s)':>20} | {'speedup':>8}")
+    print("-" * 64)
+
+    for n in args.sizes:
+        sqlite_ops = bench_sqlite(n)
+        if n <= args.legacy_max:
+            legacy_ops = bench_legacy_json(n)
+            speedup = f"{sqlite_ops / legacy_ops:>7.1f}x" if legacy_ops else "-"
+            legacy = f"{legacy_ops:>20,.0f}"
+        else:
+            legacy, speedup = f"{'-':>20}", f"{'-':>8}"
+        print(f"{n:>8} | {sqlite_ops:>16,.0f} | {legacy} | {speedup}")
+
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_saga_group_commit.py
+
+Durchsatz-Benchmark für Saga-Events: Commit pro Event (sync) vs. Group Commit
+Konkurrierende Sagas schreiben pro Schritt ein PENDING- und ein SUCCESS-Event
+(+ Audit-Zeile) über SagaDatabaseCRUD.write_saga_event. Gemessen werden
+sagas/s auf SQLite (Datei, synchronous=FULL) und auf einem PostgreSQL-Stand-in
+(SQLite + feste Commit-Latenz für Netzwerk-Roundtrip und WAL-fsync).
+Usage:
+python tests/benchmark_saga_group_commit.py [--sagas 200] [--steps 3] [--workers 16] [--commit-latency-ms 2]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.database_api_sqlite import SQLiteRelationalBackend
+from database.database_manager import DatabaseManager
+from database.saga_crud import SagaDatabaseCRUD
+from database.saga_event_writer import get_event_writer
+
+
+class PostgresStandIn(SQLiteRelationalBackend):
+    """SQLite mit zusätzlicher Latenz pro Commit (Roundtrip + WAL-fsync eines PostgreSQL-Servers)"""
+
+    def __init__(self, conf, commit_latency: float):
+        super().__init__(conf)
+        self.commit_latency = commit_latency
+
+    def execute_transaction(self, statements):
+        time.sleep(self.commit_latency)
+        return super().execute_transaction(statements)
+
+
+def make_backend(kind: str, path: str, commit_latency: float):
+    conf = {'database_path': path}
+    backend = SQLiteRelationalBackend(conf) if kind == "sqlite" else PostgresStandIn(conf, commit_latency)
+    backend._backend_connect()
+    backend.execute_query("PRAGMA synchronous = FULL")
+    return backend
+
+
+def run(kind: str, durability: str, sagas: int, steps: int, workers: int, commit_latency: float) -> dict:
+    """Führt alle Sagas aus und liefert sagas/s sowie Commit-Statistik"""
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = make_backend(kind, os.path.join(tmp, "saga.db"), commit_latency)
+        manager = DatabaseManager({'relational': {'enabled': False}})
+        manager.relational_backend = backend
+        crud = SagaDatabaseCRUD(manager=manager, event_durability=durability)
+        crud.write_saga_event('warmup', 'schema', 'PENDING', {})  # Migration außerhalb der Messung
+
+        next_saga = iter(range(sagas))
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    if next(next_saga, None) is None:
+                        return
+                saga_id = str(uuid.uuid4())
+                for step in range(steps):
+                    payload = {'document_id': f'doc_{saga_id}', 'idempotency_key': f'{saga_id}:{step}'}
+                    crud.write_saga_event(saga_id, f'step_{step}', 'PENDING', payload)
+                    crud.write_saga_event(saga_id, f'step_{step}', 'SUCCESS', payload)
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duration = time.perf_counter() - start
+
+        writer = get_event_writer(backend, durability)
+        stats = writer.get_stats()
+        writer.close()
+        backend.disconnect()
+
+    return {
+        "sagas_per_sec": sagas / duration if duration > 0 else 0.0,
+        "commits": stats["commits"],
+        "avg_group": stats["avg_group_size"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--sagas", type=int, default=200, help="Anzahl Sagas pro Lauf")
+    parser.add_argument("--steps", type=int, default=3, help="Schritte pro Saga")
+    parser.add_argument("--workers", type=int, default=16, help="Konkurrierende Sagas")
+    parser.add_argument("--commit-latency-ms", type=float, default=2.0,
+                        help="Commit-Latenz des PostgreSQL-Stand-ins")
+    args = parser.parse_args()
+    latency = args.commit_latency_ms / 1000
+
+    print("=" * 76)
+    print(f"Saga Group Commit Benchmark ({args.sagas} sagas x {args.steps} steps, "
+          f"{args.workers} workers)")
+    print("=" * 76)
+    print(f"{'backend':>14} | {'durability':>10} | {'sagas/s':>9} | {'commits':>8} | "
+          f"{'avg group':>9} | {'speedup':>7}")
+    print("-" * 76)
+
+    for kind, label in (("sqlite", "sqlite"), ("postgres", "pg stand-in")):
+        baseline = None
+        for durability in ("sync", "group"):
+            result = run(kind, durability, args.sagas, args.steps, args.workers, latency)
+            baseline = baseline or result["sagas_per_sec"]
+            print(f"{label:>14} | {durability:>10} | {result['sagas_per_sec']:>9,.1f} | "
+                  f"{result['commits']:>8} | {result['avg_group']:>9.1f} | "
+                  f"{result['sagas_per_sec'] / baseline:>6.1f}x")
+
+    print("=" * 76)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_saga_idempotency.py
+
+Latenz-Benchmark für den Idempotency-Check pro Saga-Schritt bei wachsender Event-Historie
+Vergleicht den bisherigen Fallback (payload LIKE '%key%' auf uds3_saga_events)
+mit dem indizierten Idempotency-Store (Punkt-Lookup über uds3_saga_idempotency,
+einmal mit kaltem LRU und einmal mit LRU-Treffern). Die Historie wird bis in
+den Millionenbereich befüllt; der Store sollte pro Schritt flach bleiben.
+Usage:
+python tests/benchmark_saga_idempotency.py [--history 10000 100000 1000000] [--lookups 200]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import db_migrations
+from database.database_api_sqlite import SQLiteRelationalBackend
+from database.saga_idempotency import IdempotencyStore
+
+STEPS_PER_SAGA = 5
+
+
+def populate(backend, rows: int):
+    """Legacy-Historie (ohne idempotency_key Spalte) + Store in einem Rutsch befüllen"""
+    backend.create_table('uds3_saga_events', {
+        'event_id': 'TEXT PRIMARY KEY', 'saga_id': 'TEXT', 'step_name': 'TEXT',
+        'status': 'TEXT', 'payload': 'TEXT',
+    })
+    db_migrations.ensure_idempotency_store(backend)  # leere Historie → kein Backfill
+
+    def events():
+        for i in range(rows):
+            saga, step = divmod(i, STEPS_PER_SAGA)
+            key = f"key-{saga}-{step}"
+            yield (f"e{i}", f"saga-{saga}", f"step_{step}", "SUCCESS",
+                   json.dumps({'document_id': f"doc-{saga}", 'idempotency_key': key}))
+
+    conn = backend.connection
+    conn.executemany("INSERT INTO uds3_saga_events VALUES (?, ?, ?, ?, ?)", events())
+    conn.execute(
+        "INSERT INTO uds3_saga_idempotency (saga_id, step_name, idempotency_key, event_id) "
+        "SELECT saga_id, step_name, json_extract(payload, '$.idempotency_key'), event_id "
+        "FROM uds3_saga_events"
+    )
+    conn.commit()
+
+
+def time_lookups(check, probes) -> float:
+    """Mittlere Latenz pro Check in Millisekunden"""
+    start = time.perf_counter()
+    for probe in probes:
+        check(*probe)
+    return (time.perf_counter() - start) / len(probes) * 1000
+
+
+def legacy_like(backend):
+    q = 'SELECT status FROM uds3_saga_events WHERE saga_id = ? AND step_name = ? AND payload LIKE ?'
+
+    def check(saga_id, step_name, key):
+        rows = backend.execute_query(q, (saga_id, step_name, f'%{key}%'))
+        return any(r.get('status') == 'SUCCESS' for r in rows)
+    return check
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument("--history", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Anzahl Events in uds3_saga_events")
+    parser.add_argument("--lookups", type=int, default=200, help="Idempotency-Checks pro Messung")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"Saga Idempotency Benchmark ({args.lookups} checks, 50% Treffer)")
+    print("=" * 80)
+    print(f"{'history':>10} | {'payload LIKE':>13} | {'store (cold)':>13} | {'store (LRU)':>12} | {'speedup':>8}")
+    print("-" * 80)
+
+    rng = random.Random(42)
+    for rows in args.history:
+        with tempfile.TemporaryDirectory() as tmp:
+            backend = SQLiteRelationalBackend({'database_path': os.path.join(tmp, 'history.db')})
+            backend._backend_connect()
+            populate(backend, rows)
+
+            sagas = rows // STEPS_PER_SAGA
+            probes = []
+            for i in range(args.lookups):
+                saga = rng.randrange(sagas)
+                step = rng.randrange(STEPS_PER_SAGA)
+                key = f"key-{saga}-{step}" if i % 2 == 0 else f"missing-{i}"
+                probes.append((f"saga-{saga}", f"step_{step}", key))
+
+            like_ms = time_lookups(legacy_like(backend), probes)
+            store = IdempotencyStore(backend)
+            cold_ms = time_lookups(store.contains, probes)
+            warm_ms = time_lookups(store.contains, probes)
+            backend.disconnect()
+
+        print(f"{rows:>10,} | {like_ms:>10.3f} ms | {cold_ms:>10.3f} ms | {warm_ms:>9.3f} ms | "
+              f"{like_ms / cold_ms:>7.0f}x")
+
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_streaming_embed.py
+
+Benchmark für die Embed-and-Index-Pipeline (StreamingManager.stream_to_vector_db)
+Misst Durchsatz und Peak-RSS für wachsende Dokumentgrößen; jede Größe läuft in einem
+eigenen Prozess, damit ru_maxrss nicht über Läufe hinweg akkumuliert. Konstantes RSS
+über alle Größen zeigt, dass die begrenzten Queues das Dokument nie komplett puffern.
+Embedder und Vector-Backend sind Stand-ins (feste 768-dim Vektoren, Zählung).
+Usage:
+python tests/benchmark_streaming_embed.py [--sizes-mb 64,256,1024] [--chunk 1000]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from manager.streaming import StreamingManager
+
+
+class StandInEmbedder:
+    """Liefert feste 768-dim Vektoren (misst Pipeline, nicht das Modell)"""
+
+    def __init__(self, dim: int = 768):
+        self.vector = [0.0] * dim
+
+    def embed_batch(self, texts, show_progress_bar=True):
+        return [self.vector] * len(texts)
+
+
+class CountingVectorBackend:
+    def __init__(self):
+        self.count = 0
+
+    def add_vectors(self, batch):
+        self.count += len(batch)
+        return True
+
+
+def make_document(path: str, size_mb: int) -> None:
+    line = ("Der Antragsteller beantragt die Erteilung einer Baugenehmigung für das "
+            "Grundstück Flurstück 815/4 gemäß § 64 BauO NRW. ") * 8 + "\n"
+    block = (line * (1024 * 1024 // len(line) + 1)).encode('utf-8')[:1024 * 1024]
+    with open(path, 'wb') as f:
+        for _ in range(size_mb):
+            f.write(block)
+
+
+def run_child(path: str, chunk: int) -> None:
+    """Ein Lauf; Ergebnis als JSON auf stdout"""
+    backend = CountingVectorBackend()
+    manager = StreamingManager()
+    start = time.perf_counter()
+    op_id = manager.stream_to_vector_db(path, embedder=StandInEmbedder(), vector_backend=backend,
+                                        chunk_text_size=chunk, chunk_overlap=chunk // 5)
+    elapsed = time.perf_counter() - start
+    progress = manager.get_progress(op_id)
+    print(json.dumps({
+        'seconds': elapsed,
+        'chunks': progress.chunk_count,
+        'indexed': backend.count,
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument('--sizes-mb', default='64,256,1024', help='Dokumentgrößen in MB (kommagetrennt)')
+    parser.add_argument('--chunk', type=int, default=1000, help='Chunk-Größe in Zeichen')
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.chunk)
+        return
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix='uds3-embed-bench-') as workdir:
+        for size_mb in (int(s) for s in args.sizes_mb.split(',')):
+            path = os.path.join(workdir, f'document_{size_mb}mb.txt')
+            make_document(path, size_mb)
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', path, '--chunk', str(args.chunk)],
+                check=True, capture_output=True, text=True
+            ).stdout.strip().splitlines()[-1]
+            rows.append((size_mb, json.loads(output)))
+            os.remove(path)
+
+    print("=" * 72)
+    print(f"Embed-and-Index Pipeline Benchmark (chunk={args.chunk} chars)")
+    print("=" * 72)
+    print(f"{'size MB':>8} | {'chunks':>9} | {'seconds':>8} | {'MB/s':>7} | {'chunks/s':>9} | {'peak RSS MB':>11}")
+    print("-" * 72)
+    for size_mb, r in rows:
+        print(f"{size_mb:>8} | {r['chunks']:>9} | {r['seconds']:>8.2f} | {size_mb / r['seconds']:>7.1f} | "
+              f"{r['chunks'] / r['seconds']:>9.0f} | {r['max_rss_mb']:>11.1f}")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
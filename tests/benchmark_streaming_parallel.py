@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_streaming_parallel.py
+
+Benchmark für parallele Chunk-Transfers des StreamingManager auf Multi-GB-Dateien
+Lokaler Storage-Stand-in: FileSystemStorageBackend mit konfigurierbarer Latenz pro
+Chunk (simuliert Netzwerk-RTT zu CouchDB/Objektspeicher). Vergleicht den bisherigen
+seriellen Ablauf (read → hash → upload je Chunk) mit N parallelen Transfers,
+readinto-Puffer-Pool und Hashing auf eigenem Thread.
+Usage:
+python tests/benchmark_streaming_parallel.py [--size-gb 2] [--chunk-mb 8] [--latency-ms 5] [--transfers 1,4,8]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.database_api_file_storage import FileSystemStorageBackend
+from manager.streaming import StreamingManager
+
+
+class LatencyStorage(FileSystemStorageBackend):
+    """Lokales Dateisystem + feste Latenz pro Chunk-Request"""
+
+    def __init__(self, config, latency_s: float):
+        super().__init__(config)
+        self.latency_s = latency_s
+
+    def put_stream_chunk(self, stream_id, chunk_index, data):
+        time.sleep(self.latency_s)
+        return super().put_stream_chunk(stream_id, chunk_index, data)
+
+    def read_stream_chunk_into(self, stream_id, chunk_index, buffer):
+        time.sleep(self.latency_s)
+        return super().read_stream_chunk_into(stream_id, chunk_index, buffer)
+
+
+def make_source(path: str, size: int) -> None:
+    """Schreibt eine Testdatei (pseudozufällige Blöcke, nicht komprimierbar)"""
+    block = os.urandom(16 * 1024 * 1024)
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining > 0:
+            n = min(remaining, len(block))
+            f.write(block[:n])
+            remaining -= n
+
+
+def serial_upload(storage, file_path: str, destination: str, chunk_size: int) -> None:
+    """Bisheriger Ablauf: f.read → sha256 → Upload, ein Chunk nach dem anderen"""
+    with open(file_path, 'rb') as f:
+        index = 0
+        while True:
+            data = f.read(chunk_size)
+            if not data:
+                break
+            hashlib.sha256(data).hexdigest()
+            storage.put_stream_chunk(destination, index, data)
+            index += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument('--size-gb', type=float, default=2.0, help='Dateigröße in GB')
+    parser.add_argument('--chunk-mb', type=int, default=8, help='Chunk-Größe in MB')
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='Latenz pro Chunk-Request')
+    parser.add_argument('--transfers', default='1,4,8', help='Parallele Transfers (kommagetrennt)')
+    parser.add_argument('--workdir', default=None, help='Arbeitsverzeichnis (Default: tempdir)')
+    args = parser.parse_args()
+
+    size = int(args.size_gb * 1024 ** 3)
+    chunk_size = args.chunk_mb * 1024 * 1024
+    workdir = tempfile.mkdtemp(prefix='uds3-stream-bench-', dir=args.workdir)
+    source = os.path.join(workdir, 'source.bin')
+    rows = []
+
+    try:
+        print(f"Erzeuge Testdatei ({size / 1024 ** 3:.1f} GB) ...")
+        make_source(source, size)
+
+        storage = LatencyStorage({'root_path': os.path.join(workdir, 'serial')}, args.latency_ms / 1000)
+        storage.connect()
+        start = time.perf_counter()
+        serial_upload(storage, source, 'bench/serial.bin', chunk_size)
+        rows.append(('serial (legacy)', time.perf_counter() - start, None))
+        shutil.rmtree(storage.root_path)
+
+        for transfers in (int(t) for t in args.transfers.split(',')):
+            storage = LatencyStorage({'root_path': os.path.join(workdir, f'parallel-{transfers}')}, args.latency_ms / 1000)
+            storage.connect()
+            manager = StreamingManager(storage_backend=storage, chunk_size=chunk_size,
+                                       max_concurrent_transfers=transfers)
+            start = time.perf_counter()
+            manager.upload_large_file(source, 'bench/source.bin')
+            upload_s = time.perf_counter() - start
+
+            output = os.path.join(workdir, f'download-{transfers}.bin')
+            start = time.perf_counter()
+            manager.download_large_file('bench/source.bin', output)
+            download_s = time.perf_counter() - start
+            rows.append((f'{transfers} transfers', upload_s, download_s))
+            os.remove(output)
+            shutil.rmtree(storage.root_path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    mb = size / 1024 ** 2
+    print("=" * 72)
+    print(f"Streaming Benchmark ({size / 1024 ** 3:.1f} GB, {args.chunk_mb} MB chunks, "
+          f"{args.latency_ms:.1f} ms/chunk)")
+    print("=" * 72)
+    print(f"{'variant':>18} | {'upload s':>9} | {'upload MB/s':>11} | {'download s':>10} | {'download MB/s':>13}")
+    print("-" * 72)
+    for name, upload_s, download_s in rows:
+        down = f"{download_s:>10.2f} | {mb / download_s:>13.1f}" if download_s else f"{'-':>10} | {'-':>13}"
+        print(f"{name:>18} | {upload_s:>9.2f} | {mb / upload_s:>11.1f} | {down}")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
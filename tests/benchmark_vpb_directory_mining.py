@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_vpb_directory_mining.py
+
+Benchmark für VPBRAGDataMiner.extract_from_directory auf einem generierten Prozess-Repository
+Vergleicht sequenzielles Parsing mit dem Process Pool (verschiedene Worker-Zahlen)
+und einen inkrementellen Zweitlauf, bei dem nur ein Bruchteil der Dateien geändert ist.
+UDS3-Writes gehen an einen zählenden Stand-in, Embeddings sind deaktiviert.
+Usage:
+python tests/benchmark_vpb_directory_mining.py [--files 2000] [--tasks 60] [--workers 1,2,4,8]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vpb.rag_dataminer import create_vpb_dataminer
+
+
+class CountingPolyglot:
+    def __init__(self):
+        self.count = 0
+
+    def batch_create(self, documents):
+        self.count += len(documents)
+        return [f"doc_{self.count - len(documents) + i}" for i in range(len(documents))]
+
+
+def make_bpmn(i: int, tasks: int) -> str:
+    elements, flows = [f'<bpmn:startEvent id="start_{i}"/>'], []
+    previous = f'start_{i}'
+    for t in range(tasks):
+        kind = 'exclusiveGateway' if t % 10 == 9 else 'userTask'
+        elements.append(f'<bpmn:{kind} id="el_{i}_{t}" name="Bearbeitungsschritt {t} im Verfahren {i}"/>')
+        flows.append(f'<bpmn:sequenceFlow id="f_{i}_{t}" sourceRef="{previous}" targetRef="el_{i}_{t}"/>')
+        previous = f'el_{i}_{t}'
+    elements.append(f'<bpmn:endEvent id="end_{i}"/>')
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL" id="defs">'
+            f'<bpmn:process id="verfahren_{i}" name="Verfahren {i}">'
+            + ''.join(elements) + ''.join(flows) + '</bpmn:process></bpmn:definitions>')
+
+
+def mine(directory: Path, workers: int, incremental: bool = False, state_path: Path = None):
+    dataminer = create_vpb_dataminer(polyglot_manager=CountingPolyglot(), enable_embeddings=False)
+    start = time.perf_counter()
+    result = dataminer.extract_from_directory(directory, max_workers=workers,
+                                              incremental=incremental, state_path=state_path)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument('--files', type=int, default=2000, help='Anzahl BPMN-Dateien')
+    parser.add_argument('--tasks', type=int, default=60, help='Elemente pro Prozess')
+    parser.add_argument('--workers', default='1,2,4,8', help='Worker-Zahlen (kommagetrennt)')
+    parser.add_argument('--changed', type=float, default=0.05, help='Anteil geänderter Dateien im Zweitlauf')
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory(prefix='uds3-mining-bench-') as workdir:
+        directory = Path(workdir) / 'prozesse'
+        directory.mkdir()
+        for i in range(args.files):
+            (directory / f'verfahren_{i:06d}.bpmn').write_text(make_bpmn(i, args.tasks), encoding='utf-8')
+
+        baseline = None
+        for workers in (int(w) for w in args.workers.split(',')):
+            seconds, result = mine(directory, workers)
+            baseline = baseline or seconds
+            rows.append((f'full, {workers} worker', seconds, result.processes_extracted, 0, baseline / seconds))
+
+        # Inkrementell: Erstlauf schreibt die Hashes, Zweitlauf nach Änderungen
+        state_path = Path(workdir) / 'state.json'
+        workers = max(int(w) for w in args.workers.split(','))
+        mine(directory, workers, incremental=True, state_path=state_path)
+        for i in range(0, args.files, max(1, int(1 / args.changed))):
+            (directory / f'verfahren_{i:06d}.bpmn').write_text(make_bpmn(i, args.tasks + 1), encoding='utf-8')
+        seconds, result = mine(directory, workers, incremental=True, state_path=state_path)
+        rows.append((f'incremental, {workers} worker', seconds, result.processes_extracted,
+                     result.files_skipped, baseline / seconds))
+
+    print("=" * 72)
+    print(f"Directory Mining Benchmark ({args.files} BPMN files, {args.tasks} elements each)")
+    print("=" * 72)
+    print(f"{'run':>24} | {'seconds':>8} | {'files/s':>8} | {'mined':>6} | {'skipped':>7} | {'speedup':>7}")
+    print("-" * 72)
+    for name, seconds, mined, skipped, speedup in rows:
+        print(f"{name:>24} | {seconds:>8.2f} | {args.files / seconds:>8.0f} | {mined:>6} | {skipped:>7} | "
+              f"{speedup:>6.1f}x")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
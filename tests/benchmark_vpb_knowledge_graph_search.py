@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_vpb_knowledge_graph_search.py
+
+Benchmark für die Semantic Search im VPB Knowledge Graph (query_knowledge_graph)
+Vergleicht den bisherigen Python-Scan (_cosine_similarity gegen jeden Node + volle
+Sortierung) mit dem NodeEmbeddingIndex (ein Matrix-Vektor-Produkt + argpartition),
+jeweils ohne und mit Node-Typ-Filter. Embeddings sind Zufallsvektoren.
+Usage:
+python tests/benchmark_vpb_knowledge_graph_search.py [--nodes 5000,20000] [--dim 768] [--repeat 20]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from vpb.rag_dataminer import ProcessKnowledgeGraph, ProcessKnowledgeNode, VPBRAGDataMiner
+
+NODE_TYPES = ['process', 'task', 'task', 'task', 'participant', 'regulation']
+
+
+def make_graph(n: int, dim: int) -> ProcessKnowledgeGraph:
+    rng = random.Random(42)
+    graph = ProcessKnowledgeGraph()
+    for i in range(n):
+        graph.add_node(ProcessKnowledgeNode(
+            node_id=f'node_{i}', node_type=rng.choice(NODE_TYPES), name=f'Node {i}',
+            embeddings=[rng.uniform(-1, 1) for _ in range(dim)],
+        ))
+    return graph
+
+
+def legacy_search(graph, query, node_type, top_k):
+    """Bisherige Implementierung von query_knowledge_graph"""
+    similarities = []
+    for node in graph.nodes.values():
+        if node_type and node.node_type != node_type:
+            continue
+        if node.embeddings is None:
+            continue
+        similarities.append((node, VPBRAGDataMiner._cosine_similarity(None, query, node.embeddings)))
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return [node for node, _ in similarities[:top_k]]
+
+
+def time_ms(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument('--nodes', default='5000,20000', help='Anzahl Nodes (kommagetrennt)')
+    parser.add_argument('--dim', type=int, default=768, help='Embedding-Dimension')
+    parser.add_argument('--top-k', type=int, default=5, help='Anzahl Ergebnisse')
+    parser.add_argument('--repeat', type=int, default=20, help='Wiederholungen pro Abfrage')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    query = [rng.uniform(-1, 1) for _ in range(args.dim)]
+    rows = []
+    for n in (int(s) for s in args.nodes.split(',')):
+        start = time.perf_counter()
+        graph = make_graph(n, args.dim)
+        build_s = time.perf_counter() - start
+        for node_type in (None, 'process'):
+            legacy = legacy_search(graph, query, node_type, args.top_k)
+            indexed = [node for node, _ in graph.search_similar(query, node_type, args.top_k)]
+            assert [x.node_id for x in legacy] == [x.node_id for x in indexed], 'results differ'
+            legacy_ms = time_ms(lambda: legacy_search(graph, query, node_type, args.top_k), max(1, args.repeat // 10))
+            index_ms = time_ms(lambda: graph.search_similar(query, node_type, args.top_k), args.repeat)
+            rows.append((n, node_type or 'all', build_s, legacy_ms, index_ms))
+
+    print("=" * 72)
+    print(f"Knowledge Graph Semantic Search Benchmark (dim={args.dim}, top_k={args.top_k}, ms per query)")
+    print("=" * 72)
+    print(f"{'nodes':>8} | {'filter':>8} | {'build s':>8} | {'python scan':>11} | {'matrix':>8} | {'speedup':>8}")
+    print("-" * 72)
+    for n, node_type, build_s, legacy_ms, index_ms in rows:
+        print(f"{n:>8} | {node_type:>8} | {build_s:>8.2f} | {legacy_ms:>11.2f} | {index_ms:>8.3f} | "
+              f"{legacy_ms / index_ms:>7.0f}x")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
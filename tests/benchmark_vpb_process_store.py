@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+benchmark_vpb_process_store.py
+
+Benchmark für die indizierten Process Stores des VPBCRUDManager
+Vergleicht den bisherigen Dict-Scan (list(storage.values()) + Filter) mit
+InMemoryProcessStore und SQLiteProcessStore auf einem Katalog mit N Prozessen:
+Status-/Beteiligten-/Komplexitätssuche, Seitenabruf per Cursor und Statistik.
+Usage:
+python tests/benchmark_vpb_process_store.py [--processes 100000] [--repeat 50]
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from uds3.vpb.operations import (
+    InMemoryProcessStore,
+    LegalContext,
+    ParticipantRole,
+    ProcessStatus,
+    SQLiteProcessStore,
+    VPBCRUDManager,
+    create_vpb_participant,
+    create_vpb_process,
+)
+
+
+def make_catalog(n: int):
+    rng = random.Random(42)
+    people = [create_vpb_participant(f"Sachbearbeiter {i}", ParticipantRole.PROCESSOR) for i in range(2000)]
+    processes = []
+    for i in range(n):
+        process = create_vpb_process(f"Verfahren {i}", "Beschreibung",
+                                     legal_context=rng.choice(list(LegalContext)))
+        # Wenige aktive Verfahren, viele abgeschlossene (typischer kommunaler Bestand)
+        process.status = ProcessStatus.ACTIVE if rng.random() < 0.02 else rng.choice(
+            [s for s in ProcessStatus if s != ProcessStatus.ACTIVE])
+        process.complexity_score = rng.random()
+        process.participants = rng.sample(people, 3)
+        processes.append(process)
+    return processes, people
+
+
+def legacy_workload(storage, person, status):
+    """Bisherige Implementierung: lineare Scans über alle Prozesse"""
+    return {
+        'search_by_status': lambda: [p for p in storage.values() if p.status == status],
+        'search_by_participant': lambda: [
+            p for p in storage.values() if any(x.participant_id == person for x in p.participants)],
+        'search_by_complexity': lambda: [p for p in storage.values() if 0.90 <= p.complexity_score <= 0.91],
+        'list page (status)': lambda: [p for p in list(storage.values()) if p.status == status][:50],
+        'count_processes': lambda: len([p for p in storage.values() if p.status == status]),
+        'get_statistics': lambda: [len([p for p in storage.values() if p.status == s]) for s in ProcessStatus],
+    }
+
+
+def manager_workload(manager, person, status):
+    return {
+        'search_by_status': lambda: manager.search_by_status(status),
+        'search_by_participant': lambda: manager.search_by_participant(person),
+        'search_by_complexity': lambda: manager.search_by_complexity(0.90, 0.91),
+        'list page (status)': lambda: manager.list_processes_page(limit=50, status=status),
+        'count_processes': lambda: manager.count_processes(status),
+        'get_statistics': lambda: manager.get_statistics(),
+    }
+
+
+def time_ms(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[3])
+    parser.add_argument('--processes', type=int, default=100_000, help='Anzahl Prozesse im Katalog')
+    parser.add_argument('--repeat', type=int, default=50, help='Wiederholungen pro Abfrage')
+    args = parser.parse_args()
+
+    print(f"Erzeuge Katalog ({args.processes} Prozesse) ...")
+    processes, people = make_catalog(args.processes)
+    person, status = people[0].participant_id, ProcessStatus.ACTIVE
+
+    legacy = {p.process_id: p for p in processes}
+    memory = VPBCRUDManager(storage_backend=InMemoryProcessStore())
+    start = time.perf_counter()
+    memory.batch_create(processes)
+    memory_load_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory(prefix='uds3-vpb-bench-') as workdir:
+        sqlite = VPBCRUDManager(storage_backend=SQLiteProcessStore(os.path.join(workdir, 'vpb.db')))
+        start = time.perf_counter()
+        sqlite.batch_create(processes)
+        sqlite_load_s = time.perf_counter() - start
+
+        variants = [
+            ('dict scan', legacy_workload(legacy, person, status)),
+            ('in-memory', manager_workload(memory, person, status)),
+            ('sqlite', manager_workload(sqlite, person, status)),
+        ]
+        rows = {name: {query: time_ms(fn, args.repeat) for query, fn in workload.items()}
+                for name, workload in variants}
+        sqlite.storage.close()
+
+    print("=" * 72)
+    print(f"VPB Process Store Benchmark ({args.processes} processes, ms per call)")
+    print(f"Load: in-memory {memory_load_s:.2f}s, sqlite {sqlite_load_s:.2f}s")
+    print("=" * 72)
+    print(f"{'query':>22} | {'dict scan':>10} | {'in-memory':>10} | {'sqlite':>10} | {'speedup':>8}")
+    print("-" * 72)
+    for query in rows['dict scan']:
+        legacy_ms, memory_ms, sqlite_ms = (rows[name][query] for name in ('dict scan', 'in-memory', 'sqlite'))
+        print(f"{query:>22} | {legacy_ms:>10.3f} | {memory_ms:>10.3f} | {sqlite_ms:>10.3f} | "
+              f"{legacy_ms / memory_ms:>7.0f}x")
+    print("=" * 72)
+
+
+if __name__ == '__main__':
+    main()
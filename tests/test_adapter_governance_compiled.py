@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_adapter_governance_compiled.py
+
+Tests für die kompilierten Payload-Policies von AdapterGovernance
+(gleiche Verstöße wie die rekursive Referenz, Embedding-Skip, Shape-Cache)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.adapter_governance import AdapterGovernance, AdapterGovernanceError
+
+
+def _reference_violations(governance, backend, payload):
+    """Ursprüngliche Prüfung: voller Walk über _iterate_payload"""
+    rules = governance.policies[backend]["payload_rules"]
+    fields = {str(f).lower() for f in rules.get("forbidden_fields", set())}
+    types = rules.get("forbidden_types", ())
+    found = []
+    for path, value in governance._iterate_payload(payload):
+        if path.split(".")[-1].lower() in fields:
+            found.append(("field", path))
+        if types and isinstance(value, types):
+            found.append(("type", path))
+    return found
+
+
+def _as_tuples(violations):
+    return [("field" if "nicht erlaubt" in v.message else "type", v.field_path) for v in violations]
+
+
+def _random_payload(rng, depth=0):
+    choices = ["int", "str", "bytes", "floats", "dict", "list"] if depth < 3 else ["int", "str", "bytes", "floats"]
+    kind = rng.choice(choices)
+    if kind == "int":
+        return rng.randint(0, 9)
+    if kind == "str":
+        return "text"
+    if kind == "bytes":
+        return b"\x00\x01"
+    if kind == "floats":
+        return [rng.random() for _ in range(rng.randint(0, 8))]
+    if kind == "dict":
+        keys = ["id", "Content", "meta", "chunks", "blob", "raw.content", "title"]
+        return {rng.choice(keys): _random_payload(rng, depth + 1) for _ in range(rng.randint(1, 4))}
+    return [_random_payload(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+
+@pytest.mark.parametrize("backend", ["graph", "relational"])
+def test_matches_reference_walk(backend):
+    governance = AdapterGovernance()
+    rng = random.Random(7)
+    for _ in range(300):
+        payload = _random_payload(rng)
+        expected = _reference_violations(governance, backend, payload)
+        assert _as_tuples(governance.validate_payload(backend, "create", payload)) == expected
+
+
+def test_embeddings_are_not_walked_elementwise():
+    governance = AdapterGovernance()
+    batch = [{"chunk_id": f"c{i}", "embedding": [0.1] * 1024, "metadata": {"document_id": "d"}} for i in range(50)]
+    assert governance.validate_payload("graph", "create", batch) == []
+
+    batch[7]["embedding"][512] = b"leak"  # ein Ausreißer macht die Liste inhomogen
+    violations = governance.validate_payload("graph", "create", batch)
+    assert [v.field_path for v in violations] == ["[7].embedding[512]"]
+
+
+def test_numeric_lists_are_checked_when_numbers_are_forbidden():
+    governance = AdapterGovernance({"relational": {"payload_rules": {"forbidden_types": (float,)}}})
+    violations = governance.validate_payload("relational", "create", {"embedding": [0.5, 0.25]})
+    assert [v.field_path for v in violations] == ["embedding[0]", "embedding[1]"]
+
+
+def test_shape_cache_and_policy_refresh():
+    governance = AdapterGovernance()
+    payload = {"document_id": "d", "content": "x"}
+    with pytest.raises(AdapterGovernanceError):
+        governance.enforce_payload("graph", "create", payload)
+    governance.validate_payload("graph", "create", dict(payload))
+    assert len(governance._compiled["graph"].shape_cache) == 1
+
+    governance.policies["graph"]["payload_rules"] = {"forbidden_fields": {"document_id"}}
+    governance.refresh_policies()
+    violations = governance.validate_payload("graph", "create", payload)
+    assert [v.field_path for v in violations] == ["document_id"]
+
+    uncached = AdapterGovernance(shape_cache_size=0)
+    uncached.validate_payload("graph", "create", payload)
+    assert uncached._compiled["graph"].shape_cache == {}
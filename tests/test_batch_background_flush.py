@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_batch_background_flush.py
+
+Tests für das Pipelined Background Flushing der Batch-Inserter
+(Double Buffering, Backpressure, In-Flight-Limit, Fallback-Semantik)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.batch_operations import (
+    BatchFlusher,
+    ChromaBatchInserter,
+    CouchDBBatchInserter,
+)
+
+
+class _SlowChromaBackend:
+    """add_vectors mit künstlicher Latenz; zählt gleichzeitig laufende Batches"""
+
+    def __init__(self, latency=0.05, fail_batches=False):
+        self.latency = latency
+        self.fail_batches = fail_batches
+        self.vectors = []
+        self.single_inserts = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def add_vectors(self, vectors):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+            if self.fail_batches:
+                return False
+            self.vectors.extend(vectors)
+        return True
+
+    def add_vector(self, vector, metadata, chunk_id):
+        with self._lock:
+            self.single_inserts.append(chunk_id)
+        return True
+
+
+def _add(inserter, n):
+    for i in range(n):
+        inserter.add(f"chunk_{i:04d}", [0.1], {'doc_id': 'doc'})
+
+
+def test_add_does_not_block_on_flush():
+    backend = _SlowChromaBackend(latency=0.2)
+    inserter = ChromaBatchInserter(backend, batch_size=10, background_flush=True, max_in_flight=2)
+
+    start = time.perf_counter()
+    _add(inserter, 20)  # zwei volle Batches → beide in flight
+    assert time.perf_counter() - start < 0.15
+
+    assert inserter.flush() is True
+    assert len(backend.vectors) == 20
+    assert inserter.get_stats()['total_batches'] == 2
+    inserter.close()
+
+
+def test_in_flight_limit_and_backpressure():
+    backend = _SlowChromaBackend(latency=0.05)
+    with ChromaBatchInserter(backend, batch_size=5, background_flush=True, max_in_flight=2) as inserter:
+        _add(inserter, 100)
+
+    assert len(backend.vectors) == 100
+    assert backend.max_active == 2
+    stats = inserter.get_stats()['background_flush']
+    assert stats['submitted'] == stats['completed'] == 20
+    assert stats['blocked_seconds'] > 0  # Producer wurde gebremst
+
+
+def test_fallback_semantics_are_kept():
+    backend = _SlowChromaBackend(latency=0.0, fail_batches=True)
+    inserter = ChromaBatchInserter(backend, batch_size=3, background_flush=True, max_in_flight=1)
+    _add(inserter, 7)
+    inserter.close()
+
+    assert sorted(backend.single_inserts) == [f"chunk_{i:04d}" for i in range(7)]
+    stats = inserter.get_stats()
+    assert stats['total_fallbacks'] == 3 and stats['total_added'] == 7
+
+
+def test_flush_reports_failed_background_batches():
+    class _Db:
+        def update(self, docs):
+            return [{'error': 'forbidden'} for _ in docs]
+
+    class _Backend:
+        db = _Db()
+
+        def create_document(self, doc, doc_id=None):
+            pass
+
+    inserter = CouchDBBatchInserter(_Backend(), batch_size=2, background_flush=True)
+    inserter.add({'x': 1}, doc_id='a')
+    inserter.add({'x': 2}, doc_id='b')
+
+    assert inserter.flush() is False  # Fallback aufgetreten (wie im sync Modus)
+    assert inserter.flush() is True
+    assert inserter.get_stats()['total_fallbacks'] == 1
+    inserter.close()
+
+
+def test_sync_mode_is_default():
+    inserter = ChromaBatchInserter(_SlowChromaBackend(latency=0.0), batch_size=2)
+    assert inserter.background_flush is False
+    _add(inserter, 2)
+    assert inserter.get_stats() == {'total_added': 2, 'total_batches': 1, 'total_fallbacks': 0, 'pending': 0}
+
+
+def test_flusher_drain_timeout():
+    release = threading.Event()
+    flusher = BatchFlusher(lambda batch: release.wait(), max_in_flight=1)
+    flusher.submit([1])
+
+    with pytest.raises(TimeoutError):
+        flusher.drain(timeout=0.05)
+    release.set()
+    assert flusher.close() is True
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_chroma_chunk_index.py
+
+Tests für chunk-bewusste ChromaDB Batch-Reads (database/batch_operations.py)
+(ChromaChunkIndex, batch_get_by_documents, iter_documents, ParallelBatchReader)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import batch_operations
+from database.batch_operations import (
+    ChromaBatchInserter,
+    ChromaChunkIndex,
+    ChromaDBBatchReader,
+    ParallelBatchReader,
+)
+
+
+class _FakeCollection:
+    """In-Memory Collection mit ids/where-Filter (Subset der ChromaDB API)"""
+
+    def __init__(self):
+        self.rows = {}
+        self.calls = []
+
+    def add_chunks(self, doc_id, count, key='document_id'):
+        for i in range(count):
+            self.rows[f"{doc_id}_chunk_{i:04d}"] = {
+                'document': f"{doc_id} Teil {i}",
+                'metadata': {key: doc_id, 'chunk_index': i},
+                'embedding': [float(i)],
+            }
+
+    def get(self, ids=None, where=None, include=None):
+        self.calls.append({'ids': ids, 'where': where})
+        if ids is not None:
+            keys = [chunk_id for chunk_id in ids if chunk_id in self.rows]
+        else:
+            wanted = set()
+            for condition in where['$or']:
+                (field, spec), = condition.items()
+                wanted.update((field, doc_id) for doc_id in spec['$in'])
+            keys = [
+                chunk_id for chunk_id, row in reversed(list(self.rows.items()))
+                if any((field, value) in wanted for field, value in row['metadata'].items())
+            ]
+        include = include or []
+        return {
+            'ids': keys,
+            'metadatas': [self.rows[k]['metadata'] for k in keys] if 'metadatas' in include else None,
+            'documents': [self.rows[k]['document'] for k in keys] if 'documents' in include else None,
+            'embeddings': [self.rows[k]['embedding'] for k in keys] if 'embeddings' in include else None,
+        }
+
+
+class _Backend:
+    def __init__(self, collection):
+        self.collection = collection
+        self.added = []
+
+    def add_vectors(self, vectors):
+        for chunk_id, vector, metadata in vectors:
+            self.collection.rows[chunk_id] = {'document': '', 'metadata': metadata, 'embedding': vector}
+        return True
+
+
+@pytest.fixture
+def collection():
+    collection = _FakeCollection()
+    collection.add_chunks('doc_a', 3)
+    collection.add_chunks('doc_b', 25, key='doc_id')  # mehr als 10 Chunks, alte Metadaten-Konvention
+    collection.add_chunks('doc_c', 1)
+    return collection
+
+
+def test_unknown_documents_use_metadata_filter_then_index(collection):
+    reader = ChromaDBBatchReader(_Backend(collection))
+
+    first = reader.batch_get_by_documents(['doc_a', 'doc_b', 'missing'])
+    assert len(first['ids']) == 28
+    assert collection.calls[-1]['where'] is not None
+    assert reader.chunk_index.get('doc_b') is not None and len(reader.chunk_index.get('doc_b')) == 25
+
+    second = reader.batch_get_by_documents(['doc_a', 'doc_b'])
+    assert sorted(second['ids']) == sorted(first['ids'])
+    assert len(collection.calls[-1]['ids']) == 28  # exakt die existierenden Chunks
+    assert reader.filter_lookups == 1 and reader.index_lookups == 1
+
+
+def test_reads_are_split_by_read_size(collection):
+    index = ChromaChunkIndex()
+    index.register('doc_b', [f"doc_b_chunk_{i:04d}" for i in range(25)])
+    reader = ChromaDBBatchReader(_Backend(collection), chunk_index=index, read_size=10)
+
+    result = reader.batch_get_by_documents(['doc_b'])
+
+    assert len(result['ids']) == 25
+    assert [len(call['ids']) for call in collection.calls] == [10, 10, 5]
+
+
+def test_inserter_maintains_chunk_index(collection):
+    index = ChromaChunkIndex()
+    backend = _Backend(collection)
+    with ChromaBatchInserter(backend, batch_size=2, chunk_index=index) as inserter:
+        for i in range(3):
+            inserter.add(f"doc_new_chunk_{i:04d}", [0.1], {'doc_id': 'doc_new', 'chunk_index': i})
+
+    assert index.get('doc_new') == [f"doc_new_chunk_{i:04d}" for i in range(3)]
+
+    reader = ChromaDBBatchReader(backend, chunk_index=index)
+    assert len(reader.batch_get_by_documents(['doc_new'])['ids']) == 3
+    assert reader.filter_lookups == 0
+
+
+def test_register_dedups_and_keeps_insertion_order():
+    index = ChromaChunkIndex()
+    index.register('doc', ['c2', 'c0', 'c2'])
+    index.register('doc', ['c0', 'c1'])
+
+    assert index.get('doc') == ['c2', 'c0', 'c1']
+    known, unknown = index.resolve(['doc', 'other'])
+    assert known == {'doc': ['c2', 'c0', 'c1']} and unknown == ['other']
+
+
+def test_rechunked_document_is_reread_via_filter(collection):
+    reader = ChromaDBBatchReader(_Backend(collection))
+    reader.batch_get_by_documents(['doc_a', 'doc_c'])
+
+    # doc_a wird von einem anderen Writer neu gechunkt: alte IDs weg, neue IDs
+    for chunk_id in [k for k in collection.rows if k.startswith('doc_a_')]:
+        del collection.rows[chunk_id]
+    for i in range(4):
+        collection.rows[f"doc_a_v2_{i}"] = {'document': '', 'metadata': {'document_id': 'doc_a', 'chunk_index': i},
+                                            'embedding': [0.0]}
+
+    result = reader.batch_get_by_documents(['doc_a', 'doc_c'])
+
+    assert sorted(result['ids']) == sorted([f"doc_a_v2_{i}" for i in range(4)] + ['doc_c_chunk_0000'])
+    assert reader.stale_entries == 1 and reader.filter_lookups == 2
+    assert reader.chunk_index.get('doc_a') == [f"doc_a_v2_{i}" for i in reversed(range(4))]
+
+
+def test_expired_entries_pick_up_chunks_from_other_writers(collection, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(batch_operations.time, 'monotonic', lambda: clock[0])
+    reader = ChromaDBBatchReader(_Backend(collection), chunk_index=ChromaChunkIndex(max_age_seconds=60))
+    reader.batch_get_by_documents(['doc_c'])
+
+    collection.add_chunks('doc_c', 2)  # zweiter Chunk von einem anderen Prozess
+    assert len(reader.batch_get_by_documents(['doc_c'])['ids']) == 1
+
+    clock[0] += 61
+    assert len(reader.batch_get_by_documents(['doc_c'])['ids']) == 2
+    assert reader.filter_lookups == 2
+
+
+def test_iter_documents_streams_ordered_payloads(collection):
+    reader = ChromaDBBatchReader(_Backend(collection), read_size=2)
+
+    streamed = list(reader.iter_documents(['doc_c', 'doc_a', 'missing', 'doc_b'], include_embeddings=True))
+
+    assert [doc_id for doc_id, _ in streamed] == ['doc_c', 'doc_a', 'doc_b']
+    doc_a = dict(streamed)['doc_a']
+    assert doc_a['ids'] == [f"doc_a_chunk_{i:04d}" for i in range(3)]
+    assert doc_a['embeddings'] == [[0.0], [1.0], [2.0]]
+    assert len(dict(streamed)['doc_b']['documents']) == 25
+
+
+def test_parallel_reader_uses_chunk_aware_read(collection):
+    reader = ParallelBatchReader(chromadb_reader=ChromaDBBatchReader(_Backend(collection)))
+
+    results = asyncio.run(reader.batch_get_all(['doc_b']))
+
+    assert len(results['vector']['ids']) == 25
+    assert results['errors'] == []
+    assert all('_chunk_' not in str(call['where']) for call in collection.calls)
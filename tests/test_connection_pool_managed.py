@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_connection_pool_managed.py
+
+Tests für den Managed Mode von PostgreSQLConnectionPool (database/connection_pool.py)
+(Lazy Health Checks, blockierender Checkout mit Wait-Queue, Max-Lifetime Recycling)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import connection_pool as pool_module
+from database.connection_pool import PoolTimeoutError, PostgreSQLConnectionPool
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        if self.conn.dead:
+            raise pool_module.OperationalError("server closed the connection")
+        if self.conn.broken:
+            raise RuntimeError("current transaction is aborted")
+        self.conn.statements.append(sql)
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.dead = False
+        self.broken = False
+        self.statements = []
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    opened = []
+
+    def fake_connect(**kwargs):
+        conn = _FakeConnection()
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(pool_module.psycopg2, "connect", fake_connect)
+    return opened
+
+
+def _pool(**kwargs):
+    kwargs.setdefault("min_connections", 1)
+    kwargs.setdefault("max_connections", 2)
+    kwargs.setdefault("mode", "managed")
+    pool = PostgreSQLConnectionPool("localhost", 5432, "uds3", "user", "secret", **kwargs)
+    pool.initialize()
+    return pool
+
+
+def test_no_health_check_for_recently_used_connection(connections):
+    pool = _pool()
+    for _ in range(5):
+        with pool.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT * FROM documents")
+
+    assert len(connections) == 1
+    assert connections[0].statements.count("SELECT 1") == 1  # nur beim initialize()
+    assert pool.get_stats()["health_checks"] == 0
+    pool.close()
+
+
+def test_health_check_after_idle_and_dead_connection_is_replaced(connections):
+    pool = _pool(health_check_idle_seconds=0.0)
+    connections[0].dead = True
+
+    with pool.get_connection() as conn:
+        assert conn is connections[1]
+
+    assert connections[0].closed
+    assert pool.get_stats()["health_checks"] == 1
+    assert pool.get_counts() == {"active": 0, "idle": 1, "total": 1}
+    pool.close()
+
+
+def test_health_check_discards_connection_on_any_error(connections):
+    pool = _pool(health_check_idle_seconds=0.0)
+    connections[0].broken = True
+
+    with pool.get_connection() as conn:
+        assert conn is connections[1]
+
+    assert connections[0].closed
+    assert pool.get_counts() == {"active": 0, "idle": 1, "total": 1}
+    pool.close()
+
+
+def test_connection_is_checked_after_error(connections):
+    pool = _pool()
+    with pytest.raises(ValueError):
+        with pool.get_connection():
+            raise ValueError("query failed")
+
+    with pool.get_connection() as conn:
+        assert conn is connections[0]
+    assert pool.get_stats()["health_checks"] == 1
+    assert pool.get_stats()["total_errors"] == 0  # Anwendungsfehler, kein Verbindungsfehler
+    pool.close()
+
+
+def test_connection_level_errors_are_counted(connections):
+    pool = _pool()
+    with pytest.raises(pool_module.OperationalError):
+        with pool.get_connection():
+            raise pool_module.OperationalError("server closed the connection")
+
+    assert pool.get_stats()["total_errors"] == 1
+    pool.close()
+
+
+def test_max_lifetime_recycles_connection(connections):
+    pool = _pool(max_lifetime_seconds=0.0)
+    time.sleep(0.01)
+
+    with pool.get_connection() as conn:
+        assert conn is connections[1]
+
+    assert connections[0].closed
+    assert pool.get_stats()["recycled"] == 1
+    pool.close()
+
+
+def test_checkout_blocks_until_connection_is_returned(connections):
+    pool = _pool(max_connections=1, checkout_timeout=2.0)
+    acquired = []
+
+    with pool.get_connection() as first:
+        worker = threading.Thread(target=lambda: acquired.append(pool.get_connection().__enter__()))
+        worker.start()
+        time.sleep(0.05)
+        assert acquired == [] and pool.get_stats()["waiting"] == 1
+    worker.join(timeout=2)
+
+    assert acquired == [first]
+    assert pool.get_stats()["max_wait_ms"] >= 40
+
+
+def test_checkout_timeout_and_bounded_queue(connections):
+    pool = _pool(max_connections=1, checkout_timeout=0.05, max_waiters=0)
+    with pool.get_connection():
+        with pytest.raises(PoolTimeoutError):
+            with pool.get_connection():
+                pass
+
+    pool.max_waiters = 1
+    with pool.get_connection():
+        with pytest.raises(PoolTimeoutError):
+            with pool.get_connection():
+                pass
+    assert pool.get_stats()["wait_timeouts"] == 2
+    pool.close()
+
+
+def test_classic_mode_is_the_default():
+    with pytest.raises(ValueError):
+        PostgreSQLConnectionPool("localhost", 5432, "uds3", "user", "secret", mode="eager")
+    pool = PostgreSQLConnectionPool("localhost", 5432, "uds3", "user", "secret")
+    assert pool.get_stats()["mode"] == "classic"
+    pool.close()
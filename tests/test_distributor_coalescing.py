@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_distributor_coalescing.py
+
+Write Coalescing im UDS3MultiDBDistributor (integration/write_coalescer.py):
+gebündelte Writes über die Batch-Inserter, parallele DB-Typen und exakte
+DistributionResults pro Dokument
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from integration.adaptive_strategy import StrategyType
+from integration.distributor import ProcessorResult, ProcessorType, UDS3MultiDBDistributor
+from integration.write_coalescer import DistributionWriteCoalescer
+
+
+class FakeCouchDB:
+    """db.update = _bulk_docs; zählt Aufrufe"""
+
+    def __init__(self, fail_ids=()):
+        self.calls = []
+        self.fail_ids = set(fail_ids)
+        self.db = SimpleNamespace(update=self._update)
+
+    def _update(self, docs):
+        self.calls.append([doc['_id'] for doc in docs])
+        return [{'id': doc['_id'], 'error': 'forbidden'} if doc['document_id'] in self.fail_ids
+                else {'id': doc['_id'], 'ok': True} for doc in docs]
+
+    def create_document(self, doc, doc_id=None):
+        if doc['document_id'] in self.fail_ids:
+            raise IOError('forbidden')
+
+
+class FakeChroma:
+    def __init__(self):
+        self.calls = []
+
+    def add_vectors(self, batch):
+        self.calls.append([chunk_id for chunk_id, _, _ in batch])
+        return True
+
+
+class FakeRelational:
+    """insert_record mit Latenz; misst Überlappung mit anderen Backends"""
+
+    def __init__(self, tracker, fail_ids=(), none_ids=()):
+        self.rows = []
+        self.tracker = tracker
+        self.fail_ids = set(fail_ids)
+        self.none_ids = set(none_ids)  # Backend-Vertrag: None bei fehlgeschlagenem Insert
+
+    def insert_record(self, table_name, data):
+        with self.tracker:
+            time.sleep(0.001)
+        if data['document_id'] in self.fail_ids:
+            raise IOError('constraint violation')
+        if data['document_id'] in self.none_ids:
+            return None
+        self.rows.append((table_name, data['document_id']))
+        return len(self.rows)
+
+
+class OverlapTracker:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.active -= 1
+
+
+class FakeManager:
+    def __init__(self, couch, chroma, relational):
+        self.couch, self.chroma, self.relational = couch, chroma, relational
+
+    def get_file_backend(self):
+        return self.couch
+
+    def get_vector_backend(self):
+        return self.chroma
+
+    def get_relational_backend(self):
+        return self.relational
+
+    def get_graph_backend(self):
+        return None
+
+
+def make_strategy():
+    availability = SimpleNamespace(postgresql=True, couchdb=True, chromadb=True, neo4j=False, sqlite=True)
+    return SimpleNamespace(current_strategy=StrategyType.FULL_POLYGLOT, db_availability=availability)
+
+
+def make_result(i, embedding=True):
+    data = {'text_content': f'Bescheid {i}'}
+    if embedding:
+        data['embedding'] = [0.1 * i, 0.2]
+    else:
+        data['text_vector'] = None  # Vektor angekündigt, aber nicht geliefert
+    return ProcessorResult(
+        processor_name='TextProcessor', processor_type=ProcessorType.TEXT_PROCESSOR,
+        document_id=f'doc_{i}', result_data=data, confidence_score=0.9, execution_time_ms=5
+    )
+
+
+def make_distributor(couch_fail=(), pg_fail=(), pg_none=(), **config):
+    tracker = OverlapTracker()
+    couch, chroma = FakeCouchDB(fail_ids=couch_fail), FakeChroma()
+    relational = FakeRelational(tracker, fail_ids=pg_fail, none_ids=pg_none)
+    manager = FakeManager(couch, chroma, relational)
+    distributor = UDS3MultiDBDistributor(make_strategy(), database_manager=manager, config=config)
+    return distributor, couch, chroma, relational
+
+
+def test_concurrent_results_share_backend_batches():
+    distributor, couch, chroma, relational = make_distributor(batch_size=100, coalesce_window_ms=20)
+    results = asyncio.run(distributor.distribute_multiple_results([make_result(i) for i in range(30)]))
+
+    assert all(r.success for r in results)
+    # 30 Dokumente x 2 CouchDB-Collections in einem _bulk_docs-Aufruf statt 60 Writes
+    assert len(couch.calls) == 1 and len(couch.calls[0]) == 60
+    assert len(chroma.calls) == 1 and len(chroma.calls[0]) == 30
+    # 5 relationale Tabellen pro Dokument, 150 Inserts in Batches zu 100
+    assert len(relational.rows) == 30 * 5
+
+    stats = distributor.get_distribution_stats()['write_coalescing']
+    assert stats['couchdb']['batches'] == 1 and stats['chromadb']['batches'] == 1
+
+
+def test_each_result_only_reports_its_own_items():
+    distributor, *_ = make_distributor(coalesce_window_ms=20)
+    results = asyncio.run(distributor.distribute_multiple_results(
+        [make_result(i, embedding=i % 2 == 0) for i in range(6)]))
+
+    for i, result in enumerate(results):
+        assert result.document_id == f'doc_{i}'
+        stored = [item for items in result.distributed_to.values() for item in items]
+        assert stored and all(f'doc_{i}' in item for item in stored)
+        assert f'processed_documents:doc_{i}:TextProcessor' in result.distributed_to['couchdb']
+        assert len(result.distributed_to['postgresql']) == 5
+        if i % 2 == 0:
+            assert result.distributed_to['chromadb'] == [f'document_embeddings:doc_{i}:TextProcessor']
+        else:
+            # ohne Embedding: Warnung statt Vektor, nur für dieses Dokument
+            assert result.distributed_to['chromadb'] == [] and result.warnings
+
+
+def test_failures_stay_with_the_failing_document():
+    distributor, couch, _, relational = make_distributor(pg_fail={'doc_3'}, coalesce_window_ms=20)
+    results = asyncio.run(distributor.distribute_multiple_results([make_result(i) for i in range(5)]))
+
+    failing = results[3]
+    assert failing.errors and all('constraint violation' in e for e in failing.errors)
+    assert failing.distributed_to['postgresql'] == []
+    assert failing.distributed_to['couchdb']  # andere Backends für doc_3 trotzdem geschrieben
+    assert all(not r.errors for i, r in enumerate(results) if i != 3)
+    assert len(relational.rows) == 4 * 5
+
+
+def test_insert_record_returning_none_is_a_failure():
+    distributor, *_ = make_distributor(pg_none={'doc_2'}, coalesce_window_ms=20)
+    results = asyncio.run(distributor.distribute_multiple_results([make_result(i) for i in range(4)]))
+
+    failing = results[2]
+    assert failing.distributed_to['postgresql'] == []
+    assert len(failing.errors) == 5 and all('failed' in e for e in failing.errors)
+    assert all(len(r.distributed_to['postgresql']) == 5 for i, r in enumerate(results) if i != 2)
+
+
+def test_warnings_only_database_result_is_successful():
+    distributor, *_ = make_distributor(coalesce_window_ms=20)
+    operations = [{'target': {'storage_location': 'document_embeddings'},
+                   'data': {'document_id': 'doc_1', 'processor_name': 'TextProcessor'}}]
+
+    outcome = asyncio.run(distributor._execute_database_operations('chromadb', operations, make_result(1)))
+
+    assert outcome['success'] and not outcome['stored_items'] and outcome['warnings']
+
+
+def test_backend_types_are_written_concurrently():
+    distributor, _, _, _ = make_distributor(coalesce_window_ms=5)
+    tracker = OverlapTracker()
+
+    # CouchDB-Flush blockiert, bis der relationale Flush läuft
+    relational_started = threading.Event()
+    couch_update = distributor.database_manager.couch.db.update
+    original_insert = distributor.database_manager.relational.insert_record
+
+    def slow_update(docs):
+        with tracker:
+            assert relational_started.wait(2), 'backends were flushed sequentially'
+            return couch_update(docs)
+
+    def insert_record(table_name, data):
+        with tracker:
+            relational_started.set()
+            time.sleep(0.002)
+        return original_insert(table_name, data)
+
+    distributor.database_manager.couch.db.update = slow_update
+    distributor.database_manager.relational.insert_record = insert_record
+    results = asyncio.run(distributor.distribute_multiple_results([make_result(i) for i in range(3)]))
+
+    assert all(r.success for r in results)
+    assert tracker.peak >= 2
+
+
+def test_without_coalescing_every_operation_is_written_alone():
+    distributor, couch, chroma, _ = make_distributor(coalesce_writes=False)
+    results = asyncio.run(distributor.distribute_multiple_results([make_result(i) for i in range(4)]))
+
+    assert all(r.success for r in results)
+    assert len(couch.calls) == 8 and all(len(call) == 1 for call in couch.calls)
+    assert len(chroma.calls) == 4
+
+
+def test_without_database_manager_writes_are_simulated():
+    distributor = UDS3MultiDBDistributor(make_strategy())
+    result = asyncio.run(distributor.distribute_processor_result(make_result(1)))
+
+    assert result.success and not result.errors
+    assert set(result.distributed_to) == {'postgresql', 'couchdb', 'chromadb'}
+    assert all(item.split(':', 1)[1].startswith('postgresql_') for item in result.distributed_to['postgresql'])
+
+
+def test_writes_pending_on_another_loop_are_not_dropped():
+    coalescer = DistributionWriteCoalescer(window_ms=10_000)
+    other_loop = asyncio.new_event_loop()
+    try:
+        queued = other_loop.create_task(coalescer.write('couchdb', 'docs', {'id': 'a'}))
+        other_loop.run_until_complete(asyncio.sleep(0))
+
+        with pytest.raises(RuntimeError, match='another event loop'):
+            asyncio.run(coalescer.write('couchdb', 'docs', {'id': 'b'}))
+
+        other_loop.run_until_complete(coalescer.flush())
+        assert queued.result().stored_item and not queued.result().error
+    finally:
+        other_loop.close()
+
+    # danach ist der Coalescer wieder frei für einen neuen Loop
+    coalescer.window_s = 0
+    assert not asyncio.run(coalescer.write('couchdb', 'docs', {'id': 'c'})).error
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_embedding_store.py
+
+Tests für den memory-mapped Embedding Store (core/embedding_store.py)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import hashlib
+import pickle
+
+import numpy as np
+import pytest
+
+import uds3.core.embeddings as embeddings_module
+from uds3.core.embedding_store import (
+    MMapEmbeddingStore,
+    migrate_pickle_directory,
+    store_dir_for,
+)
+
+DIM = 8
+
+
+def _key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = MMapEmbeddingStore(tmp_path / "store", DIM)
+    yield s
+    s.close()
+
+
+class TestPutAndLookup:
+
+    def test_put_and_get(self, store):
+        vec = np.arange(DIM, dtype=np.float32)
+        assert store.put(_key("a"), vec) is True
+        assert store.put(_key("a"), vec) is False  # bereits vorhanden
+
+        result = store.get(_key("a"))
+        np.testing.assert_array_equal(result, vec)
+        assert store.get(_key("missing")) is None
+        assert len(store) == 1
+
+    def test_get_batch_mask_and_order(self, store):
+        keys = [_key(f"t{i}") for i in range(10)]
+        vectors = np.random.rand(10, DIM).astype(np.float32)
+        assert store.put_batch(keys, vectors) == 10
+
+        query = [keys[3], _key("missing"), keys[7], keys[1]]
+        matrix, found = store.get_batch(query)
+
+        assert found.tolist() == [True, False, True, True]
+        np.testing.assert_array_equal(matrix, vectors[[3, 7, 1]])
+
+    def test_contiguous_batch_is_zero_copy_view(self, store):
+        keys = [_key(f"c{i}") for i in range(5)]
+        store.put_batch(keys, np.ones((5, DIM), dtype=np.float32))
+
+        matrix, _ = store.get_batch(keys[1:4])
+        assert not matrix.flags.owndata
+        assert matrix.shape == (3, DIM)
+
+    def test_duplicate_keys_in_batch(self, store):
+        keys = [_key("x"), _key("x"), _key("y")]
+        assert store.put_batch(keys, np.zeros((3, DIM), dtype=np.float32)) == 2
+        assert len(store) == 2
+
+    def test_dimension_mismatch(self, store):
+        with pytest.raises(ValueError):
+            store.put(_key("a"), np.zeros(DIM + 1, dtype=np.float32))
+
+    def test_index_merge(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(MMapEmbeddingStore, "INDEX_MERGE_THRESHOLD", 4)
+        s = MMapEmbeddingStore(tmp_path / "merge", DIM)
+        keys = [_key(f"m{i}") for i in range(10)]
+        for i, key in enumerate(keys):
+            s.put(key, np.full(DIM, i, dtype=np.float32))
+
+        rows = s.lookup_rows(keys)
+        assert rows.tolist() == list(range(10))
+        s.close()
+
+
+class TestPersistence:
+
+    def test_reopen(self, tmp_path):
+        path = tmp_path / "persist"
+        keys = [_key(f"p{i}") for i in range(4)]
+        vectors = np.random.rand(4, DIM).astype(np.float32)
+        with MMapEmbeddingStore(path, DIM) as s:
+            s.put_batch(keys, vectors)
+
+        with MMapEmbeddingStore(path, DIM) as s:
+            matrix, found = s.get_batch(keys)
+            assert found.all()
+            np.testing.assert_array_equal(matrix, vectors)
+
+    def test_wrong_dimension_on_reopen(self, tmp_path):
+        path = tmp_path / "dim"
+        MMapEmbeddingStore(path, DIM).close()
+        with pytest.raises(ValueError):
+            MMapEmbeddingStore(path, DIM * 2)
+
+    def test_truncated_write_is_recovered(self, tmp_path):
+        path = tmp_path / "crash"
+        with MMapEmbeddingStore(path, DIM) as s:
+            s.put_batch([_key("a"), _key("b")], np.ones((2, DIM), dtype=np.float32))
+
+        # Abgebrochener Append: halbe Vektorzeile ohne Key
+        with open(path / MMapEmbeddingStore.VECTORS_FILE, "ab") as fh:
+            fh.write(b"\x00" * (DIM * 2))
+
+        with MMapEmbeddingStore(path, DIM) as s:
+            assert len(s) == 2
+            assert s.put(_key("c"), np.zeros(DIM, dtype=np.float32))
+            np.testing.assert_array_equal(s.get(_key("c")), np.zeros(DIM))
+
+
+class TestDeleteAndCompact:
+
+    def test_delete_and_compact(self, store):
+        keys = [_key(f"d{i}") for i in range(6)]
+        vectors = np.random.rand(6, DIM).astype(np.float32)
+        store.put_batch(keys, vectors)
+
+        assert store.delete([keys[0], keys[4]]) == 2
+        assert store.get(keys[0]) is None
+        assert len(store) == 4
+
+        result = store.compact()
+        assert result["rows_removed"] == 2
+        assert store.get_stats()["rows"] == 4
+
+        matrix, found = store.get_batch(keys)
+        assert found.tolist() == [False, True, True, True, False, True]
+        np.testing.assert_array_equal(matrix, vectors[[1, 2, 3, 5]])
+
+    def test_reinsert_after_delete(self, store):
+        key = _key("r")
+        store.put(key, np.zeros(DIM, dtype=np.float32))
+        store.delete([key])
+        assert store.put(key, np.ones(DIM, dtype=np.float32)) is True
+        np.testing.assert_array_equal(store.get(key), np.ones(DIM))
+
+    def test_compact_keeps_reinserted_key(self, store):
+        key = _key("r")
+        store.put(key, np.zeros(DIM, dtype=np.float32))
+        store.put(_key("other"), np.full(DIM, 2, dtype=np.float32))
+        store.delete([key])
+        store.put(key, np.ones(DIM, dtype=np.float32))
+
+        result = store.compact()
+        assert result["rows_removed"] == 1
+        np.testing.assert_array_equal(store.get(key), np.ones(DIM))
+        np.testing.assert_array_equal(store.get(_key("other")), np.full(DIM, 2))
+
+
+class TestMigration:
+
+    def test_migrate_pickle_directory(self, tmp_path):
+        pickle_dir = tmp_path / "embeddings_cache"
+        pickle_dir.mkdir()
+        expected = {}
+        for i in range(5):
+            key = _key(f"legacy{i}")
+            vec = np.random.rand(DIM).astype(np.float32)
+            expected[key] = vec
+            with open(pickle_dir / f"{key}.pkl", "wb") as fh:
+                pickle.dump(vec, fh)
+        # Anderes Modell (andere Dimension) im selben Verzeichnis
+        with open(pickle_dir / f"{_key('other')}.pkl", "wb") as fh:
+            pickle.dump(np.zeros(DIM * 2, dtype=np.float32), fh)
+
+        with MMapEmbeddingStore(store_dir_for(pickle_dir, DIM), DIM) as s:
+            stats = migrate_pickle_directory(pickle_dir, s, batch_size=2, remove_source=True)
+            assert stats["migrated"] == 5
+            assert stats["skipped_dim"] == 1
+            for key, vec in expected.items():
+                np.testing.assert_array_equal(s.get(key), vec)
+
+        remaining = sorted(p.name for p in pickle_dir.glob("*.pkl"))
+        assert remaining == [f"{_key('other')}.pkl"]
+
+
+class _FakeSentenceTransformer:
+    """Ersetzt SentenceTransformer: deterministisch, zählt Encodings"""
+
+    def __init__(self, *args, **kwargs):
+        self.encoded = []
+
+    def get_sentence_embedding_dimension(self):
+        return DIM
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.encoded.extend(batch)
+        vectors = np.array([[len(t)] + [1.0] * (DIM - 1) for t in batch], dtype=np.float32)
+        return vectors[0] if single else vectors
+
+
+@pytest.fixture
+def make_embedder(monkeypatch, tmp_path):
+    monkeypatch.setattr(embeddings_module, "SENTENCE_TRANSFORMERS_AVAILABLE", True)
+    monkeypatch.setattr(embeddings_module, "SentenceTransformer", _FakeSentenceTransformer, raising=False)
+
+    def _make(**kwargs):
+        return embeddings_module.UDS3GermanEmbeddings(
+            cache_dir=tmp_path / "embeddings_cache", use_memory_cache=False, **kwargs
+        )
+    return _make
+
+
+class TestGermanEmbeddingsDiskCache:
+
+    def test_legacy_pickle_cache_is_used_without_migration(self, make_embedder):
+        legacy = make_embedder(disk_cache_backend="pickle")
+        legacy.embed_text("Bauantrag")
+        legacy.embed_batch(["Widerspruch", "Anhörung"], show_progress_bar=False)
+
+        upgraded = make_embedder()
+        vector = upgraded.embed_text("Bauantrag")
+        batch = upgraded.embed_batch(["Widerspruch", "Anhörung"], show_progress_bar=False)
+
+        assert upgraded.model.encoded == []
+        np.testing.assert_array_equal(vector, legacy.embed_text("Bauantrag"))
+        assert batch.shape == (2, DIM)
+        # Treffer wurden in den mmap Store übernommen
+        assert len(upgraded._embedding_store) == 3
+
+    def test_disk_cache_hits_are_writable_copies(self, make_embedder):
+        make_embedder().embed_text("Bauantrag")
+
+        embedder = make_embedder()
+        vector = embedder.embed_text("Bauantrag")
+        (batch_vector,) = embedder._load_batch_from_disk_cache([embedder._generate_cache_key("Bauantrag", True)])
+
+        assert embedder.model.encoded == []
+        assert not isinstance(vector, np.memmap) and vector.flags.writeable
+        assert batch_vector.flags.writeable
+        vector[0] = -1.0
+        np.testing.assert_array_equal(make_embedder().embed_text("Bauantrag")[:1], [len("Bauantrag")])
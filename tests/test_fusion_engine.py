@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_fusion_engine.py
+
+Tests für die vektorisierte Fusion Engine (search/fusion.py)
+(RRF, Weighted, CombMNZ, argpartition Top-k, keine Mutation der Eingaben)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from uds3.search.fusion import FusionEngine, top_k_indices
+from uds3.search.search_api import SearchResult
+
+
+def _results(source, ids, scores=None):
+    scores = scores or [1.0 - 0.1 * i for i in range(len(ids))]
+    return [SearchResult(document_id=d, content=f"{source}:{d}", score=s, source=source)
+            for d, s in zip(ids, scores)]
+
+
+def _reference_rrf(ranked_lists, k, weights):
+    total = sum(weights.values())
+    weights = {s: w / total for s, w in weights.items()}
+    scores = {}
+    for source, results in ranked_lists.items():
+        for rank, result in enumerate(results, start=1):
+            scores[result.document_id] = scores.get(result.document_id, 0.0) + weights[source] / (k + rank)
+    return scores
+
+
+def test_rrf_matches_reference():
+    rng = random.Random(7)
+    ranked_lists = {
+        source: _results(source, rng.sample([f"d{i}" for i in range(200)], 120))
+        for source in ("vector", "graph", "keyword")
+    }
+    weights = {"vector": 0.4, "graph": 0.3, "keyword": 0.3}
+
+    fused = FusionEngine().fuse(ranked_lists, method="rrf", weights=weights, top_k=25)
+    expected = _reference_rrf(ranked_lists, 60, weights)
+    expected_top = sorted(expected.items(), key=lambda item: -item[1])[:25]
+
+    assert [r.document_id for r in fused] == [d for d, _ in expected_top]
+    np.testing.assert_allclose([r.score for r in fused], [s for _, s in expected_top])
+    assert all(r.source == "rrf_fusion" for r in fused)
+
+
+def test_weighted_does_not_mutate_inputs():
+    vector = _results("vector", ["a", "b"], [0.9, 0.5])
+    keyword = _results("keyword", ["b", "c"], [0.8, 0.4])
+    ranked_lists = {"vector": vector, "keyword": keyword}
+
+    fused = FusionEngine().fuse(ranked_lists, method="weighted",
+                                weights={"vector": 0.5, "keyword": 0.5})
+
+    assert [r.document_id for r in fused] == ["b", "a", "c"]
+    assert fused[0].score == pytest.approx(0.5 * 0.5 + 0.5 * 0.8)
+    assert [r.score for r in vector] == [0.9, 0.5]
+    assert [r.score for r in keyword] == [0.8, 0.4]
+    assert all(f is not r for f in fused for r in vector + keyword)
+
+
+def test_combmnz_rewards_agreement():
+    ranked_lists = {
+        "vector": _results("vector", ["solo", "shared", "x"], [1.0, 0.9, 0.0]),
+        "keyword": _results("keyword", ["shared", "y"], [0.6, 0.2]),
+    }
+    fused = FusionEngine().fuse(ranked_lists, method="combmnz")
+
+    # shared: (0.9 + 1.0) * 2 = 3.8  >  solo: 1.0 * 1
+    assert fused[0].document_id == "shared"
+    assert fused[0].score == pytest.approx(3.8)
+    assert fused[1].document_id == "solo"
+
+
+def test_related_docs_are_merged_without_aliasing():
+    graph = [SearchResult(document_id="a", content="g", related_docs=[{"id": "r1"}])]
+    vector = [SearchResult(document_id="a", content="v", related_docs=[{"id": "r1"}, {"id": "r2"}])]
+
+    fused = FusionEngine().fuse({"graph": graph, "vector": vector})
+
+    assert fused[0].related_docs == [{"id": "r1"}, {"id": "r2"}]
+    assert graph[0].related_docs == [{"id": "r1"}]
+
+
+def test_top_k_indices_is_sorted_and_deterministic():
+    scores = np.array([0.1, 0.5, 0.5, 0.9, 0.0, 0.5])
+    assert top_k_indices(scores, 3).tolist() == [3, 1, 2]
+    assert top_k_indices(scores, None).tolist() == [3, 1, 2, 5, 0, 4]
+    assert top_k_indices(scores, 0).tolist() == []
+
+
+def test_large_candidate_lists():
+    n = 30000
+    ids = [f"doc{i}" for i in range(n)]
+    ranked_lists = {
+        "vector": _results("vector", ids, list(np.linspace(1, 0, n))),
+        "keyword": _results("keyword", ids[::-1], list(np.linspace(1, 0, n))),
+    }
+    fused = FusionEngine().fuse(ranked_lists, method="rrf", top_k=100)
+
+    assert len(fused) == 100
+    scores = [r.score for r in fused]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        FusionEngine().fuse({"vector": _results("vector", ["a"])}, method="borda")
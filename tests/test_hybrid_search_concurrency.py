@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_hybrid_search_concurrency.py
+
+Tests für die nebenläufige Retrieval-Stufe von UDS3SearchAPI.hybrid_search
+(Fan-out in Worker-Threads, Per-Source-Deadlines, Partial-Result-Fusion)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import asyncio
+import time
+
+from uds3.search.search_api import UDS3SearchAPI, SearchQuery, HybridSearchResults
+
+BACKEND_DELAY = 0.2
+
+
+class _FakeModel:
+    def encode(self, text):
+        time.sleep(0.05)
+
+        class _Vec(list):
+            def tolist(self):
+                return list(self)
+        return _Vec([0.1, 0.2, 0.3])
+
+
+class _VectorBackend:
+    def search_similar(self, query_vector, n_results, collection=None):
+        time.sleep(BACKEND_DELAY)
+        return [{"id": f"v{i}", "distance": 0.1 * i, "content": "vec"} for i in range(3)]
+
+
+class _GraphBackend:
+    def __init__(self, delay=BACKEND_DELAY):
+        self.delay = delay
+
+    def execute_query(self, cypher, params=None):
+        time.sleep(self.delay)
+        return [{"d": {"document_id": "g1", "content": "graph"}, "related_docs": []},
+                {"d": {"document_id": "v1", "content": "graph"}, "related_docs": []}]
+
+
+class _RelationalBackend:
+    def fulltext_search(self, query_text, top_k, table, language):
+        time.sleep(BACKEND_DELAY)
+        return [{"document_id": "k1", "snippet": "kw", "score": 0.9},
+                {"document_id": "v0", "snippet": "kw", "score": 0.5}]
+
+
+class _Strategy:
+    def __init__(self, graph_delay=BACKEND_DELAY):
+        self.vector_backend = _VectorBackend()
+        self.graph_backend = _GraphBackend(graph_delay)
+        self.relational_backend = _RelationalBackend()
+
+
+def _api(graph_delay=BACKEND_DELAY) -> UDS3SearchAPI:
+    api = UDS3SearchAPI(_Strategy(graph_delay))
+    api._embedding_model = _FakeModel()
+    return api
+
+
+def test_sources_run_concurrently():
+    """Latenz entspricht max(sources) statt sum(sources)"""
+    api = _api()
+    query = SearchQuery(query_text="Abstandsflächen", top_k=5)
+
+    start = time.perf_counter()
+    results = asyncio.run(api.hybrid_search(query))
+    elapsed = time.perf_counter() - start
+
+    assert isinstance(results, HybridSearchResults)
+    assert set(results.source_latencies_ms) == {"vector", "graph", "keyword"}
+    assert elapsed < 3 * BACKEND_DELAY
+    assert results.retrieval_ms < sum(results.source_latencies_ms.values())
+    assert not results.partial
+    assert {r.document_id for r in results} >= {"v0", "v1", "g1", "k1"}
+
+
+def test_event_loop_is_not_blocked():
+    """Der Event-Loop bleibt während der Suche reaktionsfähig"""
+    api = _api()
+    ticks = []
+
+    async def ticker():
+        for _ in range(10):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.02)
+
+    async def main():
+        await asyncio.gather(
+            api.hybrid_search(SearchQuery(query_text="LBO", top_k=5)),
+            ticker()
+        )
+
+    asyncio.run(main())
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])]
+    assert max(gaps) < BACKEND_DELAY
+
+
+def test_late_source_yields_partial_result():
+    """Eine zu langsame Quelle wird verworfen, die übrigen werden fusioniert"""
+    api = _api(graph_delay=1.0)
+    query = SearchQuery(query_text="LBO", top_k=10, source_timeouts={"graph": 0.1})
+
+    async def main():
+        start = time.perf_counter()
+        results = await api.hybrid_search(query)
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(main())
+
+    assert elapsed < 1.0
+    assert results.partial
+    assert results.timed_out_sources == ["graph"]
+    assert "g1" not in {r.document_id for r in results}
+    assert {"v0", "k1"} <= {r.document_id for r in results}
+
+
+def test_deadline_for_defaults():
+    query = SearchQuery(query_text="x", source_timeout=1.5, source_timeouts={"graph": 0.2})
+    assert query.deadline_for("graph") == 0.2
+    assert query.deadline_for("vector") == 1.5
+    assert SearchQuery(query_text="x").deadline_for("keyword") is None
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_postgres_copy_load.py
+
+Tests für den COPY-Bulk-Load Modus von PostgreSQLBatchInserter
+(COPY FROM STDIN → Staging, set-basierter Merge, Streaming mit begrenztem Speicher)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.batch_operations import PostgreSQLBatchInserter
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append(" ".join(sql.split()))
+        if sql.lstrip().startswith("INSERT INTO documents"):
+            # Merge: letzte Zeile pro document_id gewinnt
+            for row in self.conn.staging:
+                self.conn.table[row[0]] = row
+
+    def copy_expert(self, sql, buffer):
+        if self.conn.fail_copy:
+            raise RuntimeError("COPY failed")
+        self.conn.statements.append(sql)
+        for line in buffer.read().splitlines():
+            values = [None if v == "\\N" else v.replace("\\t", "\t").replace("\\n", "\n")
+                      for v in line.split("\t")]
+            self.conn.staging.append(tuple(values))
+        self.conn.max_staged = max(self.conn.max_staged, len(self.conn.staging))
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.table = {}
+        self.staging = []
+        self.statements = []
+        self.commits = 0
+        self.max_staged = 0
+        self.fail_copy = False
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+        self.staging = []  # ON COMMIT DELETE ROWS
+
+    def rollback(self):
+        self.staging = []
+
+
+class _PooledBackend:
+    def __init__(self):
+        self.conn = _FakeConnection()
+        self.checkouts = 0
+        self.single_inserts = []
+
+    def connect(self):
+        return True
+
+    @contextmanager
+    def _get_connection(self):
+        self.checkouts += 1
+        yield self.conn
+
+    def insert_document(self, **kwargs):
+        self.single_inserts.append(kwargs['document_id'])
+
+
+def _rows(n, start=0):
+    for i in range(start, start + n):
+        yield (f"doc{i}", f"/akten/doc{i}.pdf", "bescheid", 1000 + i, 3,
+               "2025-10-01T00:00:00", 0.9, "completed")
+
+
+def test_bulk_load_streams_generator_in_bounded_chunks():
+    backend = _PooledBackend()
+    inserter = PostgreSQLBatchInserter(backend, use_copy=True, copy_chunk_rows=100)
+
+    result = inserter.bulk_load(_rows(1050))
+
+    assert result['rows'] == 1050 and result['chunks'] == 11
+    assert len(backend.conn.table) == 1050
+    assert backend.conn.max_staged == 100
+    assert backend.conn.commits == 11
+    assert backend.checkouts == 1  # eine Pool-Connection für den gesamten Load
+    stats = inserter.get_stats()
+    assert stats['mode'] == 'copy'
+    assert stats['total_rows_written'] == 1050
+    assert stats['rows_per_sec'] > 0
+
+
+def test_merge_is_set_based_and_last_row_wins():
+    backend = _PooledBackend()
+    inserter = PostgreSQLBatchInserter(backend, use_copy=True)
+
+    inserter.bulk_load([
+        {'document_id': 'a', 'file_path': '/a', 'classification': 'alt',
+         'content_length': 1, 'legal_terms_count': 0},
+        {'document_id': 'a', 'file_path': '/a', 'classification': 'neu',
+         'content_length': 2, 'legal_terms_count': 0, 'quality_score': None},
+    ])
+
+    merge = [s for s in backend.conn.statements if s.startswith("INSERT INTO documents")]
+    assert len(merge) == 1
+    assert "DISTINCT ON (document_id)" in merge[0] and "ON CONFLICT (document_id)" in merge[0]
+    assert backend.conn.table['a'][2] == 'neu'
+    assert backend.conn.table['a'][6] is None  # NULL über \N
+    assert backend.conn.table['a'][7] == 'completed'
+
+
+def test_copy_text_escaping():
+    assert PostgreSQLBatchInserter._copy_text(None) == "\\N"
+    assert PostgreSQLBatchInserter._copy_text("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+
+
+def test_flush_uses_pooled_connection_not_shared_cursor():
+    backend = _PooledBackend()
+    backend.cursor = None  # shared cursor darf nicht benutzt werden
+    inserter = PostgreSQLBatchInserter(backend, batch_size=3, use_copy=True)
+
+    for i in range(3):
+        inserter.add(f"doc{i}", f"/doc{i}", "bescheid", 10, 1)
+
+    assert len(backend.conn.table) == 3
+    assert inserter.get_stats()['total_batches'] == 1
+
+
+def test_failed_chunk_falls_back_to_single_inserts():
+    backend = _PooledBackend()
+    backend.conn.fail_copy = True
+    inserter = PostgreSQLBatchInserter(backend, use_copy=True, copy_chunk_rows=2)
+
+    result = inserter.bulk_load(_rows(3))
+
+    assert result['rows'] == 0 and result['fallback_chunks'] == 2
+    assert backend.single_inserts == ['doc0', 'doc1', 'doc2']
+    assert inserter.get_stats()['total_fallbacks'] == 2
+
+
+class _TrackedCursor(_FakeCursor):
+    def copy_expert(self, sql, buffer):
+        self.conn.backend._enter()
+        try:
+            return super().copy_expert(sql, buffer)
+        finally:
+            self.conn.backend._exit()
+
+
+class _LegacyBackend:
+    """Ohne Pool: COPY und Einzel-Inserts teilen sich backend.conn"""
+
+    def __init__(self, fail_copy=False):
+        self.conn = _FakeConnection()
+        self.conn.fail_copy = fail_copy
+        self.conn.backend = self
+        self.conn.cursor = lambda: _TrackedCursor(self.conn)
+        self.single_inserts = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _enter(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+
+    def _exit(self):
+        with self._lock:
+            self.active -= 1
+
+    def connect(self):
+        return True
+
+    def insert_document(self, **kwargs):
+        self._enter()
+        self.single_inserts.append(kwargs['document_id'])
+        self._exit()
+
+
+def _add_concurrently(inserter, n):
+    for i in range(n):
+        inserter.add(f"doc{i}", f"/doc{i}", "bescheid", 10, 1)
+    inserter.close()
+
+
+def test_copy_without_pool_serializes_shared_connection():
+    backend = _LegacyBackend()
+    inserter = PostgreSQLBatchInserter(backend, batch_size=2, use_copy=True,
+                                       background_flush=True, max_in_flight=3)
+    _add_concurrently(inserter, 12)
+
+    assert len(backend.conn.table) == 12
+    assert backend.max_active == 1
+
+
+def test_fallback_inserts_serialize_shared_cursor():
+    backend = _LegacyBackend(fail_copy=True)
+    inserter = PostgreSQLBatchInserter(backend, batch_size=2, use_copy=True,
+                                       background_flush=True, max_in_flight=3)
+    _add_concurrently(inserter, 12)
+
+    assert sorted(backend.single_inserts) == sorted(f"doc{i}" for i in range(12))
+    assert backend.max_active == 1
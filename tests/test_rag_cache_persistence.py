@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_rag_cache_persistence.py
+
+Tests für den SQLite-basierten PersistentRAGCache
+(O(1) Writes, Lazy Loading, TTL, Kompaktierung, Legacy-Migration)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+from uds3.core.rag_cache import PersistentRAGCache, RAGCache
+
+
+def _put(cache, query, answer="Antwort", **kwargs):
+    cache.put(query=query, answer=answer, confidence=0.8, sources=[{"id": "d1"}],
+              query_type="GENERAL", **kwargs)
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    created = []
+
+    def _make(**kwargs):
+        kwargs.setdefault("compaction_interval_seconds", 0)
+        cache = PersistentRAGCache(cache_dir=str(tmp_path / "rag"), **kwargs)
+        created.append(cache)
+        return cache
+    yield _make
+    for cache in created:
+        cache.close()
+
+
+def test_reopen_loads_lazily(make_cache):
+    first = make_cache(max_size=10)
+    for i in range(5):
+        _put(first, f"Frage {i}", f"Antwort {i}")
+    first.close()
+
+    second = make_cache(max_size=10)
+    assert second.get_stats()["size"] == 0  # nichts vorab geladen
+    assert second.get_stats()["disk_entries"] == 5
+
+    assert second.get("Frage 3")["answer"] == "Antwort 3"
+    stats = second.get_stats()
+    assert stats["size"] == 1 and stats["disk_reads"] == 1
+
+
+def test_memory_eviction_keeps_disk_entry(make_cache):
+    cache = make_cache(max_size=2)
+    for i in range(4):
+        _put(cache, f"Frage {i}")
+
+    assert cache.get_stats()["size"] == 2
+    assert cache.get("Frage 0") is not None  # von Disk nachgeladen
+
+
+def test_expired_entries_are_not_loaded_and_compacted(make_cache):
+    cache = make_cache(max_size=10)
+    _put(cache, "alt")
+    _put(cache, "neu")
+    cache._cache.clear()
+
+    with cache._db_lock:
+        cache._connection().execute(
+            "UPDATE entries SET expires_at = ? WHERE key = ?",
+            (time.time() - 1, RAGCache._generate_cache_key("alt"))
+        )
+
+    assert cache.get("alt") is None
+    assert cache.compact() == {"expired": 1, "trimmed": 0}
+    assert cache.get_stats()["disk_entries"] == 1
+
+
+def test_compaction_trims_to_max_disk_entries(make_cache):
+    cache = make_cache(max_size=5, max_disk_entries=3)
+    for i in range(6):
+        _put(cache, f"Frage {i}")
+
+    assert cache.compact()["trimmed"] == 3
+    cache._cache.clear()
+    assert cache.get("Frage 5") is not None
+    assert cache.get("Frage 0") is None
+
+
+def test_preload_and_semantic_embeddings_survive_restart(make_cache):
+    vectors = {"abstandsflächen lbo": [1.0, 0.0], "lbo abstandsfläche": [0.99, 0.05]}
+
+    def embed(text):
+        return np.array(vectors[text])
+
+    first = make_cache(max_size=10, embedding_fn=embed, semantic_threshold=0.95)
+    _put(first, "Abstandsflächen LBO", "2,5 m")
+    first.close()
+
+    second = make_cache(max_size=10, embedding_fn=embed, semantic_threshold=0.95, preload_entries=10)
+    assert second.get_stats()["semantic_entries"] == 1
+    assert second.get("LBO Abstandsfläche")["answer"] == "2,5 m"
+    assert second.get_stats()["semantic_hits"] == 1
+
+
+def test_legacy_json_is_migrated(tmp_path, make_cache):
+    cache_dir = tmp_path / "rag"
+    cache_dir.mkdir()
+    key = RAGCache._generate_cache_key("Legacy Frage")
+    legacy = {key: {"answer": "alt", "confidence": 0.5, "sources": [], "query_type": "GENERAL",
+                    "timestamp": time.time(), "ttl_minutes": 60}}
+    (cache_dir / "rag_cache.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    cache = make_cache()
+
+    assert cache.get("Legacy Frage")["answer"] == "alt"
+    assert not (cache_dir / "rag_cache.json").exists()
+    assert (cache_dir / "rag_cache.json.migrated").exists()
+
+
+def test_clear_removes_database_files(tmp_path, make_cache):
+    cache = make_cache()
+    _put(cache, "Frage")
+    cache.clear()
+
+    assert list((tmp_path / "rag").iterdir()) == []
+    _put(cache, "Frage 2")  # Datenbank wird neu angelegt
+    assert cache.get_stats()["disk_entries"] == 1
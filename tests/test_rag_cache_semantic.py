@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_rag_cache_semantic.py
+
+Tests für die semantische Stufe des RAGCache
+(Nearest Neighbor über Query-Embeddings, Schwellwert, exakte vs. semantische Treffer)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import numpy as np
+import pytest
+
+from uds3.core.rag_cache import RAGCache
+
+# Handverlesene Embeddings: Paraphrasen liegen dicht beieinander
+VECTORS = {
+    "abstandsflächen lbo § 58": [1.0, 0.1, 0.0, 0.0],
+    "§58 lbo abstandsfläche": [0.98, 0.15, 0.02, 0.0],
+    "gebühren baugenehmigung": [0.0, 0.0, 1.0, 0.1],
+    "stellplatzpflicht": [0.6, 0.0, 0.0, 0.8],
+    "abstandsflächen nach lbo": [0.95, 0.25, 0.05, 0.0],
+}
+
+
+class _Embedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return np.array(VECTORS[text])
+
+
+def _put(cache, query, answer, **kwargs):
+    cache.put(query=query, answer=answer, confidence=0.9, sources=[],
+              query_type="GENERAL", **kwargs)
+
+
+@pytest.fixture
+def cache():
+    return RAGCache(max_size=10, embedding_fn=_Embedder(), semantic_threshold=0.95)
+
+
+def test_paraphrase_hits_semantic_tier(cache):
+    _put(cache, "Abstandsflächen LBO § 58", "2,5 m")
+
+    exact = cache.get("Abstandsflächen LBO § 58")
+    paraphrase = cache.get("§58 LBO Abstandsfläche")
+
+    assert exact["answer"] == "2,5 m" and "semantic_similarity" not in exact
+    assert paraphrase["answer"] == "2,5 m"
+    assert paraphrase["semantic_similarity"] >= 0.95
+
+    stats = cache.get_stats()
+    assert stats["exact_hits"] == 1
+    assert stats["semantic_hits"] == 1
+    assert stats["hits"] == 2
+
+
+def test_below_threshold_misses(cache):
+    _put(cache, "Abstandsflächen LBO § 58", "2,5 m")
+    assert cache.get("Stellplatzpflicht") is None
+    assert cache.get("Gebühren Baugenehmigung") is None
+    assert cache.get_stats()["misses"] == 2
+
+
+def test_context_params_must_match(cache):
+    _put(cache, "Abstandsflächen LBO § 58", "BW", context_params={"land": "BW"})
+    assert cache.get("§58 LBO Abstandsfläche", {"land": "BY"}) is None
+    assert cache.get("§58 LBO Abstandsfläche", {"land": "BW"})["answer"] == "BW"
+
+
+def test_eviction_and_expiry_remove_embeddings():
+    cache = RAGCache(max_size=2, embedding_fn=_Embedder(), semantic_threshold=0.95)
+    _put(cache, "Abstandsflächen LBO § 58", "a")
+    _put(cache, "Gebühren Baugenehmigung", "b")
+    _put(cache, "Stellplatzpflicht", "c")  # verdrängt "Abstandsflächen"
+
+    assert cache.get_stats()["semantic_entries"] == 2
+    assert cache.get("§58 LBO Abstandsfläche") is None
+
+    cache._cache[RAGCache._generate_cache_key("Stellplatzpflicht")].ttl_minutes = 0
+    assert cache.remove_expired() == 1
+    assert cache.get_stats()["semantic_entries"] == 1
+
+    cache.clear()
+    assert cache.get_stats()["semantic_entries"] == 0
+
+
+def test_expired_best_match_falls_through_to_next_candidate(cache):
+    _put(cache, "Abstandsflächen LBO § 58", "alt")
+    _put(cache, "Abstandsflächen nach LBO", "neu")
+    cache._cache[RAGCache._generate_cache_key("Abstandsflächen LBO § 58")].ttl_minutes = 0
+
+    result = cache.get("§58 LBO Abstandsfläche")
+
+    assert result["answer"] == "neu"
+    assert cache.get_stats()["expired"] == 1
+
+
+def test_context_ids_are_released_with_their_last_entry():
+    cache = RAGCache(max_size=2, embedding_fn=_Embedder(), semantic_threshold=0.95)
+    for land in ("BW", "BY", "NW", "HE", "SN"):
+        _put(cache, "Abstandsflächen LBO § 58", land, context_params={"land": land})
+
+    index = cache._semantic_index
+    assert len(index._context_ids) == 2
+    assert cache.get("§58 LBO Abstandsfläche", {"land": "SN"})["answer"] == "SN"
+    assert cache.get("§58 LBO Abstandsfläche", {"land": "BW"}) is None
+
+    cache.clear()
+    assert not index._context_ids
+
+
+def test_precomputed_embedding_skips_embedding_fn(cache):
+    embedding = cache.embed_query("§58 LBO Abstandsfläche")
+    _put(cache, "Abstandsflächen LBO § 58", "2,5 m")
+    calls_before = len(cache.embedding_fn.calls)
+
+    result = cache.get("§58 LBO Abstandsfläche", query_embedding=embedding)
+
+    assert result["answer"] == "2,5 m"
+    assert len(cache.embedding_fn.calls) == calls_before
+
+
+def test_embedding_error_falls_back_to_exact():
+    def broken(_):
+        raise RuntimeError("model offline")
+
+    cache = RAGCache(embedding_fn=broken)
+    _put(cache, "Frage", "Antwort")
+
+    assert cache.get("Frage")["answer"] == "Antwort"
+    assert cache.get("Andere Frage") is None
+    assert cache.get_stats()["embedding_errors"] == 1
+
+
+def test_without_embedding_fn_is_exact_only():
+    cache = RAGCache()
+    _put(cache, "Abstandsflächen LBO § 58", "2,5 m")
+    assert cache.get("§58 LBO Abstandsfläche") is None
+    assert cache.get_stats()["semantic_enabled"] is False
+    assert "query_embedding" not in cache.get("Abstandsflächen LBO § 58")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_rag_concurrency.py
+
+Tests für den nebenläufigen Multi-DB Executor der Async-RAG-Pipeline
+(gemeinsames Scheduling, globale/per-Backend Limits, Timeouts, Timings)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import uds3.core.rag_async as rag_async
+from uds3.core.rag_concurrency import ConcurrencyLimits, MultiDBExecutor
+
+DB_DELAY = 0.2
+
+
+class _FakeRAG:
+    """Ersetzt UDS3GenericRAG: blockierende Suche mit fester Latenz"""
+
+    def __init__(self, *args, **kwargs):
+        self.delays = {}
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def semantic_search(self, query, target_database, top_k):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(target_database, DB_DELAY))
+            return {"results": [{"db": target_database, "rank": i} for i in range(top_k)]}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def answer_query(self, query, domain=None):
+        time.sleep(0.01)
+        return {"answer": query.upper(), "confidence": 0.9, "sources": [],
+                "query_type": rag_async.QueryType.GENERAL,
+                "database_timings": {"vector": {"execution_ms": len(query), "result_count": 1}}}
+
+    def get_stats(self):
+        return {}
+
+
+@pytest.fixture
+def async_rag(monkeypatch):
+    monkeypatch.setattr(rag_async, "UDS3GenericRAG", _FakeRAG)
+
+    def _create(**kwargs):
+        return rag_async.UDS3AsyncRAG(None, None, None, enable_cache=False, **kwargs)
+    created = []
+    yield lambda **kwargs: created.append(_create(**kwargs)) or created[-1]
+    for rag in created:
+        rag.shutdown()
+
+
+def test_databases_overlap(async_rag):
+    """Drei DBs laufen parallel: Gesamtzeit ~ max statt Summe"""
+    rag = async_rag(max_workers=4)
+
+    async def main():
+        start = time.perf_counter()
+        results, timings = await rag.multi_db_search_with_timings(
+            "Bauantrag", ["chromadb", "neo4j", "sqlite"], top_k=2
+        )
+        return results, timings, time.perf_counter() - start
+
+    results, timings, elapsed = asyncio.run(main())
+
+    assert set(results) == {"chromadb", "neo4j", "sqlite"}
+    assert all(len(r) == 2 for r in results.values())
+    assert elapsed < 2 * DB_DELAY
+    assert set(timings) == set(results)
+    assert all(t.status == "ok" for t in timings.values())
+
+
+def test_global_limit_is_enforced(async_rag):
+    """Nie mehr als global_limit gleichzeitige Backend-Aufrufe"""
+    limits = ConcurrencyLimits(global_limit=2, per_backend_limit=2)
+    rag = async_rag(concurrency_limits=limits)
+
+    _, timings = asyncio.run(rag.multi_db_search_with_timings("q", [f"db{i}" for i in range(6)], top_k=1))
+
+    assert rag.rag.max_active == 2
+    waits = [t.queue_wait_ms for t in timings.values()]
+    assert max(waits) >= DB_DELAY * 1000 * 0.9  # letzte Welle musste warten
+
+
+def test_timeout_reports_partial_results(async_rag):
+    """Langsame DB wird nach Timeout abgebrochen, andere DBs liefern"""
+    rag = async_rag(max_workers=4)
+    rag.rag.delays["slow"] = 1.0
+
+    async def main():
+        start = time.perf_counter()
+        results, timings = await rag.multi_db_search_with_timings(
+            "q", ["fast", "slow"], top_k=1, timeout=0.3
+        )
+        return results, timings, time.perf_counter() - start
+
+    results, timings, elapsed = asyncio.run(main())
+
+    assert elapsed < 0.8
+    assert results["slow"] == []
+    assert len(results["fast"]) == 1
+    assert timings["slow"].status == "timeout"
+    assert rag.get_stats()["db_timeouts"] == 1
+
+
+def test_per_backend_limit():
+    """Per-Backend Limit begrenzt Parallelität pro DB unabhängig vom globalen Limit"""
+    active = {"n": 0, "max": 0}
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            active["n"] += 1
+            active["max"] = max(active["max"], active["n"])
+        time.sleep(0.05)
+        with lock:
+            active["n"] -= 1
+        return [1]
+
+    limits = ConcurrencyLimits(global_limit=8, per_backend_limit=1)
+    pool = ThreadPoolExecutor(max_workers=8)
+    executor = MultiDBExecutor(pool, limits)
+
+    async def main():
+        return await asyncio.gather(*(executor.run("neo4j", call) for _ in range(4)))
+
+    outcomes = asyncio.run(main())
+    pool.shutdown()
+
+    assert active["max"] == 1
+    assert all(timing.status == "ok" for _, timing in outcomes)
+
+
+def test_timeout_keeps_slots_until_thread_finishes():
+    """Nach Timeout bleiben die Semaphoren belegt, bis der Worker-Thread endet"""
+    release = threading.Event()
+    started = {"n": 0}
+    lock = threading.Lock()
+
+    def hang():
+        with lock:
+            started["n"] += 1
+        release.wait(5)
+        return [1]
+
+    limits = ConcurrencyLimits(global_limit=8, per_backend_limit=2)
+    pool = ThreadPoolExecutor(max_workers=6)
+    executor = MultiDBExecutor(pool, limits)
+
+    async def main():
+        outcomes = await asyncio.gather(
+            *(executor.run("hung", hang, timeout=0.1) for _ in range(2))
+        )
+        _, backend_sem = executor._semaphores("hung")
+        occupied_after_timeout = backend_sem._value
+        # Weitere Aufrufe desselben Backends dürfen keine Threads binden
+        blocked = asyncio.ensure_future(executor.run("hung", hang, timeout=None))
+        await asyncio.sleep(0.1)
+        started_while_hung = started["n"]
+        release.set()
+        await blocked
+        await asyncio.sleep(0.05)
+        return outcomes, occupied_after_timeout, started_while_hung, backend_sem._value
+
+    outcomes, occupied, started_while_hung, free_at_end = asyncio.run(main())
+    pool.shutdown()
+
+    assert all(timing.status == "timeout" for _, timing in outcomes)
+    assert occupied == 0
+    assert started_while_hung == 2
+    assert free_at_end == 2
+
+
+def test_batch_query_is_bounded(async_rag):
+    """batch_query_async liefert alle Ergebnisse trotz begrenzter In-Flight-Anzahl"""
+    limits = ConcurrencyLimits(global_limit=2, max_inflight_queries=3)
+    rag = async_rag(concurrency_limits=limits)
+
+    results = asyncio.run(rag.batch_query_async([f"frage {i}" for i in range(10)]))
+
+    assert [r.answer for r in results] == [f"FRAGE {i}" for i in range(10)]
+    assert all(r.pipeline_timing.database == "rag_pipeline" for r in results)
+    # Timings pro DB gehören zum jeweiligen Lauf
+    assert [r.database_timings["vector"].execution_ms for r in results] == [len(f"frage {i}") for i in range(10)]
+
+
+def test_caller_limits_are_not_mutated(async_rag):
+    limits = ConcurrencyLimits(global_limit=2, per_backend_overrides={"neo4j": 1})
+    rag = async_rag(concurrency_limits=limits)
+
+    assert limits.per_backend_overrides == {"neo4j": 1}
+    assert rag.limits.limit_for("rag_pipeline") == 2
+    assert rag.limits.limit_for("neo4j") == 1
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_reranker_cascade.py
+
+Tests für CrossEncoderReranker: Pair-Score-Cache, Cascade Early-Exit
+und First-Pass Pruning (search/reranker.py)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import asyncio
+
+import pytest
+
+import uds3.search.reranker as reranker_module
+from uds3.search.reranker import CrossEncoderReranker, PairScoreCache, RerankerConfig
+
+
+class _FakeCrossEncoder:
+    """Score = Zahl am Ende des Dokuments; zählt bewertete Paare"""
+
+    def __init__(self, model_name, **kwargs):
+        self.model_name = model_name
+        self.predicted = []
+
+    def predict(self, pairs, batch_size=32, show_progress_bar=False):
+        self.predicted.extend(doc for _, doc in pairs)
+        return [float(doc.rsplit(" ", 1)[-1]) for _, doc in pairs]
+
+
+@pytest.fixture(autouse=True)
+def fake_cross_encoder(monkeypatch):
+    monkeypatch.setattr(reranker_module, "CROSS_ENCODER_AVAILABLE", True)
+    monkeypatch.setattr(reranker_module, "CrossEncoder", _FakeCrossEncoder, raising=False)
+
+
+def _candidates(scores):
+    return [{"id": i, "content": f"doc{i} {score}"} for i, score in enumerate(scores)]
+
+
+def test_pair_scores_are_cached():
+    reranker = CrossEncoderReranker()
+    docs = ["a 1", "b 2", "c 3"]
+
+    assert reranker.get_scores("q", docs) == [1.0, 2.0, 3.0]
+    assert reranker.get_scores("q", docs + ["d 4"]) == [1.0, 2.0, 3.0, 4.0]
+
+    assert reranker.model.predicted == ["a 1", "b 2", "c 3", "d 4"]
+    cache_stats = reranker.get_stats()["score_cache"]
+    assert cache_stats["hits"] == 3 and cache_stats["size"] == 4
+
+    reranker.get_scores("andere Query", ["a 1"])
+    assert reranker.model.predicted[-1] == "a 1"  # Query ist Teil des Keys
+
+
+def test_cache_is_bounded():
+    cache = PairScoreCache(max_size=2)
+    keys = [("m", b"q", bytes([i])) for i in range(3)]
+    cache.put_many(keys, [0.1, 0.2, 0.3])
+
+    assert len(cache) == 2
+    assert cache.get_many(keys) == [None, 0.2, 0.3]
+
+
+def test_cascade_stops_when_top_k_is_stable():
+    config = RerankerConfig(cascade=True, cascade_chunk_size=4, cascade_margin=1.0)
+    reranker = CrossEncoderReranker(config)
+    # Erste Stufe hat gut sortiert: die besten Dokumente stehen vorne
+    candidates = _candidates([9, 8, 7, 6, 2, 1, 1, 0, 5, 5, 5, 5])
+
+    reranked = asyncio.run(reranker.rerank("q", candidates, top_k=3))
+
+    assert [c["id"] for c in reranked] == [0, 1, 2]
+    assert len(reranker.model.predicted) == 8  # dritter Chunk nicht bewertet
+    stats = reranker.get_stats()
+    assert stats["cascade_early_exits"] == 1
+    assert stats["cascade_pairs_skipped"] == 4
+
+
+def test_cascade_continues_while_chunks_compete():
+    config = RerankerConfig(cascade=True, cascade_chunk_size=2, cascade_margin=0.5)
+    reranker = CrossEncoderReranker(config)
+    candidates = _candidates([1, 2, 3, 4, 5, 6])
+
+    reranked = asyncio.run(reranker.rerank("q", candidates, top_k=2))
+
+    assert [c["id"] for c in reranked] == [5, 4]
+    assert reranker.get_stats()["cascade_early_exits"] == 0
+
+
+def test_first_pass_prunes_before_main_model():
+    fast = CrossEncoderReranker(RerankerConfig(model_name="fast"))
+    main = CrossEncoderReranker(RerankerConfig(model_name="main", first_pass_multiplier=2), first_pass=fast)
+    candidates = _candidates([3, 9, 1, 7, 5, 2, 8, 4])
+
+    reranked = asyncio.run(main.rerank("q", candidates, top_k=2))
+
+    assert [c["id"] for c in reranked] == [1, 6]
+    assert len(fast.model.predicted) == 8
+    assert len(main.model.predicted) == 4
+    assert main.get_stats()["first_pass_pruned"] == 4
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_single_flight.py
+
+Tests für Single-Flight Request Coalescing (core/single_flight.py)
+sowie dessen Einsatz in UDS3AsyncRAG und UDS3GermanEmbeddings
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import uds3.core.embeddings as embeddings_module
+import uds3.core.rag_async as rag_async
+from uds3.core.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_one_computation(self):
+        flights = SingleFlight()
+        calls = []
+        barrier = threading.Barrier(8)
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "ergebnis"
+
+        def worker():
+            barrier.wait()
+            return flights.do("key", compute)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            outcomes = list(pool.map(lambda _: worker(), range(8)))
+
+        assert len(calls) == 1
+        assert all(result == "ergebnis" for result, _ in outcomes)
+        assert sum(shared for _, shared in outcomes) == 7
+        stats = flights.get_stats()
+        assert stats["leaders"] == 1 and stats["coalesced"] == 7
+        assert stats["in_flight"] == 0
+
+    def test_error_is_shared_and_key_released(self):
+        flights = SingleFlight()
+        owned, _ = flights.claim(["k"])
+        _, waiting = flights.claim(["k"])
+        flights.resolve("k", error=RuntimeError("boom"))
+
+        with pytest.raises(RuntimeError):
+            SingleFlight.wait(waiting["k"])
+        assert flights.do("k", lambda: 42) == (42, False)
+
+    def test_claim_deduplicates_and_splits(self):
+        flights = SingleFlight()
+        owned_a, waiting_a = flights.claim(["a", "b", "a"])
+        owned_b, waiting_b = flights.claim(["b", "c"])
+
+        assert owned_a == ["a", "b"] and not waiting_a
+        assert owned_b == ["c"] and list(waiting_b) == ["b"]
+
+
+class TestAsyncSingleFlight:
+
+    def test_coalesces_and_survives_caller_cancel(self):
+        flights = AsyncSingleFlight()
+        runs = []
+
+        async def compute():
+            runs.append(1)
+            await asyncio.sleep(0.05)
+            return "antwort"
+
+        async def main():
+            first = asyncio.ensure_future(flights.do("q", compute))
+            await asyncio.sleep(0)
+            others = [asyncio.ensure_future(flights.do("q", compute)) for _ in range(3)]
+            await asyncio.sleep(0)
+            first.cancel()  # Abbruch eines Aufrufers stoppt die Berechnung nicht
+            return await asyncio.gather(*others)
+
+        outcomes = asyncio.run(main())
+        assert runs == [1]
+        assert outcomes == [("antwort", True)] * 3
+        assert flights.get_stats()["coalesced"] == 3
+
+
+class _CountingRAG:
+    """Ersetzt UDS3GenericRAG: zählt Pipeline-Läufe"""
+
+    def __init__(self, *args, **kwargs):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def answer_query(self, query, domain=None):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.1)
+        return {"answer": query.upper(), "confidence": 0.9, "sources": [],
+                "query_type": rag_async.QueryType.GENERAL}
+
+    def get_stats(self):
+        return {}
+
+
+@pytest.mark.parametrize("enable_cache", [True, False])
+def test_async_rag_coalesces_identical_queries(monkeypatch, enable_cache):
+    monkeypatch.setattr(rag_async, "UDS3GenericRAG", _CountingRAG)
+    rag = rag_async.UDS3AsyncRAG(None, None, None, max_workers=8, enable_cache=enable_cache)
+
+    async def main():
+        return await asyncio.gather(
+            *(rag.answer_query_async("Wie hoch ist die Gebühr?") for _ in range(10)),
+            rag.answer_query_async("Andere Frage")
+        )
+
+    results = asyncio.run(main())
+    rag.shutdown()
+
+    assert rag.rag.calls == 2
+    assert [r.answer for r in results[:10]] == ["WIE HOCH IST DIE GEBÜHR?"] * 10
+    assert sum(r.coalesced for r in results) == 9
+    stats = rag.get_stats()
+    assert stats["coalesced_requests"] == 9
+    assert stats["single_flight_stats"]["leaders"] == 2
+
+
+class _FakeSentenceTransformer:
+    """Ersetzt SentenceTransformer: langsames, deterministisches Encoding"""
+
+    def __init__(self, *args, **kwargs):
+        self.encoded = []
+        self._lock = threading.Lock()
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        with self._lock:
+            self.encoded.extend(batch)
+        time.sleep(0.1)
+        vectors = np.array([[len(t), 1.0, 0.0, 0.0] for t in batch], dtype=np.float32)
+        return vectors[0] if single else vectors
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    monkeypatch.setattr(embeddings_module, "SENTENCE_TRANSFORMERS_AVAILABLE", True)
+    monkeypatch.setattr(embeddings_module, "SentenceTransformer", _FakeSentenceTransformer, raising=False)
+    return embeddings_module.UDS3GermanEmbeddings(use_disk_cache=False)
+
+
+def test_embed_text_coalesces(embedder):
+    barrier = threading.Barrier(6)
+
+    def worker(_):
+        barrier.wait()
+        return embedder.embed_text("Baugenehmigung")
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        vectors = list(pool.map(worker, range(6)))
+
+    assert embedder.model.encoded == ["Baugenehmigung"]
+    assert all(np.array_equal(v, vectors[0]) for v in vectors)
+    stats = embedder.get_stats()
+    assert stats["embeddings_generated"] == 1
+    assert stats["coalesced_requests"] == 5
+
+
+def test_embed_batch_waits_for_inflight_text(embedder):
+    started = threading.Event()
+
+    def single():
+        started.set()
+        return embedder.embed_text("Bauantrag")
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(single)
+        started.wait()
+        time.sleep(0.02)  # embed_text hält den Flight für "Bauantrag"
+        matrix = embedder.embed_batch(["Bauantrag", "Statik", "Statik"], show_progress_bar=False)
+        future.result()
+
+    assert sorted(embedder.model.encoded) == ["Bauantrag", "Statik"]
+    assert matrix.shape == (3, 4)
+    np.testing.assert_array_equal(matrix[1], matrix[2])
+    assert embedder.get_stats()["coalesced_requests"] == 1
@@ -31,14 +31,16 @@ import threading
 from datetime import datetime
 from typing import Dict, Any
 
-from uds3_single_record_cache import (
+from core.cache import (
     SingleRecordCache,
+    ShardedSingleRecordCache,
     CacheEntry,
     CacheStatistics,
     CacheConfig,
     CacheStatus,
     InvalidationStrategy,
-    create_single_record_cache
+    create_single_record_cache,
+    estimate_size
 )
 
 
@@ -784,6 +786,137 @@ class TestPerformance:
         assert duration < 0.1  # Should be fast
 
 
+# ============================================================================
+# TEST: SHARDED CACHE
+# ============================================================================
+
+@pytest.fixture
+def sharded_cache():
+    """Erstellt einen Sharded Cache mit 4 Segmenten"""
+    config = CacheConfig(
+        max_size=40,
+        default_ttl_seconds=10.0,
+        auto_cleanup_interval=0.0
+    )
+    cache = ShardedSingleRecordCache(config, num_shards=4)
+    yield cache
+    cache.stop()
+
+
+class TestShardedCache:
+    """Tests für ShardedSingleRecordCache"""
+    
+    def test_put_and_get(self, sharded_cache, sample_document):
+        """Test Put/Get über mehrere Segmente"""
+        for i in range(20):
+            sharded_cache.put(f"doc{i}", sample_document)
+        
+        for i in range(20):
+            assert sharded_cache.get(f"doc{i}") == sample_document
+        assert sharded_cache.get("missing") is None
+        
+        stats = sharded_cache.get_statistics()
+        assert stats.hits == 20
+        assert stats.misses == 1
+        assert stats.total_size_bytes > 0
+    
+    def test_get_many_preserves_order(self, sharded_cache):
+        """Test get_many liefert Eingabereihenfolge"""
+        sharded_cache.put_many({f"doc{i}": {"n": i} for i in range(10)})
+        
+        ids = [f"doc{i}" for i in reversed(range(12))]
+        results = sharded_cache.get_many(ids)
+        
+        assert list(results.keys()) == ids
+        assert results["doc3"] == {"n": 3}
+        assert results["doc11"] is None
+    
+    def test_invalidate_pattern_all_shards(self, sharded_cache):
+        """Test Pattern-Invalidierung über alle Segmente"""
+        for i in range(10):
+            sharded_cache.put(f"user_{i}", {"n": i})
+            sharded_cache.put(f"post_{i}", {"n": i})
+        
+        assert sharded_cache.invalidate_pattern(r"^user_") == 10
+        assert sharded_cache.get("user_1") is None
+        assert sharded_cache.get("post_1") is not None
+    
+    def test_capacity_is_bounded(self):
+        """Test max_size wird auf Segmente verteilt"""
+        config = CacheConfig(max_size=8, auto_cleanup_interval=0.0)
+        cache = ShardedSingleRecordCache(config, num_shards=4)
+        
+        for i in range(100):
+            cache.put(f"doc{i}", {"n": i})
+        
+        info = cache.get_info()
+        assert info["current_size"] <= 8
+        assert len(info["shard_sizes"]) == 4
+        assert cache.get_statistics().evictions >= 92
+        cache.stop()
+    
+    def test_concurrent_access(self, sharded_cache, sample_document):
+        """Test Thread-Safety bei parallelem Zugriff"""
+        errors = []
+        
+        def worker(offset):
+            try:
+                for i in range(200):
+                    doc_id = f"doc{(offset + i) % 30}"
+                    sharded_cache.put(doc_id, sample_document)
+                    sharded_cache.get(doc_id)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert not errors
+        assert sharded_cache.get_statistics().total_requests == 8 * 200
+    
+    def test_factory_returns_sharded(self):
+        """Test Factory mit num_shards > 1"""
+        cache = create_single_record_cache(max_size=100, enable_auto_cleanup=False, num_shards=8)
+        assert isinstance(cache, ShardedSingleRecordCache)
+        assert cache.num_shards == 8
+        cache.stop()
+    
+    def test_invalid_shard_count(self):
+        """Test ungültige Segmentanzahl"""
+        with pytest.raises(ValueError):
+            ShardedSingleRecordCache(CacheConfig(auto_cleanup_interval=0.0), num_shards=0)
+
+
+class TestBookkeeping:
+    """Tests für O(1) Statistik und Größenschätzung"""
+    
+    def test_access_time_window_is_bounded(self, cache):
+        """Test gleitendes Fenster für average_access_time_ms"""
+        for i in range(SingleRecordCache.ACCESS_TIME_WINDOW + 50):
+            cache.get(f"doc{i}")
+        
+        assert len(cache._access_times) == SingleRecordCache.ACCESS_TIME_WINDOW
+        expected = sum(cache._access_times) / len(cache._access_times)
+        stats = cache.get_statistics()
+        assert stats.average_access_time_ms == pytest.approx(expected)
+    
+    def test_estimate_size_grows_with_content(self):
+        """Test Größenschätzung skaliert mit dem Inhalt"""
+        small = estimate_size({"title": "a"})
+        large = estimate_size({"title": "a" * 10000})
+        assert large > small
+        assert large >= 10000
+    
+    def test_estimate_size_extrapolates_large_lists(self):
+        """Test große Listen werden hochgerechnet statt traversiert"""
+        embedding = [0.1] * 100000
+        size = estimate_size({"embedding": embedding})
+        assert size >= 100000 * 8
+
+
 # ============================================================================
 # RUN TESTS
 # ============================================================================
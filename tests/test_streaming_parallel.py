@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_streaming_parallel.py
+
+Parallele Chunk-Transfers des StreamingManager (manager/streaming.py)
+gegen das echte FileSystemStorageBackend (Roundtrip, Parallelität, Resume, Rollback)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.database_api_file_storage import FileSystemStorageBackend
+from manager.streaming import (
+    ChunkMetadataCorruptError,
+    StorageBackendError,
+    StreamingManager,
+    StreamingStatus,
+)
+
+CHUNK = 64 * 1024
+
+
+class SlowStorage(FileSystemStorageBackend):
+    """Dateisystem-Backend mit Latenz pro Chunk und Zählung paralleler Transfers"""
+
+    def __init__(self, config, delay=0.02, fail_on=None):
+        super().__init__(config)
+        self.delay = delay
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak = 0
+        self._guard = threading.Lock()
+
+    def put_stream_chunk(self, stream_id, chunk_index, data):
+        with self._guard:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if chunk_index == self.fail_on:
+                raise IOError('disk full')
+            return super().put_stream_chunk(stream_id, chunk_index, data)
+        finally:
+            with self._guard:
+                self.active -= 1
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / 'source.bin'
+    path.write_bytes(os.urandom(CHUNK * 20 + 123))
+    return path
+
+
+def make_storage(tmp_path, **kwargs):
+    storage = SlowStorage({'root_path': str(tmp_path / 'assets')}, **kwargs)
+    assert storage.connect()
+    return storage
+
+
+def test_roundtrip_through_file_storage(tmp_path, source_file):
+    storage = make_storage(tmp_path, delay=0)
+    manager = StreamingManager(storage_backend=storage, chunk_size=CHUNK, max_concurrent_transfers=4)
+    updates = []
+
+    op_id = manager.upload_large_file(str(source_file), 'documents/source.bin',
+                                      progress_callback=lambda p: updates.append(p.current_chunk))
+
+    chunks = manager.get_operation_chunks(op_id)
+    assert [c.chunk_index for c in chunks] == list(range(21))
+    assert updates[:-1] == list(range(1, 22))  # Reihenfolge trotz paralleler Transfers
+    info = storage.get_stream_info('documents/source.bin')
+    assert info['size'] == source_file.stat().st_size and info['chunk_size'] == CHUNK
+    assert info['chunk_hashes'] == [c.chunk_hash for c in chunks]
+
+    output = tmp_path / 'out' / 'copy.bin'
+    down_id = manager.download_large_file('documents/source.bin', str(output), chunk_size=999)
+    assert output.read_bytes() == source_file.read_bytes()
+    assert manager.get_progress(down_id).status == StreamingStatus.COMPLETED
+
+
+def test_transfers_run_concurrently_within_bound(tmp_path, source_file):
+    storage = make_storage(tmp_path, delay=0.02)
+    manager = StreamingManager(storage_backend=storage, chunk_size=CHUNK, max_concurrent_transfers=4)
+
+    start = time.perf_counter()
+    manager.upload_large_file(str(source_file), 'documents/source.bin')
+    elapsed = time.perf_counter() - start
+
+    assert storage.peak == 4
+    assert elapsed < 21 * 0.02 / 2  # seriell wären es >= 0.42s
+
+
+def test_failed_chunk_keeps_contiguous_prefix_for_resume(tmp_path, source_file):
+    storage = make_storage(tmp_path, delay=0.005, fail_on=9)
+    manager = StreamingManager(storage_backend=storage, chunk_size=CHUNK, max_concurrent_transfers=3)
+
+    with pytest.raises(StorageBackendError):
+        manager.upload_large_file(str(source_file), 'documents/source.bin')
+    op_id = manager.list_operations(StreamingStatus.FAILED)[0].operation_id
+    chunks = manager.get_operation_chunks(op_id)
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks))) and len(chunks) <= 9
+    assert manager.get_progress(op_id).transferred_bytes == len(chunks) * CHUNK
+
+    storage.fail_on = None
+    manager.resume_upload(op_id, str(source_file), 'documents/source.bin')
+    output = tmp_path / 'copy.bin'
+    manager.download_large_file('documents/source.bin', str(output))
+    assert output.read_bytes() == source_file.read_bytes()
+
+    result = manager.cleanup_chunks_with_verification(op_id)
+    assert result['deleted_count'] == 21 and result['failed_deletions'] == []
+    assert not storage.stream_chunk_exists('documents/source.bin', 0)
+
+
+def test_download_detects_corrupted_chunk(tmp_path, source_file):
+    storage = make_storage(tmp_path, delay=0)
+    manager = StreamingManager(storage_backend=storage, chunk_size=CHUNK)
+    manager.upload_large_file(str(source_file), 'documents/source.bin')
+
+    storage.put_stream_chunk('documents/source.bin', 5, b'\x00' * CHUNK)
+    with pytest.raises(ChunkMetadataCorruptError):
+        manager.download_large_file('documents/source.bin', str(tmp_path / 'copy.bin'))
+
+
+def test_without_stream_backend_transfers_are_simulated(tmp_path, source_file):
+    manager = StreamingManager(chunk_size=CHUNK)
+    op_id = manager.upload_large_file(str(source_file), 'documents/source.bin')
+    assert manager.get_progress(op_id).transferred_bytes == source_file.stat().st_size
+    assert len(manager.get_operation_chunks(op_id)) == 21
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_streaming_pipeline.py
+
+Embed-and-Index-Pipeline hinter StreamingManager.stream_to_vector_db
+(überlappendes Chunking, Micro-Batches, ChromaBatchInserter, Backpressure, Fehlerpfad)
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from manager.streaming import StreamingManager, StreamingStatus
+from manager.streaming_pipeline import EmbedIndexPipeline, TextChunker, iter_text_segments
+
+
+class FakeEmbedder:
+    """embed_batch-kompatibel; merkt sich Batch-Größen"""
+
+    def __init__(self, delay=0.0, fail_after=None):
+        self.delay = delay
+        self.fail_after = fail_after
+        self.batches = []
+
+    def embed_batch(self, texts, show_progress_bar=True):
+        time.sleep(self.delay)
+        self.batches.append(len(texts))
+        if self.fail_after is not None and len(self.batches) > self.fail_after:
+            raise RuntimeError('embedding service down')
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class FakeVectorBackend:
+    def __init__(self):
+        self.items = []
+        self._lock = threading.Lock()
+
+    def add_vectors(self, batch):
+        with self._lock:
+            self.items.extend(batch)
+        return True
+
+
+def test_chunker_overlap_is_independent_of_segmentation():
+    text = ''.join(random.Random(1).choice('abcdefgh ') for _ in range(5000))
+    whole = TextChunker(300, 50)
+    expected = list(whole.feed(text)) + list(whole.finish())
+
+    rng = random.Random(2)
+    split = TextChunker(300, 50)
+    chunks, pos = [], 0
+    while pos < len(text):
+        size = rng.randint(1, 700)
+        chunks.extend(split.feed(text[pos:pos + size]))
+        pos += size
+    chunks.extend(split.finish())
+
+    assert chunks == expected
+    assert all(len(c) == 300 for c in chunks[:-1])
+    assert all(a[-50:] == b[:50] for a, b in zip(chunks, chunks[1:]))
+    assert chunks[0] + ''.join(c[50:] for c in chunks[1:]) == text
+    with pytest.raises(ValueError):
+        TextChunker(100, 100)
+
+
+def test_incremental_decoding_keeps_split_multibyte_chars(tmp_path):
+    path = tmp_path / 'umlaute.txt'
+    path.write_text('Baugenehmigung für Grundstück ä ö ü ß ' * 50, encoding='utf-8')
+
+    segments = list(iter_text_segments(str(path), read_size=7))
+
+    assert ''.join(text for text, _ in segments) == path.read_text(encoding='utf-8')
+    assert sum(consumed for _, consumed in segments) == path.stat().st_size
+
+
+def test_stream_to_vector_db_indexes_all_chunks(tmp_path):
+    path = tmp_path / 'bescheid.txt'
+    path.write_text('x' * 10_000, encoding='utf-8')
+    embedder, backend = FakeEmbedder(), FakeVectorBackend()
+    manager = StreamingManager()
+    updates = []
+
+    op_id = manager.stream_to_vector_db(
+        str(path), embedder=embedder, vector_backend=backend, chunk_text_size=1000, chunk_overlap=200,
+        embed_batch_size=4, progress_callback=lambda p: updates.append(dict(p.stage_progress)))
+
+    progress = manager.get_progress(op_id)
+    assert progress.status == StreamingStatus.COMPLETED
+    assert progress.chunk_count == progress.current_chunk == 13
+    assert progress.stage_progress['embedded'] == 13 and progress.stage_progress['extracted_bytes'] == 10_000
+    assert max(embedder.batches) == 4 and sum(embedder.batches) == 13
+    ids = [chunk_id for chunk_id, _, _ in backend.items]
+    assert ids == [f'bescheid_chunk_{i:04d}' for i in range(13)]
+    assert backend.items[0][2]['document_id'] == 'bescheid' and backend.items[0][2]['chunk_index'] == 0
+    assert [u['indexed'] for u in updates[:-1]] == [4, 8, 12, 13]
+
+
+def test_embedder_without_progress_bar_keyword(tmp_path):
+    class MinimalEmbedder:
+        def embed_batch(self, texts):
+            return [[float(len(t)), 1.0] for t in texts]
+
+    path = tmp_path / 'bescheid.txt'
+    path.write_text('x' * 3_000, encoding='utf-8')
+    backend = FakeVectorBackend()
+    manager = StreamingManager()
+
+    op_id = manager.stream_to_vector_db(str(path), embedder=MinimalEmbedder(), vector_backend=backend,
+                                        chunk_text_size=1000, chunk_overlap=0)
+
+    assert manager.get_progress(op_id).status == StreamingStatus.COMPLETED
+    assert len(backend.items) == 3
+
+
+def test_failed_vector_write_marks_operation_failed(tmp_path):
+    class RejectingBackend(FakeVectorBackend):
+        def add_vectors(self, batch):
+            return False
+
+        def add_vector(self, vector, metadata, chunk_id):
+            return False
+
+    path = tmp_path / 'bescheid.txt'
+    path.write_text('x' * 3_000, encoding='utf-8')
+    manager = StreamingManager()
+
+    with pytest.raises(RuntimeError, match='Vector write failed'):
+        manager.stream_to_vector_db(str(path), embedder=FakeEmbedder(), vector_backend=RejectingBackend(),
+                                    chunk_text_size=1000, chunk_overlap=0)
+
+    failed = manager.list_operations(StreamingStatus.FAILED)
+    assert len(failed) == 1 and failed[0].stage_progress['indexed'] == 0
+
+
+def test_small_chunks_clamp_default_overlap(tmp_path):
+    path = tmp_path / 'kurz.txt'
+    path.write_text('x' * 500, encoding='utf-8')
+    backend = FakeVectorBackend()
+    manager = StreamingManager()
+
+    op_id = manager.stream_to_vector_db(str(path), embedder=FakeEmbedder(), vector_backend=backend,
+                                        chunk_text_size=100)
+
+    assert manager.get_progress(op_id).status == StreamingStatus.COMPLETED
+    assert all(len(metadata['content']) == 100 for _, _, metadata in backend.items)
+
+
+def test_embedding_function_still_supported(tmp_path):
+    path = tmp_path / 'doc.txt'
+    path.write_text('abc ' * 600, encoding='utf-8')
+    calls = []
+    manager = StreamingManager()
+
+    # ohne Vector-Backend wird nur eingebettet
+    op_id = manager.stream_to_vector_db(
+        str(path), embedding_function=lambda text: calls.append(text) or [0.0], chunk_text_size=1000)
+
+    assert manager.get_progress(op_id).status == StreamingStatus.COMPLETED
+    assert len(calls) == 3 and ''.join(c[200:] if i else c for i, c in enumerate(calls)) == 'abc ' * 600
+
+
+def test_bounded_queues_apply_backpressure():
+    embedder = FakeEmbedder(delay=0.01)
+    lag = []
+
+    def segments():
+        for _ in range(200):
+            yield 'y' * 100, 100
+            lag.append(pipeline.snapshot()['chunks'] - pipeline.snapshot()['embedded'])
+
+    pipeline = EmbedIndexPipeline(embedder.embed_batch, chunk_size=100, overlap=0,
+                                  embed_batch_size=4, queue_size=2)
+    stats = pipeline.run(segments())
+
+    assert stats['indexed'] == 200
+    # Queue (2 Batches à 4) + Batch im Embedder + Batch auf dem Weg zum Index
+    assert max(lag) <= 2 * 4 + 4 + 4 + 1
+
+
+def test_failing_stage_stops_pipeline_and_marks_operation(tmp_path):
+    path = tmp_path / 'big.txt'
+    path.write_text('z' * 200_000, encoding='utf-8')
+    manager = StreamingManager()
+
+    with pytest.raises(RuntimeError, match='embedding service down'):
+        manager.stream_to_vector_db(str(path), embedder=FakeEmbedder(fail_after=2), embed_batch_size=8)
+
+    failed = manager.list_operations(StreamingStatus.FAILED)
+    assert len(failed) == 1 and failed[0].stage_progress['embedded'] == 16
+    assert not [t for t in threading.enumerate() if t.name.startswith('uds3-pipeline')]
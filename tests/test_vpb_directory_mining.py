@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_vpb_directory_mining.py
+
+Paralleles Directory Mining im VPBRAGDataMiner (extract_from_directory):
+Process Pool fürs Parsing, gebündelte UDS3-Writes und Embeddings,
+inkrementeller Modus über Inhalts-Hashes
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import json
+import re
+
+import vpb.rag_dataminer as rag_dataminer
+from vpb.rag_dataminer import create_vpb_dataminer
+
+BPMN = """<?xml version="1.0" encoding="UTF-8"?>
+<bpmn:definitions xmlns:bpmn="http://www.omg.org/spec/BPMN/20100524/MODEL" id="defs_{i}">
+  <bpmn:process id="verfahren_{i}" name="Verfahren {i}">
+    <bpmn:startEvent id="start_{i}"/>
+    <bpmn:userTask id="pruefung_{i}" name="Prüfung {i}"/>
+    <bpmn:endEvent id="ende_{i}"/>
+  </bpmn:process>
+</bpmn:definitions>
+"""
+
+
+class FakePolyglot:
+    """save() wie vom DataMiner aufgerufen; zählt Einzel-Writes"""
+
+    def __init__(self):
+        self.saved = []
+
+    def save(self, data, app_domain, metadata):
+        self.saved.append(data.get('document_id', data.get('name')))
+        return f"doc_{len(self.saved)}"
+
+
+class BatchPolyglot(FakePolyglot):
+    """Zusätzlich batch_create; fail_on lässt eine ganze Batch scheitern"""
+
+    def __init__(self, fail_on=None):
+        super().__init__()
+        self.batches = []
+        self.fail_on = fail_on
+
+    def batch_create(self, documents):
+        names = [doc['data']['name'] for doc in documents]
+        if self.fail_on in names:
+            raise IOError('bulk write rejected')
+        self.batches.append(names)
+        return [f"doc_{name}" for name in names]
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.batches = []
+
+    def embed_batch(self, texts, show_progress_bar=True):
+        self.batches.append(len(texts))
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+class StructuredBPMNParser:
+    """Liefert Prozess-Daten in der Form, die _create_knowledge_nodes_from_process erwartet"""
+
+    def parse_bpmn_to_uds3(self, bpmn_xml, filename=None):
+        i = re.search(r'id="verfahren_(\d+)"', bpmn_xml).group(1)
+        return {
+            'process_id': f'proc_{i}',
+            'name': f'Verfahren {i}',
+            'description': 'Beschreibung',
+            'steps': [{'step_number': s, 'action': f'Schritt {s}', 'responsible': 'Amt'} for s in range(1, 4)],
+        }
+
+
+def write_repository(directory, count, broken=()):
+    for i in range(count):
+        content = '<bpmn:definitions' if i in broken else BPMN.format(i=i)
+        (directory / f'verfahren_{i:03d}.bpmn').write_text(content, encoding='utf-8')
+
+
+def make_dataminer(polyglot, structured=True):
+    dataminer = create_vpb_dataminer(polyglot_manager=polyglot, enable_embeddings=False)
+    if structured:
+        dataminer.bpmn_parser = StructuredBPMNParser()
+        dataminer.enable_embeddings = True
+        dataminer.embeddings_model = CountingEmbeddings()
+    return dataminer
+
+
+def test_process_pool_matches_sequential_mining(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_dataminer, 'MINING_PARSE_CHUNK', 5)  # mehrere Chunks pro Worker
+    write_repository(tmp_path, 12, broken={5})
+
+    sequential_store, parallel_store = FakePolyglot(), FakePolyglot()
+    sequential = make_dataminer(sequential_store, structured=False).extract_from_directory(tmp_path, max_workers=1)
+    parallel = make_dataminer(parallel_store, structured=False).extract_from_directory(tmp_path, max_workers=3)
+
+    assert parallel.processes_extracted == sequential.processes_extracted == 11
+    assert parallel.documents_created == sequential.documents_created == 11
+    assert parallel.files_failed == sequential.files_failed == 1
+    # Ergebnisse kommen in Verzeichnisreihenfolge zurück, unabhängig vom Worker
+    assert parallel_store.saved == sequential_store.saved
+    assert sorted(parallel_store.saved) == sorted(f'bpmn_process_verfahren_{i}' for i in range(12) if i != 5)
+
+
+def test_writes_and_embeddings_are_batched_across_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_dataminer, 'MINING_SAVE_BATCH', 4)
+    monkeypatch.setattr(rag_dataminer, 'MINING_EMBED_BATCH', 10)
+    write_repository(tmp_path, 10)
+    polyglot = BatchPolyglot()
+    dataminer = make_dataminer(polyglot)
+
+    result = dataminer.extract_from_directory(tmp_path)
+
+    assert [len(batch) for batch in polyglot.batches] == [4, 4, 2]
+    assert polyglot.saved == []  # keine Einzel-Writes
+    # 4 Embeddings (Prozess + 3 Tasks) pro Datei, Batches über Dateigrenzen hinweg
+    assert dataminer.embeddings_model.batches == [10, 6, 10, 6, 8]
+    assert result.embeddings_generated == 40
+    assert len(dataminer.knowledge_graph.embedding_index) == 40
+    assert dataminer.query_knowledge_graph('Schritt 2', node_type='task', top_k=3)
+
+
+def test_incremental_mode_skips_writes_for_unchanged_files(tmp_path):
+    write_repository(tmp_path, 6)
+    state_path = tmp_path / 'state.json'
+    first = make_dataminer(FakePolyglot()).extract_from_directory(tmp_path, incremental=True, state_path=state_path)
+    assert first.documents_created == 6 and first.files_skipped == 0
+
+    # Eine Datei geändert, eine neu, eine gelöscht
+    (tmp_path / 'verfahren_002.bpmn').write_text(BPMN.format(i=2).replace('Prüfung', 'Vorprüfung'), encoding='utf-8')
+    (tmp_path / 'verfahren_006.bpmn').write_text(BPMN.format(i=6), encoding='utf-8')
+    (tmp_path / 'verfahren_004.bpmn').unlink()
+
+    store = FakePolyglot()
+    dataminer = make_dataminer(store)
+    second = dataminer.extract_from_directory(tmp_path, incremental=True, state_path=state_path)
+
+    assert second.documents_created == 2 and second.files_skipped == 4 and len(store.saved) == 2
+    # Unveränderte Dateien stehen trotzdem im Knowledge Graph (frischer Miner)
+    assert second.processes_extracted == 6
+    assert {f'proc_{i}' for i in (0, 1, 2, 3, 5, 6)} <= set(dataminer.knowledge_graph.nodes)
+    assert 'proc_4' not in dataminer.knowledge_graph.nodes
+    assert second.statistics['node_types']['process'] == 6
+    # Embeddings nur für die zwei geänderten Dateien neu generiert
+    assert second.embeddings_generated == 8
+    assert len(dataminer.knowledge_graph.embedding_index) == 24
+    files = json.loads(state_path.read_text(encoding='utf-8'))['files']
+    assert sorted(files) == [f'verfahren_{i:03d}.bpmn' for i in (0, 1, 2, 3, 5, 6)]
+
+    third_miner = make_dataminer(FakePolyglot())
+    third = third_miner.extract_from_directory(tmp_path, incremental=True, state_path=state_path)
+    assert third.documents_created == 0 and third.files_skipped == 6
+    assert third.embeddings_generated == 0 and third_miner.embeddings_model.batches == []
+    assert len(third_miner.knowledge_graph.embedding_index) == 24
+    assert {node.node_id for node in third_miner.query_knowledge_graph('Verfahren 0', node_type='process', top_k=6)} \
+        == {f'proc_{i}' for i in (0, 1, 2, 3, 5, 6)}
+
+
+def test_incremental_mode_regenerates_missing_embeddings(tmp_path):
+    write_repository(tmp_path, 3)
+    state_path = tmp_path / 'state.json'
+    make_dataminer(FakePolyglot()).extract_from_directory(tmp_path, incremental=True, state_path=state_path)
+    (tmp_path / ('state.json' + rag_dataminer.MINING_EMBEDDINGS_SUFFIX)).unlink()
+
+    store = FakePolyglot()
+    dataminer = make_dataminer(store)
+    result = dataminer.extract_from_directory(tmp_path, incremental=True, state_path=state_path)
+
+    assert store.saved == [] and result.files_skipped == 3
+    assert result.embeddings_generated == 12
+    assert len(dataminer.knowledge_graph.embedding_index) == 12
+
+
+def test_failed_writes_are_retried_on_the_next_incremental_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(rag_dataminer, 'MINING_SAVE_BATCH', 2)
+    write_repository(tmp_path, 4)
+    state_path = tmp_path / 'state.json'
+
+    # Batch mit Verfahren 3 scheitert komplett, ohne Einzel-Fallback
+    failing = BatchPolyglot(fail_on='Verfahren 3')
+    first = make_dataminer(failing).extract_from_directory(tmp_path, incremental=True, state_path=state_path)
+    assert first.documents_created == 2 and failing.saved == []
+    assert first.embeddings_generated == 8  # nur für gespeicherte Prozesse
+
+    retry = BatchPolyglot()
+    second = make_dataminer(retry).extract_from_directory(tmp_path, incremental=True, state_path=state_path)
+    assert second.files_skipped == 2
+    assert retry.batches == [['Verfahren 2', 'Verfahren 3']]
+
+
+def test_failing_knowledge_node_creation_only_fails_that_file(tmp_path):
+    write_repository(tmp_path, 4)
+    polyglot = BatchPolyglot()
+    dataminer = make_dataminer(polyglot)
+    create_nodes = dataminer._create_knowledge_nodes_from_process
+
+    def flaky_create(process_data):
+        if process_data['name'] == 'Verfahren 2':
+            raise KeyError('steps')
+        return create_nodes(process_data)
+
+    dataminer._create_knowledge_nodes_from_process = flaky_create
+    result = dataminer.extract_from_directory(tmp_path)
+
+    assert result.files_failed == 1
+    assert result.processes_extracted == result.documents_created == 3
+    assert polyglot.batches == [['Verfahren 0', 'Verfahren 1', 'Verfahren 3']]
+
+
+def test_embedder_without_progress_bar_keyword(tmp_path):
+    class MinimalEmbeddings(CountingEmbeddings):
+        def embed_batch(self, texts):
+            return super().embed_batch(texts)
+
+    write_repository(tmp_path, 2)
+    dataminer = make_dataminer(BatchPolyglot())
+    dataminer.embeddings_model = MinimalEmbeddings()
+
+    result = dataminer.extract_from_directory(tmp_path)
+
+    assert result.embeddings_generated == 8
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_vpb_knowledge_graph_search.py
+
+Vektorisierte Semantic Search im VPB Knowledge Graph (vpb/rag_dataminer.py):
+normalisierte Embedding-Matrix, Node-Typ-Masken, inkrementelles Anhängen,
+Top-K per argpartition
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import hashlib
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from vpb.rag_dataminer import (
+    NodeEmbeddingIndex,
+    ProcessKnowledgeGraph,
+    ProcessKnowledgeNode,
+    VPBRAGDataMiner,
+    create_vpb_dataminer,
+)
+
+NODE_TYPES = ['process', 'task', 'participant', 'regulation']
+
+
+class HashEmbeddings:
+    """Deterministische 16-dim Embeddings aus dem Text-Hash"""
+
+    def embed_query(self, text):
+        rng = random.Random(hashlib.sha256(text.encode('utf-8')).hexdigest())
+        return [rng.uniform(-1, 1) for _ in range(16)]
+
+
+def make_dataminer():
+    dataminer = create_vpb_dataminer(polyglot_manager=SimpleNamespace(), enable_embeddings=False)
+    dataminer.enable_embeddings = True
+    dataminer.embeddings_model = HashEmbeddings()
+    return dataminer
+
+
+def make_process(i):
+    return {
+        'process_id': f'proc_{i}',
+        'name': f'Verfahren {i}',
+        'description': f'Beschreibung des Verwaltungsverfahrens {i}',
+        'steps': [{'step_number': s, 'action': f'Schritt {s} von {i}', 'responsible': 'Sachbearbeitung'}
+                  for s in range(1, 4)],
+        'metadata': {'participants': ['Antragsteller'], 'legal_references': ['BauGB § 34']},
+    }
+
+
+def brute_force(graph, query_embedding, node_type, top_k):
+    """Bisherige Implementierung: _cosine_similarity gegen jeden Node, volle Sortierung"""
+    similarities = [
+        (node, VPBRAGDataMiner._cosine_similarity(None, query_embedding, node.embeddings))
+        for node in graph.nodes.values()
+        if node.embeddings is not None and (not node_type or node.node_type == node_type)
+    ]
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:top_k]
+
+
+def test_search_matches_brute_force_across_growth():
+    rng = random.Random(5)
+    graph = ProcessKnowledgeGraph()
+    # Mehr Nodes als die Startkapazität: Matrix und Masken wachsen mit
+    for i in range(NodeEmbeddingIndex.INITIAL_CAPACITY * 2 + 37):
+        graph.add_node(ProcessKnowledgeNode(
+            node_id=f'n{i}', node_type=rng.choice(NODE_TYPES), name=f'Node {i}',
+            embeddings=[rng.gauss(0, 1) for _ in range(32)] if rng.random() < 0.9 else None,
+        ))
+
+    for _ in range(20):
+        query = [rng.gauss(0, 1) for _ in range(32)]
+        for node_type in [None] + NODE_TYPES:
+            for top_k in (1, 5, 50, 10_000):
+                expected = brute_force(graph, query, node_type, top_k)
+                result = graph.search_similar(query, node_type, top_k)
+                assert [n.node_id for n, _ in result] == [n.node_id for n, _ in expected]
+                assert [s for _, s in result] == pytest.approx([s for _, s in expected], abs=1e-5)
+
+
+def test_nodes_are_indexed_incrementally_while_mining():
+    dataminer = make_dataminer()
+    for i in range(5):
+        process = make_process(i)
+        dataminer._create_knowledge_nodes_from_process(process)
+        assert dataminer._generate_embeddings_for_process(process) == 4
+
+    # Process + 3 Tasks pro Prozess, Participants/Regulations ohne Embedding
+    assert len(dataminer.knowledge_graph.embedding_index) == 5 * 4
+    hit = dataminer.query_knowledge_graph('Verfahren 3 Beschreibung des Verwaltungsverfahrens 3', top_k=1)
+    assert [n.node_id for n in hit] == ['proc_3']
+
+    # Später gemintes Wissen ist sofort suchbar, ohne Neuaufbau
+    late = make_process(99)
+    dataminer._create_knowledge_nodes_from_process(late)
+    dataminer._generate_embeddings_for_process(late)
+    hit = dataminer.query_knowledge_graph('Schritt 2 von 99 ', node_type='task', top_k=1)
+    assert [n.node_id for n in hit] == ['proc_99_task_2']
+    tasks = dataminer.query_knowledge_graph('Verfahren 99', node_type='task', top_k=100)
+    assert len(tasks) == 6 * 3 and all(n.node_type == 'task' for n in tasks)
+
+
+def test_replaced_nodes_and_type_changes_update_the_masks():
+    graph = ProcessKnowledgeGraph()
+    graph.add_node(ProcessKnowledgeNode('a', 'task', 'A', embeddings=[1.0, 0.0]))
+    graph.add_node(ProcessKnowledgeNode('b', 'task', 'B', embeddings=[0.0, 1.0]))
+
+    # Gleiche ID, neuer Typ und neues Embedding
+    graph.add_node(ProcessKnowledgeNode('a', 'process', 'A2', embeddings=[0.0, 2.0]))
+    assert [n.node_id for n, _ in graph.search_similar([0.0, 1.0], 'task')] == ['b']
+    assert [(n.name, s) for n, s in graph.search_similar([0.0, 1.0], 'process')] == [('A2', pytest.approx(1.0))]
+
+    # Ersetzt ohne Embedding: fällt aus dem Index, Zeile wird wiederverwendet
+    graph.add_node(ProcessKnowledgeNode('b', 'task', 'B2'))
+    assert graph.search_similar([0.0, 1.0], 'task') == []
+    graph.add_node(ProcessKnowledgeNode('c', 'task', 'C', embeddings=[0.0, 0.0]))
+    assert [(n.node_id, s) for n, s in graph.search_similar([1.0, 0.0], 'task')] == [('c', 0.0)]
+    assert len(graph.embedding_index) == 2
+
+
+def test_mismatched_dimensions_and_direct_mutation():
+    graph = ProcessKnowledgeGraph()
+    graph.add_node(ProcessKnowledgeNode('a', 'task', 'A', embeddings=[1.0, 0.0, 0.0]))
+    graph.add_node(ProcessKnowledgeNode('b', 'task', 'B'))
+    assert graph.set_node_embeddings('b', [1.0, 0.0]) is False  # falsche Dimension wird nicht indiziert
+    assert graph.set_node_embeddings('missing', [1.0, 0.0, 0.0]) is False
+    assert 'b' not in graph.embedding_index
+
+    # Direkt gesetzte Embeddings werden per reindex_embeddings übernommen
+    graph.nodes['b'].embeddings = [0.0, 1.0, 0.0]
+    graph.reindex_embeddings()
+    assert [n.node_id for n, _ in graph.search_similar([0.0, 1.0, 0.0], top_k=1)] == ['b']
+
+    prebuilt = ProcessKnowledgeGraph(nodes=dict(graph.nodes))
+    assert len(prebuilt.embedding_index) == 2
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+test_vpb_process_store.py
+
+Indizierte Process Stores hinter VPBCRUDManager (vpb/operations.py):
+Sekundärindizes, inkrementelle Zähler, Cursor-Pagination, SQLite-Persistenz
+
+Part of UDS3 (Unified Database Strategy v3)
+Author: Martin Krüger (ma.krueger@outlook.com)
+License: MIT with Government Partnership Commons Clause
+Repository: https://github.com/makr-code/VCC-UDS3
+"""
+
+import random
+
+import pytest
+
+from uds3.vpb.operations import (
+    InMemoryProcessStore,
+    LegalContext,
+    ParticipantRole,
+    ProcessStatus,
+    SQLiteProcessStore,
+    VPBCRUDManager,
+    VPBProcess,
+    create_vpb_participant,
+    create_vpb_process,
+    create_vpb_task,
+)
+
+
+def make_catalog(n, seed=7):
+    """Zufälliger Prozesskatalog mit gemeinsam genutzten Beteiligten"""
+    rng = random.Random(seed)
+    people = [create_vpb_participant(f"Sachbearbeiter {i}", ParticipantRole.PROCESSOR) for i in range(8)]
+    processes = []
+    for i in range(n):
+        process = create_vpb_process(f"Verfahren {i}", "Beschreibung",
+                                     legal_context=rng.choice(list(LegalContext)))
+        process.status = rng.choice(list(ProcessStatus))
+        process.complexity_score = round(rng.random(), 2)
+        process.automation_potential = round(rng.random(), 2)
+        process.participants = rng.sample(people, rng.randint(0, 3))
+        processes.append(process)
+    return processes, people
+
+
+def brute_force_statistics(processes):
+    n = len(processes)
+    return {
+        "total_processes": n,
+        "by_status": {s.value: sum(p.status == s for p in processes) for s in ProcessStatus},
+        "by_legal_context": {c.value: sum(p.legal_context == c for p in processes) for c in LegalContext},
+        "average_complexity": sum(p.complexity_score for p in processes) / n if n else 0,
+        "average_automation_potential": sum(p.automation_potential for p in processes) / n if n else 0,
+    }
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def manager(request, tmp_path):
+    store = InMemoryProcessStore() if request.param == "memory" else SQLiteProcessStore(str(tmp_path / "vpb.db"))
+    return VPBCRUDManager(storage_backend=store)
+
+
+def ids(processes):
+    return [p.process_id for p in processes]
+
+
+def test_indexes_follow_updates_and_deletes(manager):
+    processes, people = make_catalog(300)
+    manager.batch_create(processes)
+    rng = random.Random(3)
+    for process in rng.sample(processes, 80):
+        manager.update_process(process.process_id, {
+            "status": rng.choice(list(ProcessStatus)),
+            "complexity_score": round(rng.random(), 2),
+            "participants": rng.sample(people, 2),
+        })
+    for process in rng.sample(processes, 30):
+        manager.delete_process(process.process_id, soft=rng.random() < 0.5)
+
+    # Referenz: aktueller Stand, vollständig gescannt
+    current = [p for p in (manager.read_process(p.process_id) for p in processes) if p is not None]
+    assert ids(manager.search_by_status(ProcessStatus.ARCHIVED)) == \
+        ids([p for p in current if p.status == ProcessStatus.ARCHIVED])
+    assert ids(manager.search_by_legal_context(LegalContext.BAURECHT)) == \
+        ids([p for p in current if p.legal_context == LegalContext.BAURECHT])
+    assert ids(manager.search_by_participant(people[0].participant_id)) == \
+        ids([p for p in current if any(x.participant_id == people[0].participant_id for x in p.participants)])
+    assert ids(manager.search_by_complexity(0.25, 0.5)) == \
+        ids([p for p in current if 0.25 <= p.complexity_score <= 0.5])
+    assert manager.count_processes() == len(current)
+    assert manager.count_processes(ProcessStatus.DRAFT) == sum(p.status == ProcessStatus.DRAFT for p in current)
+
+    stats, expected = manager.get_statistics(), brute_force_statistics(current)
+    assert stats["by_status"] == expected["by_status"]
+    assert stats["by_legal_context"] == expected["by_legal_context"]
+    assert stats["average_complexity"] == pytest.approx(expected["average_complexity"])
+    assert stats["average_automation_potential"] == pytest.approx(expected["average_automation_potential"])
+
+
+def test_cursor_pagination_walks_filtered_results_once(manager):
+    processes, _ = make_catalog(250)
+    manager.batch_create(processes)
+
+    seen, cursor = [], None
+    while True:
+        page = manager.list_processes_page(limit=40, cursor=cursor, status=ProcessStatus.ACTIVE)
+        seen.extend(ids(page["processes"]))
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+        # Neue Prozesse während des Blätterns verschieben keine Seiten
+        late = create_vpb_process("Nachzügler", "Beschreibung")
+        manager.create_process(late)
+
+    assert seen == ids([p for p in processes if p.status == ProcessStatus.ACTIVE])
+    assert ids(manager.list_processes(limit=10, offset=20)) == ids(processes[20:30])
+
+
+def test_combined_filters_use_the_most_selective_index():
+    processes, people = make_catalog(500)
+    store = InMemoryProcessStore()
+    for process in processes:
+        store.add(process)
+
+    result, _ = store.query(status=ProcessStatus.ACTIVE, participant_id=people[1].participant_id,
+                            min_complexity=0.5)
+    assert ids(result) == ids([
+        p for p in processes
+        if p.status == ProcessStatus.ACTIVE and p.complexity_score >= 0.5
+        and any(x.participant_id == people[1].participant_id for x in p.participants)
+    ])
+
+
+def test_plain_dict_backend_is_indexed_in_place():
+    process = create_vpb_process("Bestand", "Beschreibung")
+    process.status = ProcessStatus.ACTIVE
+    backing = {process.process_id: process}
+
+    manager = VPBCRUDManager(storage_backend=backing)
+    manager.create_process(create_vpb_process("Neu", "Beschreibung"))
+
+    assert ids(manager.search_by_status(ProcessStatus.ACTIVE)) == [process.process_id]
+    assert len(backing) == 2
+
+
+def test_sqlite_store_persists_and_roundtrips(tmp_path):
+    path = str(tmp_path / "katalog.db")
+    process = create_vpb_process("Baugenehmigung", "Beschreibung", legal_context=LegalContext.BAURECHT)
+    process.tasks = [create_vpb_task("Prüfung", "Antragsprüfung")]
+    process.participants = [create_vpb_participant("Antragsteller", ParticipantRole.APPLICANT)]
+    process.geo_coordinates = (51.96, 7.62)
+
+    first = VPBCRUDManager(storage_backend=SQLiteProcessStore(path))
+    first.create_process(process)
+    first.update_process_status(process.process_id, ProcessStatus.ACTIVE)
+    first.storage.close()
+
+    reopened = VPBCRUDManager(storage_backend=SQLiteProcessStore(path))
+    loaded = reopened.read_process(process.process_id)
+    assert isinstance(loaded, VPBProcess)
+    assert loaded.status == ProcessStatus.ACTIVE
+    assert loaded.to_dict() == {**process.to_dict(), "status": "active", "updated_at": loaded.updated_at.isoformat()}
+    assert ids(reopened.search_by_participant(process.participants[0].participant_id)) == [process.process_id]
+    assert reopened.create_process(process)["success"] is False
@@ -25,11 +25,17 @@ License: MIT with Government Partnership Commons Clause
 Repository: https://github.com/makr-code/VCC-UDS3
 """
 
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
+import json
 import logging
+import os
+import sqlite3
+import threading
 import uuid
 
 logger = logging.getLogger(__name__)
@@ -101,6 +107,11 @@ class ProcessComplexity(Enum):
 # Domain Models
 # ============================================================================
 
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse ISO timestamp from to_dict() output"""
+    return datetime.fromisoformat(value) if value else None
+
+
 @dataclass
 class VPBTask:
     """
@@ -157,6 +168,17 @@ class VPBTask:
             "predecessor_task_ids": self.predecessor_task_ids,
             "successor_task_ids": self.successor_task_ids
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VPBTask":
+        """Create from dictionary (inverse of to_dict)"""
+        return cls(**{
+            **data,
+            "status": TaskStatus(data["status"]),
+            "deadline": _parse_datetime(data.get("deadline")),
+            "started_at": _parse_datetime(data.get("started_at")),
+            "completed_at": _parse_datetime(data.get("completed_at"))
+        })
 
 
 @dataclass
@@ -203,6 +225,11 @@ class VPBDocument:
             "legal_relevance": self.legal_relevance,
             "retention_years": self.retention_years
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VPBDocument":
+        """Create from dictionary (inverse of to_dict)"""
+        return cls(**{**data, "created_at": _parse_datetime(data["created_at"])})
 
 
 @dataclass
@@ -239,6 +266,15 @@ class VPBParticipant:
             "joined_at": self.joined_at.isoformat(),
             "workload_score": self.workload_score
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VPBParticipant":
+        """Create from dictionary (inverse of to_dict)"""
+        return cls(**{
+            **data,
+            "role": ParticipantRole(data["role"]),
+            "joined_at": _parse_datetime(data["joined_at"])
+        })
 
 
 @dataclass
@@ -323,6 +359,24 @@ class VPBProcess:
             "geo_scope": self.geo_scope,
             "geo_coordinates": self.geo_coordinates
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "VPBProcess":
+        """Create from dictionary (inverse of to_dict)"""
+        return cls(**{
+            **data,
+            "status": ProcessStatus(data["status"]),
+            "legal_context": LegalContext(data["legal_context"]),
+            "authority_level": AuthorityLevel(data["authority_level"]),
+            "tasks": [VPBTask.from_dict(task) for task in data.get("tasks", [])],
+            "documents": [VPBDocument.from_dict(doc) for doc in data.get("documents", [])],
+            "participants": [VPBParticipant.from_dict(p) for p in data.get("participants", [])],
+            "created_at": _parse_datetime(data["created_at"]),
+            "updated_at": _parse_datetime(data["updated_at"]),
+            "started_at": _parse_datetime(data.get("started_at")),
+            "completed_at": _parse_datetime(data.get("completed_at")),
+            "geo_coordinates": tuple(data["geo_coordinates"]) if data.get("geo_coordinates") else None
+        })
 
 
 # ============================================================================
@@ -459,6 +513,538 @@ def create_vpb_document(name: str, document_type: str = "other") -> VPBDocument:
     )
 
 
+# ============================================================================
+# Process Store
+# ============================================================================
+
+# Optional persistent store for create_vpb_crud_manager() (SQLite file path)
+VPB_STORE_PATH = os.getenv("UDS3_VPB_STORE_PATH", "")
+
+
+class _IndexKeys(NamedTuple):
+    """Indexed attributes of a process at the time it was (re-)indexed"""
+    status: ProcessStatus
+    legal_context: LegalContext
+    participants: Tuple[str, ...]
+    complexity_score: float
+    automation_potential: float
+
+    @classmethod
+    def of(cls, process: VPBProcess) -> "_IndexKeys":
+        return cls(
+            process.status,
+            process.legal_context,
+            tuple(dict.fromkeys(p.participant_id for p in process.participants)),
+            process.complexity_score,
+            process.automation_potential
+        )
+
+
+def _statistics(
+    total: int,
+    status_counts: Dict[str, int],
+    legal_context_counts: Dict[str, int],
+    complexity_sum: float,
+    automation_sum: float
+) -> Dict[str, Any]:
+    """Statistics dict as returned by VPBCRUDManager.get_statistics()"""
+    return {
+        "total_processes": total,
+        "by_status": {status.value: status_counts.get(status.value, 0) for status in ProcessStatus},
+        "by_legal_context": {context.value: legal_context_counts.get(context.value, 0) for context in LegalContext},
+        "average_complexity": complexity_sum / total if total else 0,
+        "average_automation_potential": automation_sum / total if total else 0
+    }
+
+
+class InMemoryProcessStore:
+    """
+    In-memory process store with secondary indexes.
+    
+    Processes are numbered in insertion order; every index (status, legal
+    context, participant, complexity) is a sorted list of those sequence
+    numbers, so filtered searches and cursor pagination are bisects instead
+    of full scans. Aggregate counters are updated on every write.
+    
+    Processes are stored by reference. After mutating a stored process,
+    call update() (VPBCRUDManager does this) to refresh its index entries.
+    
+    Args:
+        processes: Optional dict (process_id -> VPBProcess) used as primary
+            storage; existing entries are indexed
+    """
+    
+    def __init__(self, processes: Optional[Dict[str, VPBProcess]] = None):
+        self._processes: Dict[str, VPBProcess] = processes if processes is not None else {}
+        self._seq_of: Dict[str, int] = {}
+        self._id_of: Dict[int, str] = {}
+        self._order: List[int] = []
+        self._next_seq = 0
+        self._keys: Dict[str, _IndexKeys] = {}
+        self._by_status: Dict[ProcessStatus, List[int]] = {}
+        self._by_legal_context: Dict[LegalContext, List[int]] = {}
+        self._by_participant: Dict[str, List[int]] = {}
+        self._by_complexity: List[Tuple[float, int]] = []
+        self._status_counts: Counter = Counter()
+        self._legal_context_counts: Counter = Counter()
+        self._complexity_sum = 0.0
+        self._automation_sum = 0.0
+        self._lock = threading.RLock()
+        
+        for process in list(self._processes.values()):
+            self._index(process)
+    
+    # ------------------------------------------------------------------
+    # Mapping compatibility (storage used to be a plain dict)
+    # ------------------------------------------------------------------
+    def __contains__(self, process_id: str) -> bool:
+        return process_id in self._processes
+    
+    def __len__(self) -> int:
+        return len(self._processes)
+    
+    def get(self, process_id: str) -> Optional[VPBProcess]:
+        return self._processes.get(process_id)
+    
+    def values(self) -> Iterator[VPBProcess]:
+        with self._lock:
+            return iter([self._processes[self._id_of[seq]] for seq in self._order])
+    
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def add(self, process: VPBProcess) -> bool:
+        """Store a new process; False if the ID already exists"""
+        with self._lock:
+            if process.process_id in self._processes:
+                return False
+            self._processes[process.process_id] = process
+            self._index(process)
+            return True
+    
+    def update(self, process: VPBProcess) -> None:
+        """Store a changed process and refresh its index entries"""
+        with self._lock:
+            if process.process_id not in self._seq_of:
+                raise KeyError(process.process_id)
+            self._processes[process.process_id] = process
+            self._unindex(process.process_id)
+            self._index(process)
+    
+    def delete(self, process_id: str) -> bool:
+        """Remove a process; False if it does not exist"""
+        with self._lock:
+            if process_id not in self._processes:
+                return False
+            self._unindex(process_id)
+            del self._processes[process_id]
+            seq = self._seq_of.pop(process_id)
+            del self._id_of[seq]
+            del self._order[bisect_left(self._order, seq)]
+            return True
+    
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def query(
+        self,
+        status: Optional[ProcessStatus] = None,
+        legal_context: Optional[LegalContext] = None,
+        participant_id: Optional[str] = None,
+        min_complexity: Optional[float] = None,
+        max_complexity: Optional[float] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[VPBProcess], Optional[str]]:
+        """
+        Filtered search in insertion order.
+        
+        The most selective index drives the scan; the remaining filters are
+        checked against the indexed keys of each candidate.
+        
+        Returns:
+            (processes, next_cursor) - next_cursor is None on the last page
+        """
+        with self._lock:
+            candidates = []
+            if status is not None:
+                candidates.append(self._by_status.get(status, []))
+            if legal_context is not None:
+                candidates.append(self._by_legal_context.get(legal_context, []))
+            if participant_id is not None:
+                candidates.append(self._by_participant.get(participant_id, []))
+            if min_complexity is not None or max_complexity is not None:
+                low = bisect_left(self._by_complexity, (min_complexity, -1)) if min_complexity is not None else 0
+                high = (bisect_right(self._by_complexity, (max_complexity, self._next_seq))
+                        if max_complexity is not None else len(self._by_complexity))
+                candidates.append(sorted(seq for _, seq in self._by_complexity[low:high]))
+            driver = min(candidates, key=len) if candidates else self._order
+            check = len(candidates) > 1
+            
+            start = bisect_right(driver, int(cursor)) if cursor else 0
+            if not check:
+                # Single index: the page is a slice of it
+                start += offset
+                end = len(driver) if limit is None else min(len(driver), start + limit)
+                results = [self._processes[self._id_of[seq]] for seq in driver[start:end]]
+                next_cursor = str(driver[end - 1]) if end < len(driver) and results else None
+                return results, next_cursor
+            
+            results: List[VPBProcess] = []
+            skipped = 0
+            for position in range(start, len(driver)):
+                seq = driver[position]
+                process_id = self._id_of[seq]
+                if not self._matches(self._keys[process_id], status, legal_context,
+                                               participant_id, min_complexity, max_complexity):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                if limit is not None and len(results) >= limit:
+                    return results, str(self._seq_of[results[-1].process_id])
+                results.append(self._processes[process_id])
+            return results, None
+    
+    def count(self, status: Optional[ProcessStatus] = None) -> int:
+        with self._lock:
+            return self._status_counts[status] if status is not None else len(self._processes)
+    
+    def statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return _statistics(
+                len(self._processes),
+                {status.value: n for status, n in self._status_counts.items()},
+                {context.value: n for context, n in self._legal_context_counts.items()},
+                self._complexity_sum,
+                self._automation_sum
+            )
+    
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _matches(keys: _IndexKeys, status, legal_context, participant_id, min_complexity, max_complexity) -> bool:
+        return ((status is None or keys.status == status)
+                and (legal_context is None or keys.legal_context == legal_context)
+                and (participant_id is None or participant_id in keys.participants)
+                and (min_complexity is None or keys.complexity_score >= min_complexity)
+                and (max_complexity is None or keys.complexity_score <= max_complexity))
+    
+    def _index(self, process: VPBProcess) -> None:
+        process_id = process.process_id
+        seq = self._seq_of.get(process_id)
+        if seq is None:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._seq_of[process_id] = seq
+            self._id_of[seq] = process_id
+            self._order.append(seq)
+        
+        keys = _IndexKeys.of(process)
+        self._keys[process_id] = keys
+        insort(self._by_status.setdefault(keys.status, []), seq)
+        insort(self._by_legal_context.setdefault(keys.legal_context, []), seq)
+        for participant_id in keys.participants:
+            insort(self._by_participant.setdefault(participant_id, []), seq)
+        insort(self._by_complexity, (keys.complexity_score, seq))
+        
+        self._status_counts[keys.status] += 1
+        self._legal_context_counts[keys.legal_context] += 1
+        self._complexity_sum += keys.complexity_score
+        self._automation_sum += keys.automation_potential
+    
+    def _unindex(self, process_id: str) -> None:
+        seq = self._seq_of[process_id]
+        keys = self._keys.pop(process_id)
+        self._remove(self._by_status, keys.status, seq)
+        self._remove(self._by_legal_context, keys.legal_context, seq)
+        for participant_id in keys.participants:
+            self._remove(self._by_participant, participant_id, seq)
+        del self._by_complexity[bisect_left(self._by_complexity, (keys.complexity_score, seq))]
+        
+        self._status_counts[keys.status] -= 1
+        self._legal_context_counts[keys.legal_context] -= 1
+        self._complexity_sum -= keys.complexity_score
+        self._automation_sum -= keys.automation_potential
+    
+    @staticmethod
+    def _remove(index: Dict[Any, List[int]], key: Any, seq: int) -> None:
+        seqs = index[key]
+        del seqs[bisect_left(seqs, seq)]
+        if not seqs:
+            del index[key]
+
+
+class SQLiteProcessStore:
+    """
+    Persistent process store backed by SQLite.
+    
+    Same interface as InMemoryProcessStore. Filter columns (status, legal
+    context, complexity) and the participant table are indexed; aggregate
+    counters are maintained by triggers in vpb_process_counters. Processes
+    are stored as JSON (to_dict/from_dict), so reads return fresh objects
+    and changes must be written back with update().
+    
+    Args:
+        path: Database file (":memory:" for a throwaway store)
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS vpb_processes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            process_id TEXT NOT NULL UNIQUE,
+            status TEXT NOT NULL,
+            legal_context TEXT NOT NULL,
+            complexity_score REAL NOT NULL,
+            automation_potential REAL NOT NULL,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_vpb_processes_status ON vpb_processes (status, seq);
+        CREATE INDEX IF NOT EXISTS idx_vpb_processes_legal_context ON vpb_processes (legal_context, seq);
+        CREATE INDEX IF NOT EXISTS idx_vpb_processes_complexity ON vpb_processes (complexity_score);
+        CREATE TABLE IF NOT EXISTS vpb_process_participants (
+            participant_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            PRIMARY KEY (participant_id, seq)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_vpb_process_participants_seq ON vpb_process_participants (seq);
+        CREATE TABLE IF NOT EXISTS vpb_process_counters (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            complexity_sum REAL NOT NULL DEFAULT 0,
+            automation_sum REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID;
+        CREATE TRIGGER IF NOT EXISTS trg_vpb_processes_insert AFTER INSERT ON vpb_processes BEGIN
+            INSERT OR IGNORE INTO vpb_process_counters (dimension, value) VALUES ('status', NEW.status);
+            INSERT OR IGNORE INTO vpb_process_counters (dimension, value) VALUES ('legal_context', NEW.legal_context);
+            UPDATE vpb_process_counters SET count = count + 1,
+                complexity_sum = complexity_sum + NEW.complexity_score,
+                automation_sum = automation_sum + NEW.automation_potential
+            WHERE dimension = 'status' AND value = NEW.status;
+            UPDATE vpb_process_counters SET count = count + 1
+            WHERE dimension = 'legal_context' AND value = NEW.legal_context;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_vpb_processes_delete AFTER DELETE ON vpb_processes BEGIN
+            UPDATE vpb_process_counters SET count = count - 1,
+                complexity_sum = complexity_sum - OLD.complexity_score,
+                automation_sum = automation_sum - OLD.automation_potential
+            WHERE dimension = 'status' AND value = OLD.status;
+            UPDATE vpb_process_counters SET count = count - 1
+            WHERE dimension = 'legal_context' AND value = OLD.legal_context;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_vpb_processes_update AFTER UPDATE ON vpb_processes BEGIN
+            UPDATE vpb_process_counters SET count = count - 1,
+                complexity_sum = complexity_sum - OLD.complexity_score,
+                automation_sum = automation_sum - OLD.automation_potential
+            WHERE dimension = 'status' AND value = OLD.status;
+            UPDATE vpb_process_counters SET count = count - 1
+            WHERE dimension = 'legal_context' AND value = OLD.legal_context;
+            INSERT OR IGNORE INTO vpb_process_counters (dimension, value) VALUES ('status', NEW.status);
+            INSERT OR IGNORE INTO vpb_process_counters (dimension, value) VALUES ('legal_context', NEW.legal_context);
+            UPDATE vpb_process_counters SET count = count + 1,
+                complexity_sum = complexity_sum + NEW.complexity_score,
+                automation_sum = automation_sum + NEW.automation_potential
+            WHERE dimension = 'status' AND value = NEW.status;
+            UPDATE vpb_process_counters SET count = count + 1
+            WHERE dimension = 'legal_context' AND value = NEW.legal_context;
+        END;
+    """
+    
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        logger.info(f"SQLiteProcessStore opened: {path}")
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+    
+    # ------------------------------------------------------------------
+    # Mapping compatibility
+    # ------------------------------------------------------------------
+    def __contains__(self, process_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM vpb_processes WHERE process_id = ?", (process_id,)
+            ).fetchone() is not None
+    
+    def __len__(self) -> int:
+        return self.count()
+    
+    def get(self, process_id: str) -> Optional[VPBProcess]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM vpb_processes WHERE process_id = ?", (process_id,)
+            ).fetchone()
+        return VPBProcess.from_dict(json.loads(row[0])) if row else None
+    
+    def values(self) -> Iterator[VPBProcess]:
+        return iter(self.query()[0])
+    
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def add(self, process: VPBProcess) -> bool:
+        with self._lock, self._conn:
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO vpb_processes (process_id, status, legal_context, complexity_score, "
+                    "automation_potential, data) VALUES (?, ?, ?, ?, ?, ?)",
+                    self._row(process)
+                )
+            except sqlite3.IntegrityError:
+                return False
+            self._write_participants(cursor.lastrowid, process)
+            return True
+    
+    def update(self, process: VPBProcess) -> None:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT seq FROM vpb_processes WHERE process_id = ?", (process.process_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(process.process_id)
+            process_id, *values = self._row(process)
+            self._conn.execute(
+                "UPDATE vpb_processes SET status = ?, legal_context = ?, complexity_score = ?, "
+                "automation_potential = ?, data = ? WHERE seq = ?",
+                (*values, row[0])
+            )
+            self._conn.execute("DELETE FROM vpb_process_participants WHERE seq = ?", (row[0],))
+            self._write_participants(row[0], process)
+    
+    def delete(self, process_id: str) -> bool:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT seq FROM vpb_processes WHERE process_id = ?", (process_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            self._conn.execute("DELETE FROM vpb_process_participants WHERE seq = ?", (row[0],))
+            self._conn.execute("DELETE FROM vpb_processes WHERE seq = ?", (row[0],))
+            return True
+    
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def query(
+        self,
+        status: Optional[ProcessStatus] = None,
+        legal_context: Optional[LegalContext] = None,
+        participant_id: Optional[str] = None,
+        min_complexity: Optional[float] = None,
+        max_complexity: Optional[float] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[VPBProcess], Optional[str]]:
+        """Filtered search in insertion order; returns (processes, next_cursor)"""
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if legal_context is not None:
+            clauses.append("legal_context = ?")
+            params.append(legal_context.value)
+        if participant_id is not None:
+            clauses.append("seq IN (SELECT seq FROM vpb_process_participants WHERE participant_id = ?)")
+            params.append(participant_id)
+        if min_complexity is not None:
+            clauses.append("complexity_score >= ?")
+            params.append(min_complexity)
+        if max_complexity is not None:
+            clauses.append("complexity_score <= ?")
+            params.append(max_complexity)
+        if cursor:
+            clauses.append("seq > ?")
+            params.append(int(cursor))
+        
+        sql = "SELECT seq, data FROM vpb_processes"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        # One extra row tells whether there is a next page
+        sql += " ORDER BY seq LIMIT ? OFFSET ?"
+        params.extend([limit + 1 if limit is not None else -1, offset])
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = str(rows[-1][0])
+        return [VPBProcess.from_dict(json.loads(data)) for _, data in rows], next_cursor
+    
+    def count(self, status: Optional[ProcessStatus] = None) -> int:
+        with self._lock:
+            if status is not None:
+                row = self._conn.execute(
+                    "SELECT count FROM vpb_process_counters WHERE dimension = 'status' AND value = ?",
+                    (status.value,)
+                ).fetchone()
+                return row[0] if row else 0
+            return self._conn.execute(
+                "SELECT IFNULL(SUM(count), 0) FROM vpb_process_counters WHERE dimension = 'status'"
+            ).fetchone()[0]
+    
+    def statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT dimension, value, count, complexity_sum, automation_sum FROM vpb_process_counters"
+            ).fetchall()
+        status_rows = [row for row in rows if row[0] == 'status']
+        return _statistics(
+            sum(row[2] for row in status_rows),
+            {row[1]: row[2] for row in status_rows},
+            {row[1]: row[2] for row in rows if row[0] == 'legal_context'},
+            sum(row[3] for row in status_rows),
+            sum(row[4] for row in status_rows)
+        )
+    
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _row(process: VPBProcess) -> Tuple:
+        return (
+            process.process_id,
+            process.status.value,
+            process.legal_context.value,
+            process.complexity_score,
+            process.automation_potential,
+            json.dumps(process.to_dict())
+        )
+    
+    def _write_participants(self, seq: int, process: VPBProcess) -> None:
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO vpb_process_participants (participant_id, seq) VALUES (?, ?)",
+            [(p.participant_id, seq) for p in process.participants]
+        )
+
+
+def create_vpb_process_store(sqlite_path: Optional[str] = None):
+    """
+    Create process store for VPBCRUDManager.
+    
+    Args:
+        sqlite_path: SQLite file for a persistent store (default: UDS3_VPB_STORE_PATH);
+            empty means in-memory
+    """
+    sqlite_path = sqlite_path if sqlite_path is not None else VPB_STORE_PATH
+    if sqlite_path:
+        return SQLiteProcessStore(sqlite_path)
+    return InMemoryProcessStore()
+
+
 # ============================================================================
 # VPB CRUD Manager
 # ============================================================================
@@ -470,7 +1056,7 @@ class VPBCRUDManager:
     Features:
     - Create/Read/Update/Delete operations
     - Batch operations
-    - Search and filter
+    - Search and filter (indexed, with cursor pagination)
     - Process lifecycle management
     """
     
@@ -479,10 +1065,15 @@ class VPBCRUDManager:
         Initialize VPB CRUD Manager.
         
         Args:
-            storage_backend: Optional storage backend (dict, database, etc.)
+            storage_backend: Optional process store (InMemoryProcessStore,
+                SQLiteProcessStore) or a plain dict, which is indexed in place
         """
-        self.storage = storage_backend if storage_backend is not None else {}
-        logger.info("VPBCRUDManager initialized")
+        if storage_backend is None:
+            storage_backend = InMemoryProcessStore()
+        elif isinstance(storage_backend, dict):
+            storage_backend = InMemoryProcessStore(storage_backend)
+        self.storage = storage_backend
+        logger.info(f"VPBCRUDManager initialized ({type(self.storage).__name__})")
     
     # ========================================================================
     # CREATE Operations
@@ -503,13 +1094,10 @@ class VPBCRUDManager:
             if not process.name:
                 return {"success": False, "error": "Process name required"}
             
-            # Check if exists
-            if process.process_id in self.storage:
+            # Store (fails if exists)
+            if not self.storage.add(process):
                 return {"success": False, "error": f"Process {process.process_id} already exists"}
             
-            # Store
-            self.storage[process.process_id] = process
-            
             logger.info(f"Process created: {process.process_id}")
             return {
                 "success": True,
@@ -584,14 +1172,41 @@ class VPBCRUDManager:
         Returns:
             List of VPBProcess instances
         """
-        all_processes = list(self.storage.values())
+        processes, _ = self.storage.query(status=status, limit=limit, offset=offset)
+        return processes
+    
+    def list_processes_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status: Optional[ProcessStatus] = None,
+        legal_context: Optional[LegalContext] = None,
+        participant_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        List processes with cursor-based pagination.
         
-        # Filter by status
-        if status:
-            all_processes = [p for p in all_processes if p.status == status]
+        Unlike offset pagination, a page costs the same regardless of its
+        position and stays stable while processes are added.
         
-        # Pagination
-        return all_processes[offset:offset + limit]
+        Args:
+            limit: Maximum results per page
+            cursor: next_cursor of the previous page (None for the first page)
+            status: Optional status filter
+            legal_context: Optional legal context filter
+            participant_id: Optional participant filter
+        
+        Returns:
+            Dict with processes and next_cursor (None on the last page)
+        """
+        processes, next_cursor = self.storage.query(
+            status=status,
+            legal_context=legal_context,
+            participant_id=participant_id,
+            limit=limit,
+            cursor=cursor
+        )
+        return {"processes": processes, "next_cursor": next_cursor}
     
     def search_by_status(self, status: ProcessStatus) -> List[VPBProcess]:
         """
@@ -603,7 +1218,7 @@ class VPBCRUDManager:
         Returns:
             List of matching processes
         """
-        return [p for p in self.storage.values() if p.status == status]
+        return self.storage.query(status=status)[0]
     
     def search_by_participant(self, participant_id: str) -> List[VPBProcess]:
         """
@@ -615,11 +1230,7 @@ class VPBCRUDManager:
         Returns:
             List of processes involving participant
         """
-        results = []
-        for process in self.storage.values():
-            if any(p.participant_id == participant_id for p in process.participants):
-                results.append(process)
-        return results
+        return self.storage.query(participant_id=participant_id)[0]
     
     def search_by_complexity(
         self,
@@ -636,10 +1247,7 @@ class VPBCRUDManager:
         Returns:
             List of processes in complexity range
         """
-        return [
-            p for p in self.storage.values()
-            if min_score <= p.complexity_score <= max_score
-        ]
+        return self.storage.query(min_complexity=min_score, max_complexity=max_score)[0]
     
     def search_by_legal_context(self, legal_context: LegalContext) -> List[VPBProcess]:
         """
@@ -651,7 +1259,7 @@ class VPBCRUDManager:
         Returns:
             List of matching processes
         """
-        return [p for p in self.storage.values() if p.legal_context == legal_context]
+        return self.storage.query(legal_context=legal_context)[0]
     
     # ========================================================================
     # UPDATE Operations
@@ -685,6 +1293,9 @@ class VPBCRUDManager:
             # Update timestamp
             process.updated_at = datetime.now()
             
+            # Persist and refresh indexes
+            self.storage.update(process)
+            
             logger.info(f"Process updated: {process_id}")
             return {
                 "success": True,
@@ -762,14 +1373,15 @@ class VPBCRUDManager:
             Deletion result
         """
         try:
-            if process_id not in self.storage:
+            process = self.storage.get(process_id)
+            if process is None:
                 return {"success": False, "error": f"Process {process_id} not found"}
             
             if soft:
                 # Soft delete: mark as archived
-                process = self.storage[process_id]
                 process.status = ProcessStatus.ARCHIVED
                 process.updated_at = datetime.now()
+                self.storage.update(process)
                 
                 logger.info(f"Process soft-deleted: {process_id}")
                 return {
@@ -780,7 +1392,7 @@ class VPBCRUDManager:
                 }
             else:
                 # Hard delete
-                del self.storage[process_id]
+                self.storage.delete(process_id)
                 
                 logger.info(f"Process hard-deleted: {process_id}")
                 return {
@@ -808,34 +1420,16 @@ class VPBCRUDManager:
         Returns:
             Process count
         """
-        if status:
-            return len([p for p in self.storage.values() if p.status == status])
-        return len(self.storage)
+        return self.storage.count(status)
     
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get process statistics.
         
         Returns:
-            Statistics dictionary
+            Statistics dictionary (from incremental counters, no scan)
         """
-        all_processes = list(self.storage.values())
-        
-        status_counts = {}
-        for status in ProcessStatus:
-            status_counts[status.value] = len([p for p in all_processes if p.status == status])
-        
-        legal_context_counts = {}
-        for context in LegalContext:
-            legal_context_counts[context.value] = len([p for p in all_processes if p.legal_context == context])
-        
-        return {
-            "total_processes": len(all_processes),
-            "by_status": status_counts,
-            "by_legal_context": legal_context_counts,
-            "average_complexity": sum(p.complexity_score for p in all_processes) / len(all_processes) if all_processes else 0,
-            "average_automation_potential": sum(p.automation_potential for p in all_processes) / len(all_processes) if all_processes else 0
-        }
+        return self.storage.statistics()
 
 
 # ============================================================================
@@ -843,7 +1437,9 @@ class VPBCRUDManager:
 # ============================================================================
 
 def create_vpb_crud_manager(storage_backend=None) -> VPBCRUDManager:
-    """Create VPB CRUD Manager instance"""
+    """Create VPB CRUD Manager instance (default store: see create_vpb_process_store)"""
+    if storage_backend is None:
+        storage_backend = create_vpb_process_store()
     return VPBCRUDManager(storage_backend=storage_backend)
 
 
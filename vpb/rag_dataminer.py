@@ -25,16 +25,23 @@ License: MIT with Government Partnership Commons Clause
 Repository: https://github.com/makr-code/VCC-UDS3
 """
 
-from typing import List, Dict, Any, Optional, Tuple, Set
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Tuple, Set
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
+import hashlib
 import logging
 import json
+import os
+
+import numpy as np
 
 # UDS3 Core
 from uds3.core.polyglot_manager import UDS3PolyglotManager
-from uds3.core.embeddings import create_german_embeddings
+from uds3.core.embeddings import create_german_embeddings, embed_batch_kwargs
 from uds3.core.rag_pipeline import UDS3GenericRAG
 
 # VPB Components
@@ -45,6 +52,15 @@ from vpb.parser_epk import EPKProcessParser
 # Logging
 logger = logging.getLogger(__name__)
 
+# Directory Mining (ENV, per extract_from_directory überschreibbar)
+MINING_WORKERS = int(os.getenv("UDS3_VPB_MINING_WORKERS", "1"))  # 0 = os.cpu_count()
+MINING_PARSE_CHUNK = int(os.getenv("UDS3_VPB_MINING_PARSE_CHUNK", "16"))  # Dateien pro Worker-Aufruf
+MINING_SAVE_BATCH = int(os.getenv("UDS3_VPB_MINING_SAVE_BATCH", "100"))
+MINING_EMBED_BATCH = int(os.getenv("UDS3_VPB_MINING_EMBED_BATCH", "64"))
+MINING_STATE_FILE = os.getenv("UDS3_VPB_MINING_STATE", ".uds3_mining_state.json")
+MINING_SUFFIXES = ('.bpmn', '.epk')
+MINING_EMBEDDINGS_SUFFIX = '.embeddings.npz'  # Node-Embeddings neben der State-Datei
+
 
 @dataclass
 class ProcessKnowledgeNode:
@@ -59,16 +75,185 @@ class ProcessKnowledgeNode:
     tags: List[str] = field(default_factory=list)
 
 
+class NodeEmbeddingIndex:
+    """
+    Normalisierte Embedding-Matrix für die Semantic Search im Knowledge Graph.
+    
+    Jeder Node mit Embedding belegt eine feste Zeile einer zusammenhängenden
+    float32 Matrix, die beim Anhängen in Verdopplungsschritten wächst. Pro
+    Node-Typ gibt es eine boolesche Zeilenmaske. Eine Suche ist ein einzelnes
+    Matrix-Vektor-Produkt plus argpartition für die Top-K.
+    """
+    
+    INITIAL_CAPACITY = 256
+    
+    def __init__(self):
+        self._matrix: Optional[np.ndarray] = None  # Lazy: Dimension erst beim ersten Embedding bekannt
+        self._active = np.zeros(0, dtype=bool)
+        self._type_masks: Dict[str, np.ndarray] = {}
+        self._row_ids: List[Optional[str]] = []
+        self._row_types: List[Optional[str]] = []
+        self._id_rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+    
+    def __len__(self) -> int:
+        return len(self._id_rows)
+    
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._id_rows
+    
+    @property
+    def dim(self) -> Optional[int]:
+        return None if self._matrix is None else self._matrix.shape[1]
+    
+    def _grow(self, capacity: int):
+        old = self._matrix.shape[0]
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[:old] = self._matrix
+        self._matrix = matrix
+        self._active = np.concatenate([self._active, np.zeros(capacity - old, dtype=bool)])
+        for node_type, mask in self._type_masks.items():
+            self._type_masks[node_type] = np.concatenate([mask, np.zeros(capacity - old, dtype=bool)])
+    
+    def add(self, node_id: str, node_type: str, embedding: Any):
+        """Speichert (bzw. ersetzt) das normalisierte Embedding für node_id"""
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        if self._matrix is None:
+            self._matrix = np.zeros((self.INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32)
+            self._active = np.zeros(self.INITIAL_CAPACITY, dtype=bool)
+        elif vector.shape[0] != self._matrix.shape[1]:
+            raise ValueError(f"Embedding-Dimension {vector.shape[0]} != {self._matrix.shape[1]}")
+        
+        row = self._id_rows.get(node_id)
+        if row is None:
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                row = len(self._row_ids)
+                if row >= self._matrix.shape[0]:
+                    self._grow(2 * self._matrix.shape[0])
+                self._row_ids.append(None)
+                self._row_types.append(None)
+            self._id_rows[node_id] = row
+            self._row_ids[row] = node_id
+        elif self._row_types[row] != node_type:
+            self._type_masks[self._row_types[row]][row] = False
+        
+        norm = float(np.linalg.norm(vector))
+        # Null-Vektor bleibt Null: Similarity 0.0 wie bei _cosine_similarity
+        self._matrix[row] = vector / norm if norm > 0 else 0.0
+        self._active[row] = True
+        self._row_types[row] = node_type
+        mask = self._type_masks.get(node_type)
+        if mask is None:
+            mask = self._type_masks[node_type] = np.zeros(self._matrix.shape[0], dtype=bool)
+        mask[row] = True
+    
+    def remove(self, node_id: str):
+        row = self._id_rows.pop(node_id, None)
+        if row is None:
+            return
+        self._active[row] = False
+        self._type_masks[self._row_types[row]][row] = False
+        self._row_ids[row] = None
+        self._row_types[row] = None
+        self._free_rows.append(row)
+    
+    def clear(self):
+        self.__init__()
+    
+    def search(self, embedding: Any, node_type: Optional[str] = None, top_k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Top-K Nodes nach Cosine-Ähnlichkeit, absteigend sortiert.
+        
+        Args:
+            embedding: Query-Embedding
+            node_type: Optional nur Zeilen dieses Node-Typs
+            top_k: Anzahl Ergebnisse
+        
+        Returns:
+            Liste von (node_id, similarity)
+        """
+        if self._matrix is None or top_k <= 0:
+            return []
+        mask = self._active if node_type is None else self._type_masks.get(node_type)
+        n = len(self._row_ids)
+        if mask is None or not mask[:n].any():
+            return []
+        
+        query = np.asarray(embedding, dtype=np.float32).ravel()
+        if query.shape[0] != self._matrix.shape[1]:
+            raise ValueError(f"Query-Dimension {query.shape[0]} != {self._matrix.shape[1]}")
+        norm = float(np.linalg.norm(query))
+        if norm > 0:
+            query = query / norm
+        
+        candidates = np.flatnonzero(mask[:n])
+        similarities = (self._matrix[:n] @ query)[candidates]
+        
+        k = min(top_k, candidates.shape[0])
+        if k < candidates.shape[0]:
+            top = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            top = np.arange(candidates.shape[0])
+        # Absteigend nach Similarity, bei Gleichstand nach Zeile (stabil wie list.sort)
+        top = top[np.lexsort((top, -similarities[top]))]
+        return [(self._row_ids[candidates[i]], float(similarities[i])) for i in top]
+
+
 @dataclass
 class ProcessKnowledgeGraph:
     """Knowledge Graph für VPB Prozesse"""
     nodes: Dict[str, ProcessKnowledgeNode] = field(default_factory=dict)
     edges: List[Tuple[str, str, str]] = field(default_factory=list)  # (source, target, relation_type)
     statistics: Dict[str, Any] = field(default_factory=dict)
+    embedding_index: NodeEmbeddingIndex = field(default_factory=NodeEmbeddingIndex, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.nodes:
+            self.reindex_embeddings()
     
     def add_node(self, node: ProcessKnowledgeNode):
         """Füge Node zum Graph hinzu"""
         self.nodes[node.node_id] = node
+        if node.embeddings is not None:
+            self._index_embedding(node)
+        else:
+            self.embedding_index.remove(node.node_id)
+    
+    def set_node_embeddings(self, node_id: str, embeddings: List[float]) -> bool:
+        """Setze Embedding eines Nodes und übernimm es in den Embedding-Index"""
+        node = self.nodes.get(node_id)
+        if node is None:
+            return False
+        node.embeddings = embeddings
+        return self._index_embedding(node)
+    
+    def _index_embedding(self, node: ProcessKnowledgeNode) -> bool:
+        try:
+            self.embedding_index.add(node.node_id, node.node_type, node.embeddings)
+            return True
+        except ValueError as e:
+            logger.warning(f"Embedding für {node.node_id} nicht indiziert: {e}")
+            self.embedding_index.remove(node.node_id)
+            return False
+    
+    def reindex_embeddings(self):
+        """Baue den Embedding-Index neu auf (nach direkter Änderung von node.embeddings)"""
+        self.embedding_index.clear()
+        for node in self.nodes.values():
+            if node.embeddings is not None:
+                self._index_embedding(node)
+    
+    def search_similar(
+        self,
+        embedding: List[float],
+        node_type: Optional[str] = None,
+        top_k: int = 5
+    ) -> List[Tuple[ProcessKnowledgeNode, float]]:
+        """Top-K Nodes nach Cosine-Ähnlichkeit zum Embedding"""
+        return [(self.nodes[node_id], similarity)
+                for node_id, similarity in self.embedding_index.search(embedding, node_type, top_k)]
     
     def add_edge(self, source_id: str, target_id: str, relation_type: str):
         """Füge Edge zum Graph hinzu"""
@@ -128,6 +313,43 @@ class DataMiningResult:
     gaps_detected: List[Dict[str, Any]]
     execution_time_ms: float
     statistics: Dict[str, Any]
+    files_skipped: int = 0  # Inkrementeller Modus: unverändert, kein UDS3-Write/Embedding
+    files_failed: int = 0
+
+
+class _MiningJob(NamedTuple):
+    key: str  # Pfad relativ zum Mining-Verzeichnis
+    digest: str  # SHA-256 des Dateiinhalts
+    suffix: str
+    content: str
+    filename: str
+    unchanged: bool = False  # Inkrementeller Modus: Hash wie beim letzten Lauf
+
+
+# Parser pro Worker-Prozess, beim ersten Job erzeugt
+_WORKER_PARSERS: Optional[Tuple[BPMNProcessParser, EPKProcessParser]] = None
+
+
+def _parse_process_content(
+    bpmn_parser: BPMNProcessParser,
+    epk_parser: EPKProcessParser,
+    job: _MiningJob
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Parse eine Prozessdatei (BPMN XML oder EPK JSON) -> (process_data, error)"""
+    try:
+        if job.suffix == '.bpmn':
+            return bpmn_parser.parse_bpmn_to_uds3(job.content, job.filename), None
+        return epk_parser.parse_epk_to_uds3(json.loads(job.content), job.filename), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _parse_in_worker(jobs: List[_MiningJob]) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """Einstiegspunkt im ProcessPoolExecutor (muss auf Modulebene liegen)"""
+    global _WORKER_PARSERS
+    if _WORKER_PARSERS is None:
+        _WORKER_PARSERS = (BPMNProcessParser(), EPKProcessParser())
+    return [_parse_process_content(*_WORKER_PARSERS, job) for job in jobs]
 
 
 class VPBRAGDataMiner:
@@ -217,61 +439,117 @@ class VPBRAGDataMiner:
             logger.error(f"EPK Extraction fehlgeschlagen: {e}")
             return {}
     
-    def extract_from_directory(self, directory_path: Path, file_pattern: str = "*.bpmn") -> DataMiningResult:
+    def extract_from_directory(
+        self,
+        directory_path: Path,
+        file_pattern: str = "*.bpmn",
+        max_workers: Optional[int] = None,
+        incremental: bool = False,
+        state_path: Optional[Path] = None
+    ) -> DataMiningResult:
         """
         Extrahiere Prozess-Wissen aus allen Dateien in einem Verzeichnis
         
+        Parsing und Validierung laufen bei max_workers > 1 in einem Process Pool;
+        der Hauptprozess baut währenddessen den Knowledge Graph auf und schreibt
+        die Prozesse in Batches (UDS3-Writes, Embeddings über Dateigrenzen hinweg).
+        
         Args:
             directory_path: Verzeichnis-Pfad
             file_pattern: Datei-Pattern (*.bpmn, *.epk, etc.)
+            max_workers: Parser-Prozesse (None = UDS3_VPB_MINING_WORKERS, 0 = alle CPUs)
+            incremental: Dateien, deren Inhalt seit dem letzten Lauf unverändert ist, werden
+                nicht erneut in UDS3 geschrieben und nicht neu embedded; sie werden aber
+                geparst und kommen in den Knowledge Graph (Embeddings aus der Sidecar-Datei
+                <state_path>.embeddings.npz, fehlende werden nachgeneriert)
+            state_path: Hash-Datei für den inkrementellen Modus
+                (Default: <directory_path>/.uds3_mining_state.json)
         
         Returns:
             DataMiningResult mit Statistiken
         """
         start_time = datetime.now()
+        directory_path = Path(directory_path)
         
         logger.info(f"Starte Data Mining: {directory_path} ({file_pattern})")
         
-        processes_extracted = 0
-        documents_created = 0
-        embeddings_generated = 0
-        
-        # Finde alle Dateien
-        files = list(directory_path.glob(file_pattern))
+        # Finde alle Dateien (sortiert: reproduzierbare Batches über inkrementelle Läufe)
+        files = sorted(directory_path.glob(file_pattern))
         logger.info(f"Gefunden: {len(files)} Dateien")
         
-        for file_path in files:
+        workers = MINING_WORKERS if max_workers is None else max_workers
+        workers = workers or os.cpu_count() or 1
+        state_path = Path(state_path) if state_path else directory_path / MINING_STATE_FILE
+        previous_hashes = self._load_mining_state(state_path) if incremental else {}
+        hashes = dict(previous_hashes)
+        embeddings_path = state_path.with_name(state_path.name + MINING_EMBEDDINGS_SUFFIX)
+        stored_embeddings = (
+            self._load_mining_embeddings(embeddings_path)
+            if incremental and self.enable_embeddings else {}
+        )
+        mined_node_ids: List[str] = []
+        
+        counts = {'processes': 0, 'documents': 0, 'embeddings': 0, 'skipped': 0, 'failed': 0}
+        pending_batch: List[Tuple[_MiningJob, Dict[str, Any]]] = []
+        
+        def handle(job: _MiningJob, process_data: Optional[Dict[str, Any]], error: Optional[str]):
+            if error is not None:
+                logger.error(f"Fehler beim Verarbeiten von {job.filename}: {error}")
+                counts['failed'] += 1
+                hashes.pop(job.key, None)
+                return
+            if not process_data:
+                return
             try:
-                # Lese Datei
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Extrahiere basierend auf Dateiendung
-                if file_path.suffix == '.bpmn':
-                    process_data = self.extract_from_bpmn(content, file_path.name)
-                elif file_path.suffix == '.epk':
-                    # EPK als JSON
-                    epk_data = json.loads(content)
-                    process_data = self.extract_from_epk(epk_data, file_path.name)
-                else:
-                    logger.warning(f"Unbekanntes Dateiformat: {file_path.suffix}")
-                    continue
-                
-                if process_data:
-                    processes_extracted += 1
-                    
-                    # Speichere in UDS3
-                    doc_id = self._save_to_uds3(process_data)
-                    if doc_id:
-                        documents_created += 1
-                        
-                        # Generiere Embeddings
-                        if self.enable_embeddings:
-                            emb_count = self._generate_embeddings_for_process(process_data)
-                            embeddings_generated += emb_count
-            
+                self._create_knowledge_nodes_from_process(process_data)
+                node_ids = [node_id for node_id, _ in self._embedding_texts(process_data)]
             except Exception as e:
-                logger.error(f"Fehler beim Verarbeiten von {file_path}: {e}")
+                # Eine fehlerhafte Datei bricht den Verzeichnis-Lauf nicht ab
+                logger.error(f"Fehler beim Verarbeiten von {job.filename}: {e}")
+                counts['failed'] += 1
+                hashes.pop(job.key, None)
+                return
+            counts['processes'] += 1
+            mined_node_ids.extend(node_ids)
+            pending_batch.append((job, process_data))
+            if len(pending_batch) >= MINING_SAVE_BATCH:
+                self._flush_mining_batch(pending_batch, counts, hashes, stored_embeddings)
+        
+        jobs = self._iter_mining_jobs(directory_path, files, previous_hashes, counts)
+        completed = False
+        try:
+            if workers > 1 and len(files) > 1:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    # Begrenzt viele Chunks im Flug; Reihenfolge wie im Verzeichnis
+                    in_flight = deque()
+                    
+                    def drain_one():
+                        chunk, future = in_flight.popleft()
+                        for job, parsed in zip(chunk, future.result()):
+                            handle(job, *parsed)
+                    
+                    while True:
+                        chunk = list(islice(jobs, MINING_PARSE_CHUNK))
+                        if not chunk:
+                            break
+                        in_flight.append((chunk, executor.submit(_parse_in_worker, chunk)))
+                        if len(in_flight) >= workers * 4:
+                            drain_one()
+                    while in_flight:
+                        drain_one()
+            else:
+                for job in jobs:
+                    handle(job, *_parse_process_content(self.bpmn_parser, self.epk_parser, job))
+            self._flush_mining_batch(pending_batch, counts, hashes, stored_embeddings)
+            completed = True
+        finally:
+            if incremental:
+                self._save_mining_state(state_path, directory_path, hashes)
+                if self.enable_embeddings:
+                    # Abgebrochener Lauf: nicht erreichte Dateien behalten ihre Embeddings
+                    self._save_mining_embeddings(
+                        embeddings_path, mined_node_ids, None if completed else stored_embeddings
+                    )
         
         # Berechne Graph-Statistiken
         self.knowledge_graph.compute_statistics()
@@ -282,19 +560,149 @@ class VPBRAGDataMiner:
         execution_time = (datetime.now() - start_time).total_seconds() * 1000
         
         result = DataMiningResult(
-            processes_extracted=processes_extracted,
+            processes_extracted=counts['processes'],
             knowledge_graph=self.knowledge_graph,
-            documents_created=documents_created,
-            embeddings_generated=embeddings_generated,
+            documents_created=counts['documents'],
+            embeddings_generated=counts['embeddings'],
             gaps_detected=gaps,
             execution_time_ms=execution_time,
-            statistics=self.knowledge_graph.statistics
+            statistics=self.knowledge_graph.statistics,
+            files_skipped=counts['skipped'],
+            files_failed=counts['failed']
         )
         
-        logger.info(f"Data Mining abgeschlossen: {processes_extracted} Prozesse in {execution_time:.1f}ms")
+        logger.info(
+            f"Data Mining abgeschlossen: {counts['processes']} Prozesse in {execution_time:.1f}ms "
+            f"({counts['skipped']} unverändert übersprungen, {workers} Worker)"
+        )
         
         return result
     
+    def _iter_mining_jobs(
+        self,
+        directory_path: Path,
+        files: List[Path],
+        previous_hashes: Dict[str, str],
+        counts: Dict[str, int]
+    ) -> Iterator[_MiningJob]:
+        """Lese Dateien lazy, hashe sie und markiere unveränderte (inkrementeller Modus)"""
+        for file_path in files:
+            if file_path.suffix not in MINING_SUFFIXES:
+                logger.warning(f"Unbekanntes Dateiformat: {file_path.suffix}")
+                continue
+            try:
+                raw = file_path.read_bytes()
+                digest = hashlib.sha256(raw).hexdigest()
+                key = file_path.relative_to(directory_path).as_posix()
+                unchanged = previous_hashes.get(key) == digest
+                yield _MiningJob(key, digest, file_path.suffix, raw.decode('utf-8'), file_path.name, unchanged)
+            except Exception as e:
+                logger.error(f"Fehler beim Verarbeiten von {file_path}: {e}")
+                counts['failed'] += 1
+    
+    def _flush_mining_batch(
+        self,
+        batch: List[Tuple[_MiningJob, Dict[str, Any]]],
+        counts: Dict[str, int],
+        hashes: Dict[str, str],
+        stored_embeddings: Optional[Dict[str, List[float]]] = None
+    ):
+        """
+        Schreibe gesammelte Prozesse in UDS3 und generiere ihre Embeddings gebündelt
+        
+        Unveränderte Dateien (inkrementeller Modus) werden nicht geschrieben; ihre
+        Embeddings kommen aus stored_embeddings, nur fehlende werden generiert.
+        """
+        if not batch:
+            return
+        changed = [(job, process_data) for job, process_data in batch if not job.unchanged]
+        doc_ids = self._save_batch_to_uds3([process_data for _, process_data in changed]) if changed else []
+        saved = [(job, process_data) for (job, process_data), doc_id in zip(changed, doc_ids) if doc_id]
+        counts['documents'] += len(saved)
+        counts['skipped'] += len(batch) - len(changed)
+        
+        if self.enable_embeddings:
+            to_embed = [process_data for _, process_data in saved]
+            for job, process_data in batch:
+                if job.unchanged and not self._restore_embeddings(process_data, stored_embeddings or {}):
+                    to_embed.append(process_data)
+            if to_embed:
+                counts['embeddings'] += self._generate_embeddings_for_processes(to_embed)
+        
+        # Nur gespeicherte (oder unveränderte) Dateien gelten beim nächsten Lauf als unverändert
+        saved_keys = {job.key for job, _ in saved}
+        for job, _ in batch:
+            if job.key in saved_keys or job.unchanged:
+                hashes[job.key] = job.digest
+            else:
+                hashes.pop(job.key, None)
+        batch.clear()
+    
+    def _restore_embeddings(self, process_data: Dict[str, Any], stored: Dict[str, List[float]]) -> bool:
+        """Übernimm gespeicherte Embeddings; False, wenn eines fehlt"""
+        node_ids = [node_id for node_id, _ in self._embedding_texts(process_data)]
+        if not all(node_id in stored for node_id in node_ids):
+            return False
+        return all(self.knowledge_graph.set_node_embeddings(node_id, stored[node_id]) for node_id in node_ids)
+    
+    @staticmethod
+    def _load_mining_embeddings(embeddings_path: Path) -> Dict[str, List[float]]:
+        """Lade Node-Embeddings des letzten inkrementellen Laufs"""
+        try:
+            with np.load(embeddings_path) as data:
+                return dict(zip(data['node_ids'].tolist(), data['vectors'].tolist()))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Mining-Embeddings {embeddings_path} nicht lesbar, generiere neu: {e}")
+            return {}
+    
+    def _save_mining_embeddings(
+        self,
+        embeddings_path: Path,
+        node_ids: List[str],
+        carry_over: Optional[Dict[str, List[float]]] = None
+    ):
+        """Speichere die Embeddings der in diesem Lauf geminten Nodes atomar (plus carry_over)"""
+        nodes = self.knowledge_graph.nodes
+        embeddings = dict(carry_over or {})
+        for node_id in node_ids:
+            if node_id in nodes and nodes[node_id].embeddings is not None:
+                embeddings[node_id] = nodes[node_id].embeddings
+        node_ids = list(embeddings)
+        tmp_path = embeddings_path.with_name(embeddings_path.name + '.tmp')
+        try:
+            vectors = np.asarray([embeddings[node_id] for node_id in node_ids], dtype=np.float32)
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, node_ids=np.asarray(node_ids, dtype=str), vectors=vectors)
+            os.replace(tmp_path, embeddings_path)
+        except Exception as e:
+            logger.error(f"Mining-Embeddings {embeddings_path} konnten nicht gespeichert werden: {e}")
+    
+    @staticmethod
+    def _load_mining_state(state_path: Path) -> Dict[str, str]:
+        """Lade Datei-Hashes des letzten Laufs"""
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                return dict(json.load(f).get('files', {}))
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Mining-State {state_path} nicht lesbar, starte vollständig: {e}")
+            return {}
+    
+    @staticmethod
+    def _save_mining_state(state_path: Path, directory_path: Path, hashes: Dict[str, str]):
+        """Speichere Datei-Hashes atomar; gelöschte Dateien fallen heraus"""
+        files = {key: digest for key, digest in hashes.items() if (directory_path / key).exists()}
+        tmp_path = state_path.with_name(state_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'updated_at': datetime.now().isoformat(), 'files': files}, f)
+            os.replace(tmp_path, state_path)
+        except Exception as e:
+            logger.error(f"Mining-State {state_path} konnte nicht gespeichert werden: {e}")
+    
     def _create_knowledge_nodes_from_process(self, process_data: Dict[str, Any]):
         """
         Erstelle Knowledge Graph Nodes aus Prozess-Daten
@@ -400,6 +808,54 @@ class VPBRAGDataMiner:
             logger.error(f"Fehler beim Speichern: {e}")
             return None
     
+    def _save_batch_to_uds3(self, processes: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """
+        Speichere mehrere Prozesse in UDS3
+        
+        Nutzt batch_create des Managers, falls vorhanden, sonst _save_to_uds3
+        pro Prozess.
+        
+        Args:
+            processes: Prozess-Daten
+        
+        Returns:
+            Document IDs (None bei Fehler), positionsgleich zu processes
+        """
+        batch_create = getattr(self.polyglot, 'batch_create', None)
+        if batch_create is None:
+            return [self._save_to_uds3(process_data) for process_data in processes]
+        
+        metadata = {'source': 'rag_dataminer', 'extraction_time': datetime.now().isoformat()}
+        try:
+            doc_ids = list(batch_create([
+                {'data': process_data, 'app_domain': 'vpb', 'metadata': metadata}
+                for process_data in processes
+            ]))
+        except Exception as e:
+            # Kein Einzel-Fallback: Teile der Batch könnten bereits geschrieben sein
+            logger.error(f"Fehler beim Batch-Speichern von {len(processes)} Prozessen: {e}")
+            return [None] * len(processes)
+        
+        if len(doc_ids) != len(processes):
+            logger.error(f"batch_create lieferte {len(doc_ids)} IDs für {len(processes)} Prozesse")
+            return [None] * len(processes)
+        logger.info(f"Prozesse gespeichert: {len(doc_ids)}")
+        return doc_ids
+    
+    @staticmethod
+    def _embedding_texts(process_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """(node_id, text) der Process- und Task-Nodes eines Prozesses, die embedded werden"""
+        process_id = process_data.get('process_id', 'unknown')
+        texts = []
+        process_text = f"{process_data.get('name', '')} {process_data.get('description', '')}"
+        if process_text.strip():
+            texts.append((process_id, process_text))
+        for step in process_data.get('steps', []):
+            task_text = f"{step.get('action', '')} {step.get('description', '')}"
+            if task_text.strip():
+                texts.append((f"{process_id}_task_{step.get('step_number', 0)}", task_text))
+        return texts
+    
     def _generate_embeddings_for_process(self, process_data: Dict[str, Any]) -> int:
         """
         Generiere Embeddings für Prozess-Elemente
@@ -407,40 +863,49 @@ class VPBRAGDataMiner:
         Args:
             process_data: Prozess-Daten
         
+        Returns:
+            Anzahl generierter Embeddings
+        """
+        return self._generate_embeddings_for_processes([process_data])
+    
+    def _generate_embeddings_for_processes(self, processes: List[Dict[str, Any]]) -> int:
+        """
+        Generiere Embeddings für die Elemente mehrerer Prozesse in Batches
+        
+        Args:
+            processes: Prozess-Daten
+        
         Returns:
             Anzahl generierter Embeddings
         """
         if not self.enable_embeddings:
             return 0
         
-        count = 0
+        # (node_id, text) für Process- und Task-Level über alle Prozesse sammeln
+        pending = [pair for process_data in processes for pair in self._embedding_texts(process_data)]
+        pending = [(node_id, text) for node_id, text in pending if node_id in self.knowledge_graph.nodes]
         
-        try:
-            # Process-Level Embedding
-            process_text = f"{process_data.get('name', '')} {process_data.get('description', '')}"
-            if process_text.strip():
-                embedding = self.embeddings_model.embed_query(process_text)
+        count = 0
+        embed_batch = getattr(self.embeddings_model, 'embed_batch', None)
+        embed_kwargs = embed_batch_kwargs(embed_batch) if embed_batch is not None else {}
+        for start in range(0, len(pending), MINING_EMBED_BATCH):
+            chunk = pending[start:start + MINING_EMBED_BATCH]
+            try:
+                texts = [text for _, text in chunk]
+                if embed_batch is not None:
+                    embeddings = embed_batch(texts, **embed_kwargs)
+                else:
+                    embeddings = [self.embeddings_model.embed_query(text) for text in texts]
                 
                 # Speichere im Knowledge Graph
-                process_id = process_data.get('process_id', 'unknown')
-                if process_id in self.knowledge_graph.nodes:
-                    self.knowledge_graph.nodes[process_id].embeddings = embedding
-                    count += 1
-            
-            # Task-Level Embeddings
-            steps = process_data.get('steps', [])
-            for step in steps:
-                task_text = f"{step.get('action', '')} {step.get('description', '')}"
-                if task_text.strip():
-                    embedding = self.embeddings_model.embed_query(task_text)
-                    
-                    task_id = f"{process_data.get('process_id', 'unknown')}_task_{step.get('step_number', 0)}"
-                    if task_id in self.knowledge_graph.nodes:
-                        self.knowledge_graph.nodes[task_id].embeddings = embedding
+                for (node_id, _), embedding in zip(chunk, embeddings):
+                    if hasattr(embedding, 'tolist'):
+                        embedding = embedding.tolist()
+                    if self.knowledge_graph.set_node_embeddings(node_id, embedding):
                         count += 1
-        
-        except Exception as e:
-            logger.error(f"Fehler beim Generieren von Embeddings: {e}")
+            
+            except Exception as e:
+                logger.error(f"Fehler beim Generieren von Embeddings: {e}")
         
         return count
     
@@ -544,26 +1009,10 @@ class VPBRAGDataMiner:
             # Generiere Query Embedding
             query_embedding = self.embeddings_model.embed_query(query)
             
-            # Berechne Similarity zu allen Nodes
-            similarities = []
-            for node_id, node in self.knowledge_graph.nodes.items():
-                # Filter nach Node-Typ
-                if node_type and node.node_type != node_type:
-                    continue
-                
-                # Skip wenn keine Embeddings
-                if node.embeddings is None:
-                    continue
-                
-                # Cosine Similarity
-                similarity = self._cosine_similarity(query_embedding, node.embeddings)
-                similarities.append((node, similarity))
-            
-            # Sortiere nach Similarity
-            similarities.sort(key=lambda x: x[1], reverse=True)
+            # Ein Matrix-Vektor-Produkt über den Embedding-Index, Top-K per argpartition
+            similarities = self.knowledge_graph.search_similar(query_embedding, node_type or None, top_k)
             
-            # Return Top-K
-            return [node for node, _ in similarities[:top_k]]
+            return [node for node, _ in similarities]
         
         except Exception as e:
             logger.error(f"Query fehlgeschlagen: {e}")